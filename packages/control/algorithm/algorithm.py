@@ -3,6 +3,7 @@ import logging
 from control import counter
 from control import data
 from control.algorithm import common
+from control.algorithm.filter_chargepoints import chargepoint_plan
 from control.algorithm.additional_current import AdditionalCurrent
 from control.algorithm.min_current import MinCurrent
 from control.algorithm.no_current import NoCurrent
@@ -24,25 +25,26 @@ class Algorithm:
         try:
             log.info("# Algorithmus")
             self.evu_counter = data.data.counter_all_data.get_evu_counter()
-            self._check_auto_phase_switch_delay()
-            self.surplus_controlled.check_submode_pv_charging()
-            common.reset_current()
-            log.info("**Mindestrom setzen**")
-            self.min_current.set_min_current()
-            log.info("**Soll-Strom setzen**")
-            common.reset_current_to_target_current()
-            self.additional_current.set_additional_current()
-            counter.limit_raw_power_left_to_surplus(self.evu_counter.calc_raw_surplus())
-            self.surplus_controlled.check_switch_on()
-            if self.evu_counter.data.set.surplus_power_left > 0:
-                log.info("**PV-geführten Strom setzen**")
+            with chargepoint_plan():
+                self._check_auto_phase_switch_delay()
+                self.surplus_controlled.check_submode_pv_charging()
+                common.reset_current()
+                log.info("**Mindestrom setzen**")
+                self.min_current.set_min_current()
+                log.info("**Soll-Strom setzen**")
                 common.reset_current_to_target_current()
-                self.surplus_controlled.set_required_current_to_max()
-                self.surplus_controlled.set_surplus_current()
-            else:
-                log.info("**Keine Leistung für PV-geführtes Laden übrig.**")
-            self.no_current.set_no_current()
-            self.no_current.set_none_current()
+                self.additional_current.set_additional_current()
+                counter.limit_raw_power_left_to_surplus(self.evu_counter.calc_raw_surplus())
+                self.surplus_controlled.check_switch_on()
+                if self.evu_counter.data.set.surplus_power_left > 0:
+                    log.info("**PV-geführten Strom setzen**")
+                    common.reset_current_to_target_current()
+                    self.surplus_controlled.set_required_current_to_max()
+                    self.surplus_controlled.set_surplus_current()
+                else:
+                    log.info("**Keine Leistung für PV-geführtes Laden übrig.**")
+                self.no_current.set_no_current()
+                self.no_current.set_none_current()
         except Exception:
             log.exception("Fehler im Algorithmus-Modul")
 
@@ -33,13 +33,13 @@ def reset_current_by_chargemode(mode_tuple: Tuple[Optional[str], str, bool]) ->
 
 
 def mode_and_counter_generator(chargemodes: List) -> Iterable[Tuple[Tuple[Optional[str], str, bool], Counter]]:
+    # Die Hierarchie ändert sich während der Berechnung nicht, daher werden die Zähler nur einmal ermittelt.
+    counters = [f"counter{element['id']}"
+                for level in reversed(data.data.counter_all_data.get_list_of_elements_per_level())
+                for element in level if element["type"] == ComponentType.COUNTER.value]
     for mode_tuple in chargemodes:
-        levels = data.data.counter_all_data.get_list_of_elements_per_level()
-        for level in reversed(levels):
-            for element in level:
-                if element["type"] == ComponentType.COUNTER.value:
-                    counter = data.data.counter_data[f"counter{element['id']}"]
-                    yield mode_tuple, counter
+        for counter in counters:
+            yield mode_tuple, data.data.counter_data[counter]
 
 
 # tested
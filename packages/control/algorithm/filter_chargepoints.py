@@ -1,6 +1,7 @@
 # tested
+from contextlib import contextmanager
 import logging
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from control import data
 from control.chargepoint.chargepoint import Chargepoint
@@ -8,8 +9,54 @@ from control.chargepoint.chargepoint import Chargepoint
 log = logging.getLogger(__name__)
 
 
+class ChargepointPlan:
+    """ ordnet die Ladepunkte einmal je Regelzyklus den Lademodus-Tupeln zu, damit die Stufen des Algorithmus nicht
+    für jedes Tupel und jeden Zähler alle Ladepunkte durchgehen. Lademodus, Submodus und Priorität ändern sich
+    während der Berechnung nicht.
+    """
+
+    def __init__(self) -> None:
+        # (Lademodus, Submodus, Priorität) und (None, Submodus, Priorität) -> Ladepunkte in Reihenfolge von cp_data
+        self.by_mode: Dict[Tuple, List[Chargepoint]] = {}
+        self._cp_nums_of_counter: Dict[str, Set[int]] = {}
+        for cp in data.data.cp_data.values():
+            if cp.data.set.charging_ev != -1:
+                control_parameter = cp.data.control_parameter
+                modes = (None,) if control_parameter.chargemode is None else (control_parameter.chargemode, None)
+                for mode in modes:
+                    self.by_mode.setdefault((mode, control_parameter.submode, control_parameter.prio), []).append(cp)
+
+    def get_chargepoints_by_mode(self, mode_tuple: Tuple[Optional[str], str, bool]) -> List[Chargepoint]:
+        return list(self.by_mode.get(tuple(mode_tuple), []))
+
+    def get_cp_nums_of_counter(self, counter: str) -> Set[int]:
+        try:
+            return self._cp_nums_of_counter[counter]
+        except KeyError:
+            nums = {int(cp[2:]) for cp in data.data.counter_all_data.get_chargepoints_of_counter(counter)}
+            self._cp_nums_of_counter[counter] = nums
+            return nums
+
+
+_plan: Optional[ChargepointPlan] = None
+
+
+@contextmanager
+def chargepoint_plan() -> Iterator[ChargepointPlan]:
+    """ Innerhalb des Kontexts werden die Ladepunkte aus der Zuordnung zu Beginn ermittelt. """
+    global _plan
+    _plan = ChargepointPlan()
+    try:
+        yield _plan
+    finally:
+        _plan = None
+
+
 def get_chargepoints_by_mode_and_counter(mode_tuple: Tuple[Optional[str], str, bool],
                                          counter: str) -> List[Chargepoint]:
+    if _plan is not None:
+        cps_to_counter_ids = _plan.get_cp_nums_of_counter(counter)
+        return [cp for cp in _plan.get_chargepoints_by_mode(mode_tuple) if cp.num in cps_to_counter_ids]
     cps_to_counter = data.data.counter_all_data.get_chargepoints_of_counter(counter)
     cps_to_counter_ids = [int(cp[2:]) for cp in cps_to_counter]
     cps_by_mode = get_chargepoints_by_mode(mode_tuple)
@@ -19,6 +66,8 @@ def get_chargepoints_by_mode_and_counter(mode_tuple: Tuple[Optional[str], str, b
 
 
 def get_chargepoints_by_mode(mode_tuple: Tuple[Optional[str], str, bool]) -> List[Chargepoint]:
+    if _plan is not None:
+        return _plan.get_chargepoints_by_mode(mode_tuple)
     mode = mode_tuple[0]
     submode = mode_tuple[1]
     prio = mode_tuple[2]
@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 from unittest.mock import Mock
@@ -115,9 +116,15 @@ preferenced_cases = [
                          Chargemode.INSTANT_CHARGING, False),
                      1, (Chargemode.SCHEDULED_CHARGING,
                          Chargemode.INSTANT_CHARGING, True),
-                     [mock_cp1], id="cp2 is prioritized")
+                     [mock_cp1], id="cp2 is prioritized"),
+        pytest.param((None, Chargemode.TIME_CHARGING, False),
+                     1, (Chargemode.INSTANT_CHARGING, Chargemode.TIME_CHARGING, False),
+                     1, (Chargemode.PV_CHARGING, Chargemode.TIME_CHARGING, False),
+                     [mock_cp1, mock_cp2], id="any chargemode")
     ])
-def test_get_chargepoints_by_mode(set_mode_tuple: Tuple[Optional[str], str, bool],
+@pytest.mark.parametrize("planned", [False, True])
+def test_get_chargepoints_by_mode(planned: bool,
+                                  set_mode_tuple: Tuple[Optional[str], str, bool],
                                   charging_ev_1: int,
                                   mode_tuple_1: Tuple[str, str, bool],
                                   charging_ev_2: int,
@@ -134,7 +141,8 @@ def test_get_chargepoints_by_mode(set_mode_tuple: Tuple[Optional[str], str, bool
                          "cp2": setup_cp(mock_cp2, charging_ev_2, mode_tuple_2)}
 
     # evaluation
-    valid_chargepoints = filter_chargepoints.get_chargepoints_by_mode(set_mode_tuple)
+    with filter_chargepoints.chargepoint_plan() if planned else nullcontext():
+        valid_chargepoints = filter_chargepoints.get_chargepoints_by_mode(set_mode_tuple)
 
     # assertion
     assert valid_chargepoints == expected_valid_chargepoints
@@ -0,0 +1,208 @@
+""" Abfragen über die Ladelog-Dateien mit Indizes je Monat.
+
+Jede Monatsdatei wird beim ersten Zugriff einmalig eingelesen. Für Ladepunkt-ID, Fahrzeug-ID, ID-Tag und Lademodus
+wird je Monat ein Index mit den Positionen der Einträge erstellt, sodass für eine Abfrage nur die passenden Einträge
+betrachtet werden. Die Summen werden je Monat und Filter nur einmal berechnet. Geändert hat sich eine Datei, wenn sich
+Größe, Änderungszeitpunkt oder Inode unterscheiden; dann wird nur diese Datei neu eingelesen. Die Einträge selbst
+werden nur für die zuletzt abgefragten Monate mit zusammen höchstens MAX_CACHED_ENTRIES Einträgen im Speicher gehalten,
+mindestens aber für den zuletzt abgefragten Monat. Indizes und Summen der übrigen Monate bleiben erhalten, sodass
+Summen über mehrere Monate ohne erneutes Einlesen beantwortet werden; nur wenn die Einträge selbst benötigt werden, wird
+die Datei erneut eingelesen.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+log = logging.getLogger("chargelog")
+
+# Anzahl Einträge aller Monate, die im Speicher gehalten werden. Eingelesen belegt ein Eintrag einige kB.
+MAX_CACHED_ENTRIES = 5000
+
+# Filter-Kriterium: (Bereich im Filter, Schlüssel im Filter, Pfad des Werts im Eintrag)
+INDEXED_FILTERS = (("chargepoint", "id", ("chargepoint", "id")),
+                   ("vehicle", "id", ("vehicle", "id")),
+                   ("vehicle", "tag", ("vehicle", "rfid")),
+                   ("vehicle", "chargemode", ("vehicle", "chargemode")))
+_ENTRY_PATHS = {(section, key): entry_path for section, key, entry_path in INDEXED_FILTERS}
+
+
+@dataclass
+class MonthIndex:
+    stamp: Tuple[int, int, int]
+    # None, wenn die Einträge aus dem Speicher verdrängt wurden
+    entries: Optional[List[Dict]]
+    # Anzahl aller Einträge der Datei
+    size: int
+    # Position aller nicht leeren Einträge
+    positions: List[int]
+    # Filter-Kriterium -> Wert -> Positionen der Einträge, None wenn die Datei nicht indiziert werden konnte
+    indices: Optional[Dict[Tuple[str, str], Dict[Hashable, List[int]]]]
+    # Filter -> Summen und Anzahl der gefilterten Einträge
+    totals: Dict[Hashable, Tuple[Any, int]] = field(default_factory=dict)
+
+
+class ChargeLogIndex:
+    def __init__(self,
+                 get_totals: Callable[[Dict], Optional[Dict]],
+                 merge_totals: Callable[[List[Tuple[Dict, int]]], Dict]) -> None:
+        self.get_totals = get_totals
+        self.merge_totals = merge_totals
+        self._months: "OrderedDict[str, MonthIndex]" = OrderedDict()
+        self._lock = Lock()
+
+    def query(self, path: Path, request_filter: Dict) -> Optional[Dict]:
+        """ liefert die gefilterten Einträge einer Monatsdatei und deren Summen im Format von get_log_data, None wenn
+        die Datei nicht existiert. Die Einträge werden nicht kopiert und dürfen nicht verändert werden. """
+        with self._lock:
+            result = self._query_month(path, request_filter, True)
+            if result is None:
+                return None
+            entries, totals, _ = result
+            return {"entries": entries, "totals": dict(totals) if totals is not None else None}
+
+    def query_range(self, paths: Iterable[Path], request_filter: Dict, with_entries: bool = True) -> Dict:
+        """ liefert die gefilterten Einträge mehrerer Monatsdateien und die Summen über alle Monate. Die Summen werden
+        aus den Summen der Monate zusammengefasst. Ohne Einträge (with_entries=False) werden Monate, deren Summen für
+        den Filter bereits berechnet wurden, nicht erneut eingelesen. """
+        with self._lock:
+            entries: List[Dict] = []
+            month_totals = []
+            for path in paths:
+                result = self._query_month(path, request_filter, with_entries)
+                if result is None:
+                    continue
+                month_entries, totals, count = result
+                entries.extend(month_entries)
+                if count > 0:
+                    month_totals.append((totals, count))
+            return {"entries": entries, "totals": self.merge_totals(month_totals) if month_totals else {}}
+
+    def _query_month(self, path: Path, request_filter: Dict,
+                     with_entries: bool) -> Optional[Tuple[List[Dict], Any, int]]:
+        month_index = self._get_month(path, with_entries)
+        if month_index is None:
+            return None
+        if month_index.size == 0:
+            return [], {}, 0
+        filter_key = _filter_key(request_filter)
+        if with_entries is False and filter_key is not None and filter_key in month_index.totals:
+            totals, count = month_index.totals[filter_key]
+            return [], totals, count
+        if month_index.entries is None:
+            month_index = self._get_month(path)
+            if month_index is None:
+                return None
+        positions = self._filter(month_index, request_filter)
+        entries = [month_index.entries[position] for position in positions]
+        if filter_key is not None and filter_key in month_index.totals:
+            totals = month_index.totals[filter_key][0]
+        else:
+            totals = self.get_totals({"entries": entries})
+            if filter_key is not None and month_index.indices is not None:
+                month_index.totals[filter_key] = (totals, len(entries))
+        return (entries if with_entries else []), totals, len(entries)
+
+    def _get_month(self, path: Path, with_entries: bool = True) -> Optional[MonthIndex]:
+        key = str(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._months.pop(key, None)
+            return None
+        stamp = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        month_index = self._months.get(key)
+        if (month_index is None or month_index.stamp != stamp or
+                (with_entries and month_index.entries is None)):
+            with open(path, "r", encoding="utf-8") as json_file:
+                new_index = _create_month_index(stamp, json.load(json_file))
+            if month_index is not None and month_index.stamp == stamp:
+                # nur die Einträge waren verdrängt, die Summen gelten weiterhin
+                new_index.totals = month_index.totals
+            month_index = new_index
+            self._months[key] = month_index
+        self._months.move_to_end(key)
+        self._evict_entries()
+        return month_index
+
+    def _evict_entries(self) -> None:
+        """ verdrängt die Einträge der am längsten nicht abgefragten Monate, der zuletzt abgefragte Monat bleibt. """
+        cached = sum(month_index.size for month_index in self._months.values() if month_index.entries is not None)
+        for month_index in list(self._months.values())[:-1]:
+            if cached <= MAX_CACHED_ENTRIES:
+                break
+            if month_index.entries is not None:
+                month_index.entries = None
+                cached -= month_index.size
+
+    def _filter(self, month_index: MonthIndex, request_filter: Dict) -> List[int]:
+        if month_index.indices is None:
+            positions = []
+            try:
+                for position in month_index.positions:
+                    if _matches(month_index.entries[position], request_filter):
+                        positions.append(position)
+            except Exception:
+                # wie bisher werden die bis zum fehlerhaften Eintrag gefundenen Einträge geliefert
+                log.exception("Fehler im Ladelog-Modul")
+            return positions
+        candidates = None
+        for section, key, _ in INDEXED_FILTERS:
+            if key not in request_filter[section] or len(request_filter[section][key]) == 0:
+                continue
+            values = request_filter[section][key]
+            try:
+                if isinstance(values, (list, tuple)) is False:
+                    raise TypeError("Index nur für Listen von Filterwerten")
+                index = month_index.indices[(section, key)]
+                matching = {position for value in values for position in index.get(value, ())}
+            except TypeError:
+                # andere Container oder nicht hashbare Filterwerte: wie bisher mit "in" vergleichen
+                matching = {position for position in month_index.positions
+                            if _value(month_index.entries[position], section, key) in values}
+            candidates = matching if candidates is None else candidates & matching
+        positions = month_index.positions if candidates is None else sorted(candidates)
+        if "prio" in request_filter["vehicle"]:
+            prio = request_filter["vehicle"]["prio"]
+            positions = [position for position in positions
+                         if month_index.entries[position]["vehicle"]["prio"] is prio]
+        return positions
+
+
+def _create_month_index(stamp: Tuple[int, int, int], entries: List[Dict]) -> MonthIndex:
+    positions = [position for position, entry in enumerate(entries) if len(entry) > 0]
+    indices: Optional[Dict] = {(section, key): {} for section, key, _ in INDEXED_FILTERS}
+    try:
+        for position in positions:
+            for section, key, (entry_section, entry_key) in INDEXED_FILTERS:
+                indices[(section, key)].setdefault(entries[position][entry_section][entry_key], []).append(position)
+    except (KeyError, TypeError):
+        # unvollständige Einträge werden wie bisher beim Filtern einzeln geprüft
+        log.debug("Ladelog kann nicht indiziert werden, Einträge werden einzeln gefiltert.")
+        indices = None
+    return MonthIndex(stamp, entries, len(entries), positions, indices)
+
+
+def _value(entry: Dict, section: str, key: str) -> Any:
+    entry_section, entry_key = _ENTRY_PATHS[(section, key)]
+    return entry[entry_section][entry_key]
+
+
+def _matches(entry: Dict, request_filter: Dict) -> bool:
+    for section, key, _ in INDEXED_FILTERS:
+        if (key in request_filter[section] and len(request_filter[section][key]) > 0 and
+                _value(entry, section, key) not in request_filter[section][key]):
+            return False
+    return "prio" not in request_filter["vehicle"] or request_filter["vehicle"]["prio"] is entry["vehicle"]["prio"]
+
+
+def _filter_key(request_filter: Dict) -> Optional[Hashable]:
+    """ Schlüssel für die zwischengespeicherten Summen, None wenn sich der Filter nicht serialisieren lässt """
+    try:
+        return json.dumps(request_filter, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
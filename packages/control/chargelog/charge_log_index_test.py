@@ -0,0 +1,166 @@
+import builtins
+import json
+from pathlib import Path
+from typing import Dict, List
+from unittest.mock import Mock
+
+import pytest
+
+from control.chargelog import charge_log_index
+from control.chargelog.charge_log_index import ChargeLogIndex
+from control.chargelog.chargelog import get_totals_of_filtered_log_data, merge_totals_of_filtered_log_data
+
+
+def create_entry(cp: int, ev: int, rfid: str, chargemode: str, prio: bool, imported: float) -> Dict:
+    return {"chargepoint": {"id": cp, "name": f"LP{cp}"},
+            "vehicle": {"id": ev, "name": f"EV{ev}", "rfid": rfid, "chargemode": chargemode, "prio": prio},
+            "time": {"begin": "01.05.23 10:00", "end": "01.05.23 11:00", "time_charged": "1:00"},
+            "data": {"range_charged": 10, "imported_since_mode_switch": imported, "power": 1000, "costs": 0.3}}
+
+
+ENTRIES = [create_entry(1, 1, "1234", "pv_charging", False, 1.5),
+           {},
+           create_entry(2, 1, "5678", "instant_charging", True, 2.25),
+           create_entry(1, 2, "1234", "instant_charging", False, 3.0),
+           create_entry(3, 2, "", "pv_charging", True, 4.75)]
+
+
+def write(path: Path, entries: List[Dict]) -> Path:
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(entries, json_file)
+    return path
+
+
+def create_index() -> ChargeLogIndex:
+    return ChargeLogIndex(get_totals_of_filtered_log_data, merge_totals_of_filtered_log_data)
+
+
+def request_filter(cp=None, ev=None, tag=None, chargemode=None, **vehicle) -> Dict:
+    request = {"chargepoint": {}, "vehicle": vehicle}
+    if cp is not None:
+        request["chargepoint"]["id"] = cp
+    for key, value in (("id", ev), ("tag", tag), ("chargemode", chargemode)):
+        if value is not None:
+            request["vehicle"][key] = value
+    return request
+
+
+@pytest.mark.parametrize("filter_, expected", [
+    pytest.param(request_filter(), [0, 2, 3, 4], id="ohne Filter"),
+    pytest.param(request_filter(cp=[], ev=[]), [0, 2, 3, 4], id="leere Filter"),
+    pytest.param(request_filter(cp=[1]), [0, 3], id="Ladepunkt"),
+    pytest.param(request_filter(cp=[1, 3], ev=[2]), [3, 4], id="Ladepunkt und Fahrzeug"),
+    pytest.param(request_filter(tag=["1234"], chargemode=["instant_charging"]), [3], id="ID-Tag und Lademodus"),
+    pytest.param(request_filter(chargemode="instant_charging"), [2, 3], id="Lademodus als String"),
+    pytest.param(request_filter(prio=True), [2, 4], id="Priorität"),
+    pytest.param(request_filter(cp=[1], prio=1), [], id="Priorität wird auf Identität geprüft"),
+    pytest.param(request_filter(cp=[4]), [], id="kein Treffer"),
+])
+def test_query(filter_: Dict, expected: List[int], tmp_path: Path):
+    # setup
+    path = write(tmp_path / "202305.json", ENTRIES)
+    index = create_index()
+
+    # execution
+    log_data = index.query(path, filter_)
+
+    # evaluation
+    entries = [ENTRIES[i] for i in expected]
+    assert log_data == {"entries": entries, "totals": get_totals_of_filtered_log_data({"entries": entries})}
+
+
+def test_query_missing_and_empty_file(tmp_path: Path):
+    # setup
+    index = create_index()
+    path = write(tmp_path / "202305.json", [])
+
+    # execution and evaluation
+    assert index.query(tmp_path / "202304.json", request_filter()) is None
+    assert index.query(path, request_filter()) == {"entries": [], "totals": {}}
+
+
+def test_query_reloads_changed_file(tmp_path: Path):
+    # setup
+    path = write(tmp_path / "202305.json", ENTRIES[:1])
+    index = create_index()
+    assert index.query(path, request_filter(cp=[1]))["entries"] == ENTRIES[:1]
+
+    # execution
+    write(path, ENTRIES)
+    log_data = index.query(path, request_filter(cp=[1]))
+
+    # evaluation
+    assert log_data["entries"] == [ENTRIES[0], ENTRIES[3]]
+    assert log_data["totals"]["imported_since_mode_switch"] == 4.5
+
+
+def test_cache_limited_by_entries(tmp_path: Path, monkeypatch):
+    # setup
+    monkeypatch.setattr(charge_log_index, "MAX_CACHED_ENTRIES", 4)
+    paths = [write(tmp_path / "202303.json", ENTRIES[:2]),
+             write(tmp_path / "202304.json", ENTRIES[2:4]),
+             write(tmp_path / "202305.json", ENTRIES)]
+    index = create_index()
+
+    # execution
+    cached = []
+    for path in paths:
+        index.query(path, request_filter())
+        cached.append([month for month, month_index in index._months.items() if month_index.entries is not None])
+
+    # evaluation
+    assert cached == [[str(paths[0])],
+                      [str(paths[0]), str(paths[1])],
+                      # der zuletzt abgefragte Monat bleibt, auch wenn er allein die Grenze überschreitet
+                      [str(paths[2])]]
+    # Indizes und Summen der verdrängten Monate bleiben erhalten
+    assert list(index._months) == [str(path) for path in paths]
+    assert all(month_index.indices is not None and month_index.totals for month_index in index._months.values())
+
+
+def test_query_range(tmp_path: Path):
+    # setup
+    paths = [write(tmp_path / "202303.json", ENTRIES[:2]),
+             tmp_path / "202304.json",
+             write(tmp_path / "202305.json", ENTRIES[2:])]
+    index = create_index()
+
+    # execution
+    log_data = index.query_range(paths, request_filter(ev=[1]))
+
+    # evaluation
+    assert log_data["entries"] == [ENTRIES[0], ENTRIES[2]]
+    assert log_data["totals"] == get_totals_of_filtered_log_data({"entries": [ENTRIES[0], ENTRIES[2]]})
+
+
+def test_query_range_totals_from_evicted_months(tmp_path: Path, monkeypatch):
+    # setup
+    monkeypatch.setattr(charge_log_index, "MAX_CACHED_ENTRIES", 1)
+    paths = [write(tmp_path / "202303.json", ENTRIES[:2]),
+             write(tmp_path / "202304.json", ENTRIES[2:4]),
+             write(tmp_path / "202305.json", ENTRIES[4:])]
+    index = create_index()
+    index.query_range(paths, request_filter(cp=[1, 2]))
+    mock_open = Mock(side_effect=builtins.open)
+    monkeypatch.setattr(builtins, "open", mock_open)
+
+    # execution
+    log_data = index.query_range(paths, request_filter(cp=[1, 2]), with_entries=False)
+
+    # evaluation
+    assert [month_index.entries is None for month_index in index._months.values()] == [True, True, False]
+    mock_open.assert_not_called()
+    assert log_data == {"entries": [],
+                        "totals": get_totals_of_filtered_log_data({"entries": [ENTRIES[0], ENTRIES[2], ENTRIES[3]]})}
+
+
+def test_query_entries_without_index(tmp_path: Path):
+    # setup
+    path = write(tmp_path / "202305.json", [ENTRIES[0], {"chargepoint": {"id": 1}}, ENTRIES[3]])
+    index = create_index()
+
+    # execution
+    log_data = index.query(path, request_filter(ev=[1]))
+
+    # evaluation
+    assert log_data["entries"] == [ENTRIES[0]]
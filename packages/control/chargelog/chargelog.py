@@ -3,16 +3,16 @@ from enum import Enum
 import json
 import logging
 import pathlib
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from control import data
-from dataclass_utils import asdict
+from control.chargelog.charge_log_index import ChargeLogIndex
 from helpermodules.measurement_logging.process_log import (CalculationType, analyse_percentage,
                                                            get_log_from_date_until_now, process_entry)
 from helpermodules.measurement_logging.write_log import LegacySmartHomeLogData, LogType, create_entry
 from helpermodules.pub import Pub
 from helpermodules import timecheck
-from helpermodules.utils.json_file_handler import write_and_check
+from helpermodules.utils.json_file_handler import append_entry, read_content
 
 # alte Daten: Startzeitpunkt der Ladung, Endzeitpunkt, Geladene Reichweite, Energie, Leistung, Ladedauer, LP-Nummer,
 # Lademodus, ID-Tag
@@ -102,7 +102,7 @@ def collect_data(chargepoint):
                 log_data.range_charged = get_value_or_default(lambda: log_data.imported_since_mode_switch /
                                                               charging_ev.ev_template.data.average_consump * 100)
                 log_data.time_charged = timecheck.get_difference_to_now(log_data.timestamp_start_charging)[0]
-            Pub().pub(f"openWB/set/chargepoint/{chargepoint.num}/set/log", asdict(log_data))
+            Pub().pub(f"openWB/set/chargepoint/{chargepoint.num}/set/log", log_data)
     except Exception:
         log.exception("Fehler im Ladelog-Modul")
 
@@ -250,8 +250,8 @@ def write_new_entry(new_entry):
     filepath = str(_get_parent_file() / "data" / "charge_log" /
                    (timecheck.create_timestamp_YYYYMM() + ".json"))
     try:
-        with open(filepath, "r", encoding="utf-8") as json_file:
-            content = json.load(json_file)
+        # solange die Datei nur von hier geschrieben wird, ohne sie erneut einzulesen
+        content = read_content(filepath)
     except FileNotFoundError:
         # with open(filepath, "w", encoding="utf-8") as jsonFile:
         #     json.dump([], jsonFile)
@@ -259,7 +259,7 @@ def write_new_entry(new_entry):
         #     content = json.load(jsonFile)
         content = []
     content.append(new_entry)
-    write_and_check(filepath, content)
+    append_entry(filepath, content)
     log.debug(f"Neuer Ladelog-Eintrag: {new_entry}")
 
 
@@ -276,80 +276,39 @@ def get_log_data(request: Dict):
     Parameter
     ---------
     request: dict
-        Infos zum Request: Monat, Jahr, Filter
+        Infos zum Request: Monat, Jahr, Filter, optional end_year und end_month für mehrere Monate und totals_only,
+        wenn nur die Summen benötigt werden
     """
     log_data = {"entries": [], "totals": {}}
     try:
-        # Datei einlesen
-        filepath = str(_get_parent_file() / "data" / "charge_log" /
-                       (str(request["year"]) + str(request["month"]) + ".json"))
-        try:
-            with open(filepath, "r", encoding="utf-8") as json_file:
-                charge_log = json.load(json_file)
-        except FileNotFoundError:
+        if "end_year" in request or "end_month" in request:
+            # Liste mit gefilterten Einträgen und Summen über mehrere Monate
+            log_data = _charge_log_index.query_range(_get_month_paths(request), request["filter"],
+                                                     with_entries=not request.get("totals_only", False))
+            return log_data
+        filepath = _get_parent_file() / "data" / "charge_log" / (str(request["year"]) + str(request["month"]) + ".json")
+        # Liste mit gefilterten Einträgen aus dem Index der Monatsdatei
+        filtered_log_data = _charge_log_index.query(filepath, request["filter"])
+        if filtered_log_data is None:
             log.debug("Kein Ladelog für %s gefunden!" % (str(request)))
             return log_data
-        # Liste mit gefilterten Einträgen erstellen
-        for entry in charge_log:
-            if len(entry) > 0:
-                if (
-                    "id" in request["filter"]["chargepoint"] and
-                    len(request["filter"]["chargepoint"]["id"]) > 0 and
-                    entry["chargepoint"]["id"] not in request["filter"]["chargepoint"]["id"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen Ladepunkt ID: %s != %s" %
-                        (str(entry["chargepoint"]["id"]), str(request["filter"]["chargepoint"]["id"]))
-                    )
-                    continue
-                if (
-                    "id" in request["filter"]["vehicle"] and
-                    len(request["filter"]["vehicle"]["id"]) > 0 and
-                    entry["vehicle"]["id"] not in request["filter"]["vehicle"]["id"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen Fahrzeug ID: %s != %s" %
-                        (str(entry["vehicle"]["id"]), str(request["filter"]["vehicle"]["id"]))
-                    )
-                    continue
-                if (
-                    "tag" in request["filter"]["vehicle"] and
-                    len(request["filter"]["vehicle"]["tag"]) > 0 and
-                    entry["vehicle"]["rfid"] not in request["filter"]["vehicle"]["tag"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen ID Tag: %s != %s" %
-                        (str(entry["vehicle"]["rfid"]), str(request["filter"]["vehicle"]["tag"]))
-                    )
-                    continue
-                if (
-                    "chargemode" in request["filter"]["vehicle"] and
-                    len(request["filter"]["vehicle"]["chargemode"]) > 0 and
-                    entry["vehicle"]["chargemode"] not in request["filter"]["vehicle"]["chargemode"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen Lademodus: %s != %s" %
-                        (str(entry["vehicle"]["chargemode"]), str(request["filter"]["vehicle"]["chargemode"]))
-                    )
-                    continue
-                if (
-                    "prio" in request["filter"]["vehicle"] and
-                    request["filter"]["vehicle"]["prio"] is not entry["vehicle"]["prio"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen Priorität: %s != %s" %
-                        (str(entry["vehicle"]["prio"]), str(request["filter"]["vehicle"]["prio"]))
-                    )
-                    continue
-
-                # wenn wir hier ankommen, passt der Eintrag zum Filter
-                log_data["entries"].append(entry)
-            log_data["totals"] = get_totals_of_filtered_log_data(log_data)
+        log_data = filtered_log_data
     except Exception:
         log.exception("Fehler im Ladelog-Modul")
     return log_data
 
 
+def _get_month_paths(request: Dict) -> List[pathlib.Path]:
+    """ Pfade der Monatsdateien von year/month bis einschließlich end_year/end_month """
+    year, month = int(request["year"]), int(request["month"])
+    end_year, end_month = int(request.get("end_year", year)), int(request.get("end_month", month))
+    paths = []
+    while (year, month) <= (end_year, end_month):
+        paths.append(_get_parent_file() / "data" / "charge_log" / f"{year:04d}{month:02d}.json")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return paths
+
+
 def get_totals_of_filtered_log_data(log_data: Dict) -> Dict:
     def get_sum(entry_name: str) -> float:
         sum = 0
@@ -382,6 +341,34 @@ def get_totals_of_filtered_log_data(log_data: Dict) -> Dict:
         }
 
 
+def merge_totals_of_filtered_log_data(month_totals: List[Tuple[Dict, int]]) -> Dict:
+    """ fasst die Summen mehrerer Monate zusammen. month_totals enthält je Monat die Summen und die Anzahl der
+    Einträge, die Leistung wird mit der Anzahl gewichtet gemittelt. """
+    def get_sum(entry_name: str) -> Optional[float]:
+        try:
+            return sum(totals[entry_name] for totals, _ in month_totals)
+        except Exception:
+            return None
+    duration_sum = "00:00"
+    try:
+        for totals, _ in month_totals:
+            duration_sum = timecheck.duration_sum(duration_sum, totals["time_charged"])
+    except Exception:
+        duration_sum = None
+    try:
+        power = (sum(totals["power"] * count for totals, count in month_totals) /
+                 sum(count for _, count in month_totals))
+    except Exception:
+        power = None
+    return {
+        "time_charged": duration_sum,
+        "range_charged": get_sum("range_charged"),
+        "imported_since_mode_switch": get_sum("imported_since_mode_switch"),
+        "power": power,
+        "costs": get_sum("costs"),
+    }
+
+
 def calculate_charge_cost(cp, create_log_entry: bool = False):
     content = get_todays_daily_log()
     try:
@@ -419,7 +406,7 @@ def calculate_charge_cost(cp, create_log_entry: bool = False):
                           (data.data.optional_data.et_module is not None))
             cp.data.set.log.costs += costs
             log.debug(f"current costs {costs}, total costs {cp.data.set.log.costs}")
-            Pub().pub(f"openWB/set/chargepoint/{cp.num}/set/log", asdict(cp.data.set.log))
+            Pub().pub(f"openWB/set/chargepoint/{cp.num}/set/log", cp.data.set.log)
     except Exception:
         log.exception(f"Fehler beim Berechnen der Ladekosten für Ladepunkt {cp.num}")
 
@@ -511,3 +498,6 @@ def _calc(energy_source: Dict[str, float], charged_energy_last_hour: float, et_a
 
 def _get_parent_file() -> pathlib.Path:
     return pathlib.Path(__file__).resolve().parents[3]
+
+
+_charge_log_index = ChargeLogIndex(get_totals_of_filtered_log_data, merge_totals_of_filtered_log_data)
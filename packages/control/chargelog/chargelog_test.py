@@ -152,3 +152,21 @@ def test_calc_charge_cost_two_hour_change_reference_end(mock_data, monkeypatch):
     calculate_charge_cost(cp, True)
 
     assert cp.data.set.log.costs == 9.924900000000001
+
+
+def test_get_log_data_range(monkeypatch, tmp_path):
+    # setup
+    monkeypatch.setattr(chargelog, "_get_parent_file", Mock(return_value=tmp_path))
+    query_range = Mock(return_value={"entries": [], "totals": {}})
+    monkeypatch.setattr(chargelog._charge_log_index, "query_range", query_range)
+    request_filter = {"chargepoint": {}, "vehicle": {}}
+
+    # execution
+    chargelog.get_log_data({"year": "2023", "month": "11", "end_year": "2024", "end_month": "02",
+                            "filter": request_filter, "totals_only": True})
+
+    # evaluation
+    directory = tmp_path / "data" / "charge_log"
+    query_range.assert_called_once_with([directory / "202311.json", directory / "202312.json",
+                                         directory / "202401.json", directory / "202402.json"],
+                                        request_filter, with_entries=False)
@@ -298,11 +298,11 @@ class Chargepoint(ChargepointRfidMixin):
         reset_log.imported_at_plugtime = self.data.set.log.imported_at_plugtime
         reset_log.imported_since_plugged = self.data.set.log.imported_since_plugged
         self.data.set.log = reset_log
-        Pub().pub(f"openWB/set/chargepoint/{self.num}/set/log", asdict(self.data.set.log))
+        Pub().pub(f"openWB/set/chargepoint/{self.num}/set/log", self.data.set.log)
 
     def reset_log_data(self) -> None:
         self.data.set.log = Log()
-        Pub().pub(f"openWB/set/chargepoint/{self.num}/set/log", asdict(self.data.set.log))
+        Pub().pub(f"openWB/set/chargepoint/{self.num}/set/log", self.data.set.log)
 
     def reset_control_parameter_at_charge_stop(self) -> None:
         # Wenn die Ladung zB wegen Autolock gestoppt wird, Zählerstände beibehalten, damit nicht nochmal die Ladung
@@ -69,15 +69,59 @@ class CounterAllData:
     set: Set = field(default_factory=set_factory)
 
 
+@dataclass
+class HierarchyIndex:
+    """ Nachschlagetabellen der Hierarchie, damit die Abfragen im Algorithmus den Baum nicht jedes Mal durchlaufen
+    müssen. Bis auf die Ebenen werden nur die Elemente unterhalb des EVU-Zählers erfasst.
+    """
+    hierarchy: List
+    entries: Dict[int, Dict] = field(default_factory=dict)
+    parents: Dict[int, Dict] = field(default_factory=dict)
+    # Zähler im Zweig des Elements, vom direkt übergeordneten bis zum EVU-Zähler
+    counters: Dict[int, List[str]] = field(default_factory=dict)
+    chargepoints: Dict[int, List[str]] = field(default_factory=dict)
+    levels: List[List[Dict[str, Union[int, str]]]] = field(default_factory=list)
+
+
+def _build_index(hierarchy: List) -> HierarchyIndex:
+    index = HierarchyIndex(hierarchy)
+
+    def add_levels(entry: Dict, level: int) -> None:
+        if len(index.levels) == level:
+            index.levels.append([])
+        index.levels[level].append({"type": entry["type"], "id": entry["id"]})
+        for child in entry["children"]:
+            add_levels(child, level + 1)
+
+    def add_branch(entry: Dict, counters: List[str]) -> List[str]:
+        counters = [f"counter{entry['id']}"] + counters
+        chargepoints = []
+        for child in entry["children"]:
+            index.entries.setdefault(child["id"], child)
+            index.parents.setdefault(child["id"], entry)
+            index.counters.setdefault(child["id"], counters)
+            if child["type"] == ComponentType.CHARGEPOINT.value:
+                chargepoints.append(f"cp{child['id']}")
+            elif len(child["children"]) != 0:
+                chargepoints.extend(add_branch(child, counters))
+        index.chargepoints.setdefault(entry["id"], chargepoints)
+        return chargepoints
+
+    for item in hierarchy:
+        add_levels(item, 0)
+    if hierarchy:
+        add_branch(hierarchy[0], [])
+    return index
+
+
 class CounterAll:
     MISSING_EVU_COUNTER = "Bitte erst einen EVU-Zähler konfigurieren."
 
     def __init__(self):
         self.data = CounterAllData()
-        # Hilfsvariablen für die rekursiven Funktionen
-        self.connected_counters = []
-        self.connected_chargepoints = []
+        # Hilfsvariable für die rekursive Funktion
         self.childless = []
+        self._index: Optional[HierarchyIndex] = None
         self.sim_counter = SimCounter("", "", prefix="bezug")
         self.sim_counter.topic = "openWB/set/counter/set/"
 
@@ -209,60 +253,47 @@ class CounterAll:
             except Exception:
                 log.exception("Fehler in der allgemeinen Zähler-Klasse")
 
+    def _get_index(self) -> HierarchyIndex:
+        """ Der Index wird nach Änderungen über die hierarchy_*-Methoden oder bei Zuweisung einer neuen Hierarchie
+        neu erstellt.
+        """
+        index = self._index
+        if index is None or index.hierarchy is not self.data.get.hierarchy:
+            index = _build_index(self.data.get.hierarchy)
+            self._index = index
+        return index
+
+    def _invalidate_index(self) -> None:
+        self._index = None
+
     def get_chargepoints_of_counter(self, counter: str) -> List[str]:
         """ gibt eine Liste der Ladepunkte, die in den folgenden Zweigen des Zählers sind, zurück.
         """
-        self.connected_chargepoints.clear()
+        index = self._get_index()
         if counter == self.get_evu_counter_str():
-            counter_object = self.data.get.hierarchy[0]
+            counter_id = self.data.get.hierarchy[0]["id"]
         else:
-            counter_object = self.__get_entry(
-                self.data.get.hierarchy[0],
-                int(counter[7:]),
-                self.__get_entry_of_element)
-        try:
-            self._get_all_cp_connected_to_counter(counter_object)
-        except KeyError:
-            # Kein Ladepunkt unter dem Zähler
-            pass
-        return self.connected_chargepoints
-
-    def _get_all_cp_connected_to_counter(self, child: Dict) -> None:
-        """ Rekursive Funktion, die alle Ladepunkte ermittelt, die an den angegebenen Zähler angeschlossen sind.
-        """
-        # Alle Objekte der Ebene durchgehen
-        for child in child["children"]:
-            try:
-                if child["type"] == ComponentType.CHARGEPOINT.value:
-                    self.connected_chargepoints.append(f"cp{child['id']}")
-                # Wenn das Objekt noch Kinder hat, diese ebenfalls untersuchen.
-                elif len(child["children"]) != 0:
-                    self._get_all_cp_connected_to_counter(child)
-            except Exception:
-                log.exception("Fehler in der allgemeinen Zähler-Klasse")
+            counter_id = int(counter[7:])
+            if counter_id not in index.entries:
+                return []
+        return list(index.chargepoints.get(counter_id, []))
 
     def get_counters_to_check(self, num: int) -> List[str]:
         """ ermittelt alle Zähler im Zweig des Ladepunkts.
         """
-        self.connected_counters.clear()
-        self.__get_all_counter_in_branch(self.data.get.hierarchy[0], num)
-        return self.connected_counters
+        return list(self._get_index().counters.get(num, []))
 
     def get_entry_of_element(self, id_to_find: int) -> Dict:
         item = self.__is_id_in_top_level(id_to_find)
         if item:
             return item
         else:
-            return self.__get_entry(self.data.get.hierarchy[0], id_to_find, self.__get_entry_of_element)
+            return self._get_index().entries.get(id_to_find, {})
 
     def get_entry_of_parent(self, id_to_find: int) -> Dict:
         if self.__is_id_in_top_level(id_to_find):
             return {}
-        for child in self.data.get.hierarchy[0]["children"]:
-            if child["id"] == id_to_find:
-                return self.data.get.hierarchy[0]
-        else:
-            return self.__get_entry(self.data.get.hierarchy[0], id_to_find, self.__get_entry_of_parent)
+        return self._get_index().parents.get(id_to_find, {})
 
     def __is_id_in_top_level(self, id_to_find: int) -> Dict:
         for item in self.data.get.hierarchy:
@@ -271,52 +302,11 @@ class CounterAll:
         else:
             return {}
 
-    def __get_all_counter_in_branch(self, child: Dict, id_to_find: int) -> bool:
-        """ Rekursive Funktion, die alle Zweige durchgeht, bis der entsprechende Ladepunkt gefunden wird und dann alle
-        Zähler in diesem Pfad der Liste anhängt.
-        """
-        parent_id = child["id"]
-        for child in child["children"]:
-            if child["id"] == id_to_find:
-                self.connected_counters.append(f"counter{parent_id}")
-                return True
-            if len(child["children"]) != 0:
-                found = self.__get_all_counter_in_branch(child, id_to_find)
-                if found:
-                    self.connected_counters.append(f"counter{parent_id}")
-                    return True
-        else:
-            return False
-
-    def __get_entry(self, child: Dict, id_to_find: int, func: Callable[[Dict, int], bool]) -> Dict:
-        for child in child["children"]:
-            found = func(child, id_to_find)
-            if found:
-                return child
-            if len(child["children"]) != 0:
-                entry = self.__get_entry(child, id_to_find, func)
-                if entry:
-                    return entry
-        else:
-            return {}
-
-    def __get_entry_of_element(self, child: Dict, id_to_find: int) -> bool:
-        if child["id"] == id_to_find:
-            return True
-        else:
-            return False
-
-    def __get_entry_of_parent(self, child: Dict, id_to_find: int) -> bool:
-        for child2 in child["children"]:
-            if child2["id"] == id_to_find:
-                return True
-        else:
-            return False
-
     def hierarchy_add_item_aside(self, new_id: int, new_type: ComponentType, id_to_find: int) -> None:
         """ ruft die rekursive Funktion zum Hinzufügen eines Zählers oder Ladepunkts in die Zählerhierarchie auf
         derselben Ebene wie das angegebene Element.
         """
+        self._invalidate_index()
         if self.__is_id_in_top_level(id_to_find):
             self.data.get.hierarchy.append({"id": new_id, "type": new_type.value, "children": []})
         else:
@@ -337,6 +327,7 @@ class CounterAll:
         """ruft die rekursive Funktion zum Löschen eines Elements. Je nach Flag werden die Kinder gelöscht oder auf die
         Ebene des gelöschten Elements gehoben.
         """
+        self._invalidate_index()
         item = self.__is_id_in_top_level(id_to_find)
         if item:
             if keep_children:
@@ -358,6 +349,7 @@ class CounterAll:
             return False
 
     def hierarchy_add_item_below_evu(self, new_id: int, new_type: ComponentType) -> None:
+        self._invalidate_index()
         try:
             self.hierarchy_add_item_below(new_id, new_type, self.get_id_evu_counter())
         except (TypeError, IndexError):
@@ -375,6 +367,7 @@ class CounterAll:
     def hierarchy_add_item_below(self, new_id: int, new_type: ComponentType, id_to_find: int) -> None:
         """ruft die rekursive Funktion zum Hinzufügen eines Elements als Kind des angegebenen Elements.
         """
+        self._invalidate_index()
         item = self.__is_id_in_top_level(id_to_find)
         if item:
             item["children"].append({"id": new_id, "type": new_type.value, "children": []})
@@ -404,19 +397,7 @@ class CounterAll:
             return False
 
     def get_list_of_elements_per_level(self) -> List[List[Dict[str, Union[int, str]]]]:
-        elements_per_level: List[List[Dict[str, Union[int, str]]]] = []
-        for item in self.data.get.hierarchy:
-            list(zip(elements_per_level, self._get_list_of_elements_per_level(elements_per_level, item, 0)))
-        return elements_per_level
-
-    def _get_list_of_elements_per_level(self, elements_per_level: List, child: Dict, index: int) -> List:
-        try:
-            elements_per_level[index].extend([{"type": child["type"], "id": child["id"]}])
-        except IndexError:
-            elements_per_level.insert(index, [{"type": child["type"], "id": child["id"]}])
-        for child in child["children"]:
-            elements_per_level = self._get_list_of_elements_per_level(elements_per_level, child, index+1)
-        return elements_per_level
+        return [list(level) for level in self._get_index().levels]
 
     def validate_hierarchy(self):
         try:
@@ -6,7 +6,7 @@ import copy
 import logging
 from threading import Event, Lock
 from functools import wraps
-from typing import Dict
+from typing import Any, Dict
 from control.bat import Bat
 from control.bat_all import BatAll
 from control.chargepoint.chargepoint import Chargepoint
@@ -15,7 +15,8 @@ from control.chargepoint.chargepoint_template import CpTemplate
 from control.pv import Pv
 from control.pv_all import PvAll
 
-import dataclass_utils
+from control.state_dump import StateDump
+from helpermodules.copy_on_write import SnapshotCache, SnapshotStatistics
 from helpermodules.graph import Graph
 from helpermodules.subdata import SubData
 from control.counter import Counter
@@ -85,6 +86,8 @@ class Data:
         self._pv_data: Dict[str, Pv] = {}
         self._pv_all_data = PvAll()
         self._system_data = {}
+        self._snapshot = SnapshotCache(SubData.topic_versions)
+        self._state_dump = StateDump()
 
     # getter-Funktion, der Zugriff erfolgt wie bei einem Zugriff auf eine öffentliche Variable.
     @property
@@ -258,73 +261,53 @@ class Data:
         self._system_data = value
 
     def print_all(self):
-        self._print_dictionaries(self._bat_data)
-        log.info(f"bat_all_data\n{self._bat_all_data.data}")
-        log.info(f"cp_all_data\n{self._cp_all_data.data}")
-        self._print_dictionaries(self._cp_data)
-        self._print_dictionaries(self._cp_template_data)
-        self._print_dictionaries(self._counter_data)
-        log.info(f"counter_all_data\n{self._counter_all_data.data}")
-        self._print_dictionaries(self._ev_charge_template_data)
-        self._print_dictionaries(self._ev_data)
-        self._print_dictionaries(self._ev_template_data)
-        log.info(f"general_data\n{self._general_data.data}")
-        log.info(f"general_data-display\n{self._general_data.data.extern_display_mode}")
-        log.info(f"graph_data\n{self._graph_data.data}")
-        self._print_io_actions(self._io_actions)
-        self._print_dictionaries(self._io_states)
-        log.info(f"optional_data\n{self._optional_data.data}")
-        self._print_dictionaries(self._pv_data)
-        log.info(f"pv_all_data\n{self._pv_all_data.data}")
-        self._print_dictionaries(self._system_data)
-        self._print_device_config(self._system_data)
-        self._print_io_device_config(self._system_data)
-        log.info("\n")
-
-    def _print_dictionaries(self, data):
-        """ gibt zu Debug-Zwecken für jeden Key im übergebenen Dictionary das Dictionary aus.
-
-        Parameter
-        ---------
-        data: dict
-        """
-        for key in data:
-            try:
-                if not isinstance(data[key], dict):
-                    try:
-                        log.info(key+"\n"+str(data[key].data))
-                    except AttributeError:
-                        # Devices haben kein data-Dict
-                        pass
-                else:
-                    log.info(key+"\n"+"Klasse fehlt")
-            except Exception:
-                log.exception("Fehler im Data-Modul")
-
-    def _print_device_config(self, data: Dict[str, AbstractDevice]):
-        for key, value in data.items():
-            try:
-                if isinstance(value, AbstractDevice):
-                    log.info(f"{key}\n{dataclass_utils.asdict(value.device_config)}")
-                    for comp_key, comp_value in value.components.items():
-                        log.info(f"{comp_key}\n{dataclass_utils.asdict(comp_value.component_config)}")
-            except Exception:
-                log.exception("Fehler im Data-Modul")
+        """ protokolliert den Zustand aller Datenobjekte. """
+        log.info("Zustand aller Datenobjekte:\n" + "\n".join(self._state_dump.dump_all(self._get_state_objects())))
+
+    def print_changes(self):
+        """ protokolliert nur die Datenobjekte, die sich seit dem letzten Aufruf geändert haben. """
+        if log.isEnabledFor(logging.INFO):
+            lines = self._state_dump.dump_changes(self._get_state_objects())
+            if lines:
+                log.info("Geänderte Datenobjekte:\n" + "\n".join(lines))
+
+    def get_state_dump(self) -> str:
+        """ gibt den Zustand aller Datenobjekte zurück, eine Zeile je Objekt. """
+        return "\n".join(self._state_dump.dump_all(self._get_state_objects()))
+
+    def _get_state_objects(self) -> Dict[str, Any]:
+        objects = {}
+        for dictionary in (self._bat_data, self._cp_data, self._cp_template_data, self._counter_data,
+                           self._ev_charge_template_data, self._ev_data, self._ev_template_data, self._io_states,
+                           self._pv_data):
+            self._add_state_objects(objects, dictionary)
+        objects["bat_all_data"] = self._bat_all_data.data
+        objects["cp_all_data"] = self._cp_all_data.data
+        objects["counter_all_data"] = self._counter_all_data.data
+        objects["general_data"] = self._general_data.data
+        objects["graph_data"] = self._graph_data.data
+        objects["optional_data"] = self._optional_data.data
+        objects["pv_all_data"] = self._pv_all_data.data
+        for key, value in getattr(self._io_actions, "actions", {}).items():
+            objects[key] = value.config
+        for key, value in self._system_data.items():
+            if isinstance(value, AbstractDevice):
+                objects[key] = value.device_config
+                for comp_key, comp_value in value.components.items():
+                    objects[comp_key] = comp_value.component_config
+            elif isinstance(value, AbstractIoDevice):
+                objects[key] = value.config
+            else:
+                self._add_state_objects(objects, {key: value})
+        return objects
 
-    def _print_io_device_config(self, data: Dict[str, AbstractIoDevice]):
+    def _add_state_objects(self, objects: Dict[str, Any], data: Dict) -> None:
         for key, value in data.items():
-            try:
-                if isinstance(value, AbstractIoDevice):
-                    log.info(f"{key}\n{dataclass_utils.asdict(value.config)}")
-            except Exception:
-                log.exception("Fehler im Data-Modul")
-
-    def _print_io_actions(self, data: IoActions):
-        for key, value in data.actions.items():
-            try:
-                log.info(f"{key}\n{dataclass_utils.asdict(value.config)}")
-            except Exception:
-                log.exception("Fehler im Data-Modul")
+            if isinstance(value, dict):
+                # Klasse fehlt
+                objects[key] = value
+            elif hasattr(value, "data"):
+                objects[key] = value.data
 
     def copy_system_data(self) -> None:
         with ModuleDataReceivedContext(self.event_module_update_completed):
@@ -339,16 +322,16 @@ class Data:
             # mit simcount werden Werte aktualisiert, diese sollten jedoch nur einmal nach dem Auslesen aktualisiert
             # werden, sodass die Nutzung einer Referenz vorerst funktioniert.
             self.system_data = {
-                "system": copy.deepcopy(SubData.system_data["system"])} | {
+                "system": self._snapshot.copy("system", SubData.system_data["system"])} | {
                 k: SubData.system_data[k] for k in SubData.system_data if "device" in k} | {
                 k: SubData.system_data[k] for k in SubData.system_data if "io" in k}
-            self.general_data = copy.deepcopy(SubData.general_data)
+            self.general_data = self._snapshot.copy("general", SubData.general_data)
             self.__copy_cp_data()
         except Exception:
             log.exception("Fehler im Prepare-Modul")
 
     def __copy_counter_data(self) -> None:
-        self.counter_all_data = copy.deepcopy(SubData.counter_all_data)
+        self.counter_all_data = self._snapshot.copy("counter_all", SubData.counter_all_data)
         self.counter_data.clear()
         for counter in SubData.counter_data:
             stop = False
@@ -357,7 +340,8 @@ class Data:
                     if "device" in dev:
                         for component in SubData.system_data[dev].components:
                             if component[9:] == counter[7:]:
-                                self.counter_data[counter] = copy.deepcopy(SubData.counter_data[counter])
+                                self.counter_data[counter] = self._snapshot.copy(
+                                    counter, SubData.counter_data[counter])
                                 stop = True
                                 break
                     if stop:
@@ -381,7 +365,8 @@ class Data:
                 self.cp_data[cp].data = copy.deepcopy(SubData.cp_data[cp].chargepoint.data)
                 self.cp_data[cp].chargepoint_module = SubData.cp_data[cp].chargepoint.chargepoint_module
         self.cp_all_data = copy.deepcopy(SubData.cp_all_data)
-        self.cp_template_data = copy.deepcopy(SubData.cp_template_data)
+        self.cp_template_data = {key: self._snapshot.copy(key, value, mutable=False)
+                                 for key, value in SubData.cp_template_data.items()}
         for chargepoint in self.cp_data:
             try:
                 if "cp" in chargepoint:
@@ -408,12 +393,12 @@ class Data:
                     if "device" in dev:
                         for component in SubData.system_data[dev].components:
                             if component[9:] == pv[2:]:
-                                self.pv_data[pv] = copy.deepcopy(SubData.pv_data[pv])
+                                self.pv_data[pv] = self._snapshot.copy(pv, SubData.pv_data[pv])
                                 stop = True
                                 break
                     if stop:
                         break
-            self.pv_all_data = copy.deepcopy(SubData.pv_all_data)
+            self.pv_all_data = self._snapshot.copy("pv_all", SubData.pv_all_data)
             self.bat_data.clear()
             for bat in SubData.bat_data:
                 stop = False
@@ -421,12 +406,13 @@ class Data:
                     if "device" in dev:
                         for component in SubData.system_data[dev].components:
                             if component[9:] == bat[3:]:
-                                self.bat_data[bat] = copy.deepcopy(SubData.bat_data[bat])
+                                self.bat_data[bat] = self._snapshot.copy(bat, SubData.bat_data[bat])
                                 stop = True
                                 break
                     if stop:
                         break
-            self.bat_all_data = copy.deepcopy(SubData.bat_all_data)
+            self.bat_all_data = self._snapshot.copy("bat_all", SubData.bat_all_data)
+            log.debug(f"Kopieren der Moduldaten: {self._snapshot.statistics}")
         except Exception:
             log.exception("Fehler im Prepare-Modul")
 
@@ -435,25 +421,36 @@ class Data:
         """
         with ModuleDataReceivedContext(self.event_module_update_completed):
             try:
-                self.general_data = copy.deepcopy(SubData.general_data)
-                self.io_actions = copy.deepcopy(SubData.io_actions)
-                self.io_states = copy.deepcopy(SubData.io_states)
-                self.optional_data = copy.deepcopy(SubData.optional_data)
+                self.general_data = self._snapshot.copy("general", SubData.general_data)
+                self.io_actions = self._snapshot.copy("io_actions", SubData.io_actions)
+                self.io_states = {key: self._snapshot.copy(key, value) for key, value in SubData.io_states.items()}
+                self.optional_data = self._snapshot.copy("optional", SubData.optional_data)
                 self.__copy_ev_data()
                 self.__copy_cp_data()
                 self.__copy_counter_data()
                 self.__copy_system_data()
                 self.__copy_module_data()
-                self.graph_data = copy.deepcopy(SubData.graph_data)
+                self.graph_data = self._snapshot.copy("graph", SubData.graph_data, mutable=False)
+                log.debug(f"Kopieren der Daten: {self._snapshot.statistics}")
             except Exception:
                 log.exception("Fehler im Prepare-Modul")
 
+    def release_snapshot(self) -> SnapshotStatistics:
+        """ muss aufgerufen werden, bevor der Algorithmus die kopierten Daten verändert. Veränderliche Objekte werden
+        danach beim nächsten Kopieren wieder neu kopiert.
+        """
+        statistics = self._snapshot.release()
+        log.debug(f"Kopieren der Daten im Zyklus: {statistics}")
+        return statistics
+
     def __copy_ev_data(self) -> None:
         self.ev_data.clear()
         for ev in SubData.ev_data:
-            self.ev_data[ev] = copy.deepcopy(SubData.ev_data[ev])
-        self.ev_template_data = copy.deepcopy(SubData.ev_template_data)
-        self.ev_charge_template_data = copy.deepcopy(SubData.ev_charge_template_data)
+            self.ev_data[ev] = self._snapshot.copy(ev, SubData.ev_data[ev])
+        self.ev_template_data = {key: self._snapshot.copy(key, value, mutable=False)
+                                 for key, value in SubData.ev_template_data.items()}
+        self.ev_charge_template_data = {key: self._snapshot.copy(key, value, mutable=False)
+                                        for key, value in SubData.ev_charge_template_data.items()}
         for vehicle in self.ev_data:
             try:
                 self.ev_data[vehicle].charge_template = self.ev_charge_template_data["ct" + str(
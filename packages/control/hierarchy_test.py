@@ -235,6 +235,25 @@ def test_unknown_id():
         c.hierarchy_remove_item(5)
 
 
+def test_index_updated_after_change():
+    # setup
+    c = hierarchy_cp()
+    c.get_chargepoints_of_counter("counter4")
+
+    # execution
+    c.hierarchy_add_item_below(8, ComponentType.CHARGEPOINT, 4)
+    after_add = c.get_chargepoints_of_counter("counter4")
+    c.hierarchy_remove_item(4)
+    after_remove = c.get_counters_to_check(5)
+    c.data.get.hierarchy = [{"id": 0, "type": "counter", "children": [{"id": 5, "type": "cp", "children": []}]}]
+    after_assignment = c.get_list_of_elements_per_level()
+
+    # evaluation
+    assert after_add == ["cp5", "cp6", "cp8"]
+    assert after_remove == ["counter2", "counter0"]
+    assert after_assignment == [[{"type": "counter", "id": 0}], [{"type": "cp", "id": 5}]]
+
+
 def test_get_max_id():
     assert get_max_id_in_hierarchy([], -1) == -1
     assert get_max_id_in_hierarchy([{"id": 0, "type": ComponentType.COUNTER, "children": []}], -1) == 0
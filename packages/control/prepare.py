@@ -37,4 +37,4 @@ class Prepare:
             data.data.io_actions.setup()
         except Exception:
             log.exception("Fehler im Prepare-Modul")
-        data.data.print_all()
+        data.data.print_changes()
@@ -0,0 +1,45 @@
+""" Protokollierung des Zustands der Datenobjekte.
+
+Jedes Objekt wird als eine Zeile "<Name> <JSON>" ausgegeben. dump_changes gibt nur die Objekte aus, deren Inhalt sich
+seit dem letzten Aufruf geändert hat, entfernte Objekte mit null. dump_all gibt alle Objekte aus, zB. für das
+Debug-Log.
+"""
+import json
+import logging
+from threading import Lock
+from typing import Any, Dict, List
+
+from dataclass_utils import asjson
+
+log = logging.getLogger(__name__)
+
+
+class StateDump:
+    def __init__(self) -> None:
+        self._last: Dict[str, str] = {}
+        self._lock = Lock()
+
+    def dump_changes(self, objects: Dict[str, Any]) -> List[str]:
+        """ gibt die Zeilen der seit dem letzten Aufruf hinzugekommenen, geänderten und entfernten Objekte zurück. """
+        lines = []
+        with self._lock:
+            current = {name: _serialize(value) for name, value in objects.items()}
+            for name, serialized in current.items():
+                if self._last.get(name) != serialized:
+                    lines.append(f"{name} {serialized}")
+            for name in sorted(self._last.keys() - current.keys()):
+                lines.append(f"{name} null")
+            self._last = current
+        return lines
+
+    def dump_all(self, objects: Dict[str, Any]) -> List[str]:
+        """ gibt die Zeilen aller Objekte zurück, ohne den Stand für dump_changes zu verändern. """
+        return [f"{name} {_serialize(value)}" for name, value in objects.items()]
+
+
+def _serialize(value: Any) -> str:
+    try:
+        return asjson(value)
+    except (TypeError, ValueError):
+        # zB. Objekte ohne __dict__ oder mit zirkulären Referenzen
+        return json.dumps(str(value))
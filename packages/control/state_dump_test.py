@@ -0,0 +1,45 @@
+from enum import Enum
+
+from control.state_dump import StateDump
+
+
+class Mode(Enum):
+    PV = "pv_charging"
+
+
+class Get:
+    def __init__(self, power: float = 0, mode: Mode = Mode.PV) -> None:
+        self.power = power
+        self.mode = mode
+
+
+def test_dump_changes():
+    # setup
+    state_dump = StateDump()
+    objects = {"cp0": Get(), "cp1": Get(1000)}
+    first = state_dump.dump_changes(objects)
+
+    # execution
+    objects["cp1"].power = 2000
+    objects.pop("cp0")
+    objects["counter0"] = {"power": 0}
+    changes = state_dump.dump_changes(objects)
+
+    # evaluation
+    assert first == ['cp0 {"power": 0, "mode": "pv_charging"}', 'cp1 {"power": 1000, "mode": "pv_charging"}']
+    assert changes == ['cp1 {"power": 2000, "mode": "pv_charging"}', 'counter0 {"power": 0}', "cp0 null"]
+    assert state_dump.dump_changes(objects) == []
+
+
+def test_dump_all():
+    # setup
+    state_dump = StateDump()
+    objects = {"cp0": Get(), "unserializable": {1, 2}}
+    state_dump.dump_changes(objects)
+
+    # execution
+    lines = state_dump.dump_all(objects)
+
+    # evaluation
+    assert lines == ['cp0 {"power": 0, "mode": "pv_charging"}', 'unserializable "{1, 2}"']
+    assert state_dump.dump_changes(objects) == []
@@ -1,2 +1,2 @@
-from dataclass_utils._dataclass_asdict import asdict
+from dataclass_utils._dataclass_asdict import asdict, asjson
 from dataclass_utils._dataclass_from_dict import dataclass_from_dict
@@ -1,5 +1,7 @@
 from enum import Enum
+import json
 import logging
+from typing import Any, Callable, Dict
 
 
 log = logging.getLogger(__name__)
@@ -12,12 +14,61 @@ def asdict(value):
     is introduced, because openWB still requires compatibility with Python 3.5
     This function should be replaced when switching to actual Python 3.7 dataclasses.
     """
-    if isinstance(value, (str, int, float)):
-        return value
+    try:
+        converter = _converters[type(value)]
+    except KeyError:
+        converter = _converters[type(value)] = _get_converter(type(value))
+    return converter(value)
+
+
+def asjson(value) -> str:
+    """Serializes an object as JSON, equivalent to `json.dumps(asdict(value))` for objects
+
+    Instead of building a converted copy first, objects and Enums are handed to the json encoder as they are found.
+    Plain values, lists and dicts are serialized like `json.dumps(value)`.
+    """
+    return json.dumps(value, default=_json_default)
+
+
+def _json_default(value):
     if isinstance(value, Enum):
         return value.value
-    if isinstance(value, (list, tuple)):
-        return [None if v is None else asdict(v) for v in value]
-    if not isinstance(value, dict):
-        value = vars(value)
-    return {key: None if value is None else asdict(value) for key, value in value.items()}
+    return vars(value)
+
+
+def _unchanged(value):
+    return value
+
+
+def _enum_value(value: Enum):
+    return value.value
+
+
+def _list(value):
+    return [v if type(v) in _PLAIN_TYPES else asdict(v) for v in value]
+
+
+def _dict(value: Dict):
+    return {key: value if type(value) in _PLAIN_TYPES else asdict(value) for key, value in value.items()}
+
+
+def _object(value):
+    return _dict(vars(value))
+
+
+def _get_converter(value_type: type) -> Callable[[Any], Any]:
+    """Conversion per type, evaluated in the same order as the former isinstance checks"""
+    if issubclass(value_type, (str, int, float)):
+        return _unchanged
+    if issubclass(value_type, Enum):
+        return _enum_value
+    if issubclass(value_type, (list, tuple)):
+        return _list
+    if issubclass(value_type, dict):
+        return _dict
+    return _object
+
+
+_converters: Dict[type, Callable[[Any], Any]] = {}
+# values that are taken over as they are, without dispatching through asdict
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
@@ -1,6 +1,9 @@
+from enum import Enum
+import json
+
 import pytest
 
-from dataclass_utils import asdict
+from dataclass_utils import asdict, asjson
 
 
 class SingleValue:
@@ -37,3 +40,31 @@ def test_asdict(object, expected_dict: dict):
 
     # evaluation
     assert actual == expected_dict
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@pytest.mark.parametrize("object", [
+    pytest.param(SingleValue(Color.RED), id="enum"),
+    pytest.param(SingleValue([SingleValue(1), None, (Color.RED, "a")]), id="nested list"),
+    pytest.param(MultiValue({1: SingleValue(None)}, 4.2), id="dict with int key"),
+    pytest.param([SingleValue("a"), True], id="list"),
+    pytest.param("someString", id="plain value"),
+])
+def test_asjson(object):
+    # execution
+    actual = asjson(object)
+
+    # evaluation
+    assert json.loads(actual) == json.loads(json.dumps(asdict(object)))
+    assert actual == json.dumps(asdict(object))
+
+
+def test_asdict_enum():
+    # execution
+    actual = asdict(MultiValue(Color.RED, [Color.RED]))
+
+    # evaluation
+    assert actual == {"a": "red", "b": ["red"]}
@@ -2,7 +2,7 @@ from enum import Enum
 import inspect
 from inspect import FullArgSpec, isclass
 import typing
-from typing import TypeVar, Type, Union, get_origin
+from typing import Any, Callable, Dict, TypeVar, Type, Union, get_origin
 
 T = TypeVar('T')
 
@@ -16,33 +16,91 @@ def dataclass_from_dict(cls: Type[T], args: Union[dict, T]) -> T:
 
     In case the supplied `args` is already of the desired type, `args` is returned unchanged
     """
+    if isinstance(args, _cached(_instance_types, cls, _instance_type)):
+        return args
+    return _cached(_constructors, cls, _build_constructor)(args)
+
+
+# Ergebnisse je Klasse, damit die Klasse nur beim ersten Aufruf untersucht wird
+_instance_types: Dict[Any, type] = {}
+_constructors: Dict[Any, Callable[[Any], Any]] = {}
+
+
+def _cached(cache: Dict, cls, factory: Callable):
+    try:
+        return cache[cls]
+    except KeyError:
+        value = cache[cls] = factory(cls)
+        return value
+    except TypeError:
+        # nicht hashbare Typen werden nicht zwischengespeichert
+        return factory(cls)
+
+
+def _instance_type(cls) -> type:
+    """Typ, bei dem `args` unverändert zurückgegeben wird"""
     if isclass(cls):
-        if isinstance(args, cls):
-            return args
+        return cls
     elif get_origin(cls):
         # Generische Typen wie Dict[int, float]
-        if isinstance(args, get_origin(cls)):
-            return args
-    elif isinstance(args, type(cls)):
-        return args
+        return get_origin(cls)
+    else:
+        return type(cls)
+
+
+_NO_DEFAULT = object()
+
+
+def _build_constructor(cls) -> Callable[[Any], Any]:
     arg_spec = inspect.getfullargspec(cls.__init__)
-    return cls(*[_get_argument_value(arg_spec, index, args) for index in range(1, len(arg_spec.args))])
+    arguments = [(arg_spec.args[index], _get_default(arg_spec, index),
+                  _get_converter(arg_spec.annotations.get(arg_spec.args[index])))
+                 for index in range(1, len(arg_spec.args))]
+
+    def constructor(parameters: dict):
+        values = []
+        for argument_name, default, converter in arguments:
+            try:
+                value = parameters[argument_name]
+            except KeyError:
+                if default is _NO_DEFAULT:
+                    raise Exception(
+                        "Cannot determine value for parameter %s: not given in %s and no default value specified" % (
+                            argument_name, parameters))
+                value = default
+            values.append(converter(value))
+        return cls(*values)
+    return constructor
 
 
-def _get_argument_value(arg_spec: FullArgSpec, index: int, parameters: dict):
-    argument_name = arg_spec.args[index]
+def _get_default(arg_spec: FullArgSpec, index: int):
     try:
-        value = parameters[argument_name]
-    except KeyError:
-        try:
-            value = arg_spec.defaults[-len(arg_spec.args) + index]
-        except (IndexError, TypeError):
-            # If none of the parameters have a default value, then `arg_spec.defaults` is None and we get a `TypeError`.
-            # If there are parameters with default value, but not the one requested, we get an `IndexError`.
-            raise Exception(
-                "Cannot determine value for parameter %s: not given in %s and no default value specified" % (
-                    argument_name, parameters))
-    return _dataclass_from_dict_recurse(value, arg_spec.annotations.get(argument_name))
+        return arg_spec.defaults[-len(arg_spec.args) + index]
+    except (IndexError, TypeError):
+        # If none of the parameters have a default value, then `arg_spec.defaults` is None and we get a `TypeError`.
+        # If there are parameters with default value, but not the one requested, we get an `IndexError`.
+        return _NO_DEFAULT
+
+
+def _get_converter(requested_type) -> Callable[[Any], Any]:
+    """ermittelt einmalig je Parameter die Umwandlung aus _dataclass_from_dict_recurse"""
+    try:
+        keep_dict = (_is_optional_of_dict(requested_type) or
+                     issubclass(requested_type if isclass(requested_type) else type(bool), dict))
+    except TypeError:
+        # Fehler sollen wie bisher erst bei der Umwandlung eines dict auftreten.
+        return lambda value: _dataclass_from_dict_recurse(value, requested_type)
+    is_enum = isinstance(requested_type, type) and issubclass(requested_type, Enum)
+    if keep_dict:
+        return requested_type if is_enum else _unchanged
+    if is_enum:
+        return lambda value: (dataclass_from_dict(requested_type, value) if isinstance(value, dict)
+                              else requested_type(value))
+    return lambda value: dataclass_from_dict(requested_type, value) if isinstance(value, dict) else value
+
+
+def _unchanged(value):
+    return value
 
 
 def _dataclass_from_dict_recurse(value, requested_type: Type[T]):
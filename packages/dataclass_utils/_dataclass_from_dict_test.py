@@ -1,3 +1,5 @@
+from dataclasses import dataclass, field
+from enum import Enum
 from typing import Dict, Generic, Optional, Type, TypeVar
 
 import pytest
@@ -125,3 +127,28 @@ def test_from_dict_without_optional():
     # evaluation
     assert actual.a == "aValue"
     assert actual.o is None
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@dataclass
+class EnumAndNestedDefault:
+    color: Color = Color.RED
+    nested: SimpleSample = field(default_factory=lambda: SimpleSample("aDefault"))
+
+
+def test_from_dict_enum_and_default_factory():
+    # execution
+    first = dataclass_from_dict(EnumAndNestedDefault, {"color": "blue"})
+    second = dataclass_from_dict(EnumAndNestedDefault, {"nested": {"a": "aValue"}})
+    third = dataclass_from_dict(EnumAndNestedDefault, {})
+
+    # evaluation
+    assert first.color is Color.BLUE
+    assert first.nested.a == "aDefault"
+    assert second.color is Color.RED
+    assert second.nested.a == "aValue"
+    assert third.nested is not first.nested
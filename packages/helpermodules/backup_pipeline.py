@@ -0,0 +1,124 @@
+""" Aufbereitung der Sicherung für die Backup-Cloud.
+
+Die von backup.sh erstellte Sicherung wird als Stream gelesen und mit der gewählten Kompressionsstufe neu geschrieben,
+ohne sie vollständig in den Speicher zu laden. Bei inkrementellen Sicherungen werden Logdateien, deren Inhalt (SHA256)
+sich seit der letzten erfolgreich hochgeladenen Sicherung nicht geändert hat, nicht erneut aufgenommen. Die Datei
+BACKUP_MANIFEST in der Sicherung enthält für jede Logdatei die Prüfsumme und die Sicherung, in der der Inhalt enthalten
+ist. Zur Wiederherstellung werden zuerst diese Sicherungen und danach die inkrementelle Sicherung entpackt.
+"""
+import hashlib
+import io
+import json
+import logging
+from pathlib import Path
+import tarfile
+import tempfile
+import time
+from typing import Dict, Optional, Set
+
+from helpermodules.utils.json_file_handler import write_atomic
+
+log = logging.getLogger(__name__)
+
+DEFAULT_COMPRESSION_LEVEL = 6
+CHUNK_SIZE = 1024 * 1024
+# Inhalte bis zu dieser Größe werden beim Prüfen im Speicher gehalten, größere in einer temporären Datei
+SPOOL_SIZE = 8 * 1024 * 1024
+LOG_DIRECTORIES = ("/data/charge_log/", "/data/daily_log/", "/data/monthly_log/")
+MANIFEST_NAME = "BACKUP_MANIFEST"
+CHECKSUM_NAME = "SHA256SUM"
+
+
+class BackupPipeline:
+    def __init__(self,
+                 manifest_path: Path,
+                 compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+                 incremental: bool = False) -> None:
+        self.manifest_path = manifest_path
+        self.compression_level = compression_level
+        self.incremental = incremental
+        self._pending_manifest: Optional[Dict] = None
+
+    def create(self, source: Path) -> Path:
+        """ erstellt aus der Sicherung source die Sicherung für die Cloud im selben Verzeichnis und gibt deren Pfad
+        zurück. Der Stand für die nächste inkrementelle Sicherung wird erst mit commit() übernommen.
+        """
+        if self.compression_level == DEFAULT_COMPRESSION_LEVEL and self.incremental is False:
+            # unverändert hochladen, backup.sh komprimiert mit derselben Stufe
+            self._pending_manifest = None
+            return source
+        previous_files = self._read_manifest().get("files", {}) if self.incremental else {}
+        stem = source.name[:-len(".tar.gz")] if source.name.endswith(".tar.gz") else source.stem
+        destination = source.with_name(f"{stem}_incremental.tar.gz" if self.incremental else f"{stem}_cloud.tar.gz")
+        files: Dict[str, Dict[str, str]] = {}
+        skipped: Set[str] = set()
+        with tarfile.open(source, "r|gz") as source_tar, \
+                tarfile.open(destination, "w:gz", compresslevel=self.compression_level) as destination_tar:
+            for member in source_tar:
+                if member.isfile() is False:
+                    destination_tar.addfile(member)
+                elif member.name == CHECKSUM_NAME:
+                    _add_checksums(destination_tar, member, source_tar.extractfile(member).read(), skipped)
+                elif any(directory in member.name for directory in LOG_DIRECTORIES):
+                    with tempfile.SpooledTemporaryFile(SPOOL_SIZE) as content:
+                        digest = _copy_with_digest(source_tar.extractfile(member), content)
+                        previous = previous_files.get(member.name)
+                        if previous is not None and previous["sha256"] == digest:
+                            files[member.name] = previous
+                            skipped.add(member.name)
+                        else:
+                            files[member.name] = {"sha256": digest, "archive": destination.name}
+                            content.seek(0)
+                            destination_tar.addfile(member, content)
+                else:
+                    destination_tar.addfile(member, source_tar.extractfile(member))
+            manifest = {"archive": destination.name, "files": files}
+            _add_bytes(destination_tar, MANIFEST_NAME, json.dumps(manifest, indent=2).encode("utf-8"))
+        log.debug(f"Sicherung {destination.name} erstellt, {len(skipped)} unveränderte Logdateien übersprungen.")
+        self._pending_manifest = manifest
+        return destination
+
+    def commit(self) -> None:
+        """ übernimmt den Stand der zuletzt erstellten Sicherung nach dem erfolgreichen Hochladen. """
+        if self._pending_manifest is not None:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(str(self.manifest_path), self._pending_manifest)
+            self._pending_manifest = None
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError):
+            log.exception("Stand der letzten Sicherung kann nicht gelesen werden, es wird vollständig gesichert.")
+            return {}
+
+
+def _add_checksums(destination_tar: tarfile.TarFile,
+                   member: tarfile.TarInfo,
+                   content: bytes,
+                   skipped: Set[str]) -> None:
+    """ übernimmt die Prüfsummen der enthaltenen Dateien, damit die Prüfung bei der Wiederherstellung gelingt. """
+    checksums = "".join(line for line in content.decode("utf-8").splitlines(keepends=True)
+                        if line.rstrip("\n").split("  ", 1)[-1] not in skipped).encode("utf-8")
+    member.size = len(checksums)
+    destination_tar.addfile(member, io.BytesIO(checksums))
+
+
+def _copy_with_digest(source, destination) -> str:
+    sha256 = hashlib.sha256()
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            return sha256.hexdigest()
+        sha256.update(chunk)
+        destination.write(chunk)
+
+
+def _add_bytes(destination_tar: tarfile.TarFile, name: str, content: bytes) -> None:
+    member = tarfile.TarInfo(name)
+    member.size = len(content)
+    member.mtime = int(time.time())
+    destination_tar.addfile(member, io.BytesIO(content))
@@ -0,0 +1,77 @@
+import hashlib
+import io
+import json
+from pathlib import Path
+import tarfile
+from typing import Dict
+
+from helpermodules.backup_pipeline import BackupPipeline
+
+
+def create_backup(path: Path, files: Dict[str, bytes]) -> Path:
+    checksums = "".join(f"{hashlib.sha256(content).hexdigest()}  {name}\n" for name, content in files.items())
+    with tarfile.open(path, "w:gz") as tar:
+        for name, content in dict(files, SHA256SUM=checksums.encode("utf-8")).items():
+            member = tarfile.TarInfo(name)
+            member.size = len(content)
+            tar.addfile(member, io.BytesIO(content))
+    return path
+
+
+def read_backup(path: Path) -> Dict[str, bytes]:
+    with tarfile.open(path, "r:gz") as tar:
+        return {member.name: tar.extractfile(member).read() for member in tar.getmembers()}
+
+
+FILES = {"openWB/data/charge_log/202304.json": b"[1]",
+         "openWB/data/daily_log/20230501.json": b'{"entries": []}',
+         "configuration.json": b"{}"}
+
+
+def test_create_unchanged(tmp_path: Path):
+    # setup
+    source = create_backup(tmp_path / "backup.tar.gz", FILES)
+    pipeline = BackupPipeline(tmp_path / "manifest.json")
+
+    # execution
+    destination = pipeline.create(source)
+    pipeline.commit()
+
+    # evaluation
+    assert destination == source
+    assert not (tmp_path / "manifest.json").exists()
+
+
+def test_create_incremental(tmp_path: Path):
+    # setup
+    pipeline = BackupPipeline(tmp_path / "manifest.json", compression_level=9, incremental=True)
+    first = pipeline.create(create_backup(tmp_path / "first.tar.gz", FILES))
+    pipeline.commit()
+    files = dict(FILES, **{"openWB/data/daily_log/20230501.json": b'{"entries": [1]}'})
+
+    # execution
+    second = pipeline.create(create_backup(tmp_path / "second.tar.gz", files))
+
+    # evaluation
+    assert set(read_backup(first)) == set(FILES) | {"SHA256SUM", "BACKUP_MANIFEST"}
+    content = read_backup(second)
+    assert second.name == "second_incremental.tar.gz"
+    assert set(content) == {"openWB/data/daily_log/20230501.json", "configuration.json", "SHA256SUM",
+                            "BACKUP_MANIFEST"}
+    assert "charge_log" not in content["SHA256SUM"].decode("utf-8")
+    manifest = json.loads(content["BACKUP_MANIFEST"])
+    assert manifest["files"]["openWB/data/charge_log/202304.json"]["archive"] == "first_incremental.tar.gz"
+    assert manifest["files"]["openWB/data/daily_log/20230501.json"]["archive"] == "second_incremental.tar.gz"
+
+
+def test_create_incremental_not_committed(tmp_path: Path):
+    # setup
+    pipeline = BackupPipeline(tmp_path / "manifest.json", incremental=True)
+    pipeline.create(create_backup(tmp_path / "first.tar.gz", FILES))
+
+    # execution
+    second = pipeline.create(create_backup(tmp_path / "second.tar.gz", FILES))
+
+    # evaluation
+    # ohne erfolgreiches Hochladen werden alle Logdateien erneut gesichert
+    assert set(read_backup(second)) == set(FILES) | {"SHA256SUM", "BACKUP_MANIFEST"}
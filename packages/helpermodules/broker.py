@@ -1,11 +1,21 @@
 import datetime
+import json
 import logging
 import paho.mqtt.client as mqtt
+from threading import Event, Lock
 import time
-from typing import Callable
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from helpermodules.utils.topic_parser import decode_payload
 
 log = logging.getLogger(__name__)
 
+SNAPSHOT_TIMEOUT = 10
+# maximale Wartezeit (s) auf die Verbindung zu einem entfernten Broker
+REMOTE_CONNECT_TIMEOUT = 2
+# Wartezeit (s) nach dem Abonnieren, in der der entfernte Broker die retained Topics ausliefert
+REMOTE_SUBSCRIBE_DELAY = 1
+
 
 def get_name_suffix() -> str:
     with open('/proc/cpuinfo', 'r') as f:
@@ -16,6 +26,39 @@ def get_name_suffix() -> str:
     return f"{serial}-{datetime.datetime.today().timestamp()}"
 
 
+class _SnapshotMarker:
+    """ Der Broker liefert die retained Topics eines Abonnements vor allen danach empfangenen Nachrichten aus. Nach
+    jedem Abonnement wird daher eine Markierung an ein eigenes Topic veröffentlicht. Ist die zuletzt veröffentlichte
+    Markierung empfangen, wurden alle retained Topics der bis dahin abonnierten Zweige verarbeitet. Das gilt auch für
+    Zweige, die erst beim Verarbeiten einer Nachricht abonniert werden.
+    """
+
+    def __init__(self, client: mqtt.Client, topic: str) -> None:
+        self.client = client
+        self.topic = topic
+        self.complete = Event()
+        self._lock = Lock()
+        self._sent = 0
+        self._subscribe = client.subscribe
+        client.subscribe = self.subscribe
+        client.message_callback_add(topic, self.on_marker)
+
+    def subscribe(self, *args, **kwargs):
+        result = self._subscribe(*args, **kwargs)
+        with self._lock:
+            if self._sent == 0:
+                self._subscribe(self.topic, 2)
+            self._sent += 1
+            self.complete.clear()
+            self.client.publish(self.topic, self._sent, qos=2)
+        return result
+
+    def on_marker(self, client, userdata, msg) -> None:
+        with self._lock:
+            if int(msg.payload) == self._sent:
+                self.complete.set()
+
+
 class BrokerClient:
     def __init__(self,
                  name: str,
@@ -23,12 +66,14 @@ class BrokerClient:
                  on_message: Callable,
                  host: str = "localhost",
                  port: int = 1886) -> None:
+        self.connected = False
         try:
             self.name = f"openWB-{name}-{get_name_suffix()}"
             self.client = mqtt.Client(self.name)
             self.client.on_connect = on_connect
             self.client.on_message = on_message
             self.client.connect(host, port)
+            self.connected = True
         except Exception:
             log.exception("Fehler beim Abonnieren des internen Brokers")
 
@@ -40,11 +85,46 @@ class BrokerClient:
         time.sleep(1)
         self.client.loop_stop()
 
+    def start_snapshot_loop(self, timeout: float = SNAPSHOT_TIMEOUT) -> bool:
+        """ verarbeitet die retained Topics der in on_connect abonnierten Zweige und beendet die Verbindung, sobald der
+        Broker alle ausgeliefert hat, spätestens nach timeout Sekunden. Nur für den internen Broker, da auf das eigene
+        Markierungs-Topic veröffentlicht wird.
+        """
+        if self.connected is False:
+            return False
+        marker = _SnapshotMarker(self.client, f"openWB-snapshot/{self.name}")
+        self.client.loop_start()
+        try:
+            complete = marker.complete.wait(timeout)
+            if complete is False:
+                log.warning(f"Client {self.name} hat nicht innerhalb von {timeout}s alle retained Topics erhalten.")
+            return complete
+        finally:
+            self.client.disconnect()
+            self.client.loop_stop()
+
     def disconnect(self) -> None:
         self.client.disconnect()
         log.info(f"Verbindung von Client {self.name} geschlossen.")
 
 
+def get_retained_topics(name: str, topics: List[str], timeout: float = SNAPSHOT_TIMEOUT) -> Dict[str, bytes]:
+    """ gibt die Topics und Payloads der abonnierten Zweige des internen Brokers zurück, sobald alle retained Topics
+    empfangen wurden.
+    """
+    received_topics = {}
+
+    def on_connect(client: mqtt.Client, userdata, flags: dict, rc: int) -> None:
+        for topic in topics:
+            client.subscribe(topic, 2)
+
+    def on_message(client: mqtt.Client, userdata, msg: mqtt.MQTTMessage) -> None:
+        received_topics[msg.topic] = msg.payload
+
+    BrokerClient(name, on_connect, on_message).start_snapshot_loop(timeout)
+    return received_topics
+
+
 class InternalBrokerPublisher:
     def __init__(self) -> None:
         try:
@@ -55,3 +135,105 @@ class InternalBrokerPublisher:
 
     def start_loop(self) -> None:
         self.client.loop_start()
+
+
+class RemoteBrokerSession:
+    """ langlebige Verbindung zum Broker auf Port 1883, zB. dem einer anderen openWB.
+
+    paho hält die Verbindung im Hintergrund aufrecht und baut sie nach einer Unterbrechung neu auf. Abonnierte Zweige
+    werden nach jedem Verbindungsaufbau erneut abonniert und die empfangenen Werte in values zwischengespeichert. Nach
+    einer Unterbrechung wird der Zwischenspeicher geleert, da der Broker die retained Topics erneut ausliefert.
+    Veröffentlichte Nachrichten werden ohne Warten auf den Versand an den Netzwerk-Thread übergeben.
+    """
+
+    def __init__(self, host: str, port: int = 1883) -> None:
+        self.host = host
+        self.port = port
+        self.values: Dict[str, Any] = {}
+        self._subscriptions: Dict[str, float] = {}
+        self._connected = Event()
+        self._lock = Lock()
+        self.client = mqtt.Client(f"openWB-remote-{host}-{get_name_suffix()}")
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+        self.client.on_message = self._on_message
+        self.client.connect_async(host, port)
+        self.client.loop_start()
+
+    def _on_connect(self, client: mqtt.Client, userdata, flags: dict, rc: int) -> None:
+        if rc != 0:
+            log.error(f"Verbindung zum Broker {self.host}:{self.port} abgelehnt: {mqtt.connack_string(rc)}")
+            return
+        with self._lock:
+            for topic in self._subscriptions:
+                client.subscribe(topic)
+                self._subscriptions[topic] = time.monotonic()
+        self._connected.set()
+        log.debug(f"Verbindung zum Broker {self.host}:{self.port} hergestellt.")
+
+    def _on_disconnect(self, client: mqtt.Client, userdata, rc: int) -> None:
+        self._connected.clear()
+        with self._lock:
+            self.values.clear()
+        log.debug(f"Verbindung zum Broker {self.host}:{self.port} getrennt: {mqtt.error_string(rc)}")
+
+    def _on_message(self, client: mqtt.Client, userdata, msg: mqtt.MQTTMessage) -> None:
+        with self._lock:
+            if len(msg.payload) == 0:
+                self.values.pop(msg.topic, None)
+            else:
+                self.values[msg.topic] = decode_payload(msg.payload)
+
+    def _wait_for_connection(self) -> None:
+        if self._connected.wait(REMOTE_CONNECT_TIMEOUT) is False:
+            raise ConnectionError(f"Keine Verbindung zum Broker {self.host}:{self.port}.")
+
+    def subscribe(self, topic: str) -> None:
+        """ abonniert den Zweig dauerhaft und wartet beim ersten Abonnieren bzw. nach einem Verbindungsaufbau, bis der
+        Broker die retained Topics ausgeliefert hat.
+        """
+        self._wait_for_connection()
+        with self._lock:
+            subscribed_at = self._subscriptions.get(topic)
+            if subscribed_at is None:
+                subscribed_at = self._subscriptions[topic] = time.monotonic()
+                self.client.subscribe(topic)
+        remaining = subscribed_at + REMOTE_SUBSCRIBE_DELAY - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def get_values(self, prefix: str) -> Dict[str, Any]:
+        """ gibt die zwischengespeicherten Werte aller Topics zurück, die mit prefix beginnen. """
+        with self._lock:
+            return {topic: value for topic, value in self.values.items() if topic.startswith(prefix)}
+
+    def publish(self, topic: str, payload, no_json: bool = False, retain: bool = True) -> None:
+        self.publish_many({topic: payload}, no_json=no_json, retain=retain)
+
+    def publish_many(self, topics: Dict[str, Any], no_json: bool = False, retain: bool = True) -> None:
+        """ übergibt die Nachrichten in der angegebenen Reihenfolge an den Netzwerk-Thread. Payloads werden wie bei
+        pub_single als json gesendet, mit no_json unverändert.
+        """
+        self._wait_for_connection()
+        for topic, payload in topics.items():
+            info = self.client.publish(topic, payload if no_json else json.dumps(payload), retain=retain)
+            if info.rc != mqtt.MQTT_ERR_SUCCESS:
+                raise ConnectionError(f"Nachricht an {self.host}:{self.port} nicht gesendet: "
+                                      f"{mqtt.error_string(info.rc)}")
+
+    def stop(self) -> None:
+        self.client.disconnect()
+        self.client.loop_stop()
+
+
+_remote_sessions: Dict[Tuple[str, int], RemoteBrokerSession] = {}
+_remote_sessions_lock = Lock()
+
+
+def get_remote_session(host: str, port: int = 1883) -> RemoteBrokerSession:
+    """ gibt die gemeinsame Verbindung zum Broker host:port zurück und baut sie beim ersten Aufruf auf. """
+    with _remote_sessions_lock:
+        session: Optional[RemoteBrokerSession] = _remote_sessions.get((host, port))
+        if session is None:
+            session = _remote_sessions[(host, port)] = RemoteBrokerSession(host, port)
+        return session
@@ -0,0 +1,106 @@
+from unittest.mock import Mock, call
+
+import paho.mqtt.client as mqtt
+import pytest
+
+from helpermodules import broker
+from helpermodules.broker import _SnapshotMarker
+
+
+def test_snapshot_marker():
+    # setup
+    client = Mock()
+    subscribe = client.subscribe
+    marker = _SnapshotMarker(client, "openWB-snapshot/test")
+
+    # execution
+    client.subscribe("openWB/chargepoint/#", 2)
+    marker.on_marker(client, None, Mock(payload=b"1"))
+    complete_after_first = marker.complete.is_set()
+    # Abonnement beim Verarbeiten einer Nachricht
+    client.subscribe("openWB/vehicle/#", 2)
+    complete_after_second_subscribe = marker.complete.is_set()
+    marker.on_marker(client, None, Mock(payload=b"2"))
+
+    # evaluation
+    assert subscribe.call_args_list == [call("openWB/chargepoint/#", 2), call("openWB-snapshot/test", 2),
+                                        call("openWB/vehicle/#", 2)]
+    assert client.publish.call_args_list == [call("openWB-snapshot/test", 1, qos=2),
+                                             call("openWB-snapshot/test", 2, qos=2)]
+    client.message_callback_add.assert_called_once_with("openWB-snapshot/test", marker.on_marker)
+    assert complete_after_first is True
+    assert complete_after_second_subscribe is False
+    assert marker.complete.is_set()
+
+
+@pytest.fixture
+def remote_client(monkeypatch) -> Mock:
+    client = Mock()
+    client.publish.return_value = Mock(rc=mqtt.MQTT_ERR_SUCCESS)
+    monkeypatch.setattr(broker.mqtt, "Client", Mock(return_value=client))
+    monkeypatch.setattr(broker, "get_name_suffix", Mock(return_value="test"))
+    monkeypatch.setattr(broker, "REMOTE_SUBSCRIBE_DELAY", 0)
+    return client
+
+
+def test_remote_session_caches_subscribed_values(remote_client: Mock):
+    # setup
+    session = broker.RemoteBrokerSession("192.168.1.2")
+    session._on_connect(remote_client, None, {}, 0)
+
+    # execution
+    session.subscribe("openWB/internal_chargepoint/0/get/#")
+    session.subscribe("openWB/internal_chargepoint/0/get/#")
+    session._on_message(remote_client, None, Mock(topic="openWB/internal_chargepoint/0/get/power", payload=b"1500"))
+    session._on_message(remote_client, None, Mock(topic="openWB/internal_chargepoint/0/get/rfid", payload=b'"1234"'))
+    session._on_message(remote_client, None, Mock(topic="openWB/internal_chargepoint/0/get/rfid", payload=b""))
+    session._on_message(remote_client, None, Mock(topic="openWB/internal_chargepoint/1/get/power", payload=b"0"))
+
+    # evaluation
+    remote_client.connect_async.assert_called_once_with("192.168.1.2", 1883)
+    remote_client.subscribe.assert_called_once_with("openWB/internal_chargepoint/0/get/#")
+    assert session.get_values("openWB/internal_chargepoint/0/get/") == {"openWB/internal_chargepoint/0/get/power": 1500}
+
+
+def test_remote_session_resubscribes_after_reconnect(remote_client: Mock):
+    # setup
+    session = broker.RemoteBrokerSession("192.168.1.2")
+    session._on_connect(remote_client, None, {}, 0)
+    session.subscribe("openWB/internal_chargepoint/0/get/#")
+    session._on_message(remote_client, None, Mock(topic="openWB/internal_chargepoint/0/get/power", payload=b"1500"))
+
+    # execution
+    session._on_disconnect(remote_client, None, 1)
+    values_after_disconnect = session.get_values("openWB/")
+    session._on_connect(remote_client, None, {}, 0)
+
+    # evaluation
+    assert values_after_disconnect == {}
+    assert remote_client.subscribe.call_args_list == [call("openWB/internal_chargepoint/0/get/#")] * 2
+
+
+def test_remote_session_publish_many(remote_client: Mock):
+    # setup
+    session = broker.RemoteBrokerSession("192.168.1.2")
+    session._on_connect(remote_client, None, {}, 0)
+
+    # execution
+    session.publish_many({"openWB/set/internal_chargepoint/0/data/parent_cp": "3", "openWB/set/isss/heartbeat": 0})
+    session.publish("openWB/set/isss/parentWB", "192.168.1.1", no_json=True)
+
+    # evaluation
+    assert remote_client.publish.call_args_list == [
+        call("openWB/set/internal_chargepoint/0/data/parent_cp", '"3"', retain=True),
+        call("openWB/set/isss/heartbeat", "0", retain=True),
+        call("openWB/set/isss/parentWB", "192.168.1.1", retain=True)]
+
+
+def test_remote_session_not_connected(remote_client: Mock, monkeypatch):
+    # setup
+    monkeypatch.setattr(broker, "REMOTE_CONNECT_TIMEOUT", 0)
+    session = broker.RemoteBrokerSession("192.168.1.2")
+
+    # execution and evaluation
+    with pytest.raises(ConnectionError):
+        session.publish("openWB/set/isss/heartbeat", 0)
+    remote_client.publish.assert_not_called()
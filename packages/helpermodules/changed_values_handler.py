@@ -7,6 +7,7 @@ from control import data
 
 from control.data import Data
 from dataclass_utils._dataclass_asdict import asdict
+from helpermodules.dirty_tracking import DirtyTracker
 from helpermodules.pub import Pub
 
 
@@ -63,15 +64,67 @@ log = logging.getLogger(__name__)
 #     def __init__(self) -> None:
 #         self.data = SampleData()
 
+# Im Dirty-Tracking-Modus werden die Daten nicht kopiert und verglichen, sondern die Schreibzugriffe auf die Felder
+# erfasst (siehe helpermodules.dirty_tracking). Es werden nur die Felder veröffentlicht, die im Kontext geschrieben
+# wurden und deren Wert sich dabei geändert hat.
+
 
 class ChangedValuesHandler:
-    def __init__(self, event_module_update_completed: Event) -> None:
-        self.prev_data: Data = Data(event_module_update_completed)
+    def __init__(self, event_module_update_completed: Event, dirty_tracking: bool = False) -> None:
+        self.dirty_tracking = dirty_tracking
+        if dirty_tracking:
+            self.tracker = DirtyTracker()
+        else:
+            self.prev_data: Data = Data(event_module_update_completed)
+
+    def _tracked_data(self) -> List[Tuple[str, object]]:
+        tracked_data = [("openWB/set/bat/", data.data.bat_all_data.data),
+                        ("openWB/set/chargepoint/", data.data.cp_all_data.data.get),
+                        ("openWB/set/counter/", data.data.counter_all_data.data)]
+        tracked_data.extend((f"openWB/set/chargepoint/{value.num}/", value.data)
+                            for value in data.data.cp_data.values())
+        tracked_data.extend((f"openWB/set/bat/{value.num}/", value.data) for value in data.data.bat_data.values())
+        tracked_data.extend((f"openWB/set/counter/{value.num}/", value.data)
+                            for value in data.data.counter_data.values())
+        return tracked_data
 
     def store_initial_values(self):
         try:
-            # speichern der Daten zum Zyklus-Beginn, um später die geänderten Werte zu ermitteln
-            self.prev_data.copy_data()
+            if self.dirty_tracking:
+                for topic_prefix, value in self._tracked_data():
+                    self.tracker.track(topic_prefix, value)
+                self.tracker.start()
+            else:
+                # speichern der Daten zum Zyklus-Beginn, um später die geänderten Werte zu ermitteln
+                self.prev_data.copy_data()
+        except Exception as e:
+            log.exception(e)
+
+    def pub_written_values(self):
+        try:
+            self.tracker.stop()
+            for topic_prefix, value in self._tracked_data():
+                if self.tracker.is_tracked(value) is False:
+                    log.debug(f"Änderungen unter {topic_prefix} wurden nicht erfasst, da die Daten ersetzt wurden.")
+            for changed_field in self.tracker.get_changed_fields():
+                try:
+                    topic = changed_field.field.metadata.get("topic")
+                    if topic:
+                        value = changed_field.value
+                        previous_value = changed_field.previous_value
+                        if isinstance(value, Enum):
+                            value = value.value
+                        elif not isinstance(value, (str, int, float, bool, Dict, List, Tuple, type(None))):
+                            value = asdict(value)
+                        topic = f"{changed_field.topic_prefix}{topic}"
+                        Pub().pub(topic, value)
+                        log.debug(f"Topic {topic}, Payload {value}, vorherige Payload: {previous_value}")
+                    elif is_dataclass(changed_field.previous_value):
+                        # Feld ohne Topic, dem eine neue Klasse zugewiesen wurde
+                        self._update_value(changed_field.topic_prefix, changed_field.previous_value,
+                                           changed_field.value)
+                except Exception as e:
+                    log.exception(e)
         except Exception as e:
             log.exception(e)
 
@@ -135,12 +188,15 @@ class ChangedValuesHandler:
 
 
 class ChangedValuesContext:
-    def __init__(self, event_module_update_completed: Event):
-        self.changed_values_handler = ChangedValuesHandler(event_module_update_completed)
+    def __init__(self, event_module_update_completed: Event, dirty_tracking: bool = False):
+        self.changed_values_handler = ChangedValuesHandler(event_module_update_completed, dirty_tracking)
 
     def __enter__(self):
         self.changed_values_handler.store_initial_values()
 
     def __exit__(self, exception_type, exception, exception_traceback) -> bool:
-        self.changed_values_handler.pub_changed_values()
+        if self.changed_values_handler.dirty_tracking:
+            self.changed_values_handler.pub_written_values()
+        else:
+            self.changed_values_handler.pub_changed_values()
         return False
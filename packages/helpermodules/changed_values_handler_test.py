@@ -1,4 +1,4 @@
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from enum import IntEnum
 from typing import Dict, List, Optional, Tuple
 from unittest.mock import Mock
@@ -114,3 +114,79 @@ def test_update_value(params: Params, mock_pub: Mock, monkeypatch):
     assert len(mock_pub.method_calls) - 1 == params.expected_calls
     if params.expected_calls > 0:
         assert mock_pub.method_calls[1].args == params.expected_pub_call
+
+
+@dataclass
+class SampleTrackedData:
+    sample_field_class: SampleClass = field(
+        default_factory=sample_class, metadata={"topic": "get/field_class"})
+    sample_field_int: int = field(default=0, metadata={"topic": "get/field_int"})
+    sample_field_list: List = field(default_factory=currents_list_factory, metadata={
+                                    "topic": "get/field_list"})
+    sample_field_nested: SampleNested = field(default_factory=sample_nested)
+    sample_field_untracked: int = 0
+
+
+def _setup_dirty_tracking(monkeypatch, sample_data) -> ChangedValuesHandler:
+    handler = ChangedValuesHandler(Mock(), dirty_tracking=True)
+    monkeypatch.setattr(handler, "_tracked_data", Mock(return_value=[("openWB/", sample_data)]))
+    handler.store_initial_values()
+    return handler
+
+
+@pytest.mark.parametrize("params", cases, ids=[c.name for c in cases])
+def test_pub_written_values(params: Params, mock_pub: Mock, monkeypatch):
+    # setup
+    sample_data = SampleData()
+    handler = _setup_dirty_tracking(monkeypatch, sample_data)
+
+    # execution
+    for f in fields(params.sample_data):
+        setattr(sample_data, f.name, getattr(params.sample_data, f.name))
+    handler.pub_written_values()
+
+    # evaluation
+    assert len(mock_pub.method_calls) == params.expected_calls
+    if params.expected_calls > 0:
+        assert mock_pub.method_calls[0].args == params.expected_pub_call
+
+
+@pytest.mark.parametrize("change, expected_pub_call", [
+    pytest.param(lambda data: setattr(data, "sample_field_int", 0), None, id="same value"),
+    pytest.param(lambda data: setattr(data, "sample_field_untracked", 3), None, id="field without topic"),
+    pytest.param(lambda data: data.sample_field_list.__setitem__(1, 16),
+                 ("openWB/get/field_list", [0, 16, 0]), id="list changed in place"),
+    pytest.param(lambda data: setattr(data.sample_field_class, "parameter2", 6),
+                 ("openWB/get/field_class", {"parameter1": False, "parameter2": 6}), id="nested class in place"),
+    pytest.param(lambda data: setattr(data.sample_field_nested, "parameter2", 6),
+                 ("openWB/get/nested2", 6), id="nested field"),
+])
+def test_pub_written_values_in_place(change, expected_pub_call, mock_pub: Mock, monkeypatch):
+    # setup
+    sample_data = SampleTrackedData()
+    handler = _setup_dirty_tracking(monkeypatch, sample_data)
+
+    # execution
+    change(sample_data)
+    handler.pub_written_values()
+
+    # evaluation
+    if expected_pub_call is None:
+        assert len(mock_pub.method_calls) == 0
+    else:
+        assert len(mock_pub.method_calls) == 1
+        assert mock_pub.method_calls[0].args == expected_pub_call
+
+
+def test_pub_written_values_after_stop(mock_pub: Mock, monkeypatch):
+    # setup
+    sample_data = SampleTrackedData()
+    handler = _setup_dirty_tracking(monkeypatch, sample_data)
+    handler.pub_written_values()
+
+    # execution
+    sample_data.sample_field_int = 5
+    handler.pub_written_values()
+
+    # evaluation
+    assert len(mock_pub.method_calls) == 0
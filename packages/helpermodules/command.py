@@ -23,7 +23,7 @@ from helpermodules.utils.run_command import run_command
 # ToDo: move to module commands if implemented
 from modules.backup_clouds.onedrive.api import generateMSALAuthCode, retrieveMSALTokens
 
-from helpermodules.broker import BrokerClient
+from helpermodules.broker import BrokerClient, get_retained_topics
 from helpermodules.data_migration.data_migration import MigrateData
 from helpermodules.measurement_logging.process_log import get_daily_log, get_monthly_log, get_yearly_log
 from helpermodules.messaging import MessageType, pub_user_message
@@ -958,49 +958,57 @@ class ProcessBrokerBranch:
         self.topic_str = topic_str
 
     def get_payload(self):
-        self.payload: str
-        BrokerClient("processBrokerBranch", self.on_connect, self.__get_payload).start_finite_loop()
-        return json.loads(self.payload)
+        received_topics = get_retained_topics("processBrokerBranch", self._topics())
+        return json.loads(list(received_topics.values())[-1])
 
     def remove_topics(self):
         """ löscht einen Topic-Zweig auf dem Broker. Payload "" löscht nur ein einzelnes Topic.
         """
-        BrokerClient("processBrokerBranch", self.on_connect, self.__on_message_rm).start_finite_loop()
+        BrokerClient("processBrokerBranch", self.on_connect, self.__on_message_rm).start_snapshot_loop()
 
     def get_max_id(self) -> List[str]:
         try:
-            self.received_topics = []
-            BrokerClient("processBrokerBranch", self.on_connect, self.__on_message_max_id).start_finite_loop()
-            return self.received_topics
+            return list(get_retained_topics("processBrokerBranch", self._topics()).keys())
         except Exception:
             log.exception("Fehler im Command-Modul")
             return []
 
     def check_mqtt_bridge_exists(self, name: str) -> bool:
+        mqtt_bridge_exists = False
         try:
-            self.name = name
-            self.mqtt_bridge_exists = False
-            BrokerClient("processBrokerBranch", self.on_connect,
-                         self.__on_message_mqtt_bridge_exists).start_finite_loop()
-            return self.mqtt_bridge_exists
+            for payload in get_retained_topics("processBrokerBranch", self._topics()).values():
+                try:
+                    if decode_payload(payload)["name"] == name:
+                        mqtt_bridge_exists = True
+                except Exception:
+                    log.exception("Fehler in ProcessBrokerBranch")
+            return mqtt_bridge_exists
         except Exception:
             log.exception("Fehler im Command-Modul")
-            return self.mqtt_bridge_exists
+            return mqtt_bridge_exists
 
     def get_cloud_id(self):
+        ids = []
         try:
-            self.ids = []
-            BrokerClient("processBrokerBranch", self.on_connect, self.__on_message_cloud_id).start_finite_loop()
-            return self.ids
+            for topic, payload in get_retained_topics("processBrokerBranch", self._topics()).items():
+                try:
+                    if decode_payload(payload)['remote']['is_openwb_cloud']:
+                        ids.append(topic.replace("openWB/"+self.topic_str, ""))
+                except Exception:
+                    log.exception("Fehler in ProcessBrokerBranch")
+            return ids
         except Exception:
             log.exception("Fehler im Command-Modul")
             return []
 
+    def _topics(self) -> List[str]:
+        return [f'openWB/{self.topic_str}#', f'openWB/set/{self.topic_str}#']
+
     def on_connect(self, client, userdata, flags, rc):
         """ connect to broker and subscribe to set topics
         """
-        client.subscribe(f'openWB/{self.topic_str}#', 2)
-        client.subscribe(f'openWB/set/{self.topic_str}#', 2)
+        for topic in self._topics():
+            client.subscribe(topic, 2)
 
     def __on_message_rm(self, client, userdata, msg):
         try:
@@ -1034,30 +1042,3 @@ class ProcessBrokerBranch:
                             pub_single(f'openWB/set/vehicle/{vehicle.num}/ev_template', 0)
         except Exception:
             log.exception("Fehler in ProcessBrokerBranch")
-
-    def __on_message_max_id(self, client, userdata, msg):
-        try:
-            self.received_topics.append(msg.topic)
-        except Exception:
-            log.exception("Fehler in ProcessBrokerBranch")
-
-    def __get_payload(self, client, userdata, msg):
-        try:
-            self.payload = msg.payload
-        except Exception:
-            log.exception("Fehler in ProcessBrokerBranch")
-
-    def __on_message_mqtt_bridge_exists(self, client, userdata, msg):
-        try:
-            if decode_payload(msg.payload)["name"] == self.name:
-                self.mqtt_bridge_exists = True
-        except Exception:
-            log.exception("Fehler in ProcessBrokerBranch")
-
-    def __on_message_cloud_id(self, client, userdata, msg):
-        try:
-            if decode_payload(msg.payload)['remote']['is_openwb_cloud']:
-                id = msg.topic.replace("openWB/"+self.topic_str, "")
-                self.ids.append(id)
-        except Exception:
-            log.exception("Fehler in ProcessBrokerBranch")
@@ -0,0 +1,123 @@
+""" Copy-on-Write-Schicht für das Kopieren der per MQTT empfangenen Daten.
+
+SubData erhöht für jedes empfangene Topic die Version des zugehörigen Objekts (z.B. "cp3", "ct1", "counter_all").
+Data kopiert nur die Objekte neu, deren Version sich seit der letzten Kopie geändert hat, alle anderen werden aus dem
+Cache übernommen.
+Objekte, die vom Regelalgorithmus verändert werden (mutable), dürfen nur so lange wiederverwendet werden, bis der
+Algorithmus auf den Daten arbeitet. Danach muss release() aufgerufen werden, damit diese im nächsten Zyklus wieder
+frisch kopiert werden.
+"""
+import copy
+import logging
+import re
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Reihenfolge beachten: spezifischere Muster zuerst
+SNAPSHOT_KEY_PATTERNS = (
+    (re.compile(r"^openWB/vehicle/template/charge_template/([0-9]+)"), "ct"),
+    (re.compile(r"^openWB/vehicle/template/ev_template/([0-9]+)"), "et"),
+    (re.compile(r"^openWB/vehicle/([0-9]+)"), "ev"),
+    (re.compile(r"^openWB/chargepoint/template/([0-9]+)"), "cpt"),
+    (re.compile(r"^openWB/chargepoint/([0-9]+)"), "cp"),
+    (re.compile(r"^openWB/chargepoint/"), "cp_all"),
+    (re.compile(r"^openWB/pv/([0-9]+)"), "pv"),
+    (re.compile(r"^openWB/pv/"), "pv_all"),
+    (re.compile(r"^openWB/bat/([0-9]+)"), "bat"),
+    (re.compile(r"^openWB/bat/"), "bat_all"),
+    (re.compile(r"^openWB/counter/([0-9]+)"), "counter"),
+    (re.compile(r"^openWB/counter/"), "counter_all"),
+    (re.compile(r"^openWB/LegacySmartHome/"), "counter_all"),
+    (re.compile(r"^openWB/general/"), "general"),
+    (re.compile(r"^openWB/graph/"), "graph"),
+    (re.compile(r"^openWB/optional/"), "optional"),
+    (re.compile(r"^openWB/io/action"), "io_actions"),
+    (re.compile(r"^openWB/io/states/([0-9]+)"), "io_states"),
+    (re.compile(r"^openWB/internal_io/states"), "internal_io_states"),
+    (re.compile(r"^openWB/system/"), "system"),
+)
+
+
+def snapshot_key(topic: str) -> Optional[str]:
+    """ ermittelt aus dem Topic den Schlüssel des Objekts, in dem der Wert in SubData abgelegt wird.
+    """
+    for pattern, prefix in SNAPSHOT_KEY_PATTERNS:
+        match = pattern.match(topic)
+        if match:
+            return prefix + (match.group(1) if match.groups() else "")
+    return None
+
+
+class TopicVersions:
+    """ Versionszähler je Objekt, wird von SubData bei jeder empfangenen Nachricht erhöht.
+    """
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def bump(self, topic: str) -> None:
+        key = snapshot_key(topic)
+        if key is not None:
+            self.bump_key(key)
+
+    def bump_key(self, key: str) -> None:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def get(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+
+@dataclass
+class SnapshotStatistics:
+    reused: int = 0
+    copied: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.reused} wiederverwendet, {self.copied} kopiert"
+
+
+class SnapshotCache:
+    """ Cache mit den zuletzt kopierten Objekten und der Version, die beim Kopieren gültig war.
+    """
+
+    def __init__(self, versions: TopicVersions) -> None:
+        self.versions = versions
+        self.statistics = SnapshotStatistics()
+        self._entries: Dict[str, Tuple[int, Any, Any, bool]] = {}
+        self._lock = Lock()
+
+    def copy(self, key: str, source: Any, mutable: bool = True) -> Any:
+        """ gibt eine Kopie von source zurück. Ist die Version unverändert und stammt der Cache-Eintrag von demselben
+        Quell-Objekt, wird die vorhandene Kopie wiederverwendet.
+        """
+        # Version vor dem Kopieren lesen, damit eine währenddessen empfangene Nachricht zu einer neuen Kopie führt.
+        version = self.versions.get(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and entry[1] is source:
+                self.statistics.reused += 1
+                return entry[2]
+        copied = copy.deepcopy(source)
+        with self._lock:
+            self._entries[key] = (version, source, copied, mutable)
+            self.statistics.copied += 1
+        return copied
+
+    def release(self) -> SnapshotStatistics:
+        """ verwirft alle veränderlichen Kopien, da der Algorithmus diese ab jetzt bearbeitet, und gibt die Statistik
+        seit dem letzten Aufruf zurück.
+        """
+        with self._lock:
+            self._entries = {key: entry for key, entry in self._entries.items() if entry[3] is False}
+            statistics = self.statistics
+            self.statistics = SnapshotStatistics()
+        return statistics
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
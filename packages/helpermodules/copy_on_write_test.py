@@ -0,0 +1,96 @@
+import pytest
+
+from control.chargepoint.chargepoint_template import CpTemplate
+from control.counter import Counter
+from helpermodules.copy_on_write import SnapshotCache, TopicVersions, snapshot_key
+
+
+@pytest.mark.parametrize("topic, expected_key", [
+    pytest.param("openWB/vehicle/template/charge_template/3/chargemode/scheduled_charging/plans/1", "ct3",
+                 id="charge template plan"),
+    pytest.param("openWB/vehicle/template/ev_template/0", "et0", id="ev template"),
+    pytest.param("openWB/vehicle/2/get/soc", "ev2", id="vehicle"),
+    pytest.param("openWB/vehicle/set/vehicle_update_completed", None, id="vehicle without index"),
+    pytest.param("openWB/chargepoint/template/1", "cpt1", id="chargepoint template"),
+    pytest.param("openWB/chargepoint/12/get/power", "cp12", id="chargepoint"),
+    pytest.param("openWB/chargepoint/get/power", "cp_all", id="all chargepoints"),
+    pytest.param("openWB/counter/0/get/power", "counter0", id="counter"),
+    pytest.param("openWB/counter/config/home_consumption_source_id", "counter_all", id="counter all"),
+    pytest.param("openWB/LegacySmartHome/Status/wattnichtHaus", "counter_all", id="legacy smarthome"),
+    pytest.param("openWB/io/states/4/get/digital_input", "io_states4", id="io states"),
+    pytest.param("openWB/internal_io/states/get/digital_input", "internal_io_states", id="internal io states"),
+    pytest.param("openWB/command/command_completed", None, id="unknown"),
+])
+def test_snapshot_key(topic: str, expected_key: str):
+    # execution
+    key = snapshot_key(topic)
+
+    # evaluation
+    assert key == expected_key
+
+
+def test_copy_reuses_unchanged_object():
+    # setup
+    versions = TopicVersions()
+    cache = SnapshotCache(versions)
+    source = Counter(0)
+
+    # execution
+    first = cache.copy("counter0", source)
+    second = cache.copy("counter0", source)
+
+    # evaluation
+    assert first is not source
+    assert first is second
+    assert cache.statistics.copied == 1
+    assert cache.statistics.reused == 1
+
+
+def test_copy_after_topic_received():
+    # setup
+    versions = TopicVersions()
+    cache = SnapshotCache(versions)
+    source = Counter(0)
+    first = cache.copy("counter0", source)
+
+    # execution
+    source.data.get.power = 1000
+    versions.bump("openWB/counter/0/get/power")
+    second = cache.copy("counter0", source)
+
+    # evaluation
+    assert second is not first
+    assert second.data.get.power == 1000
+    assert cache.statistics.copied == 2
+
+
+def test_copy_after_source_replaced():
+    # setup
+    versions = TopicVersions()
+    cache = SnapshotCache(versions)
+    first = cache.copy("counter0", Counter(0))
+
+    # execution
+    second = cache.copy("counter0", Counter(0))
+
+    # evaluation
+    assert second is not first
+
+
+def test_release_drops_only_mutable_copies():
+    # setup
+    versions = TopicVersions()
+    cache = SnapshotCache(versions)
+    counter = Counter(0)
+    template = CpTemplate()
+    counter_copy = cache.copy("counter0", counter)
+    template_copy = cache.copy("cpt0", template, mutable=False)
+
+    # execution
+    statistics = cache.release()
+
+    # evaluation
+    assert statistics.copied == 2
+    assert cache.statistics.copied == 0
+    assert cache.copy("counter0", counter) is not counter_copy
+    assert cache.copy("cpt0", template, mutable=False) is template_copy
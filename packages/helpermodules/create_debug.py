@@ -416,6 +416,7 @@ def create_debug_log(input_data):
                                       f'Uptime:{run_command(["uptime"])}{run_command(["free"])}\n')
             write_to_file(df, lambda: f'# section: hardware #\n{get_hardware_data()}\n')
             write_to_file(df, lambda: f"# section: configuration and state #\n{config_and_state()}")
+            write_to_file(df, lambda: f"# section: data objects #\n{data.data.get_state_dump()}\n")
             write_to_file(df, lambda: f"# section: uuids #\n{get_uuids()}\n")
             write_to_file(df, lambda: f'# section: network #\n{run_command(["ip", "-s", "address"])}\n')
             write_to_file(df, lambda: f'# section: storage #\n{run_command(["df", "-h"])}\n')
@@ -440,9 +441,9 @@ def create_debug_log(input_data):
 
         log.info("***** uploading debug log...")
         with open(debug_file, 'rb') as f:
-            data = f.read()
+            debug_content = f.read()
             req.get_http_session().put("https://openwb.de/tools/debug2.php",
-                                       data=data,
+                                       data=debug_content,
                                        params={'debugemail': debug_email},
                                        timeout=10)
 
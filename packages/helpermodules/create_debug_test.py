@@ -0,0 +1,23 @@
+from unittest.mock import Mock
+
+from control import data
+from helpermodules import create_debug
+
+
+def test_create_debug_log_contains_data_objects(tmp_path, monkeypatch):
+    # setup
+    debug_file = tmp_path / "debug.log"
+    monkeypatch.setattr(create_debug, "debug_file", str(debug_file))
+    for name in ("BrokerContent", "get_common_data", "get_hardware_data", "config_and_state", "get_uuids",
+                 "merge_log_files", "run_command", "run_shell_command", "Pub", "req"):
+        monkeypatch.setattr(create_debug, name, Mock(return_value=Mock(return_value="")))
+    monkeypatch.setattr(create_debug.time, "sleep", Mock())
+    monkeypatch.setattr(create_debug.os, "remove", Mock())
+    monkeypatch.setattr(data, "data", Mock(get_state_dump=Mock(return_value="cp0 {\"id\": 0}")), raising=False)
+
+    # execution
+    create_debug.create_debug_log({"message": "", "serialNumber": "", "installedComponents": "", "vehicles": ""})
+
+    # evaluation
+    content = debug_file.read_text()
+    assert "# section: data objects #\ncp0 {\"id\": 0}\n" in content
@@ -0,0 +1,151 @@
+""" Erfassung der Schreibzugriffe auf die Datenklassen, damit der ChangedValuesHandler nur die geschriebenen Felder
+veröffentlicht, ohne die Daten vorher vollständig zu kopieren.
+
+Beim Start werden alle Instanzen der übergebenen Datenklassen (rekursiv) registriert und für deren Klassen ein
+__setattr__-Hook installiert. Der Hook merkt sich beim ersten Schreiben eines Feldes den vorherigen Wert. Listen und
+Dictionaries in Feldern mit Topic können auch ohne Zuweisung verändert werden, daher wird von diesen beim Start eine
+Kopie abgelegt.
+Für Klassen, die als Ganzes veröffentlicht werden (Feld mit Topic, dessen Wert eine Datenklasse ist), wird bei einer
+Änderung in der Klasse das übergeordnete Feld mit Topic als geändert gemeldet.
+"""
+import copy
+from dataclasses import Field, dataclass, field, fields, is_dataclass
+from enum import Enum
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from dataclass_utils import asdict
+
+MISSING = object()
+
+_active_trackers: List["DirtyTracker"] = []
+_active_trackers_lock = Lock()
+_class_fields: Dict[type, Tuple[Tuple[Field, Optional[str]], ...]] = {}
+
+
+def _tracking_setattr(self, name: str, value: Any) -> None:
+    for tracker in _active_trackers:
+        tracker.record(self, name)
+    object.__setattr__(self, name, value)
+
+
+def _get_class_fields(cls: type) -> Tuple[Tuple[Field, Optional[str]], ...]:
+    try:
+        return _class_fields[cls]
+    except KeyError:
+        class_fields = tuple((f, f.metadata.get("topic")) for f in fields(cls))
+        _class_fields[cls] = class_fields
+        return class_fields
+
+
+def _install_hook(cls: type) -> bool:
+    if cls.__setattr__ is _tracking_setattr:
+        return True
+    if cls.__setattr__ is not object.__setattr__:
+        # frozen oder eigenes __setattr__
+        return False
+    cls.__setattr__ = _tracking_setattr
+    return True
+
+
+def is_changed(previous: Any, value: Any) -> bool:
+    if previous is MISSING:
+        return True
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(previous, Enum):
+        previous = previous.value
+    if is_dataclass(value) or is_dataclass(previous):
+        # Bei unveränderter Referenz werden Änderungen in der Klasse selbst erfasst.
+        return previous is not value and asdict(previous) != asdict(value)
+    return previous != value
+
+
+@dataclass
+class TrackedInstance:
+    instance: Any
+    topic_prefix: str
+    # Feld mit Topic, in dem die Instanz als Ganzes veröffentlicht wird
+    anchor: Optional[Tuple["TrackedInstance", Field]] = None
+    changes: Dict[str, Any] = field(default_factory=dict)
+    containers: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ChangedField:
+    topic_prefix: str
+    field: Field
+    previous_value: Any
+    value: Any
+
+
+class DirtyTracker:
+    def __init__(self) -> None:
+        self._instances: Dict[int, TrackedInstance] = {}
+        self._lock = Lock()
+
+    def track(self, topic_prefix: str, instance: Any) -> None:
+        """ registriert die Instanz und alle enthaltenen Datenklassen. Muss vor start() aufgerufen werden.
+        """
+        self._track(topic_prefix, instance, None)
+
+    def _track(self, topic_prefix: str,
+               instance: Any,
+               anchor: Optional[Tuple[TrackedInstance, Field]]) -> None:
+        if id(instance) in self._instances or _install_hook(type(instance)) is False:
+            return
+        tracked = TrackedInstance(instance, topic_prefix, anchor)
+        self._instances[id(instance)] = tracked
+        for f, topic in _get_class_fields(type(instance)):
+            value = getattr(instance, f.name, None)
+            if is_dataclass(value) and not isinstance(value, type):
+                self._track(topic_prefix, value, (tracked, f) if topic and anchor is None else anchor)
+            elif (topic or anchor) and isinstance(value, (list, dict)):
+                tracked.containers[f.name] = copy.deepcopy(value)
+
+    def is_tracked(self, instance: Any) -> bool:
+        return id(instance) in self._instances
+
+    def start(self) -> None:
+        with _active_trackers_lock:
+            _active_trackers.append(self)
+
+    def stop(self) -> None:
+        with _active_trackers_lock:
+            if self in _active_trackers:
+                _active_trackers.remove(self)
+
+    def record(self, instance: Any, name: str) -> None:
+        tracked = self._instances.get(id(instance))
+        if tracked is not None and tracked.instance is instance and name not in tracked.changes:
+            with self._lock:
+                tracked.changes.setdefault(name, instance.__dict__.get(name, MISSING))
+
+    def get_changed_fields(self) -> List[ChangedField]:
+        """ gibt die Felder mit Topic zurück, deren Wert sich seit start() geändert hat. Felder ohne Topic, denen eine
+        neue Datenklasse zugewiesen wurde, werden mit vorherigem und aktuellem Wert zurückgegeben, damit diese wie
+        bisher verglichen werden können.
+        """
+        changed_fields: Dict[Tuple[int, str], ChangedField] = {}
+        for tracked in list(self._instances.values()):
+            if not tracked.changes and not tracked.containers:
+                continue
+            for f, topic in _get_class_fields(type(tracked.instance)):
+                if f.name in tracked.changes:
+                    previous_value = tracked.changes[f.name]
+                elif f.name in tracked.containers:
+                    previous_value = tracked.containers[f.name]
+                else:
+                    continue
+                value = getattr(tracked.instance, f.name, None)
+                if is_changed(previous_value, value) is False:
+                    continue
+                if tracked.anchor is not None:
+                    anchor_instance, anchor_field = tracked.anchor
+                    changed_fields[(id(anchor_instance.instance), anchor_field.name)] = ChangedField(
+                        anchor_instance.topic_prefix, anchor_field, None,
+                        getattr(anchor_instance.instance, anchor_field.name))
+                elif topic or is_dataclass(value):
+                    changed_fields[(id(tracked.instance), f.name)] = ChangedField(
+                        tracked.topic_prefix, f, previous_value, value)
+        return list(changed_fields.values())
@@ -0,0 +1,387 @@
+"""Binäre, spaltenorientierte Ablage der Tages- und Monats-Logs.
+
+Zu jeder Logdatei (zB. daily_log/20240301.json) wird im versteckten Unterordner .columnar eine gleichnamige Datei mit
+der Endung .bin geführt, an die jeder neue Eintrag angehängt wird. Die json-Datei bleibt die maßgebliche Quelle, da
+Datenmigrationen, Backup und Ertragsberechnung direkt auf ihr arbeiten. Die .bin-Datei merkt sich Größe und
+Änderungszeitpunkt der json-Datei und wird nur verwendet, solange diese übereinstimmen. Andernfalls wird sie beim
+nächsten Lesen aus der json-Datei neu erstellt.
+
+Aufbau: MAGIC, gefolgt von Blöcken
+    S <Länge> <json-Liste der Spalten>  Schema, gilt für alle folgenden Datensätze
+    R <Spalten * 9 Byte>                Datensatz: je Spalte ein Typ-Byte und 8 Byte Wert
+    J <Länge> <json>                    Datensatz, der sich nicht im Schema abbilden lässt
+    M <Länge> <json>                    übrige Schlüssel der Logdatei (zB. names), der letzte Block gilt
+    F <Größe> <Änderungszeitpunkt>      Stand der json-Datei, der letzte Block gilt
+Spalten sind die Pfade durch den verschachtelten Eintrag, zB. ["cp", "cp3", "imported"]. Die Datensätze eines Schemas
+haben eine feste Breite, sodass einzelne Einträge (zB. der erste und letzte) ohne Einlesen der ganzen Datei gelesen
+werden können. Für das Lesen aller Einträge ist json.load schneller, daher wird dafür weiterhin die json-Datei gelesen.
+"""
+import copy
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+from threading import Lock
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from helpermodules.utils import json_file_handler
+
+log = logging.getLogger(__name__)
+
+FOLDER = ".columnar"
+SUFFIX = ".bin"
+MAGIC = b"OWBLOG1\n"
+
+SCHEMA, RECORD, JSON_RECORD, META, STAMP = b"S", b"R", b"J", b"M", b"F"
+
+ABSENT, NONE, INT, FLOAT, TRUE, FALSE, DICT, STR = range(8)
+VALUE_SIZE = 9
+
+_LENGTH = struct.Struct("<I")
+_FLOAT = struct.Struct("<d")
+_STAMP = struct.Struct("<Qq")
+_INT_RANGE = range(-2**63, 2**63)
+_EMPTY_PAYLOAD = bytes(8)
+
+Column = Tuple[str, ...]
+
+_lock = Lock()
+# Markierung für verschachtelte Einträge beim Zerlegen in Spalten
+_DICT_MARKER = object()
+
+
+class _NotEncodable(Exception):
+    pass
+
+
+class _WrittenFile(NamedTuple):
+    # Größe und Änderungszeitpunkt der .bin-Datei nach dem letzten Schreiben
+    stamp: Tuple[int, int]
+    count: int
+    columns: List["Column"]
+    meta: Dict
+
+
+# Stand der zuletzt geschriebenen .bin-Dateien, damit zum Anhängen die Datei nicht eingelesen werden muss
+_written_files: Dict[Path, _WrittenFile] = {}
+
+
+def get_path(json_path: Union[str, Path]) -> Path:
+    json_path = Path(json_path)
+    return json_path.parent / FOLDER / (json_path.stem + SUFFIX)
+
+
+def _flatten(entry: Dict, prefix: Column = ()) -> List[Tuple[Column, Any]]:
+    values = []
+    for key, value in entry.items():
+        if not isinstance(key, str):
+            raise _NotEncodable()
+        column = prefix + (key,)
+        if isinstance(value, dict):
+            values.append((column, _DICT_MARKER))
+            values.extend(_flatten(value, column))
+        else:
+            values.append((column, value))
+    return values
+
+
+def _encode_value(value: Any) -> bytes:
+    if value is _DICT_MARKER:
+        return bytes((DICT,)) + _EMPTY_PAYLOAD
+    if value is None:
+        return bytes((NONE,)) + _EMPTY_PAYLOAD
+    if value is True:
+        return bytes((TRUE,)) + _EMPTY_PAYLOAD
+    if value is False:
+        return bytes((FALSE,)) + _EMPTY_PAYLOAD
+    if type(value) is int and value in _INT_RANGE:
+        return bytes((INT,)) + value.to_bytes(8, "little", signed=True)
+    if type(value) is float:
+        return bytes((FLOAT,)) + _FLOAT.pack(value)
+    if type(value) is str:
+        encoded = value.encode("utf-8")
+        if len(encoded) <= 8 and b"\0" not in encoded:
+            return bytes((STR,)) + encoded.ljust(8, b"\0")
+    raise _NotEncodable()
+
+
+def _block(kind: bytes, payload: bytes) -> bytes:
+    return kind + _LENGTH.pack(len(payload)) + payload
+
+
+def _json_block(kind: bytes, content: Any) -> bytes:
+    return _block(kind, json.dumps(content, separators=(",", ":")).encode("utf-8"))
+
+
+class _Encoder:
+    """ hängt Einträge an das aktuelle Schema an und beginnt ein neues Schema, wenn neue Spalten hinzukommen. """
+
+    def __init__(self, columns: Optional[List[Column]] = None) -> None:
+        self._set_columns(columns or [])
+
+    def _set_columns(self, columns: List[Column]) -> None:
+        self.columns = columns
+        self.index = {column: i for i, column in enumerate(columns)}
+
+    def encode(self, entry: Dict) -> bytes:
+        try:
+            flat = _flatten(entry)
+            values = [(column, _encode_value(value)) for column, value in flat]
+        except _NotEncodable:
+            return _json_block(JSON_RECORD, entry)
+        buffer = b""
+        if any(column not in self.index for column, _ in values):
+            # Spaltenreihenfolge des neuen Eintrags übernehmen, damit die Schlüssel beim Lesen in derselben
+            # Reihenfolge wie in der json-Datei stehen.
+            new_columns = [column for column, _ in values]
+            known = set(new_columns)
+            new_columns.extend(column for column in self.columns if column not in known)
+            self._set_columns(new_columns)
+            buffer += _json_block(SCHEMA, new_columns)
+        record = bytearray(bytes((ABSENT,)) + _EMPTY_PAYLOAD) * len(self.columns)
+        for column, value in values:
+            offset = self.index[column] * VALUE_SIZE
+            record[offset:offset+VALUE_SIZE] = value
+        return buffer + RECORD + bytes(record)
+
+
+class _Schema:
+    """ dekodiert die Datensätze eines Schemas. Typ-Bytes und Werte eines Datensatzes werden mit einem vorbereiteten
+    struct in einem Schritt gelesen.
+    """
+
+    _CONSTANTS = {NONE: None, TRUE: True, FALSE: False}
+
+    def __init__(self, columns: List[Column]) -> None:
+        self.columns = columns
+        self.size = len(columns) * VALUE_SIZE
+        self._ints = struct.Struct("<" + "Bq" * len(columns))
+        self._floats = struct.Struct("<" + "Bd" * len(columns))
+        self._layout = [(i * 2, column[:-1], column[-1], column) for i, column in enumerate(columns)]
+
+    def decode(self, buffer, offset: int) -> Dict:
+        ints = self._ints.unpack_from(buffer, offset)
+        floats = None
+        entry: Dict = {}
+        dicts: Dict[Column, Dict] = {(): entry}
+        for i, parent, key, column in self._layout:
+            tag = ints[i]
+            if tag == ABSENT:
+                continue
+            elif tag == INT:
+                value = ints[i + 1]
+            elif tag == FLOAT:
+                if floats is None:
+                    floats = self._floats.unpack_from(buffer, offset)
+                value = floats[i + 1]
+            elif tag == DICT:
+                value = dicts[column] = {}
+            elif tag == STR:
+                start = offset + i // 2 * VALUE_SIZE + 1
+                value = bytes(buffer[start:start + 8]).rstrip(b"\0").decode("utf-8")
+            elif tag in self._CONSTANTS:
+                value = self._CONSTANTS[tag]
+            else:
+                raise ValueError(f"Unbekannter Typ {tag}")
+            dicts[parent][key] = value
+        return entry
+
+
+class _Reader:
+    """ liest die Blockstruktur einer .bin-Datei ein. Datensätze werden erst bei Bedarf dekodiert. """
+
+    def __init__(self, buffer) -> None:
+        self.buffer = buffer
+        # je Datensatz Offset und Schema, None bei json-Datensätzen
+        self.records: List[Tuple[int, Optional[_Schema]]] = []
+        self.meta: Dict = {}
+        self.stamp: Optional[Tuple[int, int]] = None
+        self.columns: List[Column] = []
+        self._parse()
+
+    def _parse(self) -> None:
+        buffer = self.buffer
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("Ungültige Kennung")
+        offset, size = len(MAGIC), len(buffer)
+        schema = _Schema([])
+        while offset < size:
+            kind = buffer[offset:offset+1]
+            if kind == RECORD:
+                end = offset + 1 + schema.size
+                if end > size:
+                    # unvollständig geschriebener Datensatz
+                    break
+                self.records.append((offset + 1, schema))
+                offset = end
+                continue
+            if kind == STAMP:
+                end = offset + 1 + _STAMP.size
+                if end > size:
+                    break
+                self.stamp = _STAMP.unpack_from(buffer, offset + 1)
+                offset = end
+                continue
+            if offset + 1 + _LENGTH.size > size:
+                break
+            length = _LENGTH.unpack_from(buffer, offset + 1)[0]
+            start = offset + 1 + _LENGTH.size
+            end = start + length
+            if end > size:
+                break
+            if kind == SCHEMA:
+                schema = _Schema([tuple(column) for column in json.loads(bytes(buffer[start:end]))])
+            elif kind == JSON_RECORD:
+                self.records.append((start, None))
+            elif kind == META:
+                self.meta = json.loads(bytes(buffer[start:end]))
+            else:
+                raise ValueError(f"Unbekannter Block {kind!r}")
+            offset = end
+        self.columns = schema.columns
+
+    def entry(self, index: int) -> Dict:
+        offset, schema = self.records[index]
+        if schema is None:
+            length = _LENGTH.unpack_from(self.buffer, offset - _LENGTH.size)[0]
+            return json.loads(bytes(self.buffer[offset:offset+length]))
+        return schema.decode(self.buffer, offset)
+
+
+def _json_stamp(json_path: Path) -> Tuple[int, int]:
+    stat = os.stat(json_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _read(path: Path, read_function):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return read_function(_Reader(buffer))
+
+
+def _select(entries: List, indices: Sequence[int]) -> List:
+    count = len(entries)
+    return [entries[i] for i in indices if -count <= i < count]
+
+
+def _read_entries(reader: _Reader, indices: Optional[Sequence[int]]) -> Dict:
+    positions: Sequence[int] = range(len(reader.records))
+    if indices is not None:
+        positions = _select(positions, indices)
+    content = {"entries": [reader.entry(i) for i in positions]}
+    content.update(reader.meta)
+    return content
+
+
+def _meta(content: Dict) -> Dict:
+    return {key: value for key, value in content.items() if key != "entries"}
+
+
+def _is_storable(content: Dict) -> bool:
+    return isinstance(content, dict) and isinstance(content.get("entries"), list)
+
+
+def _write_file(path: Path, data: bytes, append: bool = False) -> None:
+    if append:
+        with open(path, "ab") as f:
+            f.write(data)
+    else:
+        path.parent.mkdir(mode=0o755, parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def write(json_path: Union[str, Path], content: Dict, stamp: Optional[Tuple[int, int]] = None) -> None:
+    """ erstellt die .bin-Datei zum Inhalt der json-Datei neu. stamp ist der Stand der json-Datei, aus dem content
+    gelesen wurde.
+    """
+    json_path = Path(json_path)
+    encoder = _Encoder()
+    data = bytearray(MAGIC)
+    for entry in content["entries"]:
+        data += encoder.encode(entry)
+    data += _json_block(META, _meta(content))
+    data += STAMP + _STAMP.pack(*(stamp or _json_stamp(json_path)))
+    path = get_path(json_path)
+    _write_file(path, bytes(data))
+    _written_files[path] = _WrittenFile(_json_stamp(path), len(content["entries"]), encoder.columns,
+                                        copy.deepcopy(_meta(content)))
+
+
+def append_entry(json_path: Union[str, Path], content: Dict) -> None:
+    """ hängt den letzten Eintrag aus content an die .bin-Datei an, nachdem content in die json-Datei geschrieben
+    wurde. Passt die .bin-Datei nicht zum vorherigen Stand, wird sie neu erstellt.
+    """
+    json_path = Path(json_path)
+    path = get_path(json_path)
+    with _lock:
+        if _is_storable(content) is False:
+            return
+        stamp = _json_stamp(json_path)
+        if (json_file_handler.is_written(str(json_path), content) is False and
+                stamp[0] != len(json.dumps(content))):
+            # Schreiben der json-Datei ist fehlgeschlagen, die .bin-Datei wird beim nächsten Lesen neu erstellt.
+            log.debug(f"Inhalt von {json_path} weicht ab, binäre Logdatei wird nicht aktualisiert.")
+            return
+        try:
+            written = _written_files.get(path)
+            if written is None or written.stamp != _json_stamp(path):
+                written = _read(path, lambda reader: _WrittenFile(
+                    _json_stamp(path), len(reader.records), reader.columns, reader.meta))
+        except (OSError, ValueError):
+            written = None
+        entries = content["entries"]
+        if written is None or written.count != len(entries) - 1:
+            write(json_path, content, stamp)
+            return
+        encoder = _Encoder(list(written.columns))
+        data = encoder.encode(entries[-1])
+        meta = _meta(content)
+        if written.meta != meta:
+            data += _json_block(META, meta)
+        data += STAMP + _STAMP.pack(*stamp)
+        _write_file(path, data, append=True)
+        _written_files[path] = _WrittenFile(_json_stamp(path), len(entries), encoder.columns, copy.deepcopy(meta))
+
+
+def load_entries(json_path: Union[str, Path], indices: Sequence[int]) -> Dict:
+    """ liest die Einträge an den Positionen indices (zB. (0, -1) für den ersten und letzten Eintrag) und die übrigen
+    Schlüssel (zB. names) einer Logdatei. Nicht vorhandene Positionen werden übersprungen.
+    Wirft wie das Lesen der json-Datei FileNotFoundError bzw. JSONDecodeError.
+    """
+    json_path = Path(json_path)
+    stamp = _json_stamp(json_path)
+    path = get_path(json_path)
+    try:
+        def read_if_current(reader: _Reader) -> Optional[Dict]:
+            return _read_entries(reader, indices) if reader.stamp == stamp else None
+        content = _read(path, read_if_current)
+        if content is not None:
+            return content
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, IndexError, KeyError):
+        log.debug(f"Binäre Logdatei {path} ist ungültig und wird neu erstellt.")
+    with open(json_path, "r") as json_file:
+        content = json.load(json_file)
+    if _is_storable(content):
+        with _lock:
+            try:
+                if _json_stamp(json_path) == stamp:
+                    write(json_path, content, stamp)
+            except Exception:
+                log.exception(f"Fehler beim Erstellen der binären Logdatei {path}")
+    selected = dict(content)
+    selected["entries"] = _select(content["entries"], indices)
+    return selected
+
+
+def export_json(json_path: Union[str, Path]) -> Dict:
+    """ gibt den Inhalt der .bin-Datei im Format der json-Logdatei zurück, unabhängig davon, ob die json-Datei noch
+    vorhanden ist.
+    """
+    return _read(get_path(json_path), lambda reader: _read_entries(reader, None))
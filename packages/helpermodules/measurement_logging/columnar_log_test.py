@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+from typing import Dict
+from unittest.mock import Mock
+
+from helpermodules.measurement_logging import columnar_log
+
+
+def entry(timestamp: int, sh: Dict) -> Dict:
+    return {"timestamp": timestamp, "date": "09:25", "prices": {"grid": 0.3, "pv": 0.08, "bat": None},
+            "cp": {"cp3": {"imported": 1500.5, "exported": 0}, "all": {"imported": 1500.5, "exported": 0}},
+            "ev": {"ev0": {"soc": None}},
+            "counter": {"counter0": {"imported": 17.913, "exported": 21.382, "grid": True}},
+            "pv": {"all": {"exported": 3269}}, "bat": {}, "sh": sh, "hc": {"all": {"imported": 108647.27}}}
+
+
+def save(json_path: Path, content: Dict) -> None:
+    json_path.write_text(json.dumps(content))
+    columnar_log.append_entry(json_path, content)
+
+
+def test_append_and_export(tmp_path: Path):
+    # setup
+    json_path = tmp_path / "20240301.json"
+    content = {"entries": [], "names": {"cp3": "Ladepunkt"}}
+
+    # execution
+    for timestamp, sh in ((1, {}), (2, {"sh1": {"imported": 5, "temp0": 21.5}}), (3, {"sh1": {"mode": [1, 2]}}),
+                          (4, {}), (5, {"sh1": {"name": "langer Gerätename"}})):
+        content["entries"].append(entry(timestamp, sh))
+        save(json_path, content)
+
+    # evaluation
+    assert columnar_log.export_json(json_path) == content
+    assert columnar_log.load_entries(json_path, (0, -1, 7)) == {
+        "entries": [content["entries"][0], content["entries"][-1]], "names": {"cp3": "Ladepunkt"}}
+
+
+def test_load_entries_rebuilds_outdated_file(tmp_path: Path):
+    # setup
+    json_path = tmp_path / "202403.json"
+    content = {"entries": [entry(1, {}), entry(2, {})], "names": {}, "totals": {}}
+    save(json_path, content)
+    # json-Datei wird zB. durch eine Datenmigration geändert
+    content["entries"][-1]["sh"] = {"sh1": {"imported": 5}}
+    json_path.write_text(json.dumps(content))
+
+    # execution
+    loaded = columnar_log.load_entries(json_path, (-1,))
+
+    # evaluation
+    assert loaded == {"entries": [content["entries"][-1]], "names": {}, "totals": {}}
+    assert columnar_log.export_json(json_path) == content
+
+
+def test_load_entries_ignores_incomplete_record(tmp_path: Path):
+    # setup
+    json_path = tmp_path / "20240301.json"
+    content = {"entries": [entry(1, {})], "names": {}}
+    save(json_path, content)
+    with open(columnar_log.get_path(json_path), "ab") as f:
+        f.write(columnar_log.RECORD + b"\x02")
+
+    # execution
+    loaded = columnar_log.export_json(json_path)
+
+    # evaluation
+    assert loaded == content
+
+
+def test_append_entry_without_reading_bin_file(tmp_path: Path, monkeypatch):
+    # setup
+    json_path = tmp_path / "20240301.json"
+    content = {"entries": [entry(1, {})], "names": {}}
+    save(json_path, content)
+    mock_read = Mock(side_effect=columnar_log._read)
+    monkeypatch.setattr(columnar_log, "_read", mock_read)
+
+    # execution
+    for timestamp in (2, 3):
+        content["entries"].append(entry(timestamp, {"sh1": {"imported": timestamp}}))
+        content["names"] = {"sh1": f"Gerät {timestamp}"}
+        save(json_path, content)
+
+    # evaluation
+    assert mock_read.call_count == 0
+    assert columnar_log.export_json(json_path) == content
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Union
 
 from helpermodules import timecheck
+from helpermodules.measurement_logging import columnar_log
 from helpermodules.measurement_logging.write_log import (LegacySmartHomeLogData, LogType, create_entry,
                                                          get_previous_entry)
 from helpermodules.messaging import MessageType, pub_system_message
@@ -183,10 +184,8 @@ def _collect_daily_log_data(date: str):
                 # bei älteren als letzten Datensatz den des nächsten Tags
                 try:
                     next_date = timecheck.get_relative_date_string(date, day_offset=1)
-                    with open(str(parent_file / (next_date+".json")),
-                              "r") as next_json_file:
-                        next_log_data = json.load(next_json_file)
-                        log_data["entries"].append(next_log_data["entries"][0])
+                    next_log_data = columnar_log.load_entries(parent_file / (next_date+".json"), (0,))
+                    log_data["entries"].extend(next_log_data["entries"])
                 except FILE_ERRORS:
                     pass
     except FILE_ERRORS:
@@ -211,21 +210,17 @@ def _collect_monthly_log_data(date: str):
             # add last entry of current day, if current month is requested
             try:
                 today = timecheck.create_timestamp_YYYYMMDD()
-                with open(f"{_get_data_folder_path()}/daily_log/{today}.json",
-                          "r") as todayJsonFile:
-                    today_log_data = json.load(todayJsonFile)
-                    if len(today_log_data["entries"]) > 0:
-                        log_data["entries"].append(today_log_data["entries"][-1])
+                today_log_data = columnar_log.load_entries(f"{_get_data_folder_path()}/daily_log/{today}.json", (-1,))
+                log_data["entries"].extend(today_log_data["entries"])
             except FILE_ERRORS:
                 pass
         else:
             # add first entry of next month
             try:
                 next_date = timecheck.get_relative_date_string(date, month_offset=1)
-                with open(f"{_get_data_folder_path()}/monthly_log/{next_date}.json",
-                          "r") as nextJsonFile:
-                    next_log_data = json.load(nextJsonFile)
-                    log_data["entries"].append(next_log_data["entries"][0])
+                next_log_data = columnar_log.load_entries(
+                    f"{_get_data_folder_path()}/monthly_log/{next_date}.json", (0,))
+                log_data["entries"].extend(next_log_data["entries"])
             except FILE_ERRORS:
                 pass
     except FILE_ERRORS:
@@ -305,9 +300,8 @@ def _collect_yearly_log_data(year: str):
     def add_monthly_log(month: str, check_next_month: bool = False) -> None:
         monthly_log_path = Path(__file__).resolve().parents[3]/"data"/"monthly_log"
         try:
-            with open(monthly_log_path / f"{month}.json", "r") as jsonFile:
-                content = json.load(jsonFile)
-                entries.append(content["entries"][0])
+            content = columnar_log.load_entries(monthly_log_path / f"{month}.json", (0, -1))
+            entries.append(content["entries"][0])
             # add last entry of current file if next file is missing
             if check_next_month:
                 next_month = timecheck.get_relative_date_string(month, month_offset=1)
@@ -321,10 +315,8 @@ def _collect_yearly_log_data(year: str):
 
     def add_daily_log(day: str) -> None:
         try:
-            with open(f"{_get_data_folder_path()}/daily_log/{day}.json", "r") as dayJsonFile:
-                day_log_data = json.load(dayJsonFile)
-                if len(day_log_data["entries"]) > 0:
-                    entries.append(day_log_data["entries"][-1])
+            day_log_data = columnar_log.load_entries(f"{_get_data_folder_path()}/daily_log/{day}.json", (-1,))
+            entries.extend(day_log_data["entries"])
         except FILE_ERRORS:
             pass
 
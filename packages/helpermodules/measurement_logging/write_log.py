@@ -12,7 +12,8 @@ from typing import Dict, Optional
 from control import data
 from helpermodules.broker import BrokerClient
 from helpermodules import timecheck
-from helpermodules.utils.json_file_handler import write_and_check
+from helpermodules.measurement_logging import columnar_log
+from helpermodules.utils.json_file_handler import append_entry, read_content
 from helpermodules.utils.topic_parser import decode_payload, get_index
 from modules.common.utils.component_parser import get_component_name_by_id
 
@@ -104,7 +105,7 @@ class LegacySmartHomeLogData:
         self.sh_dict: Dict = {}
         self.sh_names: Dict = {}
         try:
-            BrokerClient("smart-home-logging", self.on_connect, self.on_message).start_finite_loop()
+            BrokerClient("smart-home-logging", self.on_connect, self.on_message).start_snapshot_loop()
             for topic, payload in self.all_received_topics.items():
                 if re.search("openWB/LegacySmartHome/config/get/Devices/[1-9]/device_configured", topic) is not None:
                     if decode_payload(payload) == 1:
@@ -136,7 +137,7 @@ def save_log(log_type: LogType):
         gibt an, ob ein Tages-oder Monats-Log-Eintrag erstellt werden soll.
     """
     try:
-        parent_file = Path(__file__).resolve().parents[3] / "data" / \
+        parent_file = _get_parent_file() / "data" / \
             ("daily_log" if log_type == LogType.DAILY else "monthly_log")
         parent_file.mkdir(mode=0o755, parents=True, exist_ok=True)
         if log_type == LogType.DAILY:
@@ -146,8 +147,8 @@ def save_log(log_type: LogType):
         filepath = str(parent_file / f"{file_name}.json")
 
         try:
-            with open(filepath, "r") as jsonFile:
-                content = json.load(jsonFile)
+            # solange die Datei nur von hier geschrieben wird, ohne sie erneut einzulesen
+            content = read_content(filepath)
         except FileNotFoundError:
             content = {"entries": [], "names": {}}
         except json.JSONDecodeError:
@@ -165,13 +166,21 @@ def save_log(log_type: LogType):
         entries = content["entries"]
         entries.append(new_entry)
         content["names"] = get_names(content["entries"][-1], sh_log_data.sh_names)
-        write_and_check(filepath, content)
+        append_entry(filepath, content)
+        try:
+            columnar_log.append_entry(filepath, content)
+        except Exception:
+            log.exception("Fehler beim Schreiben der binären Logdatei")
         return content["entries"]
     except Exception:
         log.exception("Fehler beim Speichern des Log-Eintrags")
         return None
 
 
+def _get_parent_file() -> Path:
+    return Path(__file__).resolve().parents[3]
+
+
 def get_previous_entry(parent_file: Path, content: Dict) -> Optional[Dict]:
     try:
         previous_entry = content["entries"][-1]
@@ -181,9 +190,7 @@ def get_previous_entry(parent_file: Path, content: Dict) -> Optional[Dict]:
         # sort path list by name
         path_list = sorted(path_list, key=lambda x: x.name)
         try:
-            with open(path_list[-2], "r") as jsonFile:
-                content = json.load(jsonFile)
-            previous_entry = content["entries"][-1]
+            previous_entry = columnar_log.load_entries(path_list[-2], (-1,))["entries"][0]
         except (IndexError, FileNotFoundError, json.decoder.JSONDecodeError):
             previous_entry = None
     return previous_entry
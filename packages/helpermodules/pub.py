@@ -1,23 +1,116 @@
+from dataclasses import dataclass
 import json
 import logging
+import time
+from threading import Lock
+from typing import Dict, Tuple
 import paho.mqtt.publish as publish
 
+from dataclass_utils import asjson
 from helpermodules.broker import InternalBrokerPublisher
 
 
 log = logging.getLogger(__name__)
 
+# Unveränderte Messwerte werden spätestens nach diesem Intervall (s) erneut gesendet.
+VALUE_REPUBLISH_INTERVAL = 300
+
+
+@dataclass
+class PubStatistics:
+    sent: int = 0
+    # innerhalb eines Zyklus durch einen neueren Wert für dasselbe Topic ersetzt
+    coalesced: int = 0
+    # identisch zum zuletzt gesendeten Wert
+    suppressed: int = 0
+
 
 class PubSingleton:
     def __init__(self) -> None:
         self.publisher = InternalBrokerPublisher()
         self.publisher.start_loop()
+        self.statistics = PubStatistics()
+        self._coalescing = False
+        self._pending: Dict[str, str] = {}
+        self._last_values: Dict[str, Tuple[str, float]] = {}
+        self._lock = Lock()
 
     def pub(self, topic: str, payload, qos: int = 0, retain: bool = True) -> None:
         if payload == "":
+            if not topic.startswith("openWB/set/"):
+                # abgeleitetes Topic wird gelöscht
+                self._invalidate_value(topic, payload)
             self.publisher.client.publish(topic, payload, qos=qos, retain=retain)
         else:
-            self.publisher.client.publish(topic, payload=json.dumps(payload), qos=qos, retain=retain)
+            serialized = asjson(payload)
+            self._invalidate_value(topic, serialized)
+            self.publisher.client.publish(topic, payload=serialized, qos=qos, retain=retain)
+
+    def _invalidate_value(self, topic: str, serialized: str) -> None:
+        """ Wird ein Messwert-Topic (oder das daraus von setdata abgeleitete Topic ohne set/) mit einem anderen Wert
+        beschrieben, zB. beim Zurücksetzen des ID-Tags, muss der nächste Messwert wieder gesendet werden, auch wenn er
+        unverändert ist. Das Löschen des set-Topics durch setdata nach der Verarbeitung und das Weiterreichen desselben
+        Werts ändern den Stand auf dem Broker nicht.
+        """
+        if topic.startswith("openWB/") and not topic.startswith("openWB/set/"):
+            topic = topic.replace("openWB/", "openWB/set/", 1)
+        with self._lock:
+            last = self._last_values.get(topic)
+            if last is not None and last[0] != serialized:
+                del self._last_values[topic]
+            pending = self._pending.get(topic)
+            if pending is not None and pending != serialized:
+                # der später geschriebene Wert gilt, wie ohne Zusammenfassen
+                del self._pending[topic]
+
+    def pub_value(self, topic: str, payload) -> None:
+        """ veröffentlicht einen Messwert retained. Zwischen start_coalescing() und stop_coalescing() wird je Topic nur
+        der letzte Wert beim nächsten flush() gesendet. Werte, die identisch zum zuletzt gesendeten Wert sind, werden
+        übersprungen.
+        """
+        if payload == "":
+            self.pub(topic, payload)
+            return
+        serialized = asjson(payload)
+        with self._lock:
+            if self._coalescing:
+                if topic in self._pending:
+                    self.statistics.coalesced += 1
+                self._pending[topic] = serialized
+                return
+        self._send_value(topic, serialized)
+
+    def _send_value(self, topic: str, serialized: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_values.get(topic)
+            if last is not None and last[0] == serialized and now - last[1] < VALUE_REPUBLISH_INTERVAL:
+                self.statistics.suppressed += 1
+                return
+            self._last_values[topic] = (serialized, now)
+            self.statistics.sent += 1
+        self.publisher.client.publish(topic, payload=serialized, qos=0, retain=True)
+
+    def start_coalescing(self) -> None:
+        with self._lock:
+            self._coalescing = True
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for topic, serialized in pending.items():
+            self._send_value(topic, serialized)
+
+    def stop_coalescing(self) -> PubStatistics:
+        """ sendet die ausstehenden Werte, beendet das Zusammenfassen und gibt die Statistik seit dem letzten Aufruf
+        zurück.
+        """
+        with self._lock:
+            self._coalescing = False
+        self.flush()
+        with self._lock:
+            statistics, self.statistics = self.statistics, PubStatistics()
+        return statistics
 
 
 class Pub:
@@ -0,0 +1,103 @@
+from unittest.mock import Mock, call
+
+import pytest
+
+from helpermodules import pub
+
+
+@pytest.fixture
+def pub_singleton(monkeypatch) -> pub.PubSingleton:
+    monkeypatch.setattr(pub, "InternalBrokerPublisher", Mock())
+    return pub.PubSingleton()
+
+
+def test_pub_value_skips_unchanged_value(pub_singleton: pub.PubSingleton):
+    # execution
+    pub_singleton.pub_value("openWB/set/bat/0/get/power", 100)
+    pub_singleton.pub_value("openWB/set/bat/0/get/power", 100)
+    pub_singleton.pub_value("openWB/set/bat/0/get/power", 200)
+
+    # evaluation
+    assert pub_singleton.publisher.client.publish.call_args_list == [
+        call("openWB/set/bat/0/get/power", payload="100", qos=0, retain=True),
+        call("openWB/set/bat/0/get/power", payload="200", qos=0, retain=True)]
+    assert pub_singleton.statistics == pub.PubStatistics(sent=2, suppressed=1)
+
+
+def test_pub_value_republishes_after_interval(pub_singleton: pub.PubSingleton, monkeypatch):
+    # setup
+    monotonic_mock = Mock(side_effect=[0, pub.VALUE_REPUBLISH_INTERVAL + 1])
+    monkeypatch.setattr(pub.time, "monotonic", monotonic_mock)
+
+    # execution
+    pub_singleton.pub_value("openWB/set/bat/0/get/power", 100)
+    pub_singleton.pub_value("openWB/set/bat/0/get/power", 100)
+
+    # evaluation
+    assert pub_singleton.publisher.client.publish.call_count == 2
+
+
+def test_coalescing(pub_singleton: pub.PubSingleton):
+    # setup
+    pub_singleton.pub_value("openWB/set/bat/0/get/soc", 50)
+
+    # execution
+    pub_singleton.start_coalescing()
+    pub_singleton.pub_value("openWB/set/bat/0/get/power", 100)
+    pub_singleton.pub_value("openWB/set/bat/0/get/power", 150)
+    pub_singleton.pub_value("openWB/set/bat/0/get/soc", 50)
+    calls_before_flush = pub_singleton.publisher.client.publish.call_count
+    pub_singleton.flush()
+    pub_singleton.pub_value("openWB/set/bat/0/get/power", 200)
+    statistics = pub_singleton.stop_coalescing()
+
+    # evaluation
+    assert calls_before_flush == 1
+    assert pub_singleton.publisher.client.publish.call_args_list[1:] == [
+        call("openWB/set/bat/0/get/power", payload="150", qos=0, retain=True),
+        call("openWB/set/bat/0/get/power", payload="200", qos=0, retain=True)]
+    assert statistics == pub.PubStatistics(sent=3, coalesced=1, suppressed=1)
+    assert pub_singleton.statistics == pub.PubStatistics()
+
+
+def test_pub_value_empty_payload_deletes_topic(pub_singleton: pub.PubSingleton):
+    # execution
+    pub_singleton.start_coalescing()
+    pub_singleton.pub_value("openWB/set/bat/0/get/fault_str", "")
+
+    # evaluation
+    pub_singleton.publisher.client.publish.assert_called_once_with(
+        "openWB/set/bat/0/get/fault_str", "", qos=0, retain=True)
+
+
+@pytest.mark.parametrize("topic, payload, expected_resend", [
+    pytest.param("openWB/set/chargepoint/0/get/rfid", None, True, id="set-Topic zurückgesetzt"),
+    pytest.param("openWB/chargepoint/0/get/rfid", None, True, id="abgeleitetes Topic zurückgesetzt"),
+    pytest.param("openWB/chargepoint/0/get/rfid", "", True, id="abgeleitetes Topic gelöscht"),
+    pytest.param("openWB/chargepoint/0/get/rfid", "1234", False, id="setdata reicht Wert weiter"),
+    pytest.param("openWB/set/chargepoint/0/get/rfid", "", False, id="setdata löscht set-Topic"),
+])
+def test_pub_invalidates_value(topic: str, payload, expected_resend: bool, pub_singleton: pub.PubSingleton):
+    # setup
+    pub_singleton.pub_value("openWB/set/chargepoint/0/get/rfid", "1234")
+
+    # execution
+    pub_singleton.pub(topic, payload)
+    pub_singleton.pub_value("openWB/set/chargepoint/0/get/rfid", "1234")
+
+    # evaluation
+    assert pub_singleton.statistics.sent == (2 if expected_resend else 1)
+
+
+def test_pub_replaces_pending_value(pub_singleton: pub.PubSingleton):
+    # setup
+    pub_singleton.start_coalescing()
+    pub_singleton.pub_value("openWB/set/chargepoint/0/get/rfid", "1234")
+
+    # execution
+    pub_singleton.pub("openWB/set/chargepoint/0/get/rfid", None)
+    pub_singleton.stop_coalescing()
+
+    # evaluation
+    pub_singleton.publisher.client.publish.assert_called_once_with(
+        "openWB/set/chargepoint/0/get/rfid", payload="null", qos=0, retain=True)
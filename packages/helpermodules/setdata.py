@@ -13,6 +13,7 @@ import logging
 from helpermodules import hardware_configuration, subdata
 from helpermodules.broker import BrokerClient
 from helpermodules.pub import Pub, pub_single
+from helpermodules.topic_router import TopicRouter
 from helpermodules.utils.topic_parser import decode_payload, get_index, get_index_position
 from helpermodules.update_config import UpdateConfig
 import dataclass_utils
@@ -32,6 +33,7 @@ class SetData:
         self.event_soc = event_soc
         self.event_subdata_initialized = event_subdata_initialized
         self.heartbeat = False
+        self.router = self._build_router()
 
     def set_data(self):
         self.internal_broker_client = BrokerClient("mqttset", self.on_connect, self.on_message)
@@ -63,45 +65,37 @@ class SetData:
         self.heartbeat = True
         if decode_payload(msg.payload) != "":
             mqtt_log.debug(f"Topic: {msg.topic}, Payload: {decode_payload(msg.payload)}")
-            if "openWB/set/vehicle/" in msg.topic:
-                if "openWB/set/vehicle/template/ev_template/" in msg.topic:
-                    self.event_ev_template.wait(5)
-                    self.process_vehicle_ev_template_topic(msg)
-                elif "openWB/set/vehicle/template/charge_template/" in msg.topic:
-                    self.process_vehicle_charge_template_topic(msg)
-                else:
-                    self.process_vehicle_topic(msg)
-            elif "openWB/set/chargepoint/" in msg.topic:
-                if "openWB/set/chargepoint/" in msg.topic and "/set/charge_template" in msg.topic:
-                    self.process_vehicle_charge_template_topic(msg)
-                else:
-                    self.process_chargepoint_topic(msg)
-            elif "openWB/set/pv/" in msg.topic:
-                self.process_pv_topic(msg)
-            elif "openWB/set/bat/" in msg.topic:
-                self.process_bat_topic(msg)
-            elif "openWB/set/general/" in msg.topic:
-                self.process_general_topic(msg)
-            elif ("openWB/set/io/" in msg.topic or "openWB/set/internal_io/" in msg.topic):
-                self.process_io_topic(msg)
-            elif "openWB/set/mqtt/" in msg.topic:
-                self.process_mqtt_topic(msg)
-            elif "openWB/set/optional/" in msg.topic:
-                self.process_optional_topic(msg)
-            elif "openWB/set/counter/" in msg.topic:
-                self.process_counter_topic(msg)
-            elif "openWB/set/log/" in msg.topic:
-                self.process_log_topic(msg)
-            elif "openWB/set/graph/" in msg.topic:
-                self.process_graph_topic(msg)
-            elif "openWB/set/system/" in msg.topic:
-                self.process_system_topic(msg)
-            elif "openWB/set/command/" in msg.topic:
-                self.process_command_topic(msg)
-            elif "openWB/set/internal_chargepoint/" in msg.topic:
-                self.process_internal_chargepoint_topic(msg)
-            elif "openWB/set/LegacySmartHome/" in msg.topic:
-                self.process_legacy_smart_home_topic(msg)
+            self.router.dispatch(msg.topic, msg)
+
+    def _build_router(self) -> TopicRouter:
+        router = TopicRouter()
+        # Die Handler prüfen nur den Payload und benötigen das von "+" erfasste Segment nicht.
+        for pattern, handler in (
+                ("openWB/set/vehicle/template/ev_template/+/#", self._process_ev_template_after_init),
+                ("openWB/set/vehicle/template/charge_template/+/#", self.process_vehicle_charge_template_topic),
+                ("openWB/set/vehicle/+/#", self.process_vehicle_topic),
+                ("openWB/set/chargepoint/+/#", self.process_chargepoint_topic),
+                ("openWB/set/chargepoint/+/set/charge_template/#", self.process_vehicle_charge_template_topic),
+                ("openWB/set/pv/+/#", self.process_pv_topic),
+                ("openWB/set/bat/+/#", self.process_bat_topic),
+                ("openWB/set/general/+/#", self.process_general_topic),
+                ("openWB/set/io/+/#", self.process_io_topic),
+                ("openWB/set/internal_io/+/#", self.process_io_topic),
+                ("openWB/set/mqtt/+/#", self.process_mqtt_topic),
+                ("openWB/set/optional/+/#", self.process_optional_topic),
+                ("openWB/set/counter/+/#", self.process_counter_topic),
+                ("openWB/set/log/+/#", self.process_log_topic),
+                ("openWB/set/graph/+/#", self.process_graph_topic),
+                ("openWB/set/system/+/#", self.process_system_topic),
+                ("openWB/set/command/+/#", self.process_command_topic),
+                ("openWB/set/internal_chargepoint/+/#", self.process_internal_chargepoint_topic),
+                ("openWB/set/LegacySmartHome/+/#", self.process_legacy_smart_home_topic)):
+            router.add(pattern, lambda msg, _, handler=handler: handler(msg))
+        return router
+
+    def _process_ev_template_after_init(self, msg: mqtt.MQTTMessage):
+        self.event_ev_template.wait(5)
+        self.process_vehicle_ev_template_topic(msg)
 
     def _validate_value(self, msg: mqtt.MQTTMessage, data_type, ranges=[], collection=None, pub_json=False,
                         retain: bool = True):
@@ -973,11 +967,14 @@ class SetData:
                     "openWB/set/system/wizard_done" in msg.topic or
                     "openWB/set/system/update_in_progress" in msg.topic or
                     "openWB/set/system/backup_cloud/backup_before_update" in msg.topic or
+                    "openWB/set/system/backup_cloud/incremental" in msg.topic or
                     "openWB/set/system/installAssistantDone" in msg.topic or
                     "openWB/set/system/dataprotection_acknowledged" in msg.topic or
                     "openWB/set/system/usage_terms_acknowledged" in msg.topic or
                     "openWB/set/system/update_config_completed" in msg.topic):
                 self._validate_value(msg, bool)
+            elif "openWB/set/system/backup_cloud/compression_level" in msg.topic:
+                self._validate_value(msg, int, [(0, 9)])
             elif "openWB/set/system/version" in msg.topic:
                 self._validate_value(msg, str)
             elif "openWB/set/system/time" in msg.topic:
@@ -23,10 +23,12 @@ from control.optional_data import Ocpp
 from helpermodules import graph, system
 from helpermodules.abstract_plans import AutolockPlan, ScheduledChargingPlan, TimeChargingPlan
 from helpermodules.broker import BrokerClient
+from helpermodules.copy_on_write import TopicVersions
 from helpermodules.messaging import MessageType, pub_system_message
 from helpermodules.utils.run_command import run_command
-from helpermodules.utils.topic_parser import decode_payload, get_index, get_second_index
+from helpermodules.utils.topic_parser import decode_payload, get_index, get_second_index, parse_topic
 from helpermodules.pub import Pub
+from helpermodules.topic_router import TopicRouter
 from dataclass_utils import dataclass_from_dict
 from modules.common.abstract_vehicle import CalculatedSocState, GeneralVehicleConfig
 from modules.common.configurable_backup_cloud import ConfigurableBackupCloud
@@ -69,6 +71,8 @@ class SubData:
     optional_data = optional.Optional()
     system_data = {"system": system.System()}
     graph_data = graph.Graph()
+    # Versionen der Objekte für das Copy-on-Write beim Kopieren in data.data
+    topic_versions = TopicVersions()
 
     def __init__(self,
                  event_ev_template: Event,
@@ -104,6 +108,7 @@ class SubData:
         self.event_modbus_server = event_modbus_server
         self.event_restart_gpio = event_restart_gpio
         self.heartbeat = False
+        self.router = self._build_router()
 
     def sub_topics(self):
         self.internal_broker_client = BrokerClient("mqttsub", self.on_connect, self.on_message)
@@ -148,44 +153,45 @@ class SubData:
         mqtt_log.debug("Topic: "+str(msg.topic) +
                        ", Payload: "+str(msg.payload.decode("utf-8")))
         self.heartbeat = True
-        if "openWB/vehicle/template/charge_template/" in msg.topic:
-            self.process_vehicle_charge_template_topic(
-                self.ev_charge_template_data, msg)
-        elif "openWB/vehicle/template/ev_template/" in msg.topic:
-            self.process_vehicle_ev_template_topic(self.ev_template_data, msg)
-        elif "openWB/vehicle/" in msg.topic:
-            self.process_vehicle_topic(client, self.ev_data, msg)
-        elif "openWB/chargepoint/template/" in msg.topic:
-            self.process_chargepoint_template_topic(self.cp_template_data, msg)
-        elif "openWB/chargepoint/" in msg.topic:
-            self.process_chargepoint_topic(self.cp_data, msg)
-        elif "openWB/pv/" in msg.topic:
-            self.process_pv_topic(self.pv_data, msg)
-        elif "openWB/bat/" in msg.topic:
-            self.process_bat_topic(self.bat_data, msg)
-        elif "openWB/general/" in msg.topic:
-            self.process_general_topic(self.general_data, msg)
-        elif "openWB/graph/" in msg.topic:
-            self.process_graph_topic(self.graph_data, msg)
-        elif "openWB/io/action" in msg.topic:
-            self.process_io_topic(self.io_actions, msg)
-        elif "openWB/io/states" in msg.topic or "openWB/internal_io/states" in msg.topic:
-            self.process_io_topic(self.io_states, msg)
-        elif "openWB/internal_chargepoint/" in msg.topic:
-            self.process_internal_chargepoint_topic(client, self.internal_chargepoint_data, msg)
-        elif "openWB/optional/" in msg.topic:
-            self.process_optional_topic(self.optional_data, msg)
-        elif "openWB/counter/" in msg.topic:
-            self.process_counter_topic(self.counter_data, msg)
-        elif "openWB/system/" in msg.topic:
-            self.process_system_topic(client, self.system_data, msg)
-        elif "openWB/LegacySmartHome/" in msg.topic:
-            self.process_legacy_smarthome_topic(client, self.counter_all_data, msg)
-        elif "openWB/command/command_completed" == msg.topic:
-            self.event_command_completed.set()
-        else:
+        self.topic_versions.bump(msg.topic)
+        if self.router.dispatch(msg.topic, client, msg) is False:
             log.warning("unknown subdata-topic: "+str(msg.topic))
 
+    def _build_router(self) -> TopicRouter:
+        router = TopicRouter()
+        # die von "+" erfassten Segmente werden den Handlern als letztes Argument übergeben
+        router.add("openWB/vehicle/template/charge_template/+/#",
+                   lambda client, msg, index: self.process_vehicle_charge_template_topic(
+                       self.ev_charge_template_data, msg, index))
+        router.add("openWB/vehicle/template/ev_template/+/#",
+                   lambda client, msg, index: self.process_vehicle_ev_template_topic(self.ev_template_data, msg, index))
+        router.add("openWB/vehicle/+/#",
+                   lambda client, msg, index: self.process_vehicle_topic(client, self.ev_data, msg, index))
+        router.add("openWB/chargepoint/template/+/#",
+                   lambda client, msg, index: self.process_chargepoint_template_topic(
+                       self.cp_template_data, msg, index))
+        router.add("openWB/chargepoint/+/#",
+                   lambda client, msg, index: self.process_chargepoint_topic(self.cp_data, msg, index))
+        router.add("openWB/pv/+/#", lambda client, msg, index: self.process_pv_topic(self.pv_data, msg, index))
+        router.add("openWB/bat/+/#", lambda client, msg, index: self.process_bat_topic(self.bat_data, msg, index))
+        router.add("openWB/general/+/#", lambda client, msg, _: self.process_general_topic(self.general_data, msg))
+        router.add("openWB/graph/+/#", lambda client, msg, _: self.process_graph_topic(self.graph_data, msg))
+        router.add("openWB/io/action/#", lambda client, msg: self.process_io_topic(self.io_actions, msg))
+        router.add("openWB/io/states/#", lambda client, msg: self.process_io_topic(self.io_states, msg))
+        router.add("openWB/internal_io/states/#", lambda client, msg: self.process_io_topic(self.io_states, msg))
+        router.add("openWB/internal_chargepoint/+/#",
+                   lambda client, msg, _: self.process_internal_chargepoint_topic(
+                       client, self.internal_chargepoint_data, msg))
+        router.add("openWB/optional/+/#", lambda client, msg, _: self.process_optional_topic(self.optional_data, msg))
+        router.add("openWB/counter/+/#",
+                   lambda client, msg, index: self.process_counter_topic(self.counter_data, msg, index))
+        router.add("openWB/system/+/#",
+                   lambda client, msg, _: self.process_system_topic(client, self.system_data, msg))
+        router.add("openWB/LegacySmartHome/+/#",
+                   lambda client, msg, _: self.process_legacy_smarthome_topic(client, self.counter_all_data, msg))
+        router.add("openWB/command/command_completed", lambda client, msg: self.event_command_completed.set())
+        return router
+
     def set_json_payload(self, dict: Dict, msg: mqtt.MQTTMessage) -> None:
         """ dekodiert das JSON-Objekt und setzt diesen für den Value in das übergebene Dictionary, als Key wird der
         Name nach dem letzten / verwendet.
@@ -246,7 +252,7 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
-    def process_vehicle_topic(self, client: mqtt.Client, var: Dict[str, ev.Ev], msg: mqtt.MQTTMessage):
+    def process_vehicle_topic(self, client: mqtt.Client, var: Dict[str, ev.Ev], msg: mqtt.MQTTMessage, index: str):
         """ Handler für die EV-Topics
 
         Parameter
@@ -259,8 +265,7 @@ class SubData:
         try:
             if "openWB/vehicle/set/vehicle_update_completed" in msg.topic:
                 self.event_vehicle_update_completed.set()
-            elif re.search("/vehicle/[0-9]+/", msg.topic) is not None:
-                index = get_index(msg.topic)
+            elif index.isdigit():
                 if decode_payload(msg.payload) == "":
                     if re.search("/vehicle/[0-9]+/soc_module/config$", msg.topic) is not None:
                         var["ev"+index].soc_module = None
@@ -309,7 +314,7 @@ class SubData:
                         if re.search("/vehicle/[0-9]+/charge_template$", msg.topic) is not None:
                             charge_template_id = int(decode_payload(msg.payload))
                             if var["ev"+index].data.charge_template != charge_template_id:
-                                ev_id = get_index(msg.topic)
+                                ev_id = index
                                 for cp in self.cp_data.values():
                                     if ((cp.chargepoint.data.set.charging_ev != -1 and
                                          cp.chargepoint.data.set.charging_ev == ev_id) or
@@ -319,7 +324,8 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
-    def process_vehicle_charge_template_topic(self, var: Dict[str, ChargeTemplate], msg: mqtt.MQTTMessage):
+    def process_vehicle_charge_template_topic(self, var: Dict[str, ChargeTemplate], msg: mqtt.MQTTMessage,
+                                              index: str):
         """ Handler für die EV-Topics
 
         Parameter
@@ -330,7 +336,6 @@ class SubData:
             enthält Topic und Payload
         """
         try:
-            index = get_index(msg.topic)
             if re.search("/vehicle/template/charge_template/[0-9]+$", msg.topic) is not None:
                 if decode_payload(msg.payload) == "":
                     if "ct"+index in var:
@@ -409,7 +414,7 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
-    def process_vehicle_ev_template_topic(self, var: Dict[str, EvTemplate], msg: mqtt.MQTTMessage):
+    def process_vehicle_ev_template_topic(self, var: Dict[str, EvTemplate], msg: mqtt.MQTTMessage, index: str):
         """ Handler für die EV-Topics
 
         Parameter
@@ -420,7 +425,6 @@ class SubData:
             enthält Topic und Payload
         """
         try:
-            index = get_index(msg.topic)
             if re.search("/vehicle/template/ev_template/[0-9]+$", msg.topic) is not None:
                 if decode_payload(msg.payload) == "":
                     if "et"+index in var:
@@ -433,7 +437,7 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
-    def process_chargepoint_topic(self, var: Dict[str, chargepoint.Chargepoint], msg: mqtt.MQTTMessage):
+    def process_chargepoint_topic(self, var: Dict[str, chargepoint.Chargepoint], msg: mqtt.MQTTMessage, index: str):
         """ Handler für die Ladepunkt-Topics
 
         Parameter
@@ -444,8 +448,7 @@ class SubData:
             enthält Topic und Payload
         """
         try:
-            if re.search("/chargepoint/[0-9]+/", msg.topic) is not None:
-                index = get_index(msg.topic)
+            if index.isdigit():
                 if decode_payload(msg.payload) == "":
                     if re.search("/chargepoint/[0-9]+/config", msg.topic) is not None:
                         log.debug("Stop des Handlers für den internen Ladepunkt.")
@@ -497,7 +500,7 @@ class SubData:
                         else:
                             self.set_json_payload_class(var["cp"+index].chargepoint.data.get, msg)
                     elif re.search("/chargepoint/[0-9]+/config$", msg.topic) is not None:
-                        self.process_chargepoint_config_topic(var, msg)
+                        self.process_chargepoint_config_topic(var, msg, index)
                     elif re.search("/chargepoint/[0-9]+/control_parameter/", msg.topic) is not None:
                         if re.search("/chargepoint/[0-9]+/control_parameter/limit", msg.topic) is not None:
                             payload = decode_payload(msg.payload)
@@ -510,8 +513,8 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
-    def process_chargepoint_config_topic(self, var: Dict[str, chargepoint.CpTemplate], msg: mqtt.MQTTMessage):
-        index = get_index(msg.topic)
+    def process_chargepoint_config_topic(self, var: Dict[str, chargepoint.CpTemplate], msg: mqtt.MQTTMessage,
+                                         index: str):
         payload = decode_payload(msg.payload)
         if (var["cp"+index].chargepoint.chargepoint_module is None or
                 payload != var["cp"+index].chargepoint.chargepoint_module.config):
@@ -527,7 +530,8 @@ class SubData:
         self.set_json_payload_class(var["cp"+index].chargepoint.data.config, msg)
         self.event_cp_config.set()
 
-    def process_chargepoint_template_topic(self, var: Dict[str, chargepoint.CpTemplate], msg: mqtt.MQTTMessage):
+    def process_chargepoint_template_topic(self, var: Dict[str, chargepoint.CpTemplate], msg: mqtt.MQTTMessage,
+                                           index: str):
         """ Handler für die Ladepunkt-Topics
 
         Parameter
@@ -538,7 +542,6 @@ class SubData:
             enthält Topic und Payload
         """
         try:
-            index = get_index(msg.topic)
             payload = decode_payload(msg.payload)
             if re.search("/chargepoint/template/[0-9]+/autolock/", msg.topic) is not None:
                 index_second = get_second_index(msg.topic)
@@ -559,7 +562,7 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
-    def process_pv_topic(self, var: Dict[str, pv.Pv], msg: mqtt.MQTTMessage):
+    def process_pv_topic(self, var: Dict[str, pv.Pv], msg: mqtt.MQTTMessage, index: str):
         """ Handler für die PV-Topics
 
         Parameter
@@ -570,8 +573,7 @@ class SubData:
             enthält Topic und Payload
         """
         try:
-            if re.search("/pv/[0-9]+/", msg.topic) is not None:
-                index = get_index(msg.topic)
+            if index.isdigit():
                 if decode_payload(msg.payload) == "":
                     if "pv"+index in var:
                         var.pop("pv"+index)
@@ -592,7 +594,7 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
-    def process_bat_topic(self, var: Dict[str, bat.Bat], msg: mqtt.MQTTMessage):
+    def process_bat_topic(self, var: Dict[str, bat.Bat], msg: mqtt.MQTTMessage, index: str):
         """ Handler für die Hausspeicher-Hardware_Topics
 
         Parameter
@@ -603,8 +605,7 @@ class SubData:
             enthält Topic und Payload
         """
         try:
-            if re.search("/bat/[0-9]+/", msg.topic) is not None:
-                index = get_index(msg.topic)
+            if index.isdigit():
                 if decode_payload(msg.payload) == "":
                     if "bat"+index in var:
                         var.pop("bat"+index)
@@ -797,7 +798,7 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
-    def process_counter_topic(self, var: Dict[str, counter.Counter], msg: mqtt.MQTTMessage):
+    def process_counter_topic(self, var: Dict[str, counter.Counter], msg: mqtt.MQTTMessage, index: str):
         """ Handler für die Zähler-Topics
 
         Parameter
@@ -808,8 +809,7 @@ class SubData:
             enthält Topic und Payload
         """
         try:
-            if re.search("/counter/[0-9]+/", msg.topic) is not None:
-                index = get_index(msg.topic)
+            if index.isdigit():
                 if decode_payload(msg.payload) == "":
                     if "counter"+index in var:
                         var.pop("counter"+index)
@@ -864,14 +864,14 @@ class SubData:
                     # Durch das erneute Subscribe werden die Komponenten mit dem aktualisierten TCP-Client angelegt.
                     client.subscribe(f"openWB/system/device/{index}/component/+/config", 2)
             elif re.search("^.+/device/[0-9]+/component/[0-9]+/simulation$", msg.topic) is not None:
-                index = get_index(msg.topic)
-                index_second = get_second_index(msg.topic)
+                parsed_topic = parse_topic(msg.topic)
+                index, index_second = parsed_topic.index, parsed_topic.second_index
                 var["device"+index].components["component"+index_second].sim_counter.data = dataclass_from_dict(
                     SimCounterState,
                     decode_payload(msg.payload))
             elif re.search("^.+/device/[0-9]+/component/[0-9]+/config$", msg.topic) is not None:
-                index = get_index(msg.topic)
-                index_second = get_second_index(msg.topic)
+                parsed_topic = parse_topic(msg.topic)
+                index, index_second = parsed_topic.index, parsed_topic.second_index
                 if decode_payload(msg.payload) == "":
                     if "device"+index in var:
                         if "component"+str(index_second) in var["device"+index].components:
@@ -933,7 +933,9 @@ class SubData:
                     mod = importlib.import_module(".backup_clouds."+config_dict["type"]+".backup_cloud", "modules")
                     config = dataclass_from_dict(mod.device_descriptor.configuration_factory, config_dict)
                     var["system"].backup_cloud = ConfigurableBackupCloud(config, mod.create_backup_cloud)
-            elif "openWB/system/backup_cloud/backup_before_update" in msg.topic:
+            elif ("openWB/system/backup_cloud/backup_before_update" in msg.topic or
+                    "openWB/system/backup_cloud/compression_level" in msg.topic or
+                    "openWB/system/backup_cloud/incremental" in msg.topic):
                 self.set_json_payload(var["system"].data["backup_cloud"], msg)
             elif ("openWB/system/dataprotection_acknowledged" == msg.topic and
                     decode_payload(msg.payload) is False):
@@ -968,7 +970,9 @@ class SubData:
                 if "module_update_completed" in msg.topic:
                     self.event_module_update_completed.set()
                 elif ("openWB/system/available_branches" == msg.topic or
-                      "openWB/system/time" == msg.topic):
+                      "openWB/system/time" == msg.topic or
+                      "openWB/system/mqtt/publisher_statistics" == msg.topic or
+                      "openWB/system/modbus/connection_statistics" == msg.topic):
                     # Logged in update.log, not used in data.data and removed due to readability purposes of main.log.
                     return
                 elif "openWB/system/subdata_initialized" == msg.topic:
@@ -11,6 +11,7 @@ from typing import Optional
 
 from helpermodules import pub
 from control import data
+from helpermodules.backup_pipeline import DEFAULT_COMPRESSION_LEVEL, BackupPipeline
 from helpermodules.utils import thread_handler
 from helpermodules.utils.run_command import run_command
 from modules.common.configurable_backup_cloud import ConfigurableBackupCloud
@@ -90,9 +91,15 @@ class System:
     def create_backup_and_send_to_cloud(self):
         if self.backup_cloud is not None:
             backup_filename = self.create_backup()
-            with open(self._get_parent_file()/'data'/'backup'/backup_filename, 'rb') as f:
-                data = f.read()
-            self.backup_cloud.update(backup_filename, data)
+            pipeline = BackupPipeline(
+                self._get_parent_file()/'data'/'backup_cloud'/'manifest.json',
+                self.data["backup_cloud"].get("compression_level", DEFAULT_COMPRESSION_LEVEL),
+                self.data["backup_cloud"].get("incremental", False))
+            backup_file = pipeline.create(self._get_parent_file()/'data'/'backup'/backup_filename)
+            # Die Datei wird an die Backup-Cloud übergeben und von dieser in Blöcken gelesen.
+            with open(backup_file, 'rb') as f:
+                self.backup_cloud.update(backup_file.name, f)
+            pipeline.commit()
             log.debug('Nächtliche Sicherung erstellt und hochgeladen.')
 
     def create_backup(self) -> str:
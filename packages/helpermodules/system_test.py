@@ -0,0 +1,39 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from helpermodules.backup_pipeline_test import FILES, create_backup
+from helpermodules.system import System
+from modules.backup_clouds.samba import backup_cloud as samba
+from modules.backup_clouds.samba.config import SambaBackupCloud, SambaBackupCloudConfiguration
+from modules.common.configurable_backup_cloud import ConfigurableBackupCloud
+
+
+def failing_initializer(config):
+    raise Exception("Konfiguration fehlerhaft")
+
+
+@pytest.mark.parametrize("initializer", [
+    pytest.param(samba.create_backup_cloud, id="Host nicht erreichbar"),
+    pytest.param(failing_initializer, id="Initialisierung fehlgeschlagen"),
+])
+def test_create_backup_and_send_to_cloud_upload_failed(initializer, tmp_path: Path, monkeypatch):
+    # setup
+    (tmp_path / "data" / "backup").mkdir(parents=True)
+    create_backup(tmp_path / "data" / "backup" / "backup.tar.gz", FILES)
+    monkeypatch.setattr(samba, "is_port_open", Mock(return_value=False))
+    system = System()
+    system.data["backup_cloud"] = {"incremental": True}
+    system.backup_cloud = ConfigurableBackupCloud(
+        SambaBackupCloud(configuration=SambaBackupCloudConfiguration(smb_server="192.168.1.2")), initializer)
+    monkeypatch.setattr(system, "_get_parent_file", Mock(return_value=tmp_path))
+    monkeypatch.setattr(system, "create_backup", Mock(return_value="backup.tar.gz"))
+
+    # execution
+    with pytest.raises(Exception):
+        system.create_backup_and_send_to_cloud()
+
+    # evaluation
+    # ohne Upload wird der Stand für die nächste inkrementelle Sicherung nicht übernommen
+    assert (tmp_path / "data" / "backup_cloud" / "manifest.json").exists() is False
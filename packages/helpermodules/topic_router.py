@@ -0,0 +1,124 @@
+""" Zuordnung von MQTT-Topics zu Handlern über einen Segment-Trie.
+
+Die Muster werden wie Subscriptions angegeben ("openWB/chargepoint/+/get/#"). Bei mehreren passenden Mustern hat ein
+exaktes Segment Vorrang vor "+" und "+" Vorrang vor "#", die Reihenfolge des Hinzufügens spielt keine Rolle.
+Die Segmente, die von "+" erfasst werden, werden den Handlern beim Dispatch nach den übergebenen Argumenten mitgegeben,
+sodass z.B. der Index eines Ladepunkts nicht erneut aus dem Topic ermittelt werden muss.
+Der Trie wird ohne Rekursion durchlaufen, solange an einem Knoten nur ein Zweig passt. Nur wenn ein exaktes Segment und
+"+" passen, wird mit Backtracking gesucht. Da die meisten Topics zyklisch erneut empfangen werden, werden die
+Ergebnisse zusätzlich in einem begrenzten LRU-Cache abgelegt.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class TopicMatch:
+    handler: Callable
+    pattern: str
+    # von "+" erfasste Segmente
+    wildcards: Tuple[str, ...] = ()
+    # von "#" erfasste Segmente
+    remainder: Tuple[str, ...] = ()
+
+    @property
+    def indices(self) -> Tuple[str, ...]:
+        """ numerische Segmente, die von "+" erfasst wurden """
+        return tuple(w for w in self.wildcards if w.isdigit())
+
+
+@dataclass
+class _Node:
+    children: Dict[str, "_Node"] = field(default_factory=dict)
+    handler: Optional[Tuple[Callable, str]] = None
+    multi_level_handler: Optional[Tuple[Callable, str]] = None
+
+
+# Handler mit Muster, erfasste Segmente und Position, ab der "#" die Segmente erfasst (None ohne "#")
+_Result = Tuple[Tuple[Callable, str], Tuple[str, ...], Optional[int]]
+
+
+class TopicRouter:
+    def __init__(self, cache_size: int = 4096) -> None:
+        self._root = _Node()
+        self._lookup = lru_cache(maxsize=cache_size)(self._find)
+
+    def add(self, pattern: str, handler: Callable) -> None:
+        segments = pattern.split("/")
+        if "#" in segments[:-1]:
+            raise ValueError(f"'#' ist nur als letztes Segment erlaubt: {pattern}")
+        node = self._root
+        for segment in segments:
+            if segment == "#":
+                node.multi_level_handler = (handler, pattern)
+                self._lookup.cache_clear()
+                return
+            node = node.children.setdefault(segment, _Node())
+        node.handler = (handler, pattern)
+        self._lookup.cache_clear()
+
+    def match(self, topic: str) -> Optional[TopicMatch]:
+        result = self._lookup(topic)
+        if result is None:
+            return None
+        (handler, pattern), wildcards, position = result
+        remainder = () if position is None else tuple(topic.split("/")[position:])
+        return TopicMatch(handler, pattern, wildcards, remainder)
+
+    def _find(self, topic: str) -> Optional[_Result]:
+        segments = topic.split("/")
+        node = self._root
+        wildcards: Tuple[str, ...] = ()
+        # "#" des tiefsten bisher durchlaufenen Knotens, falls der weitere Weg nicht passt
+        fallback: Optional[_Result] = None
+        for position, segment in enumerate(segments):
+            if node.multi_level_handler is not None:
+                fallback = (node.multi_level_handler, wildcards, position)
+            children = node.children
+            child = children.get(segment)
+            if child is None:
+                child = children.get("+")
+                if child is None:
+                    return fallback
+                wildcards += (segment,)
+            elif "+" in children:
+                result = self._match(node, segments, position, wildcards)
+                return fallback if result is None else result
+            node = child
+        if node.handler is not None:
+            return (node.handler, wildcards, None)
+        if node.multi_level_handler is not None:
+            return (node.multi_level_handler, wildcards, len(segments))
+        return fallback
+
+    def _match(self, node: _Node, segments: List[str], position: int,
+               wildcards: Tuple[str, ...]) -> Optional[_Result]:
+        if position == len(segments):
+            if node.handler is not None:
+                return (node.handler, wildcards, None)
+        else:
+            segment = segments[position]
+            child = node.children.get(segment)
+            if child is not None:
+                result = self._match(child, segments, position + 1, wildcards)
+                if result is not None:
+                    return result
+            child = node.children.get("+")
+            if child is not None:
+                result = self._match(child, segments, position + 1, wildcards + (segment,))
+                if result is not None:
+                    return result
+        if node.multi_level_handler is not None:
+            return (node.multi_level_handler, wildcards, position)
+        return None
+
+    def dispatch(self, topic: str, *args: Any) -> bool:
+        """ ruft den Handler mit den übergebenen Argumenten und den von "+" erfassten Segmenten auf und gibt zurück,
+        ob ein Handler gefunden wurde.
+        """
+        result = self._lookup(topic)
+        if result is None:
+            return False
+        result[0][0](*args, *result[1])
+        return True
@@ -0,0 +1,101 @@
+from typing import Optional, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from helpermodules.topic_router import TopicRouter
+
+
+@pytest.fixture
+def router() -> TopicRouter:
+    router = TopicRouter()
+    for pattern in ["openWB/vehicle/template/charge_template/+/#",
+                    "openWB/vehicle/+/#",
+                    "openWB/chargepoint/+/get/power",
+                    "openWB/chargepoint/+/#",
+                    "openWB/system/device/+/component/+/config",
+                    "openWB/command/command_completed"]:
+        router.add(pattern, pattern)
+    return router
+
+
+@pytest.mark.parametrize("topic, expected_pattern, expected_wildcards", [
+    pytest.param("openWB/vehicle/template/charge_template/1/chargemode/scheduled_charging/plans/2",
+                 "openWB/vehicle/template/charge_template/+/#", ("1",), id="specific pattern first"),
+    pytest.param("openWB/vehicle/template/ev_template/1", "openWB/vehicle/+/#", ("template",),
+                 id="backtrack to wildcard"),
+    pytest.param("openWB/vehicle/3", "openWB/vehicle/+/#", ("3",), id="multi level matches zero levels"),
+    pytest.param("openWB/chargepoint/3/get/power", "openWB/chargepoint/+/get/power", ("3",), id="exact before #"),
+    pytest.param("openWB/chargepoint/3/get/currents", "openWB/chargepoint/+/#", ("3",), id="fallback to #"),
+    pytest.param("openWB/system/device/1/component/12/config", "openWB/system/device/+/component/+/config",
+                 ("1", "12"), id="two indices"),
+    pytest.param("openWB/command/command_completed", "openWB/command/command_completed", (), id="exact"),
+    pytest.param("openWB/command/todo", None, None, id="no match"),
+    pytest.param("openWB/vehicle", None, None, id="single level wildcard requires segment"),
+])
+def test_match(router: TopicRouter, topic: str, expected_pattern: Optional[str],
+               expected_wildcards: Optional[Tuple[str, ...]]):
+    # execution
+    match = router.match(topic)
+
+    # evaluation
+    if expected_pattern is None:
+        assert match is None
+    else:
+        assert match.handler == expected_pattern
+        assert match.pattern == expected_pattern
+        assert match.wildcards == expected_wildcards
+
+
+def test_match_indices_and_remainder(router: TopicRouter):
+    # execution
+    match = router.match("openWB/vehicle/template/charge_template/1/time_charging/plans/4")
+
+    # evaluation
+    assert match.indices == ("1",)
+    assert match.remainder == ("time_charging", "plans", "4")
+    assert router.match("openWB/chargepoint/3/get/currents").remainder == ("get", "currents")
+    assert router.match("openWB/vehicle/3").remainder == ()
+
+
+def test_dispatch():
+    # setup
+    handler = Mock()
+    router = TopicRouter()
+    router.add("openWB/counter/+/get/#", handler)
+
+    # execution
+    found = router.dispatch("openWB/counter/0/get/power", "client", "msg")
+    not_found = router.dispatch("openWB/pv/0/get/power", "client", "msg")
+
+    # evaluation
+    assert found is True
+    assert not_found is False
+    handler.assert_called_once_with("client", "msg", "0")
+
+
+@pytest.mark.parametrize("topic, handler_name, expected_index", [
+    pytest.param("openWB/chargepoint/5/get/power", "process_chargepoint_topic", "5", id="Ladepunkt"),
+    pytest.param("openWB/chargepoint/get/power", "process_chargepoint_topic", "get", id="alle Ladepunkte"),
+    pytest.param("openWB/vehicle/template/charge_template/2/time_charging/plans/1",
+                 "process_vehicle_charge_template_topic", "2", id="Ladeprofil"),
+    pytest.param("openWB/counter/7/get/power", "process_counter_topic", "7", id="Zähler"),
+])
+def test_subdata_router_passes_index(topic: str, handler_name: str, expected_index: str):
+    # setup
+    from helpermodules.subdata import SubData
+    subdata = Mock()
+    router = SubData._build_router(subdata)
+
+    # execution
+    router.dispatch(topic, "client", "msg")
+
+    # evaluation
+    handler = getattr(subdata, handler_name)
+    handler.assert_called_once()
+    assert handler.call_args.args[-2:] == ("msg", expected_index)
+
+
+def test_add_invalid_pattern():
+    with pytest.raises(ValueError):
+        TopicRouter().add("openWB/#/get", Mock())
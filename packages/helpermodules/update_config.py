@@ -31,6 +31,7 @@ from helpermodules.messaging import MessageType, pub_system_message
 from helpermodules.pub import Pub
 from helpermodules.utils.json_file_handler import write_and_check
 from helpermodules.utils.run_command import run_command
+from helpermodules.utils.topic_pattern_set import TopicPatternSet
 from helpermodules.utils.topic_parser import decode_payload, get_index, get_second_index
 from control import counter_all
 from control.bat_all import BatConsiderationMode
@@ -462,6 +463,8 @@ class UpdateConfig:
         "^openWB/system/boot_done$",
         "^openWB/system/configurable/backup_clouds$",
         "^openWB/system/backup_cloud/backup_before_update$",
+        "^openWB/system/backup_cloud/compression_level$",
+        "^openWB/system/backup_cloud/incremental$",
         "^openWB/system/configurable/chargepoints$",
         "^openWB/system/configurable/chargepoints_internal$",
         "^openWB/system/configurable/devices_components$",
@@ -491,7 +494,9 @@ class UpdateConfig:
         "^openWB/system/io/[0-9]+/config$",
         "^openWB/system/ip_address$",
         "^openWB/system/lastlivevaluesJson$",
+        "^openWB/system/modbus/connection_statistics$",
         "^openWB/system/mqtt/bridge/[0-9]+$",
+        "^openWB/system/mqtt/publisher_statistics$",
         "^openWB/system/mqtt/valid_partner_ids$",
         "^openWB/system/release_train$",
         "^openWB/system/secondary_auto_update$",
@@ -577,6 +582,8 @@ class UpdateConfig:
         ("openWB/optional/rfid/active", False),
         ("openWB/system/backup_cloud/config", NO_MODULE),
         ("openWB/system/backup_cloud/backup_before_update", True),
+        ("openWB/system/backup_cloud/compression_level", 6),
+        ("openWB/system/backup_cloud/incremental", False),
         ("openWB/system/installAssistantDone", False),
         ("openWB/system/dataprotection_acknowledged", False),
         ("openWB/system/datastore_version", DATASTORE_VERSION),
@@ -610,7 +617,7 @@ class UpdateConfig:
 
     def update(self):
         log.debug("Broker-Konfiguration aktualisieren")
-        BrokerClient("update-config", self.on_connect, self.on_message).start_finite_loop()
+        BrokerClient("update-config", self.on_connect, self.on_message).start_snapshot_loop()
         try:
             # erst breaking changes auflösen, sonst sind alte Topics schon gelöscht
             self.__solve_breaking_changes()
@@ -648,11 +655,9 @@ class UpdateConfig:
         """
         # deleting list items while in iteration throws runtime error, so we collect all topics to delete
         removed_topics = []
+        valid_topics = TopicPatternSet(self.valid_topic)
         for topic in self.all_received_topics.keys():
-            for valid_topic in self.valid_topic:
-                if re.search(valid_topic, topic) is not None:
-                    break
-            else:
+            if valid_topics.search(topic) is False:
                 log.debug(f"Ungültiges Topic zum Startzeitpunkt: {topic}")
                 removed_topics += [topic]
         # delete topics to allow setting new defaults afterwards
@@ -664,9 +669,10 @@ class UpdateConfig:
         """
         # deleting list items while in iteration throws runtime error, so we collect all topics to delete
         topics_to_delete = []
+        invalid_topics = [(re.compile(regex), check) for regex, check in self.invalid_topic]
         for topic, payload in self.all_received_topics.items():
-            for invalid_topic_regex, invalid_topic_check in self.invalid_topic:
-                if (re.search(invalid_topic_regex, topic) is not None and
+            for invalid_topic_regex, invalid_topic_check in invalid_topics:
+                if (invalid_topic_regex.search(topic) is not None and
                         invalid_topic_check(topic, payload, self.all_received_topics)):
                     log.debug(f"Ungültiges Topic '{topic}': {str(payload)}")
                     topics_to_delete.append(topic)
@@ -1,2 +1,3 @@
 from helpermodules.utils._exit_after import exit_after
 from helpermodules.utils._thread_handler import joined_thread_handler, thread_handler
+from helpermodules.utils._worker_pool import Job, WorkerPool
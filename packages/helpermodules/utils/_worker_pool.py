@@ -0,0 +1,139 @@
+""" Langlebige Worker-Threads für die zyklische Abfrage der Module.
+
+Statt in jedem Zyklus je Gerät einen neuen Thread zu starten, wird je Name (zB. "device3") ein Worker-Thread
+vorgehalten, der die Aufträge nacheinander abarbeitet. Worker, die länger keinen Auftrag erhalten haben, beenden sich
+selbst. Laufende Aufträge können nicht abgebrochen werden. Ist der Worker nach Ablauf der Frist noch mit dem
+Auftrag beschäftigt, wird er wie beim Thread-Handler als nicht fertig gemeldet und erhält keinen neuen Auftrag, bis
+der laufende beendet ist. Die Worker-Threads heißen "worker <Name>", damit der Thread-Handler sie nicht mit
+gleichnamigen Threads verwechselt. Läuft noch ein Thread mit dem Namen des Auftrags, zB. aus der Abfrage über einzelne
+Threads, wird der Auftrag ebenfalls nicht gestartet.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import queue
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from helpermodules.utils._thread_handler import is_thread_alive
+
+log = logging.getLogger(__name__)
+
+WORKER_IDLE_TIMEOUT = 600
+LATENCY_SAMPLES = 100
+
+
+@dataclass
+class Job:
+    name: str
+    target: Callable
+    args: Tuple[Any, ...] = ()
+    done: Event = field(default_factory=Event)
+
+
+@dataclass
+class LatencyStatistics:
+    count: int
+    # Laufzeit in ms
+    median: float
+    p90: float
+    max: float
+
+    def __str__(self) -> str:
+        return f"{self.count} Abfragen, Median {self.median:.0f}ms, 90% {self.p90:.0f}ms, max {self.max:.0f}ms"
+
+
+class _Worker:
+    def __init__(self, name: str, pool: "WorkerPool") -> None:
+        self.name = name
+        self.pool = pool
+        self.queue: "queue.Queue[Job]" = queue.Queue()
+        self.busy = False
+        self.stopped = False
+        self.durations: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.thread = Thread(target=self._run, name=f"worker {name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, job: Job) -> None:
+        self.busy = True
+        self.queue.put(job)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                job = self.queue.get(timeout=WORKER_IDLE_TIMEOUT)
+            except queue.Empty:
+                if self.pool._remove_idle_worker(self):
+                    return
+                continue
+            try:
+                start = time.monotonic()
+                job.target(*job.args)
+                self.durations.append(time.monotonic() - start)
+            except Exception:
+                log.exception(f"Fehler im Worker {self.name}")
+            finally:
+                self.busy = False
+                job.done.set()
+
+
+class WorkerPool:
+    def __init__(self) -> None:
+        self._workers: Dict[str, _Worker] = {}
+        self._lock = Lock()
+
+    def _remove_idle_worker(self, worker: _Worker) -> bool:
+        with self._lock:
+            if worker.busy or worker.queue.empty() is False:
+                return False
+            worker.stopped = True
+            if self._workers.get(worker.name) is worker:
+                self._workers.pop(worker.name)
+            return True
+
+    def run(self, jobs: List[Job], timeout: Optional[float]) -> List[str]:
+        """ führt die Aufträge aus und wartet gemeinsam höchstens timeout Sekunden auf alle Aufträge. Gibt wie
+        joined_thread_handler die Namen der nicht abgearbeiteten Aufträge zurück.
+        """
+        not_finished = []
+        submitted: List[Job] = []
+        for job in jobs:
+            with self._lock:
+                worker = self._workers.get(job.name)
+                if worker is None or worker.stopped:
+                    worker = _Worker(job.name, self)
+                    self._workers[job.name] = worker
+                if worker.busy or is_thread_alive(job.name):
+                    log.error(f"{job.name} ist bereits aktiv und wird nicht erneut gestartet.")
+                    not_finished.append(job.name)
+                    continue
+                worker.submit(job)
+            submitted.append(job)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in submitted:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if job.done.wait(remaining) is False:
+                log.error(f"{job.name} konnte nicht innerhalb des Timeouts abgearbeitet werden.")
+                not_finished.append(job.name)
+        return not_finished
+
+    def is_busy(self, name: str) -> bool:
+        """ gibt zurück, ob der Worker zum Auftragsnamen noch einen Auftrag abarbeitet. """
+        with self._lock:
+            worker = self._workers.get(name)
+            return worker is not None and worker.busy
+
+    def get_statistics(self) -> Dict[str, LatencyStatistics]:
+        with self._lock:
+            workers = list(self._workers.values())
+        statistics = {}
+        for worker in workers:
+            durations = sorted(worker.durations)
+            if durations:
+                statistics[worker.name] = LatencyStatistics(
+                    count=len(durations),
+                    median=durations[len(durations) // 2] * 1000,
+                    p90=durations[min(int(len(durations) * 0.9), len(durations) - 1)] * 1000,
+                    max=durations[-1] * 1000)
+        return statistics
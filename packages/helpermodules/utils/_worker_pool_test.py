@@ -0,0 +1,104 @@
+from threading import Event, Thread, current_thread
+from unittest.mock import Mock
+
+from helpermodules.utils._thread_handler import is_thread_alive, joined_thread_handler
+from helpermodules.utils._worker_pool import Job, WorkerPool
+
+
+def test_run_reuses_worker():
+    # setup
+    pool = WorkerPool()
+    threads = []
+
+    def target(value):
+        threads.append((current_thread(), value))
+
+    # execution
+    for value in range(3):
+        not_finished = pool.run([Job("device1", target, (value,))], timeout=1)
+
+    # evaluation
+    assert not_finished == []
+    assert [value for _, value in threads] == [0, 1, 2]
+    assert len({thread.ident for thread, _ in threads}) == 1
+    assert pool.get_statistics()["device1"].count == 3
+
+
+def test_run_timeout():
+    # setup
+    pool = WorkerPool()
+    release = Event()
+    fast = Mock()
+
+    # execution
+    first = pool.run([Job("device1", release.wait), Job("device2", fast)], timeout=0.1)
+    second = pool.run([Job("device1", fast), Job("device2", fast)], timeout=1)
+    release.set()
+
+    # evaluation
+    assert first == ["device1"]
+    # Der hängende Worker erhält keinen neuen Auftrag.
+    assert second == ["device1"]
+    assert fast.call_count == 2
+
+
+def test_run_exception():
+    # setup
+    pool = WorkerPool()
+    after_exception = Mock()
+
+    # execution
+    pool.run([Job("device1", Mock(side_effect=Exception("test")))], timeout=1)
+    not_finished = pool.run([Job("device1", after_exception)], timeout=1)
+
+    # evaluation
+    assert not_finished == []
+    after_exception.assert_called_once_with()
+
+
+def test_worker_thread_name_differs_from_job():
+    # setup
+    pool = WorkerPool()
+    fallback = Mock()
+
+    # execution
+    pool.run([Job("device1", Mock())], timeout=1)
+    not_finished = joined_thread_handler([Thread(target=fallback, name="device1")], timeout=1)
+
+    # evaluation
+    # ein untätiger Worker blockiert die Abfrage über einzelne Threads nicht
+    assert is_thread_alive("worker device1") is True
+    assert not_finished == []
+    fallback.assert_called_once_with()
+
+
+def test_run_skips_job_with_running_thread():
+    # setup
+    pool = WorkerPool()
+    release = Event()
+    job = Mock()
+    thread = Thread(target=release.wait, name="device1")
+    thread.start()
+
+    # execution
+    not_finished = pool.run([Job("device1", job)], timeout=1)
+    release.set()
+    thread.join()
+
+    # evaluation
+    assert not_finished == ["device1"]
+    job.assert_not_called()
+
+
+def test_is_busy():
+    # setup
+    pool = WorkerPool()
+    release = Event()
+
+    # execution
+    pool.run([Job("device1", release.wait), Job("device2", Mock())], timeout=0.1)
+    busy = (pool.is_busy("device1"), pool.is_busy("device2"), pool.is_busy("device3"))
+    release.set()
+
+    # evaluation
+    assert busy == (True, False, False)
@@ -1,7 +1,11 @@
+import glob
+import hashlib
 import json
 import logging
 import os
 import shutil
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 log = logging.getLogger(__name__)
 
@@ -47,3 +51,245 @@ def write_and_check(file_path, content):
     finally:
         if os.path.exists(backup_path):
             os.remove(backup_path)
+
+
+class _WrittenFile(NamedTuple):
+    # Größe, Änderungszeitpunkt und Inode nach dem letzten Schreiben
+    stamp: Tuple[int, int, int]
+    # Text vor der Liste der Einträge
+    head: str
+    # zuletzt geschriebener Inhalt, wird von read_content zurückgegeben
+    content: Union[Dict, List]
+    count: int
+    # Position der schließenden Klammer der Liste der Einträge
+    offset: int
+    # SHA256 des letzten geschriebenen Eintrags, None wenn die Liste leer ist
+    tail_digest: Optional[str]
+
+
+# Endung der Datei, in der vor dem Anhängen das bisherige Dateiende gesichert wird
+JOURNAL_SUFFIX = ".journal"
+
+
+_written_files: Dict[str, _WrittenFile] = {}
+_lock = Lock()
+
+
+def write_atomic(file_path: str, content: Union[Dict, List], key: str = "entries") -> None:
+    """
+    Schreibt den Inhalt in eine temporäre Datei, die erst nach dem Schreiben auf den Datenträger die bisherige Datei
+    ersetzt. Bei einem Fehler oder Stromausfall bleibt die bisherige Datei vollständig erhalten. Ist der Inhalt eine
+    Liste oder enthält er unter key eine Liste, kann mit append_entry anschließend ein Eintrag angehängt werden.
+    """
+    with _lock:
+        try:
+            _write_atomic(file_path, content, key)
+            # die vollständig geschriebene Datei ersetzt auch ein unterbrochenes Anhängen
+            _discard_journal(file_path)
+        except Exception:
+            log.exception(f"Fehler beim Schreiben der Datei {file_path}.")
+
+
+def read_content(file_path: str) -> Union[Dict, List]:
+    """
+    Gibt den zuletzt mit write_atomic/append_entry geschriebenen Inhalt zurück, wenn die Datei seitdem nicht anderweitig
+    geändert wurde, sonst den eingelesenen Inhalt. Der Inhalt wird nicht kopiert, er ist dafür gedacht, einen Eintrag
+    anzuhängen und mit append_entry zu schreiben. Existiert die Datei nicht oder ist sie ungültig, werden
+    FileNotFoundError bzw. json.JSONDecodeError ausgelöst.
+    """
+    with _lock:
+        recover_interrupted_append(file_path)
+        written = _written_files.get(file_path)
+        if written is not None and written.stamp == _stamp(file_path):
+            return written.content
+        with open(file_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+
+def is_written(file_path: str, content: Union[Dict, List], key: str = "entries") -> bool:
+    """ gibt zurück, ob content zuletzt mit write_atomic/append_entry in die Datei geschrieben und die Datei seitdem
+    nicht anderweitig geändert wurde. """
+    with _lock:
+        written = _written_files.get(file_path)
+        if written is None or written.content is not content:
+            return False
+        entries = content if isinstance(content, list) else content[key]
+        try:
+            return written.count == len(entries) and written.stamp == _stamp(file_path)
+        except FileNotFoundError:
+            return False
+
+
+def recover_interrupted_append(file_path: str) -> bool:
+    """
+    Stellt eine Datei, deren Anhängen mit append_entry unterbrochen wurde, mit dem gesicherten Dateiende im Stand vor
+    dem Anhängen wieder her. Gibt zurück, ob die Datei wiederhergestellt wurde.
+    """
+    journal_path = file_path + JOURNAL_SUFFIX
+    try:
+        with open(journal_path, "r", encoding="utf-8") as file:
+            journal = json.load(file)
+    except FileNotFoundError:
+        return False
+    except ValueError:
+        # Das Journal wurde nicht vollständig geschrieben, die Datei ist dann noch unverändert.
+        os.remove(journal_path)
+        return False
+    with open(file_path, "r+b") as file:
+        file.seek(journal["offset"])
+        file.write(journal["tail"].encode("utf-8"))
+        file.truncate()
+        file.flush()
+        os.fsync(file.fileno())
+    os.remove(journal_path)
+    _written_files.pop(file_path, None)
+    log.warning(f"Unterbrochenes Anhängen an {file_path} rückgängig gemacht.")
+    return True
+
+
+def recover_interrupted_appends(directories: List[str]) -> None:
+    """ stellt beim Start alle Dateien in den Verzeichnissen wieder her, deren Anhängen unterbrochen wurde. """
+    with _lock:
+        for directory in directories:
+            for journal_path in glob.glob(os.path.join(directory, "*" + JOURNAL_SUFFIX)):
+                try:
+                    recover_interrupted_append(journal_path[:-len(JOURNAL_SUFFIX)])
+                except Exception:
+                    log.exception(f"Fehler beim Wiederherstellen von {journal_path}.")
+
+
+def append_entry(file_path: str, content: Union[Dict, List], key: str = "entries") -> None:
+    """
+    Schreibt content, der gegenüber dem letzten Schreiben mit write_atomic/append_entry nur einen weiteren Eintrag am
+    Ende der Liste (content bzw. content[key]) und ggf. geänderte Werte nach der Liste enthält. Statt die Datei neu zu
+    schreiben, werden nur der neue Eintrag und der Rest der Datei ab dem Ende der Liste geschrieben. Wurde die Datei
+    seitdem anderweitig geändert, stimmt die Anzahl der Einträge nicht oder unterscheidet sich der zuletzt geschriebene
+    Eintrag, wird sie mit write_atomic vollständig geschrieben. Frühere Einträge werden nicht verglichen, der Inhalt
+    sollte daher mit read_content gelesen werden. Vor dem Anhängen wird das bisherige Dateiende in <Datei>.journal
+    gesichert. Wird das Anhängen unterbrochen, zB. durch einen Stromausfall, stellt recover_interrupted_append die Datei
+    wieder her.
+    """
+    with _lock:
+        try:
+            recover_interrupted_append(file_path)
+            if _append_entry(file_path, content, key) is False:
+                _write_atomic(file_path, content, key)
+        except Exception:
+            log.exception(f"Fehler beim Anhängen an die Datei {file_path}. Datei wird vollständig geschrieben.")
+            try:
+                _write_atomic(file_path, content, key)
+                _discard_journal(file_path)
+            except Exception:
+                log.exception(f"Fehler beim Schreiben der Datei {file_path}.")
+
+
+def _split(content: Union[Dict, List], key: str) -> Optional[Tuple[str, List, str]]:
+    """ teilt den Text von json.dumps(content) in den Text vor der Liste, die Liste und den Text nach der Liste. """
+    if isinstance(content, list):
+        return "", content, ""
+    if isinstance(content, dict) and isinstance(content.get(key), list) and all(isinstance(k, str) for k in content):
+        items = [f"{json.dumps(k)}: " if k == key else f"{json.dumps(k)}: {json.dumps(v)}" for k, v in content.items()]
+        position = list(content).index(key)
+        head = "{" + ", ".join(items[:position + 1])
+        rest = "".join(", " + item for item in items[position + 1:]) + "}"
+        return head, content[key], rest
+    return None
+
+
+def _stamp(file_path: str) -> Tuple[int, int, int]:
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def _write_atomic(file_path: str, content: Union[Dict, List], key: str) -> None:
+    parts = _split(content, key)
+    if parts is None:
+        text = json.dumps(content)
+    else:
+        head, entries, rest = parts
+        serialized_entries = json.dumps(entries)
+        text = head + serialized_entries + rest
+    temp_path = file_path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _sync_directory(file_path)
+    if parts is None:
+        _written_files.pop(file_path, None)
+    else:
+        _written_files[file_path] = _WrittenFile(_stamp(file_path), head, content, len(entries),
+                                                 len(head) + len(serialized_entries) - 1,
+                                                 _digest(json.dumps(entries[-1])) if entries else None)
+
+
+def _append_entry(file_path: str, content: Union[Dict, List], key: str) -> bool:
+    written = _written_files.get(file_path)
+    parts = _split(content, key)
+    if written is None or parts is None:
+        return False
+    head, entries, rest = parts
+    try:
+        stamp = _stamp(file_path)
+    except FileNotFoundError:
+        return False
+    if stamp != written.stamp or head != written.head or len(entries) != written.count + 1:
+        return False
+    if written.count > 0 and _digest(json.dumps(entries[-2])) != written.tail_digest:
+        # zuletzt geschriebener Eintrag wurde verändert
+        return False
+    serialized_entry = json.dumps(entries[-1])
+    entry = (", " if written.count > 0 else "") + serialized_entry
+    # ensure_ascii (Standard von json.dumps): Anzahl Zeichen entspricht der Anzahl Bytes
+    with open(file_path, "r+b") as file:
+        file.seek(written.offset)
+        tail = file.read().decode("utf-8")
+        _write_journal(file_path, written.offset, tail)
+        file.seek(written.offset)
+        file.write((entry + "]" + rest).encode("utf-8"))
+        file.truncate()
+        file.flush()
+        os.fsync(file.fileno())
+    _discard_journal(file_path)
+    _written_files[file_path] = _WrittenFile(_stamp(file_path), head, content, len(entries),
+                                             written.offset + len(entry), _digest(serialized_entry))
+    return True
+
+
+def _digest(serialized_entries: str) -> str:
+    return hashlib.sha256(serialized_entries.encode("utf-8")).hexdigest()
+
+
+def _write_journal(file_path: str, offset: int, tail: str) -> None:
+    with open(file_path + JOURNAL_SUFFIX, "w", encoding="utf-8") as file:
+        json.dump({"offset": offset, "tail": tail}, file)
+        file.flush()
+        os.fsync(file.fileno())
+    _sync_directory(file_path)
+
+
+def _discard_journal(file_path: str) -> None:
+    try:
+        os.remove(file_path + JOURNAL_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def _sync_directory(file_path: str) -> None:
+    # Die Umbenennung ist erst mit dem Schreiben des Verzeichnisses dauerhaft.
+    try:
+        directory = os.open(os.path.dirname(os.path.abspath(file_path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory)
+    except OSError:
+        pass
+    finally:
+        os.close(directory)
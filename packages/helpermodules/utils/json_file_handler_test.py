@@ -4,7 +4,7 @@ import tempfile
 from unittest.mock import Mock
 
 from helpermodules.utils import json_file_handler
-from helpermodules.utils.json_file_handler import write_and_check
+from helpermodules.utils.json_file_handler import append_entry, is_written, read_content, write_and_check, write_atomic
 
 import pytest
 
@@ -32,3 +32,166 @@ def test_backup_restore_and_corrupt_data_handling(load_return, expected_content,
         os.remove(file_path)
         if os.path.exists(file_path + ".bak"):
             os.remove(file_path + ".bak")
+
+
+@pytest.mark.parametrize("content", [
+    pytest.param([], id="Liste"),
+    pytest.param({"entries": [], "names": {}}, id="Einträge vor weiteren Schlüsseln"),
+    pytest.param({"version": 1, "entries": [{"a": 1}], "totals": {"ü": 2}}, id="Einträge zwischen Schlüsseln"),
+])
+def test_append_entry(content, tmp_path, monkeypatch):
+    # setup
+    file_path = str(tmp_path / "log.json")
+    write_atomic(file_path, content)
+    mock_write_atomic = Mock()
+    monkeypatch.setattr(json_file_handler, "_write_atomic", mock_write_atomic)
+    entries = content if isinstance(content, list) else content["entries"]
+
+    for i in range(3):
+        # execution
+        entries.append({"timestamp": i, "names": ["ä", None]})
+        if isinstance(content, dict):
+            content["names" if "names" in content else "totals"] = {"entry": i}
+        append_entry(file_path, content)
+
+        # evaluation
+        with open(file_path, "r", encoding="utf-8") as file:
+            assert file.read() == json.dumps(content)
+    assert mock_write_atomic.call_count == 0
+    assert os.listdir(tmp_path) == ["log.json"]
+
+
+def test_append_entry_after_external_change(tmp_path):
+    # setup
+    file_path = str(tmp_path / "log.json")
+    write_atomic(file_path, [{"a": 1}])
+    with open(file_path, "w") as file:
+        json.dump([{"a": 1}, {"b": 2}], file)
+
+    # execution
+    append_entry(file_path, [{"a": 1}, {"b": 2}, {"c": 3}])
+
+    # evaluation
+    with open(file_path, "r") as file:
+        assert json.load(file) == [{"a": 1}, {"b": 2}, {"c": 3}]
+
+
+def test_append_entry_without_previous_write(tmp_path):
+    # setup
+    file_path = str(tmp_path / "log.json")
+
+    # execution
+    append_entry(file_path, {"entries": [{"a": 1}], "names": {}})
+    append_entry(file_path, {"entries": [{"a": 1}, {"b": 2}], "names": {}})
+
+    # evaluation
+    with open(file_path, "r") as file:
+        assert json.load(file) == {"entries": [{"a": 1}, {"b": 2}], "names": {}}
+
+
+def test_append_entry_with_changed_previous_entry(tmp_path):
+    # setup
+    file_path = str(tmp_path / "log.json")
+    write_atomic(file_path, {"entries": [{"a": 1}], "names": {}})
+
+    # execution
+    append_entry(file_path, {"entries": [{"a": 2}, {"b": 2}], "names": {}})
+
+    # evaluation
+    with open(file_path, "r") as file:
+        assert json.load(file) == {"entries": [{"a": 2}, {"b": 2}], "names": {}}
+
+
+def test_read_content(tmp_path, monkeypatch):
+    # setup
+    file_path = str(tmp_path / "log.json")
+    content = {"entries": [{"a": 1}], "names": {}}
+    write_atomic(file_path, content)
+    content["entries"].append({"b": 2})
+    append_entry(file_path, content)
+    mock_json_load = Mock(side_effect=json.load)
+    monkeypatch.setattr(json_file_handler.json, "load", mock_json_load)
+
+    # execution
+    written_content = read_content(file_path)
+    with open(file_path, "w") as file:
+        json.dump({"entries": [], "names": {}}, file)
+    changed_content = read_content(file_path)
+
+    # evaluation
+    assert written_content is content
+    assert is_written(file_path, content) is False
+    assert changed_content == {"entries": [], "names": {}}
+    assert mock_json_load.call_count == 1
+
+
+def test_is_written(tmp_path):
+    # setup
+    file_path = str(tmp_path / "log.json")
+    content = [{"a": 1}]
+    write_atomic(file_path, content)
+
+    # execution and evaluation
+    assert is_written(file_path, content) is True
+    assert is_written(file_path, [{"a": 1}]) is False
+    content.append({"b": 2})
+    assert is_written(file_path, content) is False
+    append_entry(file_path, content)
+    assert is_written(file_path, content) is True
+
+
+def test_append_entry_serializes_only_new_entry(tmp_path, monkeypatch):
+    # setup
+    file_path = str(tmp_path / "log.json")
+    content = [{"a": i} for i in range(100)]
+    write_atomic(file_path, content)
+    content.append({"b": 1})
+    mock_dumps = Mock(side_effect=json.dumps)
+    monkeypatch.setattr(json_file_handler.json, "dumps", mock_dumps)
+
+    # execution
+    append_entry(file_path, content)
+
+    # evaluation
+    assert [call.args[0] for call in mock_dumps.call_args_list] == [{"a": 99}, {"b": 1}]
+
+
+def interrupt_append(file_path: str) -> None:
+    # Zustand nach einem Stromausfall während des Schreibens des neuen Dateiendes
+    written = json_file_handler._written_files[file_path]
+    with open(file_path, "r+b") as file:
+        file.seek(written.offset)
+        json_file_handler._write_journal(file_path, written.offset, file.read().decode("utf-8"))
+        file.seek(written.offset)
+        file.write(b', {"b": ')
+        file.truncate()
+
+
+def test_recover_interrupted_appends(tmp_path):
+    # setup
+    file_path = str(tmp_path / "log.json")
+    write_atomic(file_path, {"entries": [{"a": 1}], "names": {"x": "ä"}})
+    interrupt_append(file_path)
+
+    # execution
+    json_file_handler.recover_interrupted_appends([str(tmp_path)])
+
+    # evaluation
+    with open(file_path, "r") as file:
+        assert json.load(file) == {"entries": [{"a": 1}], "names": {"x": "ä"}}
+    assert os.listdir(tmp_path) == ["log.json"]
+
+
+def test_append_entry_after_interrupted_append(tmp_path):
+    # setup
+    file_path = str(tmp_path / "log.json")
+    write_atomic(file_path, [{"a": 1}])
+    interrupt_append(file_path)
+
+    # execution
+    append_entry(file_path, [{"a": 1}, {"b": 2}])
+
+    # evaluation
+    with open(file_path, "r") as file:
+        assert json.load(file) == [{"a": 1}, {"b": 2}]
+    assert os.listdir(tmp_path) == ["log.json"]
@@ -1,38 +1,93 @@
+from functools import lru_cache
 import json
 import re
-from typing import Any
+from typing import Any, NamedTuple, Optional, Tuple
+
+# Zahl vor einem / oder am Ende eines Strings. Wird keine gefunden, ist der Index leer und steht am Ende des Topics.
+# Entspricht '(?!/)([0-9]*)(?=/|$)', ist aber deutlich schneller, da nicht an jeder Stelle ein leerer Treffer
+# geprüft wird.
+_INDEX = re.compile('[0-9]+(?=/|$)')
+_SECOND_INDEX = re.compile('^.+/([0-9]*)/.+/([0-9]+)/*.*$')
+# Ebene des Topics, die nur aus Ziffern besteht
+_LEVEL_INDEX = re.compile('(?<![^/])[0-9]+(?![^/])')
+# Anzahl zwischengespeicherter Topics, reicht für die retained Topics einer größeren Installation
+PARSE_CACHE_SIZE = 8192
+
+
+class ParsedTopic(NamedTuple):
+    topic: str
+    index: str
+    index_position: int
+
+    @property
+    def second_index(self) -> Optional[str]:
+        """ zweiter Index, wird erst bei Bedarf bestimmt """
+        return _parse_second_index(self.topic)[0]
+
+    @property
+    def second_index_position(self) -> Optional[int]:
+        return _parse_second_index(self.topic)[1]
+
+    @property
+    def prefix(self) -> str:
+        """ Topic bis zum Index, zB. "openWB/chargepoint/" """
+        return self.topic[:self.index_position - len(self.index)]
+
+    @property
+    def suffix(self) -> str:
+        """ Topic nach dem Index, zB. "/get/power" """
+        return self.topic[self.index_position:]
+
+    @property
+    def indices(self) -> Tuple[str, ...]:
+        """ alle Ebenen des Topics, die nur aus Ziffern bestehen """
+        return tuple(_LEVEL_INDEX.findall(self.topic))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_topic(topic: str) -> ParsedTopic:
+    """zerlegt das Topic einmalig, wiederholte Aufrufe mit dem gleichen Topic werden aus dem Cache beantwortet.
+    """
+    index = _INDEX.search(topic)
+    if index is None:
+        return ParsedTopic(topic, "", len(topic))
+    return ParsedTopic(topic, index.group(), index.end())
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_second_index(topic: str) -> Tuple[Optional[str], Optional[int]]:
+    # Der gierige Ausdruck ist deutlich langsamer als die Suche nach dem ersten Index und wird nur für Topics
+    # ausgewertet, deren zweiter Index benötigt wird.
+    second_index = _SECOND_INDEX.search(topic)
+    if second_index is None:
+        return None, None
+    return second_index.group(2), second_index.end(2)
 
 
 def get_index(topic: str) -> str:
     """extrahiert den Index aus einem Topic (Zahl zwischen zwei // oder am Ende eines Strings)
     """
-    regex = re.search('(?!/)([0-9]*)(?=/|$)', topic)
-    if regex is None:
-        raise ValueError(f"Couldn't find index in {topic}")
-    return regex.group()
+    return parse_topic(topic).index
 
 
 def get_index_position(topic: str) -> int:
-    regex = re.search('(?!/)([0-9]*)(?=/|$)', topic)
-    if regex is None:
-        raise ValueError(f"Couldn't find index in {topic}")
-    return regex.end()
+    return parse_topic(topic).index_position
 
 
 def get_second_index(topic: str) -> str:
     """extrahiert den zweiten Index aus einem Topic (Zahl zwischen zwei //)
     """
-    regex = re.search('^.+/([0-9]*)/.+/([0-9]+)/*.*$', topic)
-    if regex is None:
+    second_index = parse_topic(topic).second_index
+    if second_index is None:
         raise ValueError(f"Couldn't find index in {topic}")
-    return regex.group(2)
+    return second_index
 
 
 def get_second_index_position(topic: str) -> int:
-    regex = re.search('^.+/([0-9]*)/.+/([0-9]+)/*.*$', topic)
-    if regex is None:
+    second_index_position = parse_topic(topic).second_index_position
+    if second_index_position is None:
         raise ValueError(f"Couldn't find index in {topic}")
-    return regex.end(2)
+    return second_index_position
 
 
 def decode_payload(payload) -> Any:
@@ -1,5 +1,10 @@
+import re
+from unittest.mock import Mock
+
 import pytest
-from helpermodules.utils.topic_parser import get_index, get_index_position, get_second_index, get_second_index_position
+from helpermodules.utils import topic_parser
+from helpermodules.utils.topic_parser import (get_index, get_index_position, get_second_index,
+                                              get_second_index_position, parse_topic)
 
 
 @pytest.mark.parametrize(
@@ -92,3 +97,58 @@ def test_get_second_index_position_fail(topic):
     # setup & execution & evaluation
     with pytest.raises(Exception):
         get_second_index_position(topic)
+
+
+def test_parse_topic():
+    # setup & execution
+    parsed = parse_topic(
+        "openWB/set/vehicle/template/charge_template/10/chargemode/scheduled_charging/plans/112/active")
+
+    # evaluation
+    assert parsed.index == "10"
+    assert parsed.second_index == "112"
+    assert parsed.indices == ("10", "112")
+    assert parsed.prefix == "openWB/set/vehicle/template/charge_template/"
+    assert parsed.suffix == "/chargemode/scheduled_charging/plans/112/active"
+    assert parse_topic(parsed.topic) is parsed
+
+
+def test_parse_topic_without_second_index():
+    # setup & execution
+    parsed = parse_topic("openWB/chargepoint/3/get/power")
+
+    # evaluation
+    assert parsed.index == "3"
+    assert parsed.second_index is None
+    assert parsed.second_index_position is None
+    assert parsed.indices == ("3",)
+
+
+def test_parse_topic_second_index_on_demand(monkeypatch):
+    # setup
+    mock_second_index = Mock(wraps=topic_parser._SECOND_INDEX)
+    monkeypatch.setattr(topic_parser, "_SECOND_INDEX", mock_second_index)
+    topic = "openWB/system/device/4/component/17/config"
+
+    # execution
+    index = get_index(topic)
+    search_calls = mock_second_index.search.call_count
+    second_index = get_second_index(topic)
+
+    # evaluation
+    assert index == "4"
+    assert search_calls == 0
+    assert second_index == "17"
+
+
+@pytest.mark.parametrize("topic", ["openWB/chargepoint/get/power", "openWB/chargepoint/3", "openWB/cp3/x", "a1b2/x",
+                                   "openWB//3/", "openWB/", "12", ""])
+def test_parse_topic_index_matches_previous_pattern(topic):
+    # setup
+    previous = re.search('(?!/)([0-9]*)(?=/|$)', topic)
+
+    # execution
+    parsed = parse_topic(topic)
+
+    # evaluation
+    assert (parsed.index, parsed.index_position) == (previous.group(), previous.end())
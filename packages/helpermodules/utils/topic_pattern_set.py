@@ -0,0 +1,44 @@
+""" Prüfung eines Topics gegen eine Liste regulärer Ausdrücke in einem Schritt.
+
+Statt jedes Muster einzeln mit re.search zu prüfen, werden die Muster einmalig zu wenigen regulären Ausdrücken
+zusammengefasst. Muster, die mit einem festen Bereich beginnen ("^openWB/chargepoint/..."), werden nach diesem Bereich
+gruppiert, sodass für ein Topic nur die Muster seines Bereichs geprüft werden. Alle übrigen Muster werden für jedes
+Topic geprüft. Das Ergebnis entspricht any(re.search(pattern, topic) for pattern in patterns).
+"""
+from collections import defaultdict
+import re
+from typing import Dict, Iterable, List, Optional, Pattern
+
+# fester Bereich nach "openWB/", auf den "/" oder das Ende des Topics folgt
+_BRANCH = re.compile(r"\^openWB/([A-Za-z0-9_\-]+)(?=/|\$)")
+
+
+def _combine(patterns: List[str]) -> Optional[Pattern]:
+    if len(patterns) == 0:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+class TopicPatternSet:
+    def __init__(self, patterns: Iterable[str]) -> None:
+        branches: Dict[str, List[str]] = defaultdict(list)
+        generic = []
+        for pattern in patterns:
+            match = _BRANCH.match(pattern)
+            # Bei einer Alternative auf oberster Ebene gilt der Anker nicht für das ganze Muster.
+            if match is not None and "|" not in pattern:
+                # ohne "^", da die gruppierten Muster mit match statt search geprüft werden
+                branches[match.group(1)].append(pattern[1:])
+            else:
+                generic.append(pattern)
+        self._branches = {branch: _combine(branch_patterns) for branch, branch_patterns in branches.items()}
+        self._generic = _combine(generic)
+
+    def search(self, topic: str) -> bool:
+        """ True, wenn mindestens eines der Muster im Topic gefunden wird. """
+        segments = topic.split("/", 2)
+        if len(segments) > 1 and segments[0] == "openWB":
+            pattern = self._branches.get(segments[1])
+            if pattern is not None and pattern.match(topic) is not None:
+                return True
+        return self._generic is not None and self._generic.search(topic) is not None
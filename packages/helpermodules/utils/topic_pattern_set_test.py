@@ -0,0 +1,36 @@
+import re
+
+import pytest
+
+from helpermodules.utils.topic_pattern_set import TopicPatternSet
+
+PATTERNS = ["^openWB/chargepoint/[0-9]+/get/power$",
+            "^openWB/chargepoint/[0-9]+/config$",
+            "^openWB/vehicle/template/charge_template/[0-9]+",
+            "^openWB/system/datastore_version",
+            "^openWB/bat/get/soc$|/legacy/",
+            "^openWB/(pv|bat)/[0-9]+/get/power$",
+            "/int_display/theme$"]
+
+
+@pytest.mark.parametrize("topic", [
+    "openWB/chargepoint/3/get/power",
+    "openWB/chargepoint/3/get/power/phase",
+    "openWB/chargepoint/get/power",
+    "openWB/vehicle/template/charge_template/1/chargemode/scheduled_charging/plans/0",
+    "openWB/system/datastore_version",
+    "openWB/bat/get/soc",
+    "openWB/counter/legacy/value",
+    "openWB/pv/1/get/power",
+    "openWB/bat/1/get/power",
+    "openWB/optional/int_display/theme",
+    "openWB/unknown",
+    "openWB",
+    "other/chargepoint/3/config",
+])
+def test_search(topic: str):
+    # setup
+    pattern_set = TopicPatternSet(PATTERNS)
+
+    # execution and evaluation
+    assert pattern_set.search(topic) is any(re.search(pattern, topic) is not None for pattern in PATTERNS)
@@ -27,6 +27,7 @@ from helpermodules.measurement_logging.write_log import LogType, save_log
 from helpermodules.modbusserver import start_modbus_server
 from helpermodules.pub import Pub
 from helpermodules.utils import exit_after
+from helpermodules.utils.json_file_handler import recover_interrupted_appends
 from modules import configuration, loadvars, update_soc
 from modules.internal_chargepoint_handler.internal_chargepoint_handler import GeneralInternalChargepointHandler
 from modules.internal_chargepoint_handler.gpio import InternalGpioHandler
@@ -52,7 +53,7 @@ class HandlerAlgorithm:
                     wait_for_module_update_completed(loadvars_.event_module_update_completed,
                                                      "openWB/set/system/device/module_update_completed")
                     data.data.copy_data()
-                    with ChangedValuesContext(loadvars_.event_module_update_completed):
+                    with ChangedValuesContext(loadvars_.event_module_update_completed, dirty_tracking=True):
                         self.heartbeat = True
                         if data.data.system_data["system"].data["perform_update"]:
                             data.data.system_data["system"].perform_update()
@@ -60,6 +61,7 @@ class HandlerAlgorithm:
                         elif data.data.system_data["system"].data["update_in_progress"]:
                             log.info("Regelung pausiert, da ein Update durchgeführt wird.")
                         event_global_data_initialized.set()
+                        data.data.release_snapshot()
                         prep.setup_algorithm()
                         control.calc_current()
                         proc.process_algorithm_results()
@@ -88,7 +90,7 @@ class HandlerAlgorithm:
         ausführt, die nur alle 5 Minuten ausgeführt werden müssen.
         """
         try:
-            with ChangedValuesContext(loadvars_.event_module_update_completed):
+            with ChangedValuesContext(loadvars_.event_module_update_completed, dirty_tracking=True):
                 totals = save_log(LogType.DAILY)
                 update_daily_yields(totals)
                 update_pv_monthly_yearly_yields()
@@ -128,7 +130,7 @@ class HandlerAlgorithm:
                     general_internal_chargepoint_handler.event_start.set()
                 else:
                     general_internal_chargepoint_handler.internal_chargepoint_handler.heartbeat = False
-            with ChangedValuesContext(loadvars_.event_module_update_completed):
+            with ChangedValuesContext(loadvars_.event_module_update_completed, dirty_tracking=True):
                 sub.system_data["system"].update_ip_address()
         except KeyboardInterrupt:
             log.critical("Ausführung durch exit_after gestoppt: "+traceback.format_exc())
@@ -156,7 +158,7 @@ class HandlerAlgorithm:
     @exit_after(10)
     def handler_hour(self):
         try:
-            with ChangedValuesContext(loadvars_.event_module_update_completed):
+            with ChangedValuesContext(loadvars_.event_module_update_completed, dirty_tracking=True):
                 for cp in data.data.cp_data.values():
                     calculate_charge_cost(cp)
             data.data.optional_data.et_get_prices()
@@ -181,7 +183,9 @@ def schedule_jobs():
 
 try:
     log.debug("Start openWB2.service")
-    loadvars_ = loadvars.Loadvars()
+    recover_interrupted_appends([str(Path(__file__).resolve().parents[1]/"data"/folder)
+                                 for folder in ("daily_log", "monthly_log", "charge_log")])
+    loadvars_ = loadvars.Loadvars(use_worker_pool=True)
     data.data_init(loadvars_.event_module_update_completed)
     update_config.UpdateConfig().update()
     configuration.pub_configurable()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import logging
 import re
+from typing import BinaryIO
 
 from modules.backup_clouds.nextcloud.config import NextcloudBackupCloud, NextcloudBackupCloudConfiguration
 from modules.common import req
@@ -9,7 +10,7 @@ from modules.common.abstract_device import DeviceDescriptor
 log = logging.getLogger(__name__)
 
 
-def upload_backup(config: NextcloudBackupCloudConfiguration, backup_filename: str, backup_file: bytes) -> None:
+def upload_backup(config: NextcloudBackupCloudConfiguration, backup_filename: str, backup_file: BinaryIO) -> None:
     if config.user is None:
         url_match = re.fullmatch(r'(http[s]?):\/\/([\S^/]+)\/(?:index.php\/)?s\/(.+)', config.ip_address)
         if not url_match:
@@ -31,7 +32,7 @@ def upload_backup(config: NextcloudBackupCloudConfiguration, backup_filename: st
 
 
 def create_backup_cloud(config: NextcloudBackupCloud):
-    def updater(backup_filename: str, backup_file: bytes):
+    def updater(backup_filename: str, backup_file: BinaryIO):
         upload_backup(config.configuration, backup_filename, backup_file)
     return updater
 
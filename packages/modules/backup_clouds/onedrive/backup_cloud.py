@@ -2,6 +2,7 @@
 import logging
 import os
 import pathlib
+from typing import BinaryIO
 
 from modules.backup_clouds.onedrive.msdrive.onedrive import OneDrive
 from modules.backup_clouds.onedrive.api import get_tokens
@@ -12,7 +13,7 @@ from modules.common.abstract_device import DeviceDescriptor
 log = logging.getLogger(__name__)
 
 
-def upload_backup(config: OneDriveBackupCloudConfiguration, backup_filename: str, backup_file: bytes) -> None:
+def upload_backup(config: OneDriveBackupCloudConfiguration, backup_filename: str, backup_file: BinaryIO) -> None:
     # upload a single file to onedrive using credentials from OneDriveBackupCloudConfiguration
     # https://docs.microsoft.com/en-us/onedrive/developer/rest-api/api/driveitem_put_content?view=odsp-graph-online
     tokens = get_tokens(config)  # type: ignore
@@ -33,7 +34,7 @@ def upload_backup(config: OneDriveBackupCloudConfiguration, backup_filename: str
 
 
 def create_backup_cloud(config: OneDriveBackupCloud):
-    def updater(backup_filename: str, backup_file: bytes):
+    def updater(backup_filename: str, backup_file: BinaryIO):
         upload_backup(config.configuration, backup_filename, backup_file)
     return updater
 
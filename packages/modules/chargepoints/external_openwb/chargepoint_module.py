@@ -2,10 +2,9 @@ import logging
 import time
 
 from control import data
-from helpermodules import pub, timecheck
-from helpermodules.broker import BrokerClient
+from helpermodules import timecheck
+from helpermodules.broker import RemoteBrokerSession, get_remote_session
 from helpermodules.utils.error_handling import CP_ERROR, ErrorTimerContext
-from helpermodules.utils.topic_parser import decode_payload
 from modules.chargepoints.external_openwb.config import OpenWBSeries
 from modules.common.abstract_chargepoint import AbstractChargepoint
 from modules.common.abstract_device import DeviceDescriptor
@@ -27,21 +26,21 @@ class ChargepointModule(AbstractChargepoint):
             f"openWB/set/chargepoint/{self.config.id}/get/error_timestamp", CP_ERROR, hide_exception=True)
         self.store = get_chargepoint_value_store(self.config.id)
 
+    def _session(self) -> RemoteBrokerSession:
+        # Alle Ladepunkte einer openWB (Duo) teilen sich eine Verbindung.
+        return get_remote_session(self.config.configuration.ip_address)
+
     def set_current(self, current: float) -> None:
         if self.client_error_context.error_counter_exceeded():
             current = 0
         with SingleComponentUpdateContext(self.fault_state, update_always=False):
             with self.client_error_context:
                 if self.config.configuration.duo_num == 0:
-                    pub.pub_single("openWB/set/internal_chargepoint/0/data/set_current", current,
-                                   hostname=self.config.configuration.ip_address)
-                    pub.pub_single("openWB/set/isss/Current", current,
-                                   hostname=self.config.configuration.ip_address)
+                    self._session().publish_many({"openWB/set/internal_chargepoint/0/data/set_current": current,
+                                                  "openWB/set/isss/Current": current})
                 else:
-                    pub.pub_single("openWB/set/internal_chargepoint/1/data/set_current", current,
-                                   hostname=self.config.configuration.ip_address)
-                    pub.pub_single("openWB/set/isss/Lp2Current", current,
-                                   hostname=self.config.configuration.ip_address)
+                    self._session().publish_many({"openWB/set/internal_chargepoint/1/data/set_current": current,
+                                                  "openWB/set/isss/Lp2Current": current})
 
     def get_values(self) -> None:
         with SingleComponentUpdateContext(self.fault_state, update_always=False):
@@ -52,35 +51,25 @@ class ChargepointModule(AbstractChargepoint):
                     my_ip_address = "localhost"
                 else:
                     my_ip_address = data.data.system_data["system"].data["ip_address"]
-                pub.pub_single("openWB/set/internal_chargepoint/global_data",
-                               {"heartbeat": timecheck.create_timestamp(), "parent_ip": my_ip_address},
-                               hostname=ip_address)
-                pub.pub_single("openWB/set/isss/heartbeat", 0, hostname=ip_address)
-                pub.pub_single("openWB/set/isss/parentWB", my_ip_address,
-                               hostname=ip_address, no_json=True)
+                session = self._session()
+                session.publish_many({"openWB/set/internal_chargepoint/global_data":
+                                      {"heartbeat": timecheck.create_timestamp(), "parent_ip": my_ip_address},
+                                      "openWB/set/isss/heartbeat": 0})
+                session.publish("openWB/set/isss/parentWB", my_ip_address, no_json=True)
                 if (self.config.configuration.duo_num == 1):
-                    pub.pub_single("openWB/set/internal_chargepoint/1/data/parent_cp", str(num), hostname=ip_address)
-                    pub.pub_single("openWB/set/isss/parentCPlp2", str(num), hostname=ip_address)
+                    session.publish_many({"openWB/set/internal_chargepoint/1/data/parent_cp": str(num),
+                                          "openWB/set/isss/parentCPlp2": str(num)})
                 else:
-                    pub.pub_single("openWB/set/internal_chargepoint/0/data/parent_cp", str(num), hostname=ip_address)
-                    pub.pub_single("openWB/set/isss/parentCPlp1", str(num), hostname=ip_address)
-
-                def on_connect(client, userdata, flags, rc):
-                    client.subscribe(f"openWB/internal_chargepoint/{self.config.configuration.duo_num}/get/#")
-
-                def on_message(client, userdata, message):
-                    received_topics.update({message.topic: decode_payload(message.payload)})
+                    session.publish_many({"openWB/set/internal_chargepoint/0/data/parent_cp": str(num),
+                                          "openWB/set/isss/parentCPlp1": str(num)})
 
-                received_topics = {}
-                BrokerClient(f"subscribeSeriesChargepoint{self.config.id}",
-                             on_connect,
-                             on_message,
-                             host=self.config.configuration.ip_address,
-                             port=1883).start_finite_loop()
+                topic_prefix = f"openWB/internal_chargepoint/{self.config.configuration.duo_num}/get/"
+                # Der Zweig bleibt abonniert, die Werte werden aus dem Zwischenspeicher der Verbindung gelesen.
+                session.subscribe(f"{topic_prefix}#")
+                received_topics = session.get_values(topic_prefix)
 
                 if received_topics:
                     log.debug(f"Empfange MQTT Daten für Ladepunkt {self.config.id}: {received_topics}")
-                    topic_prefix = f"openWB/internal_chargepoint/{self.config.configuration.duo_num}/get/"
                     chargepoint_state = ChargepointState(
                         power=received_topics.get(f"{topic_prefix}power"),
                         phases_in_use=received_topics.get(f"{topic_prefix}phases_in_use"),
@@ -112,38 +101,31 @@ class ChargepointModule(AbstractChargepoint):
     def switch_phases(self, phases_to_use: int, duration: int) -> None:
         with SingleComponentUpdateContext(self.fault_state, update_always=False):
             with self.client_error_context:
-                pub.pub_single(
-                    f"openWB/set/internal_chargepoint/{self.config.configuration.duo_num}/data/phases_to_use",
-                    phases_to_use,
-                    self.config.configuration.ip_address)
-                pub.pub_single(
-                    f"openWB/set/internal_chargepoint/{self.config.configuration.duo_num}/data/trigger_phase_switch",
-                    True,
-                    self.config.configuration.ip_address)
-                pub.pub_single("openWB/set/isss/U1p3p", phases_to_use,
-                               self.config.configuration.ip_address)
+                duo_num = self.config.configuration.duo_num
+                self._session().publish_many({
+                    f"openWB/set/internal_chargepoint/{duo_num}/data/phases_to_use": phases_to_use,
+                    f"openWB/set/internal_chargepoint/{duo_num}/data/trigger_phase_switch": True,
+                    "openWB/set/isss/U1p3p": phases_to_use})
                 time.sleep(6+duration-1)
 
     def interrupt_cp(self, duration: int) -> None:
         with SingleComponentUpdateContext(self.fault_state, update_always=False):
             with self.client_error_context:
-                ip_address = self.config.configuration.ip_address
                 if (self.config.configuration.duo_num == 1):
-                    pub.pub_single("openWB/set/internal_chargepoint/1/data/cp_interruption_duration",
-                                   duration, hostname=ip_address)
-                    pub.pub_single("openWB/set/isss/Cpulp2", duration, hostname=ip_address)
+                    self._session().publish_many({"openWB/set/internal_chargepoint/1/data/cp_interruption_duration":
+                                                  duration,
+                                                  "openWB/set/isss/Cpulp2": duration})
                 else:
-                    pub.pub_single("openWB/set/internal_chargepoint/0/data/cp_interruption_duration",
-                                   duration, hostname=ip_address)
-                    pub.pub_single("openWB/set/isss/Cpulp1", duration, hostname=ip_address)
+                    self._session().publish_many({"openWB/set/internal_chargepoint/0/data/cp_interruption_duration":
+                                                  duration,
+                                                  "openWB/set/isss/Cpulp1": duration})
                 time.sleep(duration)
 
     def clear_rfid(self) -> None:
         with SingleComponentUpdateContext(self.fault_state):
             with self.client_error_context:
-                ip_address = self.config.configuration.ip_address
-                pub.pub_single("openWB/set/isss/ClearRfid", 1, hostname=ip_address)
-                pub.pub_single("openWB/set/internal_chargepoint/last_tag", None, hostname=ip_address)
+                self._session().publish_many({"openWB/set/isss/ClearRfid": 1,
+                                              "openWB/set/internal_chargepoint/last_tag": None})
 
 
 chargepoint_descriptor = DeviceDescriptor(configuration_factory=OpenWBSeries)
@@ -1,4 +1,4 @@
-from typing import TypeVar, Generic, Callable
+from typing import BinaryIO, TypeVar, Generic, Callable
 
 from modules.common.component_context import SingleComponentUpdateContext
 from modules.common.component_type import ComponentType
@@ -18,7 +18,10 @@ class ConfigurableBackupCloud(Generic[T_BACKUP_CLOUD_CONFIG]):
         with SingleComponentUpdateContext(self.fault_state):
             self._component_updater = component_initializer(config)
 
-    def update(self, backup_filename: str, backup_file: bytes):
+    def update(self, backup_filename: str, backup_file: BinaryIO):
         if hasattr(self, "_component_updater"):
             # Wenn beim Initialisieren etwas schief gelaufen ist, ursprüngliche Fehlermeldung beibehalten
             self._component_updater(backup_filename, backup_file)
+        else:
+            # Fehler weitergeben, damit die Sicherung nicht als hochgeladen gilt
+            raise Exception("Backup-Cloud konnte nicht initialisiert werden, Sicherung nicht hochgeladen.")
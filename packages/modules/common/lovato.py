@@ -4,35 +4,38 @@ from modules.common import modbus
 from typing import List, Tuple
 from modules.common.abstract_counter import AbstractCounter
 from modules.common.modbus import ModbusDataType
+from modules.common.modbus_read_plan import CachedReadPlan, ReadPlan
 
 
 class Lovato(AbstractCounter):
     def __init__(self, modbus_id: int, client: modbus.ModbusTcpClient_) -> None:
         self.client = client
         self.id = modbus_id
+        read_plan = ReadPlan()
+        read_plan.add("voltages", 0x0001, [ModbusDataType.INT_32]*3)
+        read_plan.add("currents", 0x0007, [ModbusDataType.INT_32]*3)
+        read_plan.add("powers", 0x0013, [ModbusDataType.INT_32]*3)
+        read_plan.add("power_factors", 0x0025, [ModbusDataType.INT_32]*3)
+        read_plan.add("frequency", 0x0031, ModbusDataType.INT_32)
+        self.values = CachedReadPlan(read_plan, self.client.read_input_registers, unit=self.id)
 
     def get_voltages(self) -> List[float]:
-        return [val / 100 for val in self.client.read_input_registers(
-            0x0001, [ModbusDataType.INT_32]*3, unit=self.id)]
+        return [val / 100 for val in self.values.get("voltages")]
 
     def get_power(self) -> Tuple[List[float], float]:
-        powers = [val / 100 for val in self.client.read_input_registers(
-            0x0013, [ModbusDataType.INT_32]*3, unit=self.id
-        )]
+        powers = [val / 100 for val in self.values.get("powers")]
         power = sum(powers)
         return powers, power
 
     def get_power_factors(self) -> List[float]:
-        return [val / 10000 for val in self.client.read_input_registers(
-            0x0025, [ModbusDataType.INT_32]*3, unit=self.id)]
+        return [val / 10000 for val in self.values.get("power_factors")]
 
     def get_frequency(self) -> float:
-        frequency = self.client.read_input_registers(0x0031, ModbusDataType.INT_32, unit=self.id) / 100
+        frequency = self.values.get("frequency") / 100
         if frequency > 100:
             # needed if external measurement clamps connected
             frequency = frequency / 10
         return frequency
 
     def get_currents(self) -> List[float]:
-        return [val / 10000 for val in self.client.read_input_registers(
-            0x0007, [ModbusDataType.INT_32]*3, unit=self.id)]
+        return [val / 10000 for val in self.values.get("currents")]
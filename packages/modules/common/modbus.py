@@ -2,12 +2,14 @@
 """Modul für einfache Modbus-Operationen.
 
 Das Modul baut eine Modbus-TCP-Verbindung auf. Es gibt verschiedene Funktionen, um die gelesenen Register zu
-formatieren.
+formatieren. TCP-Verbindungen werden über den Pool in modbus_pool je Host und Port gemeinsam genutzt und bleiben über
+die Regelzyklen hinweg geöffnet.
 """
 import logging
 import struct
 from enum import Enum
 import time
+from threading import RLock
 from typing import Any, Callable, Iterable, Optional, Union, overload, List
 
 import pymodbus
@@ -16,6 +18,8 @@ from pymodbus.constants import Endian
 from pymodbus.payload import BinaryPayloadDecoder
 from urllib3.util import parse_url
 
+from modules.common.modbus_pool import PooledConnection, connection_pool
+
 log = logging.getLogger(__name__)
 
 
@@ -44,33 +48,67 @@ NO_CONNECTION = ("Modbus-Client konnte keine Verbindung zu {}:{} aufbauen. Bitte
                  "Einstellungen, IP-Adresse und Port sowie Netzwerk-Anschluss prüfen.")
 NO_VALUES = ("TCP-Client {}:{} konnte keinen Wert abfragen. Falls vorhanden, parallele Verbindungen, zB. node red,"
              "beenden und bei anhaltender Fehlermeldung Zähler neu starten.")
+BACKOFF = "Nach wiederholten Fehlern wird die Verbindung zu {}:{} erst in {}s erneut aufgebaut."
 
 
 class ModbusClient:
     def __init__(self,
                  delegate: Union[ModbusSerialClient, ModbusTcpClient],
                  address: str, port: int = 502,
-                 sleep_after_connect: Optional[int] = 0):
+                 sleep_after_connect: Optional[int] = 0,
+                 connection: Optional[PooledConnection] = None):
         self._delegate = delegate
         self.address = address
         self.port = port
         self.sleep_after_connect = sleep_after_connect
+        self._connection = connection
+        self._lock = RLock() if connection is None else connection.lock
 
     def __enter__(self):
+        self._lock.acquire()
         try:
-            self._delegate.__enter__()
-            time.sleep(self.sleep_after_connect)
+            if self._connection is None:
+                self._delegate.__enter__()
+                time.sleep(self.sleep_after_connect)
+            else:
+                self._connection.close_if_idle()
+                self.connect()
         except pymodbus.exceptions.ConnectionException as e:
-            e.args += (NO_CONNECTION.format(self.address, self.port),)
+            self._lock.release()
+            if NO_CONNECTION.format(self.address, self.port) not in e.args:
+                e.args += (NO_CONNECTION.format(self.address, self.port),)
             raise e
+        except Exception:
+            self._lock.release()
+            raise
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        self._delegate.__exit__(exc_type, exc_value, exc_traceback)
+        try:
+            # Gepoolte Verbindungen bleiben für den nächsten Zyklus geöffnet.
+            if self._connection is None:
+                self._delegate.__exit__(exc_type, exc_value, exc_traceback)
+        finally:
+            self._lock.release()
 
     def connect(self) -> None:
-        self._delegate.connect()
-        time.sleep(self.sleep_after_connect)
+        if self._connection is None:
+            self._delegate.connect()
+            time.sleep(self.sleep_after_connect)
+            return
+        with self._lock:
+            if self.is_socket_open():
+                return
+            if self._connection.in_backoff():
+                raise pymodbus.exceptions.ConnectionException(
+                    NO_CONNECTION.format(self.address, self.port),
+                    BACKOFF.format(self.address, self.port,
+                                   round(self._connection.backoff_until - time.monotonic())))
+            success = self._delegate.connect()
+            self._connection.record_connect(success)
+            if success is False:
+                raise pymodbus.exceptions.ConnectionException(NO_CONNECTION.format(self.address, self.port))
+            time.sleep(self.sleep_after_connect)
 
     def close(self) -> None:
         try:
@@ -82,43 +120,71 @@ class ModbusClient:
     def is_socket_open(self) -> bool:
         return self._delegate.is_socket_open()
 
+    def _record_error(self, connection_lost: bool) -> None:
+        if self._connection is not None:
+            self._connection.record_error(connection_lost)
+
     def __read_registers(self, read_register_method: Callable,
                          address: int,
                          types: Union[Iterable[ModbusDataType], ModbusDataType],
                          byteorder: Endian = Endian.Big,
                          wordorder: Endian = Endian.Big,
                          **kwargs):
-        if self.is_socket_open() is False:
-            self.connect()
-        try:
-            multi_request = isinstance(types, Iterable)
-            if not multi_request:
-                types = [types]
-
-            def divide_rounding_up(numerator: int, denominator: int):
-                return -(-numerator // denominator)
-
-            number_of_addresses = sum(divide_rounding_up(
-                t.bits, _MODBUS_HOLDING_REGISTER_SIZE) for t in types)
-            response = read_register_method(
-                address, number_of_addresses, **kwargs)
-            if response.isError():
-                raise Exception(__name__+" "+str(response))
-            decoder = BinaryPayloadDecoder.fromRegisters(response.registers, byteorder, wordorder)
-            result = [struct.unpack(">e", struct.pack(">H", decoder.decode_16bit_uint())) if t ==
-                      ModbusDataType.FLOAT_16 else getattr(decoder, t.decoding_method)() for t in types]
-            return result if multi_request else result[0]
-        except pymodbus.exceptions.ConnectionException as e:
-            self.close()
-            e.args += (NO_CONNECTION.format(self.address, self.port),)
-            raise e
-        except pymodbus.exceptions.ModbusIOException as e:
-            self.close()
-            e.args += (NO_VALUES.format(self.address, self.port),)
-            raise e
-        except Exception as e:
-            self.close()
-            raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
+        with self._lock:
+            reused_connection = self._connection is not None and self.is_socket_open()
+            try:
+                return self.__read_registers_once(read_register_method, address, types, byteorder, wordorder, **kwargs)
+            except (pymodbus.exceptions.ConnectionException, pymodbus.exceptions.ModbusIOException):
+                if reused_connection is False:
+                    raise
+                # Die Gegenstelle hat die offen gehaltene Verbindung möglicherweise beendet.
+                log.debug(f"Modbus-Verbindung zu {self.address}:{self.port} wird neu aufgebaut.")
+                return self.__read_registers_once(read_register_method, address, types, byteorder, wordorder, **kwargs)
+
+    def __read_registers_once(self, read_register_method: Callable,
+                              address: int,
+                              types: Union[Iterable[ModbusDataType], ModbusDataType],
+                              byteorder: Endian,
+                              wordorder: Endian,
+                              **kwargs):
+        with self._lock:
+            if self.is_socket_open() is False:
+                self.connect()
+            start = time.monotonic()
+            try:
+                multi_request = isinstance(types, Iterable)
+                if not multi_request:
+                    types = [types]
+
+                def divide_rounding_up(numerator: int, denominator: int):
+                    return -(-numerator // denominator)
+
+                number_of_addresses = sum(divide_rounding_up(
+                    t.bits, _MODBUS_HOLDING_REGISTER_SIZE) for t in types)
+                response = read_register_method(
+                    address, number_of_addresses, **kwargs)
+                if response.isError():
+                    raise Exception(__name__+" "+str(response))
+                decoder = BinaryPayloadDecoder.fromRegisters(response.registers, byteorder, wordorder)
+                result = [struct.unpack(">e", struct.pack(">H", decoder.decode_16bit_uint())) if t ==
+                          ModbusDataType.FLOAT_16 else getattr(decoder, t.decoding_method)() for t in types]
+                if self._connection is not None:
+                    self._connection.record_request(time.monotonic() - start)
+                return result if multi_request else result[0]
+            except pymodbus.exceptions.ConnectionException as e:
+                self._record_error(True)
+                self.close()
+                e.args += (NO_CONNECTION.format(self.address, self.port),)
+                raise e
+            except pymodbus.exceptions.ModbusIOException as e:
+                self._record_error(True)
+                self.close()
+                e.args += (NO_VALUES.format(self.address, self.port),)
+                raise e
+            except Exception as e:
+                self._record_error(False)
+                self.close()
+                raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
 
     @overload
     def read_holding_registers(self, address: int, types: Iterable[ModbusDataType], byteorder: Endian = Endian.Big,
@@ -173,23 +239,28 @@ class ModbusClient:
         pass
 
     def read_coils(self, address: int, count: int, **kwargs):
-        try:
-            response = self._delegate.read_coils(address, count, **kwargs)
-            if response.isError():
-                raise Exception(__name__+" "+str(response))
-            return response.bits[0] if count == 1 else response.bits[:count]
-        except pymodbus.exceptions.ConnectionException as e:
-            e.args += (NO_CONNECTION.format(self.address, self.port),)
-            raise e
-        except pymodbus.exceptions.ModbusIOException as e:
-            e.args += (NO_VALUES.format(self.address, self.port),)
-            raise e
+        with self._lock:
+            try:
+                response = self._delegate.read_coils(address, count, **kwargs)
+                if response.isError():
+                    raise Exception(__name__+" "+str(response))
+                return response.bits[0] if count == 1 else response.bits[:count]
+            except pymodbus.exceptions.ConnectionException as e:
+                self._record_error(True)
+                e.args += (NO_CONNECTION.format(self.address, self.port),)
+                raise e
+            except pymodbus.exceptions.ModbusIOException as e:
+                self._record_error(True)
+                e.args += (NO_VALUES.format(self.address, self.port),)
+                raise e
 
     def write_registers(self, address: int, value: Any, **kwargs):
-        self._delegate.write_registers(address, value, **kwargs)
+        with self._lock:
+            self._delegate.write_registers(address, value, **kwargs)
 
     def write_single_coil(self, address: int, value: Any, **kwargs):
-        self._delegate.write_coil(address, value, **kwargs)
+        with self._lock:
+            self._delegate.write_coil(address, value, **kwargs)
 
 
 class ModbusTcpClient_(ModbusClient):
@@ -202,7 +273,8 @@ class ModbusTcpClient_(ModbusClient):
         host = parsed_url.host
         if parsed_url.port is not None:
             port = parsed_url.port
-        super().__init__(ModbusTcpClient(host, port, **kwargs), address, port, sleep_after_connect)
+        connection = connection_pool.get(host, port, lambda: ModbusTcpClient(host, port, **kwargs))
+        super().__init__(connection.delegate, address, port, sleep_after_connect, connection)
 
 
 class ModbusSerialClient_(ModbusClient):
@@ -0,0 +1,130 @@
+"""Prozessweiter Pool der Modbus-TCP-Verbindungen.
+
+Mehrere Geräte hinter einem Gateway (zB. SMA, Fronius oder Kostal unter einer IP) teilen sich je Host und Port eine
+Verbindung. Die Verbindung bleibt über die Regelzyklen hinweg geöffnet, die Anfragen werden je Verbindung über ein
+Lock nacheinander ausgeführt. Nach mehreren aufeinanderfolgenden Fehlern wird für eine ansteigende Wartezeit kein
+Verbindungsaufbau versucht, damit die Threads nicht bei jedem Zyklus in den Timeout laufen. Verbindungen, die länger
+als IDLE_TIMEOUT nicht verwendet wurden, zB. nach dem Entfernen oder Umkonfigurieren eines Geräts, werden geschlossen
+und aus dem Pool entfernt.
+"""
+from dataclasses import asdict, dataclass
+import logging
+import time
+from threading import Lock, RLock
+from typing import Callable, Dict, Tuple
+
+from pymodbus.client.sync import ModbusTcpClient
+
+log = logging.getLogger(__name__)
+
+# Anzahl aufeinanderfolgender Fehler, ab der kein Verbindungsaufbau mehr versucht wird
+BACKOFF_THRESHOLD = 3
+BACKOFF_MIN = 10
+BACKOFF_MAX = 300
+# Verbindungen, die länger nicht verwendet wurden, werden neu aufgebaut, da viele Geräte inaktive Verbindungen
+# ohne Rückmeldung beenden.
+IDLE_TIMEOUT = 60
+
+
+@dataclass
+class ConnectionStatistics:
+    requests: int = 0
+    errors: int = 0
+    connects: int = 0
+    consecutive_errors: int = 0
+    # Antwortzeit in ms
+    latency_avg: float = 0
+    latency_max: float = 0
+
+
+class PooledConnection:
+    def __init__(self, host: str, port: int, delegate: ModbusTcpClient) -> None:
+        self.host = host
+        self.port = port
+        self.delegate = delegate
+        self.lock = RLock()
+        self.statistics = ConnectionStatistics()
+        self.backoff_until = 0.0
+        self.last_used = 0.0
+        # letzter Verbindungsaufbau, Anfrage oder Fehler
+        self.last_access = time.monotonic()
+
+    def in_backoff(self) -> bool:
+        return time.monotonic() < self.backoff_until
+
+    def is_unused(self) -> bool:
+        """ Während der Wartezeit wird die Verbindung nicht verwendet, aber noch benötigt. """
+        return self.in_backoff() is False and time.monotonic() - self.last_access > IDLE_TIMEOUT
+
+    def close_if_idle(self) -> None:
+        if self.last_used and time.monotonic() - self.last_used > IDLE_TIMEOUT and self.delegate.is_socket_open():
+            log.debug(f"Modbus-Verbindung zu {self.host}:{self.port} wird nach Inaktivität neu aufgebaut.")
+            self.delegate.close()
+
+    def record_connect(self, success: bool) -> None:
+        self.last_access = time.monotonic()
+        if success:
+            self.statistics.connects += 1
+        else:
+            self.record_error(True)
+
+    def record_request(self, duration: float) -> None:
+        latency = duration * 1000
+        statistics = self.statistics
+        statistics.requests += 1
+        statistics.consecutive_errors = 0
+        # gleitender Mittelwert
+        statistics.latency_avg = latency if statistics.requests == 1 else statistics.latency_avg * 0.9 + latency * 0.1
+        statistics.latency_max = max(statistics.latency_max, latency)
+        self.last_used = self.last_access = time.monotonic()
+        self.backoff_until = 0.0
+
+    def record_error(self, connection_lost: bool) -> None:
+        """ Fehlerantworten des Geräts werden gezählt, führen aber nicht zur Wartezeit. """
+        self.last_access = time.monotonic()
+        statistics = self.statistics
+        statistics.errors += 1
+        if connection_lost is False:
+            return
+        statistics.consecutive_errors += 1
+        if statistics.consecutive_errors >= BACKOFF_THRESHOLD:
+            backoff = min(BACKOFF_MIN * 2 ** (statistics.consecutive_errors - BACKOFF_THRESHOLD), BACKOFF_MAX)
+            self.backoff_until = time.monotonic() + backoff
+            log.debug(f"Modbus-Verbindung zu {self.host}:{self.port}: {statistics.consecutive_errors} Fehler in "
+                      f"Folge, nächster Verbindungsversuch in {backoff}s.")
+
+
+class ModbusConnectionPool:
+    def __init__(self) -> None:
+        self._connections: Dict[Tuple[str, int], PooledConnection] = {}
+        self._lock = Lock()
+
+    def get(self, host: str, port: int, factory: Callable[[], ModbusTcpClient]) -> PooledConnection:
+        with self._lock:
+            connection = self._connections.get((host, port))
+            if connection is None:
+                connection = PooledConnection(host, port, factory())
+                self._connections[(host, port)] = connection
+            return connection
+
+    def evict_unused(self) -> None:
+        """ schließt und entfernt die Verbindungen, die länger als IDLE_TIMEOUT nicht verwendet wurden. Ein Client, der
+        die Verbindung noch hält, baut sie bei der nächsten Anfrage wieder auf. """
+        with self._lock:
+            for key, connection in list(self._connections.items()):
+                if connection.is_unused() and connection.lock.acquire(blocking=False):
+                    try:
+                        log.debug(f"Nicht verwendete Modbus-Verbindung zu {connection.host}:{connection.port} wird "
+                                  "entfernt.")
+                        connection.delegate.close()
+                    finally:
+                        connection.lock.release()
+                    del self._connections[key]
+
+    def get_statistics(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {f"{host}:{port}": asdict(connection.statistics)
+                    for (host, port), connection in self._connections.items()}
+
+
+connection_pool = ModbusConnectionPool()
@@ -0,0 +1,159 @@
+import sys
+from threading import Event, Thread
+from unittest.mock import Mock
+
+import pytest
+
+from modules.common import modbus, modbus_pool
+from modules.common.modbus import ModbusClient, ModbusDataType
+from modules.common.modbus_pool import BACKOFF_THRESHOLD, ModbusConnectionPool, PooledConnection
+
+
+class ConnectionException(Exception):
+    pass
+
+
+class ModbusIOException(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def exceptions(monkeypatch):
+    # pymodbus wird in der conftest ersetzt
+    module = type(sys)("pymodbus.exceptions")
+    module.ConnectionException = ConnectionException
+    module.ModbusIOException = ModbusIOException
+    monkeypatch.setattr(modbus.pymodbus, "exceptions", module, raising=False)
+
+
+@pytest.fixture
+def delegate() -> Mock:
+    delegate = Mock()
+    delegate.is_socket_open.return_value = False
+
+    def connect():
+        delegate.is_socket_open.return_value = True
+        return True
+
+    def close():
+        delegate.is_socket_open.return_value = False
+    delegate.connect.side_effect = connect
+    delegate.close.side_effect = close
+    delegate.read_holding_registers.return_value = Mock(isError=Mock(return_value=False), registers=[0, 230])
+    return delegate
+
+
+def create_client(delegate: Mock) -> ModbusClient:
+    return ModbusClient(delegate, "192.168.0.10", 502, connection=PooledConnection("192.168.0.10", 502, delegate))
+
+
+def test_pool_shares_connection_per_host():
+    # setup
+    pool = ModbusConnectionPool()
+    factory = Mock(side_effect=lambda: Mock())
+
+    # execution
+    first = pool.get("192.168.0.10", 502, factory)
+    second = pool.get("192.168.0.10", 502, factory)
+    other_port = pool.get("192.168.0.10", 1502, factory)
+
+    # evaluation
+    assert first is second
+    assert first is not other_port
+    assert factory.call_count == 2
+    assert set(pool.get_statistics()) == {"192.168.0.10:502", "192.168.0.10:1502"}
+
+
+def test_pooled_connection_stays_open(delegate: Mock):
+    # setup
+    client = create_client(delegate)
+
+    # execution
+    for _ in range(3):
+        with client:
+            client.read_holding_registers(0, ModbusDataType.UINT_32)
+
+    # evaluation
+    assert delegate.read_holding_registers.call_count == 3
+    assert delegate.connect.call_count == 1
+    delegate.close.assert_not_called()
+    assert client._connection.statistics.requests == 3
+    assert client._connection.statistics.connects == 1
+
+
+def test_reconnect_on_closed_connection(delegate: Mock):
+    # setup
+    client = create_client(delegate)
+    with client:
+        client.read_holding_registers(0, ModbusDataType.UINT_32)
+    delegate.read_holding_registers.side_effect = [ModbusIOException("closed"),
+                                                   Mock(isError=Mock(return_value=False), registers=[0, 230])]
+
+    # execution
+    with client:
+        client.read_holding_registers(0, ModbusDataType.UINT_32)
+
+    # evaluation
+    assert delegate.read_holding_registers.call_count == 3
+    assert delegate.connect.call_count == 2
+    assert client._connection.statistics.errors == 1
+    assert client._connection.statistics.consecutive_errors == 0
+
+
+def test_backoff_after_repeated_failures(delegate: Mock, monkeypatch):
+    # setup
+    monkeypatch.setattr(modbus_pool.time, "monotonic", Mock(return_value=1000))
+    delegate.connect.side_effect = None
+    delegate.connect.return_value = False
+    client = create_client(delegate)
+
+    # execution
+    for _ in range(BACKOFF_THRESHOLD + 2):
+        with pytest.raises(ConnectionException):
+            with client:
+                pass
+
+    # evaluation
+    assert delegate.connect.call_count == BACKOFF_THRESHOLD
+    assert client._connection.in_backoff()
+    assert client._connection.statistics.errors == BACKOFF_THRESHOLD
+    # Das Lock wird auch bei Fehlern freigegeben.
+    assert client._lock.acquire(blocking=False)
+    client._lock.release()
+
+
+def test_evict_unused_connections(delegate: Mock, monkeypatch):
+    # setup
+    monotonic = Mock(return_value=1000)
+    monkeypatch.setattr(modbus_pool.time, "monotonic", monotonic)
+    pool = ModbusConnectionPool()
+    unused = pool.get("192.168.0.10", 502, lambda: delegate)
+    unused.delegate.connect()
+    in_use = pool.get("192.168.0.11", 502, Mock)
+    in_backoff = pool.get("192.168.0.12", 502, Mock)
+    used = pool.get("192.168.0.13", 502, Mock)
+    monotonic.return_value += modbus_pool.IDLE_TIMEOUT + 1
+    in_backoff.backoff_until = monotonic.return_value + 10
+    used.record_request(0.01)
+    locked, release = Event(), Event()
+
+    def hold_lock():
+        with in_use.lock:
+            locked.set()
+            release.wait()
+    thread = Thread(target=hold_lock, daemon=True)
+    thread.start()
+    locked.wait()
+
+    # execution
+    try:
+        pool.evict_unused()
+    finally:
+        release.set()
+        thread.join()
+
+    # evaluation
+    assert set(pool.get_statistics()) == {"192.168.0.11:502", "192.168.0.12:502", "192.168.0.13:502"}
+    delegate.close.assert_called_once_with()
+    in_use.delegate.close.assert_not_called()
+    assert pool.get("192.168.0.10", 502, Mock) is not unused
@@ -0,0 +1,150 @@
+"""Zusammenfassen von Registerabfragen zu möglichst wenigen Modbus-Anfragen.
+
+Eine Komponente meldet alle benötigten Register einmalig mit Adresse und Datentyp im ReadPlan an. Der Plan fasst
+aufeinanderfolgende Register zu Blöcken von höchstens 125 Registern zusammen, fragt diese ab und ordnet die
+dekodierten Werte wieder den angemeldeten Namen zu. Lücken zwischen den Registern werden nur bis max_gap mitgelesen,
+da viele Geräte Anfragen auf nicht belegte Register mit einem Fehler beantworten.
+"""
+from dataclasses import dataclass, field
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from modules.common.modbus import ModbusDataType
+
+# maximale Anzahl Register je Anfrage laut Modbus-Spezifikation
+MAX_REGISTERS = 125
+
+
+def _register_count(data_type: ModbusDataType) -> int:
+    return -(-data_type.bits // 16)
+
+
+@dataclass(frozen=True)
+class RegisterEntry:
+    name: str
+    address: int
+    types: Tuple[ModbusDataType, ...]
+    # Bei mehreren Datentypen wird eine Liste zurückgegeben.
+    multi_request: bool
+
+    @property
+    def count(self) -> int:
+        return sum(_register_count(t) for t in self.types)
+
+    @property
+    def end(self) -> int:
+        return self.address + self.count
+
+
+@dataclass
+class RegisterBlock:
+    address: int
+    entries: List[RegisterEntry] = field(default_factory=list)
+    # Datentypen für die Abfrage inkl. der Füllregister in Lücken
+    types: List[ModbusDataType] = field(default_factory=list)
+    # Index des ersten Werts je Eintrag in types
+    offsets: List[int] = field(default_factory=list)
+    end: Optional[int] = None
+
+    def append(self, entry: RegisterEntry) -> None:
+        if self.end is not None:
+            self.types.extend([ModbusDataType.UINT_16] * (entry.address - self.end))
+        self.offsets.append(len(self.types))
+        self.types.extend(entry.types)
+        self.entries.append(entry)
+        self.end = entry.end
+
+    def read(self, read_method: Callable, **kwargs) -> Dict[str, Any]:
+        return self.decode(read_method(self.address, self.types, **kwargs))
+
+    def decode(self, values: List[Any]) -> Dict[str, Any]:
+        result = {}
+        for entry, offset in zip(self.entries, self.offsets):
+            entry_values = list(values[offset:offset + len(entry.types)])
+            result[entry.name] = entry_values if entry.multi_request else entry_values[0]
+        return result
+
+
+class ReadPlan:
+    def __init__(self, max_registers: int = MAX_REGISTERS, max_gap: int = 0) -> None:
+        self.max_registers = max_registers
+        self.max_gap = max_gap
+        self._entries: Dict[str, RegisterEntry] = {}
+        self._blocks: Optional[List[RegisterBlock]] = None
+
+    def add(self, name: str, address: int, types: Union[Iterable[ModbusDataType], ModbusDataType]) -> None:
+        multi_request = isinstance(types, Iterable)
+        types = tuple(types) if multi_request else (types,)
+        if any(t.bits < 16 for t in types):
+            # 8-Bit-Werte belegen ein halbes Register und lassen sich nicht aneinanderreihen.
+            raise ValueError(f"Datentyp mit weniger als 16 Bit kann nicht zusammengefasst werden: {name}")
+        entry = RegisterEntry(name, address, types, multi_request)
+        if entry.count > self.max_registers:
+            raise ValueError(f"{name} umfasst mehr als {self.max_registers} Register.")
+        self._entries[name] = entry
+        self._blocks = None
+
+    @property
+    def blocks(self) -> List[RegisterBlock]:
+        if self._blocks is None:
+            self._blocks = self._plan()
+        return self._blocks
+
+    def block_of(self, name: str) -> RegisterBlock:
+        """ gibt den Block zurück, der den Eintrag name enthält. """
+        for block in self.blocks:
+            if any(entry.name == name for entry in block.entries):
+                return block
+        raise KeyError(name)
+
+    def _plan(self) -> List[RegisterBlock]:
+        blocks: List[RegisterBlock] = []
+        block: Optional[RegisterBlock] = None
+        for entry in sorted(self._entries.values(), key=lambda e: e.address):
+            if (block is None or
+                    entry.address < block.end or
+                    entry.address - block.end > self.max_gap or
+                    entry.end - block.address > self.max_registers):
+                block = RegisterBlock(entry.address)
+                blocks.append(block)
+            block.append(entry)
+        return blocks
+
+    def read(self, read_method: Callable, **kwargs) -> Dict[str, Any]:
+        """ fragt alle Blöcke ab. read_method ist zB. ModbusClient.read_input_registers. """
+        values = {}
+        for block in self.blocks:
+            values.update(block.read(read_method, **kwargs))
+        return values
+
+
+class CachedReadPlan:
+    """ fragt beim Zugriff auf einen Wert nur den Block ab, der diesen enthält, und gibt für die folgenden Zugriffe
+    auf die Werte des Blocks die zwischengespeicherten Werte zurück. Blöcke, deren Werte nicht angefragt werden, werden
+    nicht abgefragt. Wird ein Wert des Blocks erneut angefragt oder sind die Werte älter als max_age, wird nur dieser
+    Block neu abgefragt, sodass jeder Durchlauf der get-Methoden einer Komponente aktuelle Werte erhält.
+    """
+
+    def __init__(self, plan: ReadPlan, read_method: Callable, max_age: float = 1, **kwargs) -> None:
+        self.plan = plan
+        self.read_method = read_method
+        self.max_age = max_age
+        self.kwargs = kwargs
+        self._blocks: Optional[List[RegisterBlock]] = None
+        # Werte, Zeitpunkt der Abfrage und bereits zurückgegebene Namen je Blockadresse
+        self._cache: Dict[int, Tuple[Dict[str, Any], float, Set[str]]] = {}
+
+    def get(self, name: str) -> Any:
+        if self._blocks is not self.plan.blocks:
+            # Plan wurde nach dem Anlegen erweitert
+            self._blocks = self.plan.blocks
+            self._cache = {}
+        block = self.plan.block_of(name)
+        now = time.monotonic()
+        cached = self._cache.get(block.address)
+        if cached is None or name in cached[2] or now - cached[1] > self.max_age:
+            self._cache.pop(block.address, None)
+            cached = (block.read(self.read_method, **self.kwargs), now, set())
+            self._cache[block.address] = cached
+        cached[2].add(name)
+        return cached[0][name]
@@ -0,0 +1,107 @@
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+
+from modules.common import sdm
+from modules.common.modbus import ModbusDataType
+from modules.common.modbus_read_plan import CachedReadPlan, ReadPlan
+
+
+def read_registers(address: int, types: List[ModbusDataType], **kwargs) -> List[int]:
+    # gibt je Datentyp die Startadresse des Werts zurück
+    values, current = [], address
+    for t in types:
+        values.append(current)
+        current += -(-t.bits // 16)
+    return values
+
+
+@pytest.mark.parametrize("max_gap, expected_blocks", [
+    pytest.param(0, [(0x00, 18), (0x1E, 6), (0x46, 6)], id="ohne Lücken"),
+    pytest.param(12, [(0x00, 36), (0x46, 6)], id="Lücke mitlesen"),
+])
+def test_plan(max_gap: int, expected_blocks):
+    # setup
+    plan = ReadPlan(max_gap=max_gap)
+    plan.add("power_factors", 0x1E, [ModbusDataType.FLOAT_32]*3)
+    plan.add("voltages", 0x00, [ModbusDataType.FLOAT_32]*3)
+    plan.add("currents", 0x06, [ModbusDataType.FLOAT_32]*3)
+    plan.add("powers", 0x0C, [ModbusDataType.FLOAT_32]*3)
+    plan.add("frequency", 0x46, ModbusDataType.FLOAT_32)
+    plan.add("imported", 0x48, ModbusDataType.FLOAT_32)
+    plan.add("exported", 0x4A, ModbusDataType.FLOAT_32)
+    read_method = Mock(side_effect=read_registers)
+
+    # execution
+    values = plan.read(read_method, unit=1)
+
+    # evaluation
+    assert [(block.address, block.end - block.address) for block in plan.blocks] == expected_blocks
+    assert read_method.call_count == len(expected_blocks)
+    assert values == {"voltages": [0x00, 0x02, 0x04], "currents": [0x06, 0x08, 0x0A], "powers": [0x0C, 0x0E, 0x10],
+                      "power_factors": [0x1E, 0x20, 0x22], "frequency": 0x46, "imported": 0x48, "exported": 0x4A}
+
+
+def test_plan_max_registers():
+    # setup
+    plan = ReadPlan(max_registers=10)
+    plan.add("first", 0, [ModbusDataType.UINT_32]*4)
+    plan.add("second", 8, [ModbusDataType.UINT_32]*2)
+
+    # execution
+    values = plan.read(read_registers)
+
+    # evaluation
+    assert len(plan.blocks) == 2
+    assert values == {"first": [0, 2, 4, 6], "second": [8, 10]}
+
+
+def test_plan_rejects_8bit():
+    with pytest.raises(ValueError):
+        ReadPlan().add("value", 0, ModbusDataType.UINT_8)
+
+
+def test_cached_read_plan():
+    # setup
+    plan = ReadPlan()
+    plan.add("voltages", 0x00, [ModbusDataType.FLOAT_32]*3)
+    plan.add("frequency", 0x46, ModbusDataType.FLOAT_32)
+    read_method = Mock(side_effect=read_registers)
+    cached = CachedReadPlan(plan, read_method, unit=1)
+
+    # execution
+    cached.get("voltages")
+    cached.get("frequency")
+    first_pass = read_method.call_count
+    cached.get("voltages")
+
+    # evaluation
+    assert first_pass == 2
+    # nur der Block mit dem erneut angefragten Wert wird neu abgefragt
+    assert read_method.call_count == 3
+    assert read_method.call_args[0][0] == 0x00
+
+
+def test_sdm630_reads_blocks():
+    # setup
+    client = Mock(read_input_registers=Mock(side_effect=read_registers))
+    meter = sdm.Sdm630_72(1, client)
+    meter.WAIT_MS_BETWEEN_QUERIES = 0
+
+    # execution
+    voltages = meter.get_voltages()
+    currents = meter.get_currents()
+    powers, power = meter.get_power()
+    meter.get_power_factors()
+    meter.get_frequency()
+    imported = meter.get_imported()
+    exported = meter.get_exported()
+
+    # evaluation
+    assert voltages == [0x00, 0x02, 0x04]
+    assert currents == [0x06, 0x08, 0x0A]
+    assert power == sum(powers)
+    assert imported == 0x48 * 1000
+    assert exported == 0x4A * 1000
+    assert client.read_input_registers.call_count == 3
@@ -4,46 +4,53 @@ from typing import List, Tuple
 from modules.common import modbus
 from modules.common.abstract_counter import AbstractCounter
 from modules.common.modbus import ModbusDataType
+from modules.common.modbus_read_plan import CachedReadPlan, ReadPlan
 
 
 class Mpm3pm(AbstractCounter):
     def __init__(self, modbus_id: int, client: modbus.ModbusTcpClient_) -> None:
         self.client = client
         self.id = modbus_id
+        read_plan = ReadPlan()
+        read_plan.add("imported", 0x02, ModbusDataType.UINT_32)
+        read_plan.add("exported", 0x04, ModbusDataType.UINT_32)
+        read_plan.add("voltages", 0x08, [ModbusDataType.UINT_32]*3)
+        read_plan.add("currents", 0x0E, [ModbusDataType.UINT_32]*3)
+        read_plan.add("powers", 0x14, [ModbusDataType.INT_32]*3)
+        read_plan.add("power_factors", 0x20, [ModbusDataType.UINT_32]*3)
+        read_plan.add("power", 0x26, ModbusDataType.INT_32)
+        read_plan.add("frequency", 0x2c, ModbusDataType.UINT_32)
+        self.values = CachedReadPlan(read_plan, self.client.read_input_registers, unit=self.id)
 
     def get_voltages(self) -> List[float]:
-        return [val / 10 for val in self.client.read_input_registers(
-            0x08, [ModbusDataType.UINT_32]*3, unit=self.id)]
+        return [val / 10 for val in self.values.get("voltages")]
 
     def get_imported(self) -> float:
         # Faktorisierung anders als in der Dokumentation angegeben
-        return self.client.read_input_registers(0x0002, ModbusDataType.UINT_32, unit=self.id) * 10
+        return self.values.get("imported") * 10
 
     def get_power(self) -> Tuple[List[float], float]:
-        powers = [val / 100 for val in self.client.read_input_registers(
-            0x14, [ModbusDataType.INT_32]*3, unit=self.id)]
-        power = self.client.read_input_registers(0x26, ModbusDataType.INT_32, unit=self.id) / 100
+        powers = [val / 100 for val in self.values.get("powers")]
+        power = self.values.get("power") / 100
         return powers, power
 
     def get_exported(self) -> float:
         # Faktorisierung anders als in der Dokumentation angegeben
-        return self.client.read_input_registers(0x0004, ModbusDataType.UINT_32, unit=self.id) * 10
+        return self.values.get("exported") * 10
 
     def get_power_factors(self) -> List[float]:
         # Faktorisierung anders als in der Dokumentation angegeben?
-        factors = [val / 10 for val in self.client.read_input_registers(
-            0x20, [ModbusDataType.UINT_32]*3, unit=self.id)]
+        factors = [val / 10 for val in self.values.get("power_factors")]
         # check if the absolute value of an entry in factors is greater 1
         if any([abs(factor) > 1 for factor in factors]):
             factors = [factor / 100 for factor in factors]
         return factors
 
     def get_frequency(self) -> float:
-        return self.client.read_input_registers(0x2c, ModbusDataType.UINT_32, unit=self.id) / 100
+        return self.values.get("frequency") / 100
 
     def get_currents(self) -> List[float]:
-        return [val / 100 for val in self.client.read_input_registers(
-            0x0E, [ModbusDataType.UINT_32]*3, unit=self.id)]
+        return [val / 100 for val in self.values.get("currents")]
 
     def get_serial_number(self) -> str:
         return str(self.client.read_input_registers(0x33, ModbusDataType.UINT_32, unit=self.id))
@@ -5,6 +5,7 @@ from typing import List, Tuple, Optional
 from modules.common import modbus
 from modules.common.abstract_counter import AbstractCounter
 from modules.common.modbus import ModbusDataType
+from modules.common.modbus_read_plan import CachedReadPlan, ReadPlan
 
 
 class Sdm(AbstractCounter):
@@ -13,18 +14,20 @@ class Sdm(AbstractCounter):
         self.id = modbus_id
         self.last_query = self._get_time_ms()
         self.WAIT_MS_BETWEEN_QUERIES = 100
+        self.read_plan = ReadPlan()
+        self.read_plan.add("frequency", 0x46, ModbusDataType.FLOAT_32)
+        self.read_plan.add("imported", 0x48, ModbusDataType.FLOAT_32)
+        self.read_plan.add("exported", 0x4a, ModbusDataType.FLOAT_32)
+        self.values = CachedReadPlan(self.read_plan, self._read_input_registers, unit=self.id)
 
     def get_imported(self) -> float:
-        self._ensure_min_time_between_queries()
-        return self.client.read_input_registers(0x0048, ModbusDataType.FLOAT_32, unit=self.id) * 1000
+        return self.values.get("imported") * 1000
 
     def get_exported(self) -> float:
-        self._ensure_min_time_between_queries()
-        return self.client.read_input_registers(0x004a, ModbusDataType.FLOAT_32, unit=self.id) * 1000
+        return self.values.get("exported") * 1000
 
     def get_frequency(self) -> float:
-        self._ensure_min_time_between_queries()
-        frequency = self.client.read_input_registers(0x46, ModbusDataType.FLOAT_32, unit=self.id)
+        frequency = self.values.get("frequency")
         if frequency > 100:
             frequency = frequency / 10
         return frequency
@@ -33,6 +36,10 @@ class Sdm(AbstractCounter):
         self._ensure_min_time_between_queries()
         return str(self.client.read_holding_registers(0xFC00, ModbusDataType.INT_32, unit=self.id))
 
+    def _read_input_registers(self, address: int, types: List[ModbusDataType], **kwargs) -> List[float]:
+        self._ensure_min_time_between_queries()
+        return self.client.read_input_registers(address, types, **kwargs)
+
     # These meters require some minimum time between subsequent Modbus reads. Some Eastron papers recommend 100 ms.
     # Sometimes the time between calls to the get_* methods are much shorter so we forcibly wait for the remaining time.
     def _ensure_min_time_between_queries(self) -> None:
@@ -49,44 +56,44 @@ class Sdm(AbstractCounter):
 class Sdm630_72(Sdm):
     def __init__(self, modbus_id: int, client: modbus.ModbusTcpClient_) -> None:
         super().__init__(modbus_id, client)
+        self.read_plan.add("voltages", 0x00, [ModbusDataType.FLOAT_32]*3)
+        self.read_plan.add("currents", 0x06, [ModbusDataType.FLOAT_32]*3)
+        self.read_plan.add("powers", 0x0C, [ModbusDataType.FLOAT_32]*3)
+        self.read_plan.add("power_factors", 0x1E, [ModbusDataType.FLOAT_32]*3)
 
     def get_currents(self) -> List[float]:
-        self._ensure_min_time_between_queries()
-        return self.client.read_input_registers(0x06, [ModbusDataType.FLOAT_32]*3, unit=self.id)
+        return self.values.get("currents")
 
     def get_power_factors(self) -> List[float]:
-        self._ensure_min_time_between_queries()
-        return self.client.read_input_registers(0x1E, [ModbusDataType.FLOAT_32]*3, unit=self.id)
+        return self.values.get("power_factors")
 
     def get_power(self) -> Tuple[List[float], float]:
-        self._ensure_min_time_between_queries()
-        powers = self.client.read_input_registers(0x0C, [ModbusDataType.FLOAT_32]*3, unit=self.id)
+        powers = self.values.get("powers")
         power = sum(powers)
         return powers, power
 
     def get_voltages(self) -> List[float]:
-        self._ensure_min_time_between_queries()
-        return self.client.read_input_registers(0x00, [ModbusDataType.FLOAT_32]*3, unit=self.id)
+        return self.values.get("voltages")
 
 
 class Sdm120(Sdm):
     def __init__(self, modbus_id: int, client: modbus.ModbusTcpClient_) -> None:
         super().__init__(modbus_id, client)
+        self.read_plan.add("voltage", 0x00, ModbusDataType.FLOAT_32)
+        self.read_plan.add("current", 0x06, ModbusDataType.FLOAT_32)
+        self.read_plan.add("power", 0x0C, ModbusDataType.FLOAT_32)
+        self.read_plan.add("power_factor", 0x1E, ModbusDataType.FLOAT_32)
 
     def get_power(self) -> Tuple[List[float], float]:
-        self._ensure_min_time_between_queries()
-        power = self.client.read_input_registers(0x0C, ModbusDataType.FLOAT_32, unit=self.id)
+        power = self.values.get("power")
         return [power, 0, 0], power
 
     def get_currents(self) -> List[float]:
-        self._ensure_min_time_between_queries()
-        return [self.client.read_input_registers(0x06, ModbusDataType.FLOAT_32, unit=self.id), 0.0, 0.0]
+        return [self.values.get("current"), 0.0, 0.0]
 
     def get_voltages(self) -> List[float]:
-        self._ensure_min_time_between_queries()
-        voltage = self.client.read_input_registers(0x00, ModbusDataType.FLOAT_32, unit=self.id)
+        voltage = self.values.get("voltage")
         return [voltage, 0.0, 0.0]
 
     def get_power_factors(self) -> List[float]:
-        self._ensure_min_time_between_queries()
-        return [self.client.read_input_registers(0x1E, ModbusDataType.FLOAT_32, unit=self.id), 0.0, 0.0]
+        return [self.values.get("power_factor"), 0.0, 0.0]
@@ -7,8 +7,8 @@ from modules.common.store._util import get_rounding_function_by_digits
 def pub_to_broker(topic: str, value, digits: Union[int, None] = None) -> None:
     rounding = get_rounding_function_by_digits(digits)
     if value is None:
-        Pub().pub(topic, value)
+        Pub().pub_value(topic, value)
     elif isinstance(value, list):
-        Pub().pub(topic, [rounding(v) for v in value])
+        Pub().pub_value(topic, [rounding(v) for v in value])
     else:
-        Pub().pub(topic, rounding(value))
+        Pub().pub_value(topic, rounding(value))
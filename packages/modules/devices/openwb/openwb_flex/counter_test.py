@@ -0,0 +1,37 @@
+from typing import List
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from modules.common import sdm
+from modules.common.modbus import ModbusDataType
+from modules.devices.openwb.openwb_flex import counter
+from modules.devices.openwb.openwb_flex.config import EvuKitFlexConfiguration, EvuKitFlexSetup
+
+
+def read_registers(address: int, types: List[ModbusDataType], **kwargs) -> List[int]:
+    return [address + i + 1 for i in range(len(types))]
+
+
+@pytest.mark.parametrize("version, expected_requests", [
+    pytest.param(0, 4, id="MPM3PM"),
+    pytest.param(1, 4, id="Lovato"),
+    pytest.param(2, 3, id="SDM630"),
+])
+def test_update_requests(version: int, expected_requests: int, monkeypatch):
+    # setup
+    monkeypatch.setattr(sdm.Sdm, "_ensure_min_time_between_queries", Mock())
+    monkeypatch.setattr(counter, "SimCounter", Mock(return_value=Mock(sim_count=Mock(return_value=(0, 0)))))
+    store = Mock()
+    monkeypatch.setattr(counter, "get_counter_value_store", Mock(return_value=store))
+    client = MagicMock(read_input_registers=Mock(side_effect=read_registers))
+    component = counter.EvuKitFlex(EvuKitFlexSetup(configuration=EvuKitFlexConfiguration(version=version)),
+                                   device_id=0, client=client)
+    component.initialize()
+
+    # execution
+    component.update()
+
+    # evaluation
+    assert client.read_input_registers.call_count == expected_requests
+    assert store.set.call_count == 1
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import logging
+from typing import Any, Dict
 
 from modules.common.abstract_device import AbstractBat
 from modules.common.component_state import BatState
@@ -7,12 +8,15 @@ from modules.common.component_type import ComponentDescriptor
 from modules.common.fault_state import ComponentInfo, FaultState
 from modules.common.store import get_bat_value_store
 from modules.devices.rct.rct.config import RctBatSetup
-from modules.devices.rct.rct.rct_lib import RCT
 
 log = logging.getLogger(__name__)
 
 
 class RctBat(AbstractBat):
+    # Werte, die für alle Komponenten eines Wechselrichters mit einer Anfrage gelesen werden
+    NAMES = ('battery.soc', 'g_sync.p_acc_lp', 'battery.stored_energy', 'battery.used_energy',
+             'battery.bat_status', 'battery.status', 'battery.status2')
+
     def __init__(self, component_config: RctBatSetup) -> None:
         self.component_config = component_config
 
@@ -20,31 +24,23 @@ class RctBat(AbstractBat):
         self.store = get_bat_value_store(self.component_config.id)
         self.fault_state = FaultState(ComponentInfo.from_component_config(self.component_config))
 
-    def update(self, rct_client: RCT) -> None:
-        my_tab = []
-        socx = rct_client.add_by_name(my_tab, 'battery.soc')
-        watt1 = rct_client.add_by_name(my_tab, 'g_sync.p_acc_lp')
-        watt2 = rct_client.add_by_name(my_tab, 'battery.stored_energy')
-        watt3 = rct_client.add_by_name(my_tab, 'battery.used_energy')
-        stat1 = rct_client.add_by_name(my_tab, 'battery.bat_status')
-        stat2 = rct_client.add_by_name(my_tab, 'battery.status')
-        stat3 = rct_client.add_by_name(my_tab, 'battery.status2')
-
-        # read all parameters
-        rct_client.read(my_tab)
+    def update(self, values: Dict[str, Any]) -> None:
+        stat1 = values['battery.bat_status']
+        stat2 = values['battery.status']
+        stat3 = values['battery.status2']
 
         bat_state = BatState(
-            power=watt1.value * -1,
-            soc=socx.value * 100,
-            imported=watt2.value,
-            exported=watt3.value
+            power=values['g_sync.p_acc_lp'] * -1,
+            soc=values['battery.soc'] * 100,
+            imported=values['battery.stored_energy'],
+            exported=values['battery.used_energy']
         )
         self.store.set(bat_state)
-        if (stat1.value + stat2.value + stat3.value) > 0:
+        if (stat1 + stat2 + stat3) > 0:
             # Werte werden trotz Fehlercode übermittelt.
             self.fault_state.warning(
-                f"Speicher-Status ist ungleich 0. Status 1: {stat1.value}, Status 2: {stat2.value}, "
-                f"Status 3: {stat3.value}")
+                f"Speicher-Status ist ungleich 0. Status 1: {stat1}, Status 2: {stat2}, "
+                f"Status 3: {stat3}")
 
 
 component_descriptor = ComponentDescriptor(configuration_factory=RctBatSetup)
@@ -1,11 +1,10 @@
 #!/usr/bin/env python3
 import logging
-import time
-from typing import Callable, Optional, List
+from typing import Iterable, Optional, List, Union
 
 from helpermodules.cli import run_using_positional_cli_args
 from modules.common.abstract_device import DeviceDescriptor
-from modules.common.configurable_device import ConfigurableDevice, ComponentFactoryByType, IndependentComponentUpdater
+from modules.common.configurable_device import ConfigurableDevice, ComponentFactoryByType, MultiComponentUpdater
 from modules.devices.rct.rct import bat, counter, inverter, rct_lib
 from modules.devices.rct.rct.bat import RctBat
 from modules.devices.rct.rct.config import Rct, RctConfiguration, RctBatSetup, RctCounterSetup, RctInverterSetup
@@ -16,6 +15,8 @@ log = logging.getLogger(__name__)
 
 
 def create_device(device_config: Rct):
+    client = None
+
     def create_bat_component(component_config: RctBatSetup):
         return RctBat(component_config)
 
@@ -25,25 +26,26 @@ def create_device(device_config: Rct):
     def create_inverter_component(component_config: RctInverterSetup):
         return RctInverter(component_config)
 
-    def update_component(update_func: Callable[[rct_lib.RCT], None]):
-        try:
-            rct = rct_lib.RCT(device_config.configuration.ip_address)
-            if rct.connect_to_server():
-                update_func(rct)
-        except Exception:
-            raise
-        finally:
-            rct.close()
-            time.sleep(0.5)
+    def update_components(components: Iterable[Union[RctBat, RctCounter, RctInverter]]):
+        nonlocal client
+        # Die Werte aller Komponenten werden mit einer Anfrage über die bestehende Verbindung gelesen.
+        values = client.read_by_names(name for component in components for name in component.NAMES)
+        for component in components:
+            component.update(values)
+
+    def initializer():
+        nonlocal client
+        client = rct_lib.RCT(device_config.configuration.ip_address)
 
     return ConfigurableDevice(
         device_config=device_config,
+        initializer=initializer,
         component_factory=ComponentFactoryByType(
             bat=create_bat_component,
             counter=create_counter_component,
             inverter=create_inverter_component,
         ),
-        component_updater=IndependentComponentUpdater(lambda component: update_component(component.update)),
+        component_updater=MultiComponentUpdater(update_components)
     )
 
 
@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
+from typing import Any, Dict
+
 from modules.common.abstract_device import AbstractInverter
 from modules.common.component_state import InverterState
 from modules.common.component_type import ComponentDescriptor
 from modules.common.fault_state import ComponentInfo, FaultState
 from modules.common.store import get_inverter_value_store
 from modules.devices.rct.rct.config import RctInverterSetup
-from modules.devices.rct.rct.rct_lib import RCT
 
 
 class RctInverter(AbstractInverter):
+    # Werte, die für alle Komponenten eines Wechselrichters mit einer Anfrage gelesen werden
+    # 'p_rec_lim[2]': max. AC power according to RCT Power
+    NAMES = ('dc_conv.dc_conv_struct[0].p_dc', 'dc_conv.dc_conv_struct[1].p_dc', 'io_board.s0_external_power',
+             'energy.e_dc_total[0]', 'energy.e_dc_total[1]', 'energy.e_ext_total')
+
     def __init__(self, component_config: RctInverterSetup) -> None:
         self.component_config = component_config
 
@@ -16,22 +22,11 @@ class RctInverter(AbstractInverter):
         self.store = get_inverter_value_store(self.component_config.id)
         self.fault_state = FaultState(ComponentInfo.from_component_config(self.component_config))
 
-    def update(self, rct_client: RCT) -> None:
-        my_tab = []
-        power1 = rct_client.add_by_name(my_tab, 'dc_conv.dc_conv_struct[0].p_dc')
-        power2 = rct_client.add_by_name(my_tab, 'dc_conv.dc_conv_struct[1].p_dc')
-        power3 = rct_client.add_by_name(my_tab, 'io_board.s0_external_power')
-        # pLimit = rct_client.add_by_name(MyTab, 'p_rec_lim[2]')   # max. AC power according to RCT Power
-        exported1 = rct_client.add_by_name(my_tab, 'energy.e_dc_total[0]')
-        exported2 = rct_client.add_by_name(my_tab, 'energy.e_dc_total[1]')
-        exported3 = rct_client.add_by_name(my_tab, 'energy.e_ext_total')
-
-        # read all parameters
-        rct_client.read(my_tab)
-
+    def update(self, values: Dict[str, Any]) -> None:
         inverter_state = InverterState(
-            power=(power1.value + power2.value + power3.value) * -1,
-            exported=(exported1.value + exported2.value + exported3.value),
+            power=(values['dc_conv.dc_conv_struct[0].p_dc'] + values['dc_conv.dc_conv_struct[1].p_dc'] +
+                   values['io_board.s0_external_power']) * -1,
+            exported=(values['energy.e_dc_total[0]'] + values['energy.e_dc_total[1]'] + values['energy.e_ext_total']),
         )
         self.store.set(inverter_state)
 
@@ -161,6 +161,9 @@ HEADER_WITH_LENGTH = 1 + 1 + 2  # frame length for header, command and 2 byte le
 FRAME_TYPE_STANDARD = 4         # standard frame with id
 FRAME_TYPE_PLANT = 8            # plant frame with id and address
 FRAME_CRC16_LENGTH = 2          # nr of bytes for CRC16 field
+MAX_UNANSWERED_REQUESTS = 3     # nr of consecutive requests without any response before giving up
+START_BYTE = start_token[0]
+ESCAPE_BYTE = escape_token[0]
 
 
 class Frame:
@@ -170,8 +173,9 @@ class Frame:
         self.idList = []
         self.frame_type = frame_type
         self.bEscapeMode = False
-        self.rxStream = b""
+        self.rxStream = bytearray()
         self.pendingCount = False  # nr of id's which are not yet handled
+        self.idDict = {}  # id -> first rct_id item in idList
         self.statisticRxDropped = 0
         self.statisticRxConsumed = 0
         self.statisticRxDuplicate = 0
@@ -188,6 +192,7 @@ class Frame:
                 self.desc_len = len(item.desc)
 
             self.idList.append(item)
+            self.idDict.setdefault(item.id, item)
             item.pending = True
             item.value = None
             if item.id > 0:
@@ -196,93 +201,100 @@ class Frame:
     # consume all data, extract frames and decode them.
     # Incomplete frames remain in self.rxStream for the next data chunk
     def consume(self, data):
-        for d in data:
-            c = bytes([d])
-
+        view = memoryview(data)
+        pos = 0
+        end = len(data)
+        while pos < end:
             # sync to start_token
             if len(self.rxStream) == 0:
-                if c == start_token:
-                    self.rxStream += c
+                pos = data.find(START_BYTE, pos)
+                if pos < 0:
+                    return
+                self.rxStream.append(START_BYTE)
+                pos += 1
                 continue
 
             if self.bEscapeMode:
                 self.bEscapeMode = False
+                self.rxStream.append(data[pos])
+                pos += 1
+            elif data[pos] == ESCAPE_BYTE:
+                self.bEscapeMode = True  # escape mode -> set mode and don't add byte
+                pos += 1
+                continue
             else:
-                if c == escape_token:
-                    self.bEscapeMode = True  # escape mode -> set mode and don't add byte
-                    continue
-
-            # add byte to receive stream
-            self.rxStream += c
+                # copy all bytes up to the next escape token, the end of the header or the end of the frame at once
+                if len(self.rxStream) < HEADER_WITH_LENGTH:
+                    stop = pos + HEADER_WITH_LENGTH - len(self.rxStream)
+                else:
+                    stop = pos + self.FrameLength + FRAME_CRC16_LENGTH - len(self.rxStream)
+                stop = min(stop, end)
+                escape = data.find(ESCAPE_BYTE, pos, stop)
+                if escape >= 0:
+                    stop = escape
+                self.rxStream += view[pos:stop]
+                pos = stop
 
             # when minimum frame size is received, decode the length and check completeness of frame
-            if len(self.rxStream) >= HEADER_WITH_LENGTH:
-                if len(self.rxStream) == HEADER_WITH_LENGTH:
-                    cmd = struct.unpack("B", bytes([self.rxStream[1]]))[0]
-                    if cmd == cmd_long_response or cmd == cmd_long_write:
-                        self.FrameLength = struct.unpack(">H", self.rxStream[2:4])[0] + 2  # 2 byte length MSBF
-                    else:
-                        self.FrameLength = struct.unpack(">B", bytes([self.rxStream[2]]))[0] + 1  # 1 byte length
-
-                    self.FrameLength += 2  # 2 bytes header
+            if len(self.rxStream) == HEADER_WITH_LENGTH:
+                cmd = self.rxStream[1]
+                if cmd == cmd_long_response or cmd == cmd_long_write:
+                    self.FrameLength = struct.unpack_from(">H", self.rxStream, 2)[0] + 2  # 2 byte length MSBF
                 else:
-                    if len(self.rxStream) == self.FrameLength + FRAME_CRC16_LENGTH:
-                        # print(binascii.hexlify(self.rxStream))
-                        self.decode()
-                        self.rxStream = b""
+                    self.FrameLength = self.rxStream[2] + 1  # 1 byte length
+
+                self.FrameLength += 2  # 2 bytes header
+            elif len(self.rxStream) > HEADER_WITH_LENGTH and \
+                    len(self.rxStream) == self.FrameLength + FRAME_CRC16_LENGTH:
+                self.decode()
+                self.rxStream = bytearray()
 
     # decode rxStream and store the values in the frame
     def decode(self):
         crc16_pos = len(self.rxStream)-2
-        received = struct.unpack(">H", self.rxStream[crc16_pos:crc16_pos+2])[0]
-        calculated = self.CRC16(self.rxStream[1:crc16_pos])
+        received = struct.unpack_from(">H", self.rxStream, crc16_pos)[0]
+        calculated = self.CRC16(memoryview(self.rxStream)[1:crc16_pos])
         if received != calculated:
-            # print(binascii.hexlify(self.rxStream))
-            # print("CRC Error: {}".format(binascii.hexlify(self.rxStream)))
             self.statisticCrc16Error += 1
             return
 
         # CRC16 is correct
         # extract command and length field
-        self.command = struct.unpack(">B", bytes([self.rxStream[1]]))[0]
+        self.command = self.rxStream[1]
         if self.command == cmd_long_response or self.command == cmd_long_write:
-            data_length = struct.unpack(">H", self.rxStream[2:4])[0]  # 2 byte length MSBF
+            data_length = struct.unpack_from(">H", self.rxStream, 2)[0]  # 2 byte length MSBF
             idx = 4
         else:
-            data_length = struct.unpack(">B", bytes([self.rxStream[2]]))[0]  # 1 byte length
+            data_length = self.rxStream[2]  # 1 byte length
             idx = 3
 
         # subtract frame type specific length
         data_length -= self.frame_type
 
         # extract 32 bit ID
-        id = struct.unpack(">I", self.rxStream[idx:idx+4])[0]
+        id = struct.unpack_from(">I", self.rxStream, idx)[0]
         idx += 4
 
         # Just for completeness. Plant specific frames should not be received
         if self.frame_type == FRAME_TYPE_PLANT:
-            self.address = struct.unpack(">I", self.rxStream[idx:idx+4])[0]
+            self.address = struct.unpack_from(">I", self.rxStream, idx)[0]
             idx += 4
 
-        # extract the payload from the stream
-        data = self.rxStream[idx:idx+data_length]
-        # data_dump = binascii.hexlify(data)
-
         # just decode responses
         if data_length > 0 and (self.command == cmd_response or self.command == cmd_long_response):
-            # The frame object contains a list of id's for which responses are expected
-            for item in self.idList:
-                if item.id == id:
-                    # received ID found in the list. store the value in the item!
-                    item.value = item.decode_value(data)
-                    # mark the ID item in the list as "not pending" (just if not yet done)
-                    if item.pending is True:
-                        item.pending = False
-                        self.pendingCount -= 1
-                        self.statisticRxConsumed += 1
-                    else:
-                        self.statisticRxDuplicate += 1
-                    return
+            # The frame object contains the id's for which responses are expected
+            item = self.idDict.get(id)
+            if item is not None:
+                # received ID found in the list. store the value in the item!
+                item.value = item.decode_value(bytes(self.rxStream[idx:idx+data_length]))
+                # mark the ID item in the list as "not pending" (just if not yet done)
+                if item.pending is True:
+                    item.pending = False
+                    self.pendingCount -= 1
+                    self.statisticRxConsumed += 1
+                else:
+                    self.statisticRxDuplicate += 1
+                return
 
         self.statisticRxDropped += 1
 
@@ -346,33 +358,15 @@ class Frame:
 
     # inject escape token whenever there is a 0x2B (start_token) or 0x2D (escape_token) byte in data
     def createStream(self, data):
-        stream = bytearray()
-        for d in data:
-            c = bytes([d])
-            if c == start_token or c == escape_token:
-                stream += escape_token
-
-            stream += c
-        return stream
+        return bytes(data).replace(escape_token, escape_token + escape_token).replace(
+            start_token, escape_token + start_token)
 
-    # calculate the CRC16 for the passed data stream
+    # calculate the CRC16 (CCITT, table driven) for the passed data stream
     def CRC16(self, data):
-        bitrange = range(8)  # 8 Bits
-        crcsum = 0xFFFF
-        polynom = 0x1021  # CCITT Polynom
-
+        crcsum = binascii.crc_hqx(data, 0xFFFF)
         # align buffer: append a 0 if needed
-        Buffer = bytearray(data)
         if len(data) & 0x01:
-            Buffer.append(0)
-
-        for byte in Buffer:
-            crcsum ^= byte << 8
-            for bit in bitrange:  # Loop for 8 bits
-                crcsum <<= 1
-                if crcsum & 0x7FFF0000:
-                    # ~~ overflow in bit 16
-                    crcsum = (crcsum & 0x0000FFFF) ^ polynom
+            crcsum = binascii.crc_hqx(b"\x00", crcsum)
         return crcsum
 
     # encode a value according to the id data type
@@ -423,11 +417,17 @@ class RCT():
 
         self.id_tab_setup()
         self.host = ip
+        # index for lookups by id and name, the first entry of the sorted table wins as with a linear search
+        self.id_index = {}
+        self.name_index = {}
+        for line in self.id_tab:
+            self.id_index.setdefault(line.id, line)
+            self.name_index.setdefault(line.name, line)
 
     # find a table entry by using the 32 bit ID
     def find_by_id(self, id, tab=[]):
         if tab == []:
-            tab = self.id_tab
+            return self.id_index.get(id)
 
         for line in tab:
             if line.id == id:
@@ -438,7 +438,7 @@ class RCT():
     # find a table entry by using the name
     def find_by_name(self, name, tab=[]):
         if tab == []:
-            tab = self.id_tab
+            return self.name_index.get(name)
 
         for line in tab:
             if line.name == name:
@@ -448,23 +448,39 @@ class RCT():
 
     # search in id_tab by name and append a copy of the entry to the passed table tab
     def add_by_name(self, tab, name):
-        for line in self.id_tab:
-            if line.name == name:
-                newItem = copy.deepcopy(line)
-                tab.append(newItem)
-                return newItem
-
-        return None
+        return self._add_copy(tab, self.name_index.get(name))
 
     # search in id_tab by id and append a copy of the entry to the passed table tab
     def add_by_id(self, tab, id):
-        for line in self.id_tab:
-            if line.id == id:
-                newItem = copy.deepcopy(line)
-                tab.append(newItem)
-                return newItem
+        return self._add_copy(tab, self.id_index.get(id))
 
-        return None
+    def _add_copy(self, tab, line):
+        if line is None:
+            return None
+        # all attributes are immutable, a shallow copy is sufficient
+        newItem = copy.copy(line)
+        tab.append(newItem)
+        return newItem
+
+    # read the values of all names with a single request and return them by name.
+    # The connection is kept open for the next call and closed on errors.
+    def read_by_names(self, names):
+        my_tab = []
+        items = {}
+        for name in names:
+            if name not in items:
+                item = self.add_by_name(my_tab, name)
+                if item is None:
+                    raise Exception("Unbekannte RCT-ID " + name)
+                items[name] = item
+        try:
+            if self.socket is None and self.connect_to_server() is False:
+                raise Exception("Verbindung zu " + str(self.host) + " fehlgeschlagen")
+            self.read(my_tab)
+        except Exception:
+            self.close()
+            raise
+        return {name: item.value for name, item in items.items()}
 
     # helper function to connect to the RCT power device
     def connect_to_server(self):
@@ -477,6 +493,7 @@ class RCT():
         except Exception:
             print("-"*100)
             traceback.print_exc(file=sys.stdout)
+            self.close()
             return False
 
     # this function reads from the socket.
@@ -502,6 +519,9 @@ class RCT():
                     timeout = 0
                     if response.pendingCount <= 0:
                         return
+                else:
+                    # connection closed by the inverter
+                    raise ConnectionError("Verbindung von " + str(self.host) + " geschlossen")
             else:
                 # timeout
                 return
@@ -510,6 +530,7 @@ class RCT():
     def read(self, idList):
         # setup request frame
         frame = self.read_setup_frame(idList)
+        unanswered = 0
 
         # repeat until all id's are processed
         while (frame.pendingCount > 0):
@@ -520,10 +541,17 @@ class RCT():
                 return  # break
 
             requestedCount = frame.pendingCount
-            self.socket.send(stream)
+            self.socket.sendall(stream)
 
             # wait for response and consume requested ids and set the value
             self.receive(frame, self.receive_timeout)
+            if frame.statisticRxConsumed == 0:
+                unanswered += 1
+                if unanswered >= MAX_UNANSWERED_REQUESTS:
+                    raise Exception("Keine Antwort von " + str(self.host) + " auf " +
+                                    str(frame.pendingCount) + " Anfragen")
+            else:
+                unanswered = 0
             log.debug("Response: requested {:4d} | consumed {:4d} | dropped {:4d}".format(
                 requestedCount, frame.statisticRxConsumed, frame.statisticRxDropped) +
                 " | duplicate {:4d} | Crc16Error {:4d} | pending {:4d}".format(
@@ -551,11 +579,14 @@ class RCT():
 
     # close socket
     def close(self):
+        if self.socket is None:
+            return
         try:
             self.socket.close()
         except Exception:
             print("-"*100)
             traceback.print_exc(file=sys.stdout)
+        self.socket = None
 
     def id_tab_setup(self):
         # add all known id's with name, data type, description and unit to the id table
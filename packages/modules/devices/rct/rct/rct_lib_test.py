@@ -0,0 +1,126 @@
+import socket
+import struct
+
+import pytest
+
+from modules.devices.rct.rct import rct_lib
+from modules.devices.rct.rct.rct_lib import RCT, Frame
+
+
+def crc16_bitwise(data: bytes) -> int:
+    # bisherige bitweise Berechnung als Referenz
+    crcsum = 0xFFFF
+    buffer = bytearray(data)
+    if len(data) & 0x01:
+        buffer.append(0)
+    for byte in buffer:
+        crcsum ^= byte << 8
+        for _ in range(8):
+            crcsum <<= 1
+            if crcsum & 0x7FFF0000:
+                crcsum = (crcsum & 0x0000FFFF) ^ 0x1021
+    return crcsum
+
+
+def response_stream(id: int, value: float) -> bytes:
+    frame = Frame()
+    buf = struct.pack(">BBI", rct_lib.cmd_response, rct_lib.FRAME_TYPE_STANDARD + 4, id) + struct.pack(">f", value)
+    buf += struct.pack(">H", frame.CRC16(buf))
+    return rct_lib.start_token + frame.createStream(buf)
+
+
+@pytest.fixture(scope="module")
+def rct() -> RCT:
+    return RCT("localhost")
+
+
+@pytest.mark.parametrize("data", [b"", b"\x01", b"\x01\x02\x2b\x2d", bytes(range(256)), b"\xff" * 31])
+def test_crc16(data: bytes):
+    assert Frame().CRC16(data) == crc16_bitwise(data)
+
+
+def test_find(rct: RCT):
+    # setup
+    expected = next(line for line in rct.id_tab if line.name == "battery.soc")
+
+    # execution and evaluation
+    assert rct.find_by_name("battery.soc") is expected
+    assert rct.find_by_id(expected.id) is expected
+    assert rct.find_by_name("unknown") is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+def test_consume(chunk_size: int, rct: RCT):
+    # setup
+    my_tab = []
+    # 0x2B und 0x2D in ID und Wert müssen maskiert übertragen werden
+    soc = rct.add_by_name(my_tab, "battery.soc")
+    power = rct.add_by_name(my_tab, "g_sync.p_acc_lp")
+    frame = rct.read_setup_frame(my_tab)
+    stream = (b"\x00garbage" + response_stream(soc.id, 0.5) + response_stream(0x2B2D2B2D, 1.0) +
+              response_stream(power.id, 42.25))
+
+    # execution
+    for pos in range(0, len(stream), chunk_size):
+        frame.consume(stream[pos:pos + chunk_size])
+
+    # evaluation
+    assert soc.value == 0.5
+    assert power.value == 42.25
+    assert frame.pendingCount == 0
+    assert frame.statisticRxDropped == 1
+    assert frame.statisticCrc16Error == 0
+
+
+def test_consume_crc_error(rct: RCT):
+    # setup
+    my_tab = []
+    soc = rct.add_by_name(my_tab, "battery.soc")
+    frame = rct.read_setup_frame(my_tab)
+    stream = bytearray(response_stream(soc.id, 0.5))
+    stream[-1] ^= 0x01
+
+    # execution
+    frame.consume(bytes(stream))
+
+    # evaluation
+    assert soc.value is None
+    assert frame.statisticCrc16Error == 1
+
+
+def test_read_by_names(rct: RCT):
+    # setup
+    client, inverter = socket.socketpair()
+    rct.socket = client
+    soc = rct.find_by_name("battery.soc")
+    power = rct.find_by_name("g_sync.p_acc_lp")
+    inverter.sendall(response_stream(power.id, -100.0) + response_stream(soc.id, 0.75))
+
+    try:
+        # execution
+        values = rct.read_by_names(["battery.soc", "g_sync.p_acc_lp", "battery.soc"])
+
+        # evaluation
+        assert values == {"battery.soc": 0.75, "g_sync.p_acc_lp": -100.0}
+        # eine Anfrage mit beiden IDs, die Verbindung bleibt bestehen
+        request = inverter.recv(1000)
+        assert request.count(rct_lib.start_token) == 2
+        assert rct.socket is client
+        assert soc.value is None
+    finally:
+        rct.close()
+        inverter.close()
+
+
+def test_read_by_names_connection_closed(rct: RCT):
+    # setup
+    client, inverter = socket.socketpair()
+    rct.socket = client
+    inverter.close()
+
+    # execution
+    with pytest.raises(OSError):
+        rct.read_by_names(["battery.soc"])
+
+    # evaluation
+    assert rct.socket is None
@@ -3,11 +3,11 @@ import copy
 import logging
 from threading import Event, Thread
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
 from helpermodules import timecheck
-from helpermodules import pub
+from helpermodules.broker import RemoteBrokerSession, get_remote_session
 
-from helpermodules.pub import Pub, pub_single
+from helpermodules.pub import Pub
 from helpermodules.subdata import SubData
 from modules.chargepoints.internal_openwb.config import InternalChargepointMode
 from modules.common.component_context import SingleComponentUpdateContext
@@ -39,25 +39,33 @@ class UpdateValues:
         self.parent_ip = parent_ip
         self.parent_cp = parent_cp
         self.hierarchy_id = hierarchy_id
+        self.parent_session = None  # type: Optional[RemoteBrokerSession]
 
-    def update_values(self, chargepoint_state: ChargepointState, heartbeat_expired: bool) -> None:
+    def update_values(self, chargepoint_state: ChargepointState, heartbeat_expired: bool,
+                      parent_ip: Optional[str] = None) -> None:
+        if parent_ip is not None and parent_ip != self.parent_ip:
+            log.debug(f"Neue übergeordnete openWB {parent_ip}, alle Werte werden veröffentlicht.")
+            self.parent_ip = parent_ip
+            self.old_chargepoint_state = None
         if self.parent_ip is not None:
+            topics = {}
             if self.old_chargepoint_state:
                 # iterate over counter state
                 vars_old_counter_state = vars(self.old_chargepoint_state)
                 for key, value in vars(chargepoint_state).items():
                     # Zählerstatus immer veröffentlichen für Ladelog-Einträge
                     if value != vars_old_counter_state[key] or key == "imported":
-                        self._pub_values_to_2(key, value)
+                        topics.update(self._get_topic_for_2(key, value))
             else:
                 # Bei Neustart alles veröffentlichen
                 for key, value in vars(chargepoint_state).items():
-                    self._pub_values_to_2(key, value)
+                    topics.update(self._get_topic_for_2(key, value))
+            self._pub_values_to_2(topics)
             if heartbeat_expired is False:
                 # Nur wenn eine Verbindung zum Master besteht, die veröffentlichten Werte speichern.
                 self.old_chargepoint_state = chargepoint_state
 
-    def _pub_values_to_2(self, topic: str, value) -> None:
+    def _get_topic_for_2(self, topic: str, value) -> Dict[str, Any]:
         rounding = get_rounding_function_by_digits(2)
         # fix rfid default value
         if topic == "rfid" and value == "0":
@@ -70,10 +78,22 @@ class UpdateValues:
                 payload = [rounding(v) for v in value]
             else:
                 payload = rounding(value)
-        pub_single(f"openWB/set/chargepoint/{self.parent_cp}/get/{topic}", payload=payload, hostname=self.parent_ip)
+        return {f"openWB/set/chargepoint/{self.parent_cp}/get/{topic}": payload}
+
+    def _pub_values_to_2(self, topics: Dict[str, Any]) -> None:
+        """ sendet die geänderten Werte eines Durchlaufs über die Verbindung zur übergeordneten openWB. Ändert sich
+        deren IP, wird die Verbindung neu aufgebaut.
+        """
+        if len(topics) == 0:
+            return
+        if self.parent_session is None or self.parent_session.host != self.parent_ip:
+            if self.parent_session is not None:
+                self.parent_session.stop()
+            self.parent_session = RemoteBrokerSession(self.parent_ip)
+        self.parent_session.publish_many(topics)
         if self.parent_ip != "localhost":
-            pub_single(f"openWB/set/chargepoint/{self.hierarchy_id}/get/state_str",
-                       payload="Statusmeldungen bitte auf der Primary-openWB einsehen.")
+            get_remote_session("localhost").publish(f"openWB/set/chargepoint/{self.hierarchy_id}/get/state_str",
+                                                    "Statusmeldungen bitte auf der Primary-openWB einsehen.")
 
 
 class UpdateState:
@@ -104,11 +124,12 @@ class UpdateState:
                           " noch aktiv. Es muss erst gewartet werden, bis die CP-Unterbrechung abgeschlossen ist.")
                 return
         self.cp_module.set_current(set_current)
-        pub_single(f"openWB/set/chargepoint/{self.hierarchy_id}/set/current", payload=set_current)
+        get_remote_session("localhost").publish(f"openWB/set/chargepoint/{self.hierarchy_id}/set/current",
+                                                set_current)
         if data.trigger_phase_switch:
             log.debug("Switch Phases from "+str(self.old_phases_to_use) + " to " + str(data.phases_to_use))
             self.__thread_phase_switch(data.phases_to_use)
-            pub.pub_single(
+            get_remote_session("localhost").publish(
                 f"openWB/set/internal_chargepoint/{self.cp_module.local_charge_point_num}/data/trigger_phase_switch",
                 False)
 
@@ -275,7 +296,7 @@ class HandlerChargepoint:
             log.debug("Published plug state "+str(state.plug_state))
             heartbeat_expired = self._check_heartbeat_expired(global_data.heartbeat)
             if global_data.parent_ip is not None:
-                self.update_values.update_values(state, heartbeat_expired)
+                self.update_values.update_values(state, heartbeat_expired, global_data.parent_ip)
             self.update_state.update_state(data, heartbeat_expired)
             return True
         return False
@@ -1,5 +1,6 @@
 import copy
-from unittest.mock import Mock
+from typing import Tuple
+from unittest.mock import Mock, call
 import pytest
 
 from modules.common.component_state import ChargepointState
@@ -22,16 +23,24 @@ OLD_CHARGEPOINT_STATE = copy.deepcopy(CHARGEPOINT_STATE)
 OLD_CHARGEPOINT_STATE.imported = 80
 
 
+@pytest.fixture
+def sessions(monkeypatch) -> Tuple[Mock, Mock]:
+    parent_session = Mock(host=SAMPLE_IP)
+    local_session = Mock()
+    monkeypatch.setattr(internal_chargepoint_handler, "RemoteBrokerSession", Mock(return_value=parent_session))
+    monkeypatch.setattr(internal_chargepoint_handler, "get_remote_session", Mock(return_value=local_session))
+    return parent_session, local_session
+
+
 @pytest.mark.parametrize(
     "old_chargepoint_state, published_topics",
-    [(None, 50),
-     (OLD_CHARGEPOINT_STATE, 2)]
+    [(None, 25),
+     (OLD_CHARGEPOINT_STATE, 1)]
 
 )
-def test_update_values(old_chargepoint_state, published_topics, monkeypatch):
+def test_update_values(old_chargepoint_state, published_topics, sessions: Tuple[Mock, Mock]):
     # setup
-    mock_pub_single = Mock()
-    monkeypatch.setattr(internal_chargepoint_handler, "pub_single", mock_pub_single)
+    parent_session, local_session = sessions
     u = UpdateValues(0, SAMPLE_IP, "1", 1)
     u.old_chargepoint_state = old_chargepoint_state
 
@@ -39,4 +48,25 @@ def test_update_values(old_chargepoint_state, published_topics, monkeypatch):
     u.update_values(CHARGEPOINT_STATE, False)
 
     # evaluation
-    assert mock_pub_single.call_count == published_topics
+    parent_session.publish_many.assert_called_once()
+    assert len(parent_session.publish_many.call_args[0][0]) == published_topics
+    assert parent_session.publish_many.call_args[0][0]["openWB/set/chargepoint/1/get/imported"] == 100
+    local_session.publish.assert_called_once_with("openWB/set/chargepoint/1/get/state_str",
+                                                  "Statusmeldungen bitte auf der Primary-openWB einsehen.")
+
+
+def test_update_values_parent_changed(sessions: Tuple[Mock, Mock]):
+    # setup
+    parent_session, _ = sessions
+    u = UpdateValues(0, SAMPLE_IP, "1", 1)
+    u.update_values(OLD_CHARGEPOINT_STATE, False)
+
+    # execution
+    u.update_values(CHARGEPOINT_STATE, False, "192.168.1.200")
+
+    # evaluation
+    # neue Verbindung zur neuen übergeordneten openWB und alle Werte erneut veröffentlichen
+    parent_session.stop.assert_called_once_with()
+    assert internal_chargepoint_handler.RemoteBrokerSession.call_args_list == [call(SAMPLE_IP),
+                                                                               call("192.168.1.200")]
+    assert len(parent_session.publish_many.call_args[0][0]) == 25
@@ -1,26 +1,32 @@
 import logging
+from dataclasses import asdict
 from threading import Event, Thread
 from typing import List
 
 from control import data
+from helpermodules.pub import Pub
 from modules.common.abstract_io import AbstractIoDevice
+from modules.common.modbus_pool import connection_pool
 from modules.utils import wait_for_module_update_completed
 from modules.common.abstract_device import AbstractDevice
 from modules.common.component_type import ComponentType, type_to_topic_mapping
 from modules.common.store import update_values
 from modules.common.utils.component_parser import get_finished_component_obj_by_id
-from helpermodules.utils import joined_thread_handler
+from helpermodules.utils import Job, WorkerPool, joined_thread_handler
 
 log = logging.getLogger(__name__)
 
 
 class Loadvars:
-    def __init__(self) -> None:
+    def __init__(self, use_worker_pool: bool = False) -> None:
         self.event_module_update_completed = Event()
+        # Ohne Worker-Pool wird je Auftrag und Zyklus ein neuer Thread gestartet.
+        self.worker_pool = WorkerPool() if use_worker_pool else None
 
     def get_values(self) -> None:
         topic = "openWB/set/system/device/module_update_completed"
         try:
+            Pub().start_coalescing()
             not_finished_threads = self._set_values()
             levels = data.data.counter_all_data.get_list_of_elements_per_level()
             levels.reverse()
@@ -29,87 +35,114 @@ class Loadvars:
                 wait_for_module_update_completed(self.event_module_update_completed, topic)
                 data.data.copy_module_data()
             wait_for_module_update_completed(self.event_module_update_completed, topic)
-            joined_thread_handler(self._get_io(), data.data.general_data.data.control_interval/3)
-            joined_thread_handler(self._set_io(), data.data.general_data.data.control_interval/3)
+            self._run_jobs(self._get_io())
+            self._run_jobs(self._set_io())
             wait_for_module_update_completed(self.event_module_update_completed, topic)
         except Exception:
             log.exception("Fehler im loadvars-Modul")
+        finally:
+            self._pub_statistics()
+
+    def _pub_statistics(self) -> None:
+        try:
+            statistics = Pub().stop_coalescing()
+            log.debug(f"Veröffentlichte Messwerte: {statistics}")
+            Pub().pub("openWB/system/mqtt/publisher_statistics", asdict(statistics))
+            connection_pool.evict_unused()
+            Pub().pub("openWB/system/modbus/connection_statistics", connection_pool.get_statistics())
+            if self.worker_pool is not None:
+                for name, latency in self.worker_pool.get_statistics().items():
+                    log.debug(f"Laufzeit {name}: {latency}")
+        except Exception:
+            log.exception("Fehler im loadvars-Modul")
+
+    def _run_jobs(self, jobs: List[Job]) -> List[str]:
+        timeout = data.data.general_data.data.control_interval/3
+        not_finished: List[str] = []
+        if self.worker_pool is not None:
+            try:
+                return self.worker_pool.run(jobs, timeout)
+            except Exception:
+                log.exception("Fehler im Worker-Pool, Abfrage über einzelne Threads")
+                # Aufträge, deren Worker noch beschäftigt ist, nicht zusätzlich starten
+                for job in jobs:
+                    if self.worker_pool.is_busy(job.name):
+                        log.error(f"{job.name} ist bereits aktiv und wird nicht erneut gestartet.")
+                        not_finished.append(job.name)
+                jobs = [job for job in jobs if job.name not in not_finished]
+        return not_finished + joined_thread_handler(
+            [Thread(target=job.target, args=job.args, name=job.name) for job in jobs], timeout)
 
     def _set_values(self) -> List[str]:
-        """Threads, um Werte von Geräten abzufragen"""
-        modules_threads: List[Thread] = []
+        """Aufträge, um Werte von Geräten abzufragen"""
+        modules_jobs: List[Job] = []
         for item in data.data.system_data.values():
             try:
                 if isinstance(item, AbstractDevice):
-                    modules_threads.append(Thread(target=item.update, args=(),
-                                           name=f"device{item.device_config.id}"))
+                    modules_jobs.append(Job(f"device{item.device_config.id}", item.update))
             except Exception:
                 log.exception(f"Fehler im loadvars-Modul bei Element {item}")
         for cp in data.data.cp_data.values():
             try:
-                modules_threads.append(Thread(target=cp.chargepoint_module.get_values,
-                                       args=(), name=f"set values cp{cp.chargepoint_module.config.id}"))
+                modules_jobs.append(Job(f"set values cp{cp.chargepoint_module.config.id}",
+                                        cp.chargepoint_module.get_values))
             except Exception:
                 log.exception(f"Fehler im loadvars-Modul bei Element {cp.num}")
-        return joined_thread_handler(modules_threads, data.data.general_data.data.control_interval/3)
+        return self._run_jobs(modules_jobs)
 
     def _update_values_of_level(self, elements, not_finished_threads: List[str]) -> None:
-        """Threads, um von der niedrigsten Ebene der Hierarchie Werte ggf. miteinander zu verrechnen und zu
+        """Aufträge, um von der niedrigsten Ebene der Hierarchie Werte ggf. miteinander zu verrechnen und zu
         veröffentlichen"""
-        modules_threads: List[Thread] = []
+        modules_jobs: List[Job] = []
         for element in elements:
             try:
                 if element["type"] == ComponentType.CHARGEPOINT.value:
                     chargepoint = data.data.cp_data[f'{type_to_topic_mapping(element["type"])}{element["id"]}']
-                    if self.thread_without_set_value(modules_threads, not_finished_threads) is False:
-                        modules_threads.append(Thread(
-                            target=update_values,
-                            args=(chargepoint.chargepoint_module,),
-                            name=f"update values cp{chargepoint.chargepoint_module.config.id}"))
+                    if self.thread_without_set_value(modules_jobs, not_finished_threads) is False:
+                        modules_jobs.append(Job(f"update values cp{chargepoint.chargepoint_module.config.id}",
+                                                update_values, (chargepoint.chargepoint_module,)))
                 else:
                     component = get_finished_component_obj_by_id(element["id"], not_finished_threads)
                     if component is None:
                         continue
-                    modules_threads.append(Thread(target=update_values, args=(
-                        component,), name=f"component{component.component_config.id}"))
+                    modules_jobs.append(Job(f"component{component.component_config.id}", update_values, (component,)))
             except Exception:
                 log.exception(f"Fehler im loadvars-Modul bei Element {element}")
-        joined_thread_handler(modules_threads, data.data.general_data.data.control_interval/3)
+        self._run_jobs(modules_jobs)
 
     def thread_without_set_value(self,
-                                 modules_threads: List[Thread],
+                                 modules_jobs: List[Job],
                                  not_finished_threads: List[str]) -> bool:
         for t in not_finished_threads:
-            for module_thread in modules_threads:
-                if t == module_thread.name:
+            for module_job in modules_jobs:
+                if t == module_job.name:
                     return True
         return False
 
-    def _get_io(self) -> List[Thread]:
-        threads = []  # type: List[Thread]
+    def _get_io(self) -> List[Job]:
+        jobs = []  # type: List[Job]
         try:
-            for io_device in data.data.system_data.values():
+            for key, io_device in data.data.system_data.items():
                 try:
                     if isinstance(io_device, AbstractIoDevice):
-                        threads.append(
-                            Thread(target=io_device.read, args=(), name="get io state"))
+                        jobs.append(Job(f"get io state {key}", io_device.read))
                 except Exception:
                     log.exception("Fehler im loadvars-Modul")
         except Exception:
             log.exception("Fehler im loadvars-Modul")
         finally:
-            return threads
+            return jobs
 
-    def _set_io(self) -> List[Thread]:
-        threads = []  # type: List[Thread]
+    def _set_io(self) -> List[Job]:
+        jobs = []  # type: List[Job]
         try:
-            for io_device in data.data.system_data.values():
+            for key, io_device in data.data.system_data.items():
                 try:
                     if isinstance(io_device, AbstractIoDevice):
-                        threads.append(Thread(target=update_values, args=(io_device,), name="publish io state"))
+                        jobs.append(Job(f"publish io state {key}", update_values, (io_device,)))
                 except Exception:
                     log.exception("Fehler im loadvars-Modul")
         except Exception:
             log.exception("Fehler im loadvars-Modul")
         finally:
-            return threads
+            return jobs
@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 from smarthome.smartbase import Sbase
+from modules.smarthome.acthor.watt import read_power
 from typing import Dict
 import logging
 log = logging.getLogger(__name__)
@@ -42,14 +43,11 @@ class Sacthor(Sbase):
     def getwatt(self, uberschuss: int, uberschussoffset: int) -> None:
         self.prewatt(uberschuss, uberschussoffset)
         forcesend = self.checkbefsend()
-        argumentList = ['python3', self._prefixpy + 'acthor/watt.py',
-                        str(self.device_nummer), str(self._device_ip),
-                        str(self.devuberschuss), self._device_acthortype,
-                        self._device_acthorpower, str(forcesend),
-                        str(self.newwatt), str(self._oldmeasuretype1)]
         try:
-            self.callpro(argumentList)
-            self.answer = self.readret()
+            self.answer = read_power(self.device_nummer, str(self._device_ip),
+                                     int(self.devuberschuss), self._device_acthortype,
+                                     int(self._device_acthorpower), forcesend,
+                                     int(self.newwatt), str(self._oldmeasuretype1))
             self.newwatt = int(self.answer['power'])
             self.newwattk = int(self.answer['powerc'])
             self.relais = int(self.answer['on'])
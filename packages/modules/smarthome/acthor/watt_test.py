@@ -0,0 +1,24 @@
+from unittest.mock import Mock
+
+from modules.smarthome.acthor import watt
+
+
+def test_read_power(monkeypatch, tmp_path):
+    # setup
+    monkeypatch.setattr(watt, "bp", str(tmp_path) + "/smarthome_device_")
+    (tmp_path / "smarthome_device_1_pv").write_text("1")
+    registers = [0] * 35
+    registers[0] = 1500
+    registers[1] = 553
+    registers[3] = 9
+    client = Mock(read_holding_registers=Mock(return_value=Mock(registers=registers)))
+    monkeypatch.setattr(watt, "ModbusTcpClient", Mock(return_value=client))
+
+    # execution
+    answer = watt.read_power(1, "192.168.1.3", 500, "9s", 9000, 1, 0, "empty")
+
+    # evaluation
+    assert answer == {"power": 1500, "powerc": 0, "send": 1, "sendpower": 2000,
+                      "temp0": 55.3, "temp1": 300, "temp2": 300, "on": 1}
+    client.write_register.assert_called_once_with(1000, 2000, unit=1)
+    client.close.assert_called_once_with()
@@ -5,7 +5,8 @@ import time
 import json
 import urllib.request
 import hashlib
-import credentials
+from typing import Any, Dict, Optional
+from modules.smarthome.avmhomeautomation import credentials
 import xml.etree.ElementTree as ET
 import logging
 log = logging.getLogger(__name__)
@@ -18,13 +19,12 @@ LOGLEVELERROR = 2
 
 
 class AVMHomeAutomation:
-    # Parse configuration from command line arguments as provided by /runs/smarthomehandler.py
-    def __init__(self):
-        self.devicenumber = str(sys.argv[1])
-        self.host = str(sys.argv[2])  # IP or hostname (e.g. "fritz.box")
-        self.switchname = str(sys.argv[5])
-        self.username = str(sys.argv[6])
-        self.password = str(sys.argv[7])
+    def __init__(self, devicenumber: str, host: str, switchname: str, username: str, password: str):
+        self.devicenumber = devicenumber
+        self.host = host  # IP or hostname (e.g. "fritz.box")
+        self.switchname = switchname
+        self.username = username
+        self.password = password
         self.baseURL = "http://" + self.host
         self.sessionID = ""
         self.device_infos = {}
@@ -48,6 +48,11 @@ class AVMHomeAutomation:
             except Exception as e:
                 self.logMessage(LOGLEVELDEBUG, "unable to load cache file: %s" % (e))
 
+    # Parse configuration from command line arguments as provided by /runs/smarthomehandler.py
+    @classmethod
+    def from_argv(cls):
+        return cls(str(sys.argv[1]), str(sys.argv[2]), str(sys.argv[5]), str(sys.argv[6]), str(sys.argv[7]))
+
     def cachedOwnInfo(self):
         key = self.cacheKey
         if key in self.cache:
@@ -318,18 +323,17 @@ class AVMHomeAutomation:
         urllib.request.urlopen(commandURL, timeout=5)
         self.logMessage(LOGLEVELDEBUG, "end of switchDevice")
 
-    # getActualPowerForce returns current observed power and the state of the switch relays.
-    # The JSON answer is either written to the according smart home device return file
-    # or dumped to stdout if no such file exists (for local development)
-    def getActualPower(self):
+    # readActualPower returns current observed power and the state of the switch relays
+    # or None if no values are available.
+    def readActualPower(self) -> Optional[Dict[str, Any]]:
         if self.sessionID == INVALID_SESSIONID:
             self.logMessage(LOGLEVELERROR, "Kann ohne valide Anmeldung keine neuen Daten holen.")
-            return
+            return None
         self.logMessage(LOGLEVELDEBUG, "start of getActualPower")
         self.readOrBuildDeviceInfoCache()
         if self.switchname not in self.device_infos:
             self.logMessage(LOGLEVELERROR, "no such device found at FRITZ!Box: %s" % (self.switchname))
-            return
+            return None
 
         try:
             switch = self.device_infos[self.switchname]
@@ -351,13 +355,21 @@ class AVMHomeAutomation:
             else:
                 self.logMessage(LOGLEVELERROR, "device does not provider switch state, falling back to OFF")
                 relais = 0
-            answer = '{"power":' + str(aktpower) + ',"powerc":' + str(powerc) + ',"on":' + str(relais) + '}'
+            return {"power": aktpower, "powerc": powerc, "on": relais}
         except Exception:
             exc_type, exc_obj, exc_tb = sys.exc_info()
             fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
             self.logMessage(LOGLEVELERROR, "unexpected error getActualPower build JSON string: %s %s %s" %
                             (exc_type, fname, exc_tb.tb_lineno))
+            return None
 
+    # getActualPower writes the JSON answer of readActualPower to the according smart home device return file
+    # or dumps it to stdout if no such file exists (for local development)
+    def getActualPower(self):
+        power = self.readActualPower()
+        if power is None:
+            return
+        answer = json.dumps(power)
         self.logMessage(LOGLEVELDEBUG, "constructed JSON answer: %s" % (answer))
         outFileString = '/var/www/html/openWB/ramdisk/smarthome_device_ret' + str(self.devicenumber)
         self.logMessage(LOGLEVELDEBUG, "handing answer back to smarthomehandler via %s" % (outFileString))
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
-import avmcommon
+from modules.smarthome.avmhomeautomation import avmcommon
 
-interface = avmcommon.AVMHomeAutomation()
+interface = avmcommon.AVMHomeAutomation.from_argv()
 interface.connect()
 interface.switchDevice(True)
@@ -1,6 +1,16 @@
 #!/usr/bin/python3
-import avmcommon
+from typing import Any, Dict, Optional
+from modules.smarthome.avmhomeautomation import avmcommon
 
-interface = avmcommon.AVMHomeAutomation()
-interface.connect()
-interface.getActualPower()
+
+def read_power(devicenumber: str, host: str, switchname: str, username: str,
+               password: str) -> Optional[Dict[str, Any]]:
+    interface = avmcommon.AVMHomeAutomation(devicenumber, host, switchname, username, password)
+    interface.connect()
+    return interface.readActualPower()
+
+
+if __name__ == "__main__":
+    interface = avmcommon.AVMHomeAutomation.from_argv()
+    interface.connect()
+    interface.getActualPower()
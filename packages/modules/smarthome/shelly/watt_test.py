@@ -0,0 +1,43 @@
+import io
+import json
+import urllib.request
+from unittest.mock import Mock
+
+import pytest
+
+from modules.smarthome.shelly import watt
+
+
+@pytest.fixture(autouse=True)
+def ramdisk(monkeypatch, tmp_path):
+    monkeypatch.setattr(watt, "RAMDISK", str(tmp_path) + "/")
+    return tmp_path
+
+
+def response(content) -> io.BytesIO:
+    return io.BytesIO(json.dumps(content).encode("utf-8"))
+
+
+def test_read_power_gen2(monkeypatch):
+    # setup
+    status = {"switch:0": {"apower": 1234.5, "output": True}, "temperature:100": {"tC": 45.5}}
+    urlopen = Mock(side_effect=[response({"gen": 2, "model": "SNSW-001P16EU"}), response(status)])
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+
+    # execution
+    answer = watt.read_power("192.168.1.2", 0, 0, "", "")
+
+    # evaluation
+    assert answer == {"power": 1234, "powerc": 0, "on": 1, "temp0": "45.5", "temp1": "0.0", "temp2": "0.0"}
+
+
+def test_read_power_not_reachable(monkeypatch, ramdisk):
+    # setup
+    (ramdisk / "smarthome_device_ret.192.168.1.2_shelly_infogv1").write_text('{"gen": "1", "model": "SHSW-1"}')
+    monkeypatch.setattr(urllib.request, "urlopen", Mock(side_effect=OSError("keine Verbindung")))
+
+    # execution
+    answer = watt.read_power("192.168.1.2", 0, 0, "", "")
+
+    # evaluation
+    assert answer == {"power": 0, "powerc": 0, "on": 0, "temp0": "0.0", "temp1": "0.0", "temp2": "0.0"}
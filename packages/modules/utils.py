@@ -10,6 +10,8 @@ log = logging.getLogger(__name__)
 def wait_for_module_update_completed(event_module_update_completed: Event, topic: str):
     timeout = data.data.general_data.data.control_interval/2
     event_module_update_completed.clear()
+    # zusammengefasste Messwerte vor der Markierung senden, damit sie vor dieser empfangen werden
+    pub.Pub().flush()
     pub.Pub().pub(topic, True)
     if event_module_update_completed.wait(timeout) is False:
         log.error("Daten wurden noch nicht vollständig empfangen. Timeout abgelaufen, fortsetzen der Regelung.")
@@ -0,0 +1,86 @@
+""" Gemeinsame Sitzung der Fahrzeuge eines Kontos für die SoC-Abfrage über Hersteller-APIs.
+
+Fahrzeuge, die dasselbe Konto verwenden, teilen sich eine HTTP-Sitzung (Wiederverwendung der Verbindungen), das
+Token und die Zuordnung der Fahrzeuge des Kontos zu deren IDs. Das Token wird bereits TOKEN_REFRESH_MARGIN Sekunden
+vor Ablauf erneuert, damit keine Abfrage mit einem abgelaufenen Token fehlschlägt. Die Sitzung wird über einen
+Schlüssel, zB. das Refresh-Token, gefunden. Ändert sich dieser bei der Erneuerung, wird der neue Schlüssel mit
+add_key() derselben Sitzung zugeordnet.
+"""
+import logging
+import time
+from threading import Lock, RLock
+from typing import Callable, Dict, Hashable, List, Optional, TypeVar
+
+from modules.common import req
+
+log = logging.getLogger(__name__)
+
+TOKEN_REFRESH_MARGIN = 600
+VEHICLE_IDS_MAX_AGE = 24 * 60 * 60
+
+T = TypeVar("T")
+
+
+class VehicleApiSession:
+    def __init__(self) -> None:
+        self.http_session = req.get_http_session()
+        self._token = None
+        self._vehicle_ids: Optional[List[str]] = None
+        self._vehicle_ids_timestamp = 0.0
+        self._lock = RLock()
+
+    def add_key(self, key: Hashable) -> None:
+        """ ordnet den Schlüssel dieser Sitzung zu. """
+        with _sessions_lock:
+            _sessions[key] = self
+
+    def get_token(self,
+                  token: T,
+                  expires_at: Callable[[T], float],
+                  refresh: Callable[[T], T]) -> T:
+        """ gibt das gemeinsame Token zurück und erneuert es, wenn es in weniger als TOKEN_REFRESH_MARGIN Sekunden
+        abläuft. Ein übergebenes Token, das später abläuft als das gemeinsame, ersetzt dieses (zB. nach neuer
+        Anmeldung).
+        """
+        with self._lock:
+            if self._token is None or expires_at(token) > expires_at(self._token):
+                self._token = token
+            if time.time() > expires_at(self._token) - TOKEN_REFRESH_MARGIN:
+                log.debug("Token läuft ab, wird erneuert.")
+                self._token = refresh(self._token)
+            else:
+                log.debug("No need to authenticate. Valid token already present.")
+            return self._token
+
+    def get_vehicle_id(self, index: int, request_vehicle_ids: Callable[[], List[str]]) -> str:
+        """ gibt die ID des index-ten Fahrzeugs des Kontos zurück. Die Liste wird höchstens VEHICLE_IDS_MAX_AGE
+        Sekunden zwischengespeichert und erneut abgefragt, wenn das Fahrzeug nicht enthalten ist.
+        """
+        with self._lock:
+            cached = (self._vehicle_ids is not None and
+                      time.time() - self._vehicle_ids_timestamp < VEHICLE_IDS_MAX_AGE)
+            if cached and 0 <= index < len(self._vehicle_ids):
+                return self._vehicle_ids[index]
+            self._vehicle_ids = request_vehicle_ids()
+            self._vehicle_ids_timestamp = time.time()
+            log.debug(f"Fahrzeug-IDs des Kontos: {self._vehicle_ids}")
+            return self._vehicle_ids[index]
+
+    def invalidate_vehicle_ids(self) -> None:
+        """ verwirft die zwischengespeicherten Fahrzeug-IDs, zB. wenn eine Abfrage mit der ID fehlschlägt. """
+        with self._lock:
+            self._vehicle_ids = None
+
+
+_sessions: Dict[Hashable, VehicleApiSession] = {}
+_sessions_lock = Lock()
+
+
+def get_api_session(key: Hashable) -> VehicleApiSession:
+    """ gibt die Sitzung zum Schlüssel zurück und legt sie bei Bedarf an. """
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = VehicleApiSession()
+            _sessions[key] = session
+        return session
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from unittest.mock import Mock
+
+import pytest
+
+from modules.vehicles.common.api_session import api_session
+from modules.vehicles.common.api_session.api_session import VehicleApiSession, get_api_session
+
+
+@dataclass
+class Token:
+    refresh_token: str
+    expires_at: float
+
+
+@pytest.fixture(autouse=True)
+def setup(monkeypatch):
+    monkeypatch.setattr(api_session, "_sessions", {})
+    monkeypatch.setattr(api_session.time, "time", Mock(return_value=10000))
+
+
+def test_get_api_session_shared_per_key():
+    # execution
+    session = get_api_session("a")
+    session.add_key("b")
+
+    # evaluation
+    assert get_api_session("a") is session
+    assert get_api_session("b") is session
+    assert get_api_session("c") is not session
+
+
+@pytest.mark.parametrize("expires_at, expected_refreshs", [
+    pytest.param(20000, 0, id="gültig"),
+    pytest.param(10500, 1, id="läuft bald ab"),
+    pytest.param(5000, 1, id="abgelaufen"),
+])
+def test_get_token(expires_at: float, expected_refreshs: int):
+    # setup
+    session = VehicleApiSession()
+    refresh = Mock(return_value=Token("new", 20000))
+
+    # execution
+    token = session.get_token(Token("old", expires_at), lambda t: t.expires_at, refresh)
+
+    # evaluation
+    assert refresh.call_count == expected_refreshs
+    assert token.refresh_token == ("new" if expected_refreshs else "old")
+
+
+def test_get_token_shared():
+    # setup
+    session = VehicleApiSession()
+    refresh = Mock(return_value=Token("new", 20000))
+    session.get_token(Token("old", 5000), lambda t: t.expires_at, refresh)
+
+    # execution
+    token = session.get_token(Token("old", 5000), lambda t: t.expires_at, refresh)
+    newer_token = session.get_token(Token("login", 30000), lambda t: t.expires_at, refresh)
+
+    # evaluation
+    assert refresh.call_count == 1
+    assert token.refresh_token == "new"
+    assert newer_token.refresh_token == "login"
+
+
+def test_get_vehicle_id_cached():
+    # setup
+    session = VehicleApiSession()
+    request_vehicle_ids = Mock(return_value=["1", "2"])
+
+    # execution
+    vehicle_ids = [session.get_vehicle_id(index, request_vehicle_ids) for index in (0, 1, 0)]
+
+    # evaluation
+    assert vehicle_ids == ["1", "2", "1"]
+    request_vehicle_ids.assert_called_once_with()
+
+
+def test_get_vehicle_id_requests_again():
+    # setup
+    session = VehicleApiSession()
+    request_vehicle_ids = Mock(side_effect=[["1"], ["1", "2"], ["3"], ["4"]])
+    session.get_vehicle_id(0, request_vehicle_ids)
+
+    # execution and evaluation
+    # unbekanntes Fahrzeug
+    assert session.get_vehicle_id(1, request_vehicle_ids) == "2"
+    # verworfene IDs
+    session.invalidate_vehicle_ids()
+    assert session.get_vehicle_id(0, request_vehicle_ids) == "3"
+    # veraltete IDs
+    api_session.time.time.return_value += api_session.VEHICLE_IDS_MAX_AGE
+    assert session.get_vehicle_id(0, request_vehicle_ids) == "4"
+    with pytest.raises(IndexError):
+        session.get_vehicle_id(1, Mock(return_value=["4"]))
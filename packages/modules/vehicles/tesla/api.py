@@ -3,9 +3,11 @@
 import logging
 import time
 import json
-from typing import Tuple
+from typing import List, Tuple
 
-from modules.common import req
+from requests import HTTPError
+
+from modules.vehicles.common.api_session.api_session import VehicleApiSession, get_api_session
 from modules.vehicles.tesla.config import TeslaSocToken
 
 log = logging.getLogger(__name__)
@@ -34,15 +36,21 @@ def post_wake_up_command(vehicle: int, token: TeslaSocToken) -> str:
         "x-tesla-user-agent": X_TESLA_USER_AGENT,
         "authorization": "bearer " + token.access_token
     }
-    session = req.get_http_session()
-    response = session.post("https://owner-api.teslamotors.com/api/1/" + command, headers=headers, timeout=50).json()
+    response = _get_session(token).http_session.post("https://owner-api.teslamotors.com/api/1/" + command,
+                                                     headers=headers,
+                                                     timeout=50).json()
     return response["response"]["state"]
 
 
 def request_soc_range(vehicle: int, token: TeslaSocToken) -> Tuple[float, float, float]:
     vehicle_id = __get_vehicle_id(vehicle, token)
     data_part = "vehicles/"+str(vehicle_id)+"/vehicle_data"
-    response = __request_data(data_part, token)
+    try:
+        response = __request_data(data_part, token)
+    except HTTPError:
+        # Fahrzeug-ID kann sich geändert haben, zB. nach Entfernen eines Fahrzeugs aus dem Konto
+        _get_session(token).invalidate_vehicle_ids()
+        raise
     response = json.loads(response)
     soc = float(response["response"]["charge_state"]["battery_level"])
     # convert miles to km
@@ -54,14 +62,21 @@ def request_soc_range(vehicle: int, token: TeslaSocToken) -> Tuple[float, float,
 def validate_token(token: TeslaSocToken) -> TeslaSocToken:
     if token.access_token is None and token.refresh_token is None:
         raise Exception("Konfiguration des Tesla SoC unvollständig! Keine Token vorhanden.")
-    expiration = token.created_at + token.expires_in
-    log.debug("No need to authenticate. Valid token already present.")
-    if time.time() > expiration:
-        log.debug("Access token expired. Refreshing token.")
-        token = __refresh_token(token)
+    session = _get_session(token)
+    token = session.get_token(token, lambda t: t.created_at + t.expires_in, __refresh_token)
+    # nach der Erneuerung wird die Sitzung auch über das neue Refresh-Token gefunden
+    session.add_key(_get_session_key(token))
     return token
 
 
+def _get_session_key(token: TeslaSocToken) -> Tuple[str, str]:
+    return ("tesla", token.refresh_token or token.access_token)
+
+
+def _get_session(token: TeslaSocToken) -> VehicleApiSession:
+    return get_api_session(_get_session_key(token))
+
+
 def __refresh_token(token: TeslaSocToken) -> TeslaSocToken:
     headers = {"user-agent": UA, "x-tesla-user-agent": X_TESLA_USER_AGENT}
     payload = {
@@ -70,10 +85,10 @@ def __refresh_token(token: TeslaSocToken) -> TeslaSocToken:
         "refresh_token": token.refresh_token,
         "scope": "openid email offline_access",
     }
-    resp = req.get_http_session().post("https://auth.tesla.com/oauth2/v3/token",
-                                       headers=headers,
-                                       json=payload,
-                                       timeout=50)
+    resp = _get_session(token).http_session.post("https://auth.tesla.com/oauth2/v3/token",
+                                                 headers=headers,
+                                                 json=payload,
+                                                 timeout=50)
     log.debug("received refresh token")
     resp_json = resp.json()
     token.refresh_token = resp_json["refresh_token"]
@@ -85,9 +100,12 @@ def __refresh_token(token: TeslaSocToken) -> TeslaSocToken:
 
 
 def __get_vehicle_id(index: int, token: TeslaSocToken) -> str:
-    products = __request_data('products', token)
+    def request_vehicle_ids() -> List[str]:
+        products = __request_data('products', token)
+        return [str(product["id"]) for product in json.loads(products)["response"]]
+
     try:
-        vehicle_id = str(json.loads(products)["response"][index]["id"])
+        vehicle_id = _get_session(token).get_vehicle_id(index, request_vehicle_ids)
         log.debug("vehicle_id for entry %d: %s" % (index, vehicle_id))
     except IndexError:
         raise Exception("Zur Tesla-ID "+str(index)+" konnte kein Fahrzeug im Account gefunden werden.")
@@ -101,7 +119,7 @@ def __request_data(data_part: str, token: TeslaSocToken) -> str:
         "x-tesla-user-agent": X_TESLA_USER_AGENT,
         "authorization": "bearer " + token.access_token
     }
-    response = req.get_http_session().get("https://owner-api.teslamotors.com/api/1/" + data_part,
-                                          headers=headers,
-                                          timeout=50)
+    response = _get_session(token).http_session.get("https://owner-api.teslamotors.com/api/1/" + data_part,
+                                                    headers=headers,
+                                                    timeout=50)
     return response.text
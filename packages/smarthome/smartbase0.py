@@ -5,12 +5,14 @@ import subprocess
 import logging
 from typing import Any, Dict
 from typing import List
+from smarthome.smartscript import ScriptRunner
 log = logging.getLogger(__name__)
 
 
 class Sbase0:
     _basePath = '/var/www/html/openWB'
     _prefixpy = _basePath+'/packages/modules/smarthome/'
+    _script_runner = ScriptRunner(_prefixpy)
 
     def readret(self) -> Dict[str, Any]:
         with open(self._basePath+'/ramdisk/smarthome_device_ret' +
@@ -159,6 +161,9 @@ class Sbase0:
                         % (str(e1)))
 
     def callpro(self, argumentList: List[str]) -> None:
+        if self._script_runner.runs_in_process(argumentList):
+            self._script_runner.run(argumentList)
+            return
         try:
             my_env = os.environ.copy()
             my_env["PYTHONPATH"] = "/var/www/html/openWB/packages"
@@ -17,6 +17,7 @@ from modules.smarthome.acthor.smartacthor import Sacthor
 from modules.smarthome.avmhomeautomation.smartavm import Savm
 from modules.smarthome.nibe.smartnibe import Snibe
 from smarthome.smartbase import Sbase
+from smarthome.smartpub import get_publisher
 from typing import Dict, Tuple, Any
 import paho.mqtt.client as mqtt
 import re
@@ -196,17 +197,16 @@ def getdevicevalues(uberschuss: int, uberschussoffset: int, pvwatt: int, charges
     sendmq(mqtt_all)
 
 
-def pub(client: mqtt.Client, key: str, value: str) -> None:
+def payload(key: str, value: str) -> str:
     if ("TemperatureSensor" in key and "300" in value):
-        client.publish(key, payload="", qos=0, retain=True)
+        return ""
     else:
-        client.publish(key, payload=value, qos=0, retain=True)
+        return value
 
 
 def sendmq(mqtt_input: Dict[str, str]) -> None:
     global mqtt_cache
-    client = mqtt.Client("openWB-SmartHome-bulkpublisher-" + str(os.getpid()))
-    client.connect("localhost", mqttport)
+    changed = {}
     for key, value in mqtt_input.items():
         valueold = mqtt_cache.get(key, 'not in cache')
         if (valueold == value):
@@ -214,13 +214,13 @@ def sendmq(mqtt_input: Dict[str, str]) -> None:
         else:
             log.info("Mq pub " + str(key) + "=" +
                      str(value) + " old " + str(valueold))
-            if (mqttcs in str(key)):
-                log.info("Mq no caching " + str(key))
-            else:
-                mqtt_cache[key] = value
-            pub(client, key, value)
-            client.loop(timeout=2.0)
-    client.disconnect()
+            changed[key] = value
+    # nur übergebene Topics in den Cache aufnehmen, damit die übrigen im nächsten Zyklus erneut gesendet werden
+    for key in get_publisher(mqttport).publish({key: payload(key, value) for key, value in changed.items()}):
+        if (mqttcs in str(key)):
+            log.info("Mq no caching " + str(key))
+        else:
+            mqtt_cache[key] = changed[key]
 
 
 def conditions(speichersoc: int) -> None:
@@ -233,8 +233,7 @@ def update_devices() -> None:
     global parammqtt
     global mydevices
     global mqtt_cache
-    client = mqtt.Client("openWB-SmartHome-bulkpublisher-" + str(os.getpid()))
-    client.connect("localhost", mqttport)
+    removed_topics = {}
     # statische daten einschaltgruppe
     Sbase.ausdevices = 0
     Sbase.eindevices = 0
@@ -328,15 +327,14 @@ def update_devices() -> None:
                         valueold = mqtt_cache.pop(key, 'not in cache')
                         log.info("Mq pub " + str(key) + "=" +
                                  str(value) + " old " + str(valueold))
-                        pub(client, key, value)
-                        client.loop(timeout=2.0)
+                        removed_topics[key] = payload(key, value)
                     mydevice.device_nummer = 0
                     mydevice._device_configured = '9'
                     # del mydevice
                     mydevices.remove(mydevice)
                     log.info("(" + str(i) + ") " +
                              "Device gelöscht")
-    client.disconnect()
+    get_publisher(mqttport).publish(removed_topics)
 
 
 def readmq() -> None:
@@ -0,0 +1,46 @@
+from unittest.mock import Mock
+
+import pytest
+
+from smarthome import smartcommon
+
+
+@pytest.fixture
+def publisher(monkeypatch) -> Mock:
+    publisher = Mock(publish=Mock(side_effect=lambda topics: list(topics.keys())))
+    monkeypatch.setattr(smartcommon, "get_publisher", Mock(return_value=publisher))
+    monkeypatch.setattr(smartcommon, "mqtt_cache", {})
+    monkeypatch.setattr(smartcommon, "mqttcs", "openWB/config/set/SmartHome/")
+    return publisher
+
+
+def test_sendmq_publishes_changed_topics_once(publisher: Mock):
+    # setup
+    topics = {"openWB/SmartHome/Devices/1/Watt": "100",
+              "openWB/SmartHome/Devices/1/TemperatureSensor0": "300",
+              "openWB/config/set/SmartHome/Devices/1/mode": "0"}
+
+    # execution
+    smartcommon.sendmq(topics)
+    smartcommon.sendmq(dict(topics, **{"openWB/SmartHome/Devices/1/Watt": "150"}))
+
+    # evaluation
+    assert publisher.publish.call_args_list[0][0][0] == {"openWB/SmartHome/Devices/1/Watt": "100",
+                                                         "openWB/SmartHome/Devices/1/TemperatureSensor0": "",
+                                                         "openWB/config/set/SmartHome/Devices/1/mode": "0"}
+    # set-Topics werden nicht zwischengespeichert
+    assert publisher.publish.call_args_list[1][0][0] == {"openWB/SmartHome/Devices/1/Watt": "150",
+                                                         "openWB/config/set/SmartHome/Devices/1/mode": "0"}
+
+
+def test_sendmq_retries_unpublished_topics(publisher: Mock):
+    # setup
+    publisher.publish.side_effect = [[], ["openWB/SmartHome/Devices/1/Watt"]]
+
+    # execution
+    smartcommon.sendmq({"openWB/SmartHome/Devices/1/Watt": "100"})
+    smartcommon.sendmq({"openWB/SmartHome/Devices/1/Watt": "100"})
+
+    # evaluation
+    assert publisher.publish.call_count == 2
+    assert smartcommon.mqtt_cache == {"openWB/SmartHome/Devices/1/Watt": "100"}
@@ -1,12 +1,22 @@
 import logging
+import os
+
+LOG_PREFIX = '/var/www/html/openWB/ramdisk/smarthome_device_'
 
 
 def initlog(name: str, devicenumber: int) -> None:
+    """ leitet das Log des Geräts in eine eigene Datei. Die Skripte rufen initlog bei jeder Ausführung auf. Da sie im
+    laufenden Prozess ausgeführt werden, wird der FileHandler nur beim ersten Aufruf angelegt. Die Meldungen werden
+    nicht zusätzlich ins Hauptlog weitergegeben.
+    """
     log = logging.getLogger(name)
     formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
     log.setLevel(logging.DEBUG)
-    fname = '/var/www/html/openWB/ramdisk/smarthome_device_'
-    fname += str(devicenumber) + '_' + str(name) + '.log'
+    log.propagate = False
+    fname = LOG_PREFIX + str(devicenumber) + '_' + str(name) + '.log'
+    for handler in log.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == os.path.abspath(fname):
+            return
     fh = logging.FileHandler(fname, encoding='utf8')
     fh.setLevel(logging.DEBUG)
     fh.setFormatter(formatter)
@@ -0,0 +1,24 @@
+import logging
+
+from smarthome import smartlog
+
+
+def test_initlog_adds_handler_once(monkeypatch, tmp_path):
+    # setup
+    monkeypatch.setattr(smartlog, "LOG_PREFIX", str(tmp_path) + "/smarthome_device_")
+    log = logging.getLogger("test_device")
+
+    try:
+        # execution
+        for _ in range(5):
+            smartlog.initlog("test_device", 1)
+        smartlog.initlog("test_device", 2)
+
+        # evaluation
+        assert [handler.baseFilename for handler in log.handlers] == [
+            str(tmp_path / "smarthome_device_1_test_device.log"), str(tmp_path / "smarthome_device_2_test_device.log")]
+        assert log.propagate is False
+    finally:
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+            handler.close()
@@ -3,6 +3,10 @@ from typing import Dict, Tuple
 from modules.common import modbus
 from modules.common import sdm, b23
 from modules.common import lovato
+from modules.smarthome.avmhomeautomation import watt as avm_watt
+from modules.smarthome.mystrom import watt as mystrom_watt
+from modules.smarthome.shelly import watt as shelly_watt
+from modules.smarthome.tasmota import watt as tasmota_watt
 import logging
 log = logging.getLogger(__name__)
 
@@ -218,12 +222,8 @@ class Slshelly(Slbase):
         return self.newwatt, self.newwattk
 
     def _watt(self, ip: str, chan: int, shaut: int, shuser: str, shpw: str) -> None:
-        argumentList = ['python3', self._prefixpy + 'shelly/watt.py',
-                        str(self.device_nummer), str(ip), '0',
-                        str(chan), str(shaut), shuser, shpw]
         try:
-            self.callpro(argumentList)
-            answer = self.readret()
+            answer = shelly_watt.read_power(str(ip), int(chan), int(shaut), shuser, shpw)
             self.newwatt = int(answer['power'])
             self.newwattk = int(answer['powerc'])
             self.relais = int(answer['on'])
@@ -271,14 +271,10 @@ class Slavm(Slbase):
         return self.newwatt, self.newwattk
 
     def _watt(self, ip: str, act: str, user: str, pw: str) -> None:
-        argumentList = ['python3', self._prefixpy +
-                        'avmhomeautomation/watt.py',
-                        str(self.device_nummer), str(ip),
-                        '0', '0',
-                        act, user, pw]
         try:
-            self.callpro(argumentList)
-            answer = self.readret()
+            answer = avm_watt.read_power(str(self.device_nummer), str(ip), act, user, pw)
+            if answer is None:
+                raise Exception("keine Werte von der FRITZ!Box")
             self.newwatt = int(answer['power'])
             self.newwattk = int(answer['powerc'])
             self.relais = int(answer['on'])
@@ -300,11 +296,8 @@ class Sltasmota(Slbase):
         return self.newwatt, self.newwattk
 
     def _watt(self, ip: str) -> None:
-        argumentList = ['python3', self._prefixpy + 'tasmota/watt.py',
-                        str(self.device_nummer), str(ip), '0']
         try:
-            self.callpro(argumentList)
-            answer = self.readret()
+            answer = tasmota_watt.read_power(str(ip))
             self.newwatt = int(answer['power'])
             self.newwattk = int(answer['powerc'])
             self.relais = int(answer['on'])
@@ -356,11 +349,8 @@ class Slmystrom(Slbase):
         return self.newwatt, self.newwattk
 
     def _watt(self, ip: str) -> None:
-        argumentList = ['python3', self._prefixpy + 'mystrom/watt.py',
-                        str(self.device_nummer), str(ip), '0']
         try:
-            self.callpro(argumentList)
-            answer = self.readret()
+            answer = mystrom_watt.read_power(str(ip))
             self.newwatt = int(answer['power'])
             self.newwattk = int(answer['powerc'])
             self.relais = int(answer['on'])
@@ -0,0 +1,63 @@
+""" Langlebige Verbindung zum Broker für die SmartHome-Topics.
+
+Bisher wurde bei jedem Aufruf von sendmq und update_devices ein neuer Client verbunden und nach jedem geänderten Topic
+bis zu 2s auf den Versand gewartet. Der SmartPublisher hält eine Verbindung, die paho im Hintergrund aufrecht erhält,
+und übergibt alle geänderten Topics eines Zyklus ohne Wartezeit an den Netzwerk-Thread.
+"""
+import logging
+import os
+from threading import Event
+from typing import Dict, List, Optional
+
+import paho.mqtt.client as mqtt
+
+log = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 2
+
+
+class SmartPublisher:
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self._connected = Event()
+        self.client = mqtt.Client("openWB-SmartHome-bulkpublisher-" + str(os.getpid()))
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+        self.client.connect_async("localhost", port)
+        self.client.loop_start()
+
+    def _on_connect(self, client: mqtt.Client, userdata, flags: Dict, rc: int) -> None:
+        if rc == 0:
+            self._connected.set()
+
+    def _on_disconnect(self, client: mqtt.Client, userdata, rc: int) -> None:
+        self._connected.clear()
+
+    def publish(self, topics: Dict[str, str]) -> List[str]:
+        """ veröffentlicht die Topics retained und gibt die Topics zurück, die an paho übergeben werden konnten. """
+        if len(topics) == 0:
+            return []
+        if self._connected.wait(CONNECT_TIMEOUT) is False:
+            log.warning("Keine Verbindung zum Broker, %s Topics werden im nächsten Zyklus gesendet." % len(topics))
+            return []
+        published = []
+        for key, value in topics.items():
+            if self.client.publish(key, payload=value, qos=0, retain=True).rc == mqtt.MQTT_ERR_SUCCESS:
+                published.append(key)
+        return published
+
+    def stop(self) -> None:
+        self.client.disconnect()
+        self.client.loop_stop()
+
+
+_publisher = None  # type: Optional[SmartPublisher]
+
+
+def get_publisher(port: int) -> SmartPublisher:
+    global _publisher
+    if _publisher is None or _publisher.port != port:
+        if _publisher is not None:
+            _publisher.stop()
+        _publisher = SmartPublisher(port)
+    return _publisher
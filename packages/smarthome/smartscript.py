@@ -0,0 +1,79 @@
+""" Ausführung der SmartHome-Skripte (watt.py, on.py, off.py) im laufenden Prozess.
+
+Bisher wurde für jede Abfrage und jedes Schalten ein eigener python3-Prozess gestartet. Die mitgelieferten Skripte aus
+modules/smarthome werden stattdessen einmalig kompiliert und im laufenden Prozess ausgeführt. Die Skripte lesen ihre
+Argumente aus sys.argv und legen das Ergebnis wie bisher in der ramdisk ab, daher werden die Ausführungen über einen
+Lock serialisiert. Wie beim eigenen Prozess wird das Verzeichnis des Skripts für die Ausführung vorne in sys.path
+eingefügt, damit Importe benachbarter Dateien (zB. import avmcommon) gelingen. Die dabei importierten Module werden
+danach wieder aus sys.modules entfernt. Andere Skripte (zB. eigene Skripte) und Skripte, die Signal-Handler setzen,
+werden weiterhin als eigener Prozess gestartet.
+
+Die Leistungsmessung von Shelly, Tasmota, myStrom, AVM und AC-Thor läuft nicht über die Skripte, sondern über
+read_power() der jeweiligen watt.py, die die Werte direkt zurückgibt. Die watt.py bleiben als Skript aufrufbar.
+"""
+import logging
+import os
+import sys
+from threading import Lock
+from types import CodeType
+from typing import Dict, List, Set
+
+log = logging.getLogger(__name__)
+
+# Skripte, die nicht im laufenden Prozess ausgeführt werden können
+SUBPROCESS_ONLY = ("smaem/watt.py",)
+
+
+class ScriptRunner:
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self._code: Dict[str, CodeType] = {}
+        self._lock = Lock()
+
+    def runs_in_process(self, argumentList: List[str]) -> bool:
+        return (len(argumentList) > 1 and argumentList[0] == "python3" and
+                argumentList[1].startswith(self.prefix) and
+                argumentList[1].endswith(SUBPROCESS_ONLY) is False and
+                os.path.isfile(argumentList[1]))
+
+    def _get_code(self, path: str) -> CodeType:
+        code = self._code.get(path)
+        if code is None:
+            with open(path, "r") as f:
+                code = compile(f.read(), path, "exec")
+            self._code[path] = code
+        return code
+
+    def run(self, argumentList: List[str]) -> None:
+        """ führt das Skript wie "python3 skript.py argumente" aus. Fehler im Skript werden wie bei einem eigenen
+        Prozess geloggt und nicht weitergegeben.
+        """
+        path = argumentList[1]
+        directory = os.path.dirname(os.path.abspath(path))
+        with self._lock:
+            argv = sys.argv
+            sys_path = list(sys.path)
+            modules = set(sys.modules)
+            try:
+                sys.argv = argumentList[1:]
+                sys.path.insert(0, directory)
+                exec(self._get_code(path), {"__name__": "__main__", "__file__": path})
+            except SystemExit as e:
+                if e.code not in (None, 0):
+                    log.error("%s beendet mit %s" % (path, e.code))
+            except Exception:
+                log.exception("Fehler im Skript %s" % path)
+            finally:
+                sys.argv = argv
+                sys.path[:] = sys_path
+                _remove_modules_of_directory(directory, set(sys.modules) - modules)
+
+
+def _remove_modules_of_directory(directory: str, names: Set[str]) -> None:
+    """ entfernt die aus dem Verzeichnis des Skripts importierten Module, damit gleichnamige Dateien anderer Skripte
+    nicht verwechselt werden.
+    """
+    for name in names:
+        file = getattr(sys.modules.get(name), "__file__", None)
+        if file is not None and os.path.dirname(os.path.abspath(file)) == directory:
+            del sys.modules[name]
@@ -0,0 +1,63 @@
+import sys
+import urllib.request
+from pathlib import Path
+from unittest.mock import Mock
+
+from smarthome.smartscript import ScriptRunner
+
+
+def test_run(tmp_path: Path):
+    # setup
+    script = tmp_path / "shelly" / "watt.py"
+    script.parent.mkdir()
+    script.write_text("import sys\n"
+                      "from pathlib import Path\n"
+                      "Path(__file__).with_name('ret' + sys.argv[1]).write_text(sys.argv[2])\n"
+                      "sys.exit(0)\n")
+    runner = ScriptRunner(str(tmp_path) + "/")
+    argv = sys.argv
+
+    # execution
+    runner.run(["python3", str(script), "1", "100"])
+    runner.run(["python3", str(script), "2", "200"])
+
+    # evaluation
+    assert (tmp_path / "shelly" / "ret1").read_text() == "100"
+    assert (tmp_path / "shelly" / "ret2").read_text() == "200"
+    assert sys.argv is argv
+
+
+def test_runs_in_process(tmp_path: Path):
+    # setup
+    for name in ("shelly/watt.py", "smaem/watt.py"):
+        (tmp_path / name).parent.mkdir()
+        (tmp_path / name).write_text("")
+    runner = ScriptRunner(str(tmp_path) + "/")
+
+    # execution and evaluation
+    assert runner.runs_in_process(["python3", str(tmp_path / "shelly/watt.py"), "1"]) is True
+    assert runner.runs_in_process(["python3", str(tmp_path / "smaem/watt.py"), "1"]) is False
+    assert runner.runs_in_process(["python3", "/home/pi/own_script.py", "1"]) is False
+
+
+def test_run_bundled_script_with_sibling_import(monkeypatch, caplog):
+    # setup
+    directory = Path(__file__).parents[1] / "modules" / "smarthome"
+    script = directory / "avmhomeautomation" / "watt.py"
+    urlopen = Mock(side_effect=OSError("keine Verbindung"))
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+    runner = ScriptRunner(str(directory) + "/")
+    argument_list = ["python3", str(script), "1", "127.0.0.1", "", "", "Steckdose", "user", "password"]
+    sys_path = list(sys.path)
+
+    # execution
+    runner.run(argument_list)
+
+    # evaluation
+    assert runner.runs_in_process(argument_list) is True
+    assert "Fehler im Skript" not in caplog.text
+    # avmcommon wurde importiert und hat die Anmeldung versucht
+    urlopen.assert_called_once()
+    assert sys.path == sys_path
+    assert "avmcommon" not in sys.modules
+    assert "credentials" not in sys.modules
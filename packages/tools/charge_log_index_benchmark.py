@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+""" Benchmark für die Abfrage des Ladelogs.
+
+Verglichen wird die bisherige Umsetzung, die für jede Abfrage die Monatsdatei einliest und alle Einträge einzeln prüft,
+mit ChargeLogIndex, der die Datei einmalig einliest und über Indizes je Ladepunkt, Fahrzeug, ID-Tag und Lademodus
+filtert. Abgefragt werden abwechselnd die Einträge eines Ladepunkts und eines Fahrzeugs in einer Monatsdatei sowie
+die Summen über --months Monatsdateien mit je 1000 Einträgen.
+
+Aufruf: PYTHONPATH=packages python3 packages/tools/charge_log_index_benchmark.py [--entries 100 1000 5000]
+        [--queries 10] [--months 12]
+"""
+import argparse
+import json
+import pathlib
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from control import data  # noqa: F401 vor dem Ladelog importieren, um zirkuläre Importe zu vermeiden
+from control.chargelog.charge_log_index import ChargeLogIndex
+from control.chargelog.chargelog import get_totals_of_filtered_log_data, merge_totals_of_filtered_log_data
+
+
+def create_entry(index: int) -> Dict:
+    return {"chargepoint": {"id": index % 4, "name": f"LP{index % 4}", "serial_number": "", "imported_at_start": 0,
+                            "imported_at_end": 10, "exported_at_start": 0, "exported_at_end": 0},
+            "vehicle": {"id": index % 3, "name": f"EV{index % 3}", "chargemode": "pv_charging", "prio": False,
+                        "rfid": str(index % 5), "soc_at_start": 20, "soc_at_end": 80, "range_at_start": 100,
+                        "range_at_end": 300},
+            "time": {"begin": "01.05.23 10:00", "end": "01.05.23 11:00", "time_charged": "1:00"},
+            "data": {"range_charged": 20, "imported_since_mode_switch": 1000.5 + index, "exported_since_mode_switch": 0,
+                     "imported_since_plugged": 1000.5 + index, "exported_since_plugged": 0, "power": 11000,
+                     "costs": 0.3, "energy_source": {"grid": 0.5, "pv": 0.5, "bat": 0, "cp": 0}}}
+
+
+def legacy_query(path: pathlib.Path, request_filter: Dict) -> Dict:
+    log_data = {"entries": [], "totals": {}}
+    with open(path, "r", encoding="utf-8") as json_file:
+        charge_log = json.load(json_file)
+    for entry in charge_log:
+        if len(entry) > 0:
+            if ("id" in request_filter["chargepoint"] and len(request_filter["chargepoint"]["id"]) > 0 and
+                    entry["chargepoint"]["id"] not in request_filter["chargepoint"]["id"]):
+                continue
+            if ("id" in request_filter["vehicle"] and len(request_filter["vehicle"]["id"]) > 0 and
+                    entry["vehicle"]["id"] not in request_filter["vehicle"]["id"]):
+                continue
+            log_data["entries"].append(entry)
+        log_data["totals"] = get_totals_of_filtered_log_data(log_data)
+    return log_data
+
+
+def legacy_query_range(paths: List[pathlib.Path], request_filter: Dict) -> Dict:
+    entries = []
+    for path in paths:
+        entries.extend(legacy_query(path, request_filter)["entries"])
+    return {"entries": [], "totals": get_totals_of_filtered_log_data({"entries": entries})}
+
+
+def rounded(log_data: Dict) -> Dict:
+    # Summen je Monat werden in anderer Reihenfolge addiert als die Einträge
+    return {key: round(value, 6) if isinstance(value, float) else value for key, value in log_data["totals"].items()}
+
+
+def create_index() -> ChargeLogIndex:
+    return ChargeLogIndex(get_totals_of_filtered_log_data, merge_totals_of_filtered_log_data)
+
+
+def run(name: str, query: Callable, path: pathlib.Path, filters: List[Dict]) -> List:
+    start = time.perf_counter()
+    result = [query(path, request_filter) for request_filter in filters]
+    print(f"  {name:<24} {(time.perf_counter() - start) / len(filters) * 1000:8.2f}ms pro Abfrage")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 5000], help="Anzahl Einträge")
+    parser.add_argument("--queries", type=int, default=10, help="Anzahl Abfragen")
+    parser.add_argument("--months", type=int, default=12, help="Anzahl Monate für die Summen über mehrere Monate")
+    args = parser.parse_args()
+
+    filters = [{"chargepoint": {"id": [i % 4]}, "vehicle": {}} if i % 2 else
+               {"chargepoint": {}, "vehicle": {"id": [i % 3]}} for i in range(args.queries)]
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.entries:
+            path = pathlib.Path(directory) / f"{count}.json"
+            with open(path, "w", encoding="utf-8") as json_file:
+                json.dump([create_entry(i) for i in range(count)], json_file)
+            print(f"{count} Einträge:")
+            legacy = run("Einlesen je Abfrage:", legacy_query, path, filters)
+            indexed = run("ChargeLogIndex:", create_index().query, path, filters)
+            if legacy != indexed:
+                raise ValueError("Ergebnisse weichen voneinander ab.")
+        paths = []
+        for month in range(args.months):
+            paths.append(pathlib.Path(directory) / f"month{month}.json")
+            with open(paths[-1], "w", encoding="utf-8") as json_file:
+                json.dump([create_entry(i) for i in range(1000)], json_file)
+        print(f"Summen über {args.months} Monate:")
+        legacy = run("Einlesen je Abfrage:", legacy_query_range, paths, filters)
+        index = create_index()
+        indexed = run("ChargeLogIndex:",
+                      lambda paths, request_filter: index.query_range(paths, request_filter, with_entries=False),
+                      paths, filters)
+        if [rounded(log_data) for log_data in legacy] != [rounded(log_data) for log_data in indexed]:
+            raise ValueError("Ergebnisse weichen voneinander ab.")
+
+
+if __name__ == "__main__":
+    main()
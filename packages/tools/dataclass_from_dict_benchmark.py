@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+""" Benchmark für dataclass_from_dict.
+
+Verglichen wird die bisherige Umsetzung, die bei jedem Aufruf __init__ mit inspect.getfullargspec untersucht, mit der
+aktuellen Umsetzung, die je Klasse einmalig einen Konstruktor erstellt. Umgewandelt werden ein Lade-Profil mit
+Zielladen-Plänen sowie die Konfigurationen aller Geräte und Komponenten, die sich importieren lassen.
+
+Aufruf: PYTHONPATH=packages python3 packages/tools/dataclass_from_dict_benchmark.py [--repeat 200]
+"""
+import argparse
+from enum import Enum
+import importlib
+import inspect
+from inspect import isclass
+import pkgutil
+import time
+import typing
+from typing import Any, Callable, List, Tuple, Union, get_origin
+
+from control import data  # noqa: F401 vor den Lade-Profilen importieren, um zirkuläre Importe zu vermeiden
+from control.ev.charge_template import ChargeTemplateData
+from dataclass_utils import asdict, dataclass_from_dict
+from helpermodules.abstract_plans import ScheduledChargingPlan, TimeChargingPlan
+import modules.devices
+
+
+def legacy_dataclass_from_dict(cls, args):
+    if isclass(cls):
+        if isinstance(args, cls):
+            return args
+    elif get_origin(cls):
+        if isinstance(args, get_origin(cls)):
+            return args
+    elif isinstance(args, type(cls)):
+        return args
+    arg_spec = inspect.getfullargspec(cls.__init__)
+    values = []
+    for index in range(1, len(arg_spec.args)):
+        argument_name = arg_spec.args[index]
+        try:
+            value = args[argument_name]
+        except KeyError:
+            try:
+                value = arg_spec.defaults[-len(arg_spec.args) + index]
+            except (IndexError, TypeError):
+                raise Exception(f"Cannot determine value for parameter {argument_name}")
+        requested_type = arg_spec.annotations.get(argument_name)
+        if isinstance(value, dict) and not (
+                _legacy_is_optional_of_dict(requested_type) or
+                issubclass(requested_type if isclass(requested_type) else type(bool), dict)):
+            value = legacy_dataclass_from_dict(requested_type, value)
+        elif isinstance(requested_type, type) and issubclass(requested_type, Enum):
+            value = requested_type(value)
+        values.append(value)
+    return cls(*values)
+
+
+def _legacy_is_optional_of_dict(requested_type):
+    if typing.get_origin(requested_type) == Union:
+        args = typing.get_args(requested_type)
+        if len(args) == 2:
+            return issubclass(args[0], dict) and issubclass(args[1], type(None))
+    return False
+
+
+def charge_template() -> Tuple[type, dict]:
+    template = asdict(ChargeTemplateData(name="Benchmark"))
+    template["chargemode"]["scheduled_charging"]["plans"] = {
+        str(i): asdict(ScheduledChargingPlan(id=i)) for i in range(10)}
+    template["time_charging"]["plans"] = {str(i): asdict(TimeChargingPlan(id=i)) for i in range(10)}
+    return ChargeTemplateData, template
+
+
+def device_configs() -> List[Tuple[type, dict]]:
+    configs = []
+    for module_info in pkgutil.walk_packages(modules.devices.__path__, "modules.devices."):
+        if module_info.name.endswith(".config") is False:
+            continue
+        try:
+            module = importlib.import_module(module_info.name)
+        except Exception:
+            continue
+        for _, cls in inspect.getmembers(module, isclass):
+            if cls.__module__ == module.__name__:
+                try:
+                    configs.append((cls, asdict(cls())))
+                except Exception:
+                    pass
+    return configs
+
+
+def run(name: str, from_dict: Callable, samples: List[Tuple[type, Any]], repeat: int) -> List:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [from_dict(cls, payload) for cls, payload in samples]
+        durations.append(time.perf_counter() - start)
+    print(f"  {name:<28} {min(durations) / len(samples) * 1e6:8.1f}µs pro Umwandlung")
+    return [asdict(value) for value in result]
+
+
+def compare(title: str, samples: List[Tuple[type, Any]], repeat: int) -> None:
+    print(f"{title}: {len(samples)} Klassen")
+    legacy = run("getfullargspec je Aufruf:", legacy_dataclass_from_dict, samples, repeat)
+    cached = run("Konstruktor je Klasse:", dataclass_from_dict, samples, repeat)
+    if legacy != cached:
+        raise ValueError("Ergebnisse weichen voneinander ab.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="Anzahl Wiederholungen")
+    args = parser.parse_args()
+
+    compare("Lade-Profil mit je 10 Plänen", [charge_template()], args.repeat)
+    compare("Konfigurationen von Geräten und Komponenten", device_configs(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
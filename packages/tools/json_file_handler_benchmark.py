@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+""" Benchmark für das Schreiben der Logdateien abhängig von der Anzahl der Einträge.
+
+Ein Eintrag im Format des Tages-Logs wird an eine Datei mit der angegebenen Anzahl Einträge angehängt. Verglichen
+werden write_and_check (Sicherung, vollständiges Schreiben, Lesen und Vergleichen), write_atomic (vollständiges
+Schreiben in eine temporäre Datei mit fsync und Umbenennen) und append_entry (Schreiben ab dem Ende der Liste).
+Angegeben ist die Dauer je angehängtem Eintrag und die Anzahl geschriebener Bytes. Für den vollständigen Ablauf von
+save_log (Lesen der Tagesdatei, Anhängen und binäre Logdatei) wird das erneute Einlesen der Datei vor jedem Eintrag mit
+read_content verglichen; der neue Eintrag wird dabei nicht aus den Modulen erzeugt.
+
+Aufruf: PYTHONPATH=packages python3 packages/tools/json_file_handler_benchmark.py [--entries 100 1000 10000]
+        [--appends 20] [--dir /var/www/html/openWB/data]
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Callable, Dict
+from unittest.mock import Mock, patch
+
+from control import data  # noqa: F401 vor dem Werte-Logging importieren, um zirkuläre Importe zu vermeiden
+from helpermodules.measurement_logging import columnar_log, write_log
+from helpermodules.measurement_logging.write_log import LogType, save_log
+from helpermodules.utils.json_file_handler import append_entry, write_and_check, write_atomic
+
+NAMES = '"names": {"cp0": "Ladepunkt"}'
+
+
+def create_entry(index: int) -> Dict:
+    return {"timestamp": 1700000000 + index * 300, "date": "12:00",
+            "cp": {f"cp{cp}": {"imported": 1000.5 + index, "exported": 0} for cp in range(3)},
+            "counter": {"counter0": {"imported": 5000.25 + index, "exported": 1200, "grid": True}},
+            "pv": {"all": {"exported": 800.75 + index}},
+            "bat": {"all": {"imported": 10, "exported": 20, "soc": 50}},
+            "ev": {"ev0": {"soc": 80}},
+            "hc": {"all": {"imported": 400.0 + index}},
+            "sh": {}}
+
+
+def run(name: str, write: Callable, directory: str, count: int, appends: int) -> None:
+    file_path = os.path.join(directory, f"benchmark_{count}.json")
+    content = {"entries": [create_entry(i) for i in range(count)], "names": {"cp0": "Ladepunkt"}}
+    write_atomic(file_path, content)
+    durations = []
+    for i in range(appends):
+        content["entries"].append(create_entry(count + i))
+        start = time.perf_counter()
+        write(file_path, content)
+        durations.append(time.perf_counter() - start)
+    with open(file_path, "r", encoding="utf-8") as file:
+        if json.load(file) != content:
+            raise ValueError(f"{name}: Inhalt der Datei weicht ab.")
+    if write is append_entry:
+        # neuer Eintrag und der Rest der Datei ab dem Ende der Liste
+        written = len(", " + json.dumps(content["entries"][-1]) + "], " + json.dumps(content)[-len(NAMES) - 1:])
+    else:
+        written = os.path.getsize(file_path)
+    print(f"  {name:<16} {sum(durations) / appends * 1000:8.2f}ms, {written:>10} Bytes geschrieben")
+    os.remove(file_path)
+
+
+def load(file_path: str) -> Dict:
+    with open(file_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def run_save_log(name: str, read: Callable, directory: str, count: int, appends: int) -> None:
+    log_directory = Path(directory) / f"save_log_{name}_{count}"
+    (log_directory / "data" / "daily_log").mkdir(parents=True)
+    file_path = str(log_directory / "data" / "daily_log" / "20240301.json")
+    content = {"entries": [create_entry(i) for i in range(count)], "names": {}}
+    write_atomic(file_path, content)
+    columnar_log.write(file_path, content)
+    new_entries = (create_entry(count + i) for i in range(appends))
+    with patch.object(write_log, "_get_parent_file", Mock(return_value=log_directory)), \
+            patch.object(write_log, "read_content", read), \
+            patch.object(write_log, "LegacySmartHomeLogData", Mock(return_value=Mock(sh_names={}))), \
+            patch.object(write_log, "create_entry", lambda *args: next(new_entries)), \
+            patch.object(write_log.timecheck, "create_timestamp_YYYYMMDD", Mock(return_value="20240301")):
+        start = time.perf_counter()
+        for _ in range(appends):
+            save_log(LogType.DAILY)
+        duration = time.perf_counter() - start
+    if len(load(file_path)["entries"]) != count + appends:
+        raise ValueError(f"{name}: Inhalt der Datei weicht ab.")
+    print(f"  save_log, {name + ':':<17} {duration / appends * 1000:8.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 10000], help="Anzahl Einträge")
+    parser.add_argument("--appends", type=int, default=20, help="Anzahl angehängter Einträge je Messung")
+    parser.add_argument("--dir", default=None, help="Verzeichnis für die Testdateien, zB. auf der SD-Karte")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        for count in args.entries:
+            print(f"{count} Einträge:")
+            run("write_and_check:", write_and_check, directory, count, args.appends)
+            run("write_atomic:", write_atomic, directory, count, args.appends)
+            run("append_entry:", append_entry, directory, count, args.appends)
+            run_save_log("Einlesen", load, directory, count, args.appends)
+            run_save_log("read_content", write_log.read_content, directory, count, args.appends)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+""" Benchmark für die Index-Bestimmung aus Topics.
+
+Verglichen werden die bisherigen Funktionen, die bei jedem Aufruf re.search mit dem Muster als String aufrufen, mit den
+Funktionen aus helpermodules.utils.topic_parser, die das Topic einmalig zerlegen und das Ergebnis zwischenspeichern.
+Pro Nachricht werden wie in SubData/SetData Index und zweiter Index bestimmt. Gemessen wird einmal mit sich
+wiederholenden Topics (wie im laufenden Betrieb) und einmal mit lauter verschiedenen Topics (wie beim Start), jeweils
+auch nur mit dem ersten Index, da der zweite Index erst bei Bedarf bestimmt wird.
+
+Aufruf: PYTHONPATH=packages python3 packages/tools/topic_parser_benchmark.py [--topics 2000] [--messages 200000]
+"""
+import argparse
+import re
+import time
+from typing import Callable, List, Optional
+
+from helpermodules.utils import topic_parser
+
+TOPIC_TEMPLATES = ("openWB/set/chargepoint/{}/get/power",
+                   "openWB/chargepoint/{}/get/currents",
+                   "openWB/set/vehicle/template/charge_template/{}/chargemode/scheduled_charging/plans/{}",
+                   "openWB/system/device/{}/component/{}/config",
+                   "openWB/counter/{}/get/power")
+
+
+def legacy_get_index(topic: str) -> str:
+    regex = re.search('(?!/)([0-9]*)(?=/|$)', topic)
+    if regex is None:
+        raise ValueError(f"Couldn't find index in {topic}")
+    return regex.group()
+
+
+def legacy_get_second_index(topic: str) -> Optional[str]:
+    regex = re.search('^.+/([0-9]*)/.+/([0-9]+)/*.*$', topic)
+    if regex is None:
+        return None
+    return regex.group(2)
+
+
+def cached_get_second_index(topic: str) -> Optional[str]:
+    return topic_parser.parse_topic(topic).second_index
+
+
+def generate_topics(count: int) -> List[str]:
+    return [TOPIC_TEMPLATES[i % len(TOPIC_TEMPLATES)].format(i, i % 7) for i in range(count)]
+
+
+def run(name: str, get_index: Callable, get_second_index: Callable, messages: List[str], repeat: int) -> List:
+    durations = []
+    for _ in range(repeat):
+        topic_parser.parse_topic.cache_clear()
+        topic_parser._parse_second_index.cache_clear()
+        start = time.perf_counter()
+        result = [(get_index(topic), get_second_index(topic)) for topic in messages]
+        durations.append(time.perf_counter() - start)
+    per_message = min(durations) / len(messages) * 1e6
+    print(f"{name:<32} {min(durations):.3f}s, {per_message:.2f}µs pro Nachricht")
+    return result
+
+
+def compare(title: str, messages: List[str], repeat: int) -> None:
+    print(f"{title}: {len(messages)} Nachrichten, {len(set(messages))} verschiedene Topics")
+    legacy = run("  re.search:", legacy_get_index, legacy_get_second_index, messages, repeat)
+    cached = run("  parse_topic:", topic_parser.get_index, cached_get_second_index, messages, repeat)
+    if legacy != cached:
+        raise ValueError("Ergebnisse weichen voneinander ab.")
+    legacy = run("  re.search, nur Index:", legacy_get_index, lambda topic: None, messages, repeat)
+    cached = run("  parse_topic, nur Index:", topic_parser.get_index, lambda topic: None, messages, repeat)
+    if legacy != cached:
+        raise ValueError("Ergebnisse weichen voneinander ab.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=2000, help="Anzahl verschiedener Topics im Betrieb")
+    parser.add_argument("--messages", type=int, default=200000, help="Anzahl Nachrichten")
+    parser.add_argument("--repeat", type=int, default=3, help="Anzahl Wiederholungen")
+    args = parser.parse_args()
+
+    topics = generate_topics(args.topics)
+    compare("Betrieb", [topics[i % len(topics)] for i in range(args.messages)], args.repeat)
+    compare("Start", generate_topics(args.messages), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+""" Benchmark für die Zuordnung der Topics zu den Handlern in SubData/SetData.
+
+Die Topics werden aus einem Mitschnitt der retained Topics gelesen, z.B. erstellt mit
+    mosquitto_sub -t "openWB/#" -v --retained-only -W 3 > dump.txt
+Jede Zeile enthält das Topic und durch ein Leerzeichen getrennt den Payload. Ohne Mitschnitt werden synthetische Topics
+erzeugt. Verglichen wird die bisherige Zuordnung über die if-Kette, nach der die Handler den Index erneut per Regex aus
+dem Topic gelesen haben, mit dem Router, den SubData aufbaut und der den Index beim Matching erfasst. "Trie" entspricht
+dem ersten Empfang eines Topics (zB. die retained Topics beim Start), "Trie+Cache" dem zyklisch erneuten Empfang. Die
+Handler selbst werden nicht ausgeführt.
+
+Aufruf: PYTHONPATH=packages python3 packages/tools/topic_router_benchmark.py [--dump dump.txt] [--repeat 20]
+"""
+import argparse
+import re
+import time
+from typing import Callable, List
+from unittest.mock import Mock
+
+from control import data  # noqa: F401 vor SubData importieren, um zirkuläre Importe zu vermeiden
+from helpermodules.subdata import SubData
+
+SUBDATA_CHAIN = ("openWB/vehicle/template/charge_template/", "openWB/vehicle/template/ev_template/",
+                 "openWB/vehicle/", "openWB/chargepoint/template/", "openWB/chargepoint/", "openWB/pv/",
+                 "openWB/bat/", "openWB/general/", "openWB/graph/", "openWB/io/action", "openWB/io/states",
+                 "openWB/internal_io/states", "openWB/internal_chargepoint/", "openWB/optional/", "openWB/counter/",
+                 "openWB/system/", "openWB/LegacySmartHome/")
+
+
+def read_dump(path: str) -> List[str]:
+    with open(path, "r") as f:
+        return [line.split(" ", 1)[0] for line in f if line.strip()]
+
+
+def generate_topics(chargepoints: int) -> List[str]:
+    topics = []
+    for i in range(chargepoints):
+        topics.extend(f"openWB/chargepoint/{i}/get/{key}" for key in (
+            "power", "currents", "voltages", "imported", "exported", "plug_state", "charge_state", "fault_state",
+            "fault_str", "state_str", "phases_in_use", "connected_vehicle/info", "connected_vehicle/config"))
+        topics.extend(f"openWB/chargepoint/{i}/set/{key}" for key in ("current", "log", "charging_ev", "manual_lock"))
+        topics.extend(f"openWB/vehicle/{i}/{key}" for key in ("name", "charge_template", "get/soc", "get/range"))
+        topics.append(f"openWB/vehicle/template/charge_template/{i}")
+        topics.append(f"openWB/vehicle/template/charge_template/{i}/chargemode/scheduled_charging/plans/0")
+        topics.append(f"openWB/system/device/{i}/config")
+        topics.extend(f"openWB/system/device/{i}/component/{i}/{key}" for key in ("config", "simulation"))
+        topics.extend(f"openWB/counter/{i}/get/{key}" for key in ("power", "currents", "voltages", "fault_state"))
+    topics.extend(["openWB/general/chargemode_config/pv_charging/feed_in_yield", "openWB/optional/et/get/prices",
+                   "openWB/system/version", "openWB/command/command_completed"])
+    return topics
+
+
+def legacy_dispatch(topic: str) -> bool:
+    for prefix in SUBDATA_CHAIN:
+        if prefix in topic:
+            # bisherige Prüfung und Ermittlung des Index in den Handlern
+            if re.search("/[0-9]+/", topic) is not None:
+                re.search('(?!/)([0-9]*)(?=/|$)', topic).group()
+            return True
+    return "openWB/command/command_completed" == topic
+
+
+def run(name: str, dispatch: Callable[[str], bool], topics: List[str], repeat: int) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for topic in topics:
+            dispatch(topic)
+    duration = time.perf_counter() - start
+    count = len(topics) * repeat
+    print(f"{name:<12} {count:>9} Nachrichten in {duration:.3f}s: {count / duration:>12.0f} Nachrichten/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dump", help="Mitschnitt der retained Topics (Topic und Payload je Zeile)")
+    parser.add_argument("--chargepoints", type=int, default=30, help="Anzahl Ladepunkte für synthetische Topics")
+    parser.add_argument("--repeat", type=int, default=20, help="Anzahl Wiederholungen")
+    args = parser.parse_args()
+
+    topics = read_dump(args.dump) if args.dump else generate_topics(args.chargepoints)
+    # die Handler werden nicht aufgerufen, daher genügt ein Mock anstelle der SubData-Instanz
+    router = SubData._build_router(Mock())
+    unmatched = [topic for topic in topics if router.match(topic) is None]
+    print(f"{len(topics)} Topics, davon {len(unmatched)} ohne Handler")
+    run("if-Kette", legacy_dispatch, topics, args.repeat)
+    run("Trie", lambda topic: router._find(topic) is not None, topics, args.repeat)
+    run("Trie+Cache", lambda topic: router._lookup(topic) is not None, topics, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
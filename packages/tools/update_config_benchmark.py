@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+""" Benchmark für den Start von UpdateConfig.update() mit vielen retained Topics.
+
+Statt des Brokers wird ein synthetischer Mitschnitt mit der angegebenen Anzahl Topics an UpdateConfig übergeben, die
+Veröffentlichungen an den Broker werden verworfen. Gemessen wird die Laufzeit von update() ohne die Wartezeit auf den
+Broker. Zusätzlich wird die Prüfung der Topics gegen valid_topic einzeln mit re.search und mit dem TopicPatternSet
+verglichen.
+
+Aufruf: PYTHONPATH=packages python3 packages/tools/update_config_benchmark.py [--topics 20000] [--repeat 3]
+"""
+import argparse
+import re
+import time
+from typing import Dict, List
+from unittest.mock import patch
+
+from control import data  # noqa: F401 vor update_config importieren, um zirkuläre Importe zu vermeiden
+from helpermodules import update_config
+from helpermodules.update_config import UpdateConfig
+from helpermodules.utils.topic_pattern_set import TopicPatternSet
+
+CHARGEPOINT_KEYS = ("get/power", "get/currents", "get/voltages", "get/imported", "get/exported", "get/plug_state",
+                    "get/charge_state", "get/fault_state", "get/fault_str", "get/state_str", "set/current", "set/log",
+                    "get/connected_vehicle/info", "control_parameter/submode", "control_parameter/phases")
+
+
+def generate_dump(count: int) -> Dict[str, bytes]:
+    """ erzeugt Topics von Ladepunkten, Fahrzeugen, Zählern und SmartHome-Geräten. Jedes zehnte Topic ist veraltet.
+    """
+    topics = {"openWB/system/datastore_version": str(UpdateConfig.DATASTORE_VERSION).encode()}
+    index = 0
+    while len(topics) < count:
+        topics[f"openWB/chargepoint/{index}/config"] = b'{"name": "Ladepunkt"}'
+        for key in CHARGEPOINT_KEYS:
+            topics[f"openWB/chargepoint/{index}/{key}"] = b"0"
+        topics[f"openWB/chargepoint/{index}/get/outdated"] = b"0"
+        topics[f"openWB/vehicle/{index}/name"] = b'"Fahrzeug"'
+        topics[f"openWB/vehicle/{index}/get/soc"] = b"50"
+        topics[f"openWB/counter/{index}/get/power"] = b"0"
+        topics[f"openWB/counter/{index}/get/outdated"] = b"0"
+        topics[f"openWB/LegacySmartHome/Devices/{index}/Watt"] = b"0"
+        index += 1
+    return topics
+
+
+def classify_legacy(topics: List[str], patterns: List[str]) -> List[str]:
+    invalid = []
+    for topic in topics:
+        for pattern in patterns:
+            if re.search(pattern, topic) is not None:
+                break
+        else:
+            invalid.append(topic)
+    return invalid
+
+
+def classify_compiled(topics: List[str], patterns: List[str]) -> List[str]:
+    pattern_set = TopicPatternSet(patterns)
+    return [topic for topic in topics if pattern_set.search(topic) is False]
+
+
+class _Broker:
+    """ übergibt den Mitschnitt anstelle des BrokerClient an on_message """
+
+    def __init__(self, dump: Dict[str, bytes]) -> None:
+        self.dump = dump
+
+    def __call__(self, name, on_connect, on_message):
+        self.on_message = on_message
+        return self
+
+    def start_snapshot_loop(self) -> None:
+        for topic, payload in self.dump.items():
+            self.on_message(None, None, type("Message", (), {"topic": topic, "payload": payload}))
+
+
+def run_update(dump: Dict[str, bytes], repeat: int) -> None:
+    durations = []
+    for _ in range(repeat):
+        with patch.object(update_config, "BrokerClient", _Broker(dump)), patch.object(update_config, "Pub"):
+            start = time.perf_counter()
+            UpdateConfig().update()
+            durations.append(time.perf_counter() - start)
+    print(f"update():       {min(durations):.3f}s (bestes von {repeat})")
+
+
+def run_classification(name: str, classify, topics: List[str], repeat: int) -> List[str]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        invalid = classify(topics, UpdateConfig.valid_topic)
+        durations.append(time.perf_counter() - start)
+    print(f"{name:<15} {min(durations):.3f}s, {len(invalid)} veraltete Topics")
+    return invalid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=20000, help="Anzahl retained Topics im Mitschnitt")
+    parser.add_argument("--repeat", type=int, default=3, help="Anzahl Wiederholungen")
+    args = parser.parse_args()
+
+    dump = generate_dump(args.topics)
+    topics = list(dump.keys())
+    print(f"{len(topics)} Topics, {len(UpdateConfig.valid_topic)} Muster in valid_topic")
+    legacy = run_classification("re.search:", classify_legacy, topics, args.repeat)
+    compiled = run_classification("TopicPatternSet:", classify_compiled, topics, args.repeat)
+    if legacy != compiled:
+        raise ValueError("Ergebnisse der Prüfungen weichen voneinander ab.")
+    run_update(dump, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
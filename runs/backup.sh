@@ -48,6 +48,7 @@ fi
 	tar --verbose --create \
 		--file="$BACKUPFILE" \
 		--directory="$TARBASEDIR/" \
+		--exclude=".columnar" \
 		"$OPENWBDIRNAME/data/charge_log" \
 		"$OPENWBDIRNAME/data/daily_log" \
 		"$OPENWBDIRNAME/data/monthly_log" \